@@ -10,6 +10,7 @@ import numpy as np
 from utils import timezone
 
 from models.market_data import MarketData, GramAltinCandle
+from models.candle_frame import CandleFrame
 from indicators.rsi import RSIIndicator
 from indicators.macd import MACDIndicator
 from indicators.bollinger_bands import BollingerBandsIndicator
@@ -32,10 +33,14 @@ class GramAltinAnalyzer:
         self.atr = ATRIndicator()
         self.pattern_recognition = PatternRecognition()
         
-    def analyze(self, candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def analyze(self, candles: List[GramAltinCandle], frame: Optional[CandleFrame] = None) -> Dict[str, Any]:
         """
         Gram altın mumlarını analiz et
         
+        Args:
+            candles: Gram altın mumları
+            frame: Aynı mumların kolon bazlı hali (verilmezse burada oluşturulur)
+        
         Returns:
             Analiz sonuçları (göstergeler, destek/direnç, sinyal)
         """
@@ -50,10 +55,12 @@ class GramAltinAnalyzer:
                 logger.warning(f"Yetersiz mum verisi: {len(candles)}, minimum 10 gerekli")
                 return self._empty_analysis()
             
-            # Fiyat dizisi hazırla - numpy array kullan (daha hızlı)
-            prices = np.array([float(c.close) for c in candles])
-            high_prices = np.array([float(c.high) for c in candles])
-            low_prices = np.array([float(c.low) for c in candles])
+            # Fiyat dizileri - paylaşılan kolon verisi
+            if frame is None or len(frame) != len(candles):
+                frame = CandleFrame.from_candles(candles)
+            prices = frame.close
+            high_prices = frame.high
+            low_prices = frame.low
             
             current_price = Decimal(str(prices[-1]))
             logger.info(f"Mevcut gram altın fiyatı: {current_price}")
@@ -71,7 +78,7 @@ class GramAltinAnalyzer:
             trend, trend_strength = self._analyze_trend(prices, macd_result)
             
             # Destek/Direnç seviyeleri
-            support_levels, resistance_levels = self._find_support_resistance(candles)
+            support_levels, resistance_levels = self._find_support_resistance(candles, frame)
             
             # RSI Divergence ve Volume analizi
             rsi_divergence = self._detect_rsi_divergence(candles, prices)
@@ -165,14 +172,16 @@ class GramAltinAnalyzer:
             
         return trend, strength
     
-    def _find_support_resistance(self, candles: List[GramAltinCandle]) -> Tuple[List[SupportResistanceLevel], List[SupportResistanceLevel]]:
+    def _find_support_resistance(self, candles: List[GramAltinCandle],
+                                 frame: Optional[CandleFrame] = None) -> Tuple[List[SupportResistanceLevel], List[SupportResistanceLevel]]:
         """Destek ve direnç seviyelerini bul"""
-        # Numpy array'e çevir - daha hızlı işlem
-        candle_count = len(candles)
+        if frame is None:
+            frame = CandleFrame.from_candles(candles)
+        candle_count = len(frame)
         look_back = min(50, candle_count)
         
-        highs = np.array([float(c.high) for c in candles[-look_back:]])
-        lows = np.array([float(c.low) for c in candles[-look_back:]])
+        highs = frame.high[-look_back:]
+        lows = frame.low[-look_back:]
         
         # En yüksek ve en düşük 5 nokta
         unique_highs = np.unique(highs)[-5:][::-1]  # Benzersiz ve sıralı
@@ -0,0 +1,12 @@
+"""
+Performans benchmark paketi
+
+Sabit seed'li veri setleri (1k/10k/100k mum, 100k/1M tick) üzerinde
+göstergeler, analizörler, HybridStrategy.analyze, depolama okumaları ve
+FastAPI route'ları ölçülür. Sonuçlar JSON olarak saklanır ve bir baseline ile
+karşılaştırılır; eşiği aşan yavaşlama sıfırdan farklı çıkış kodu verir.
+
+    python -m benchmarks run --save-baseline local        # baseline oluştur
+    python -m benchmarks run --compare local              # değişiklik sonrası kontrol
+    python -m benchmarks compare baseline.json current.json --threshold 0.15
+"""
@@ -0,0 +1,118 @@
+"""
+Benchmark CLI
+
+    python -m benchmarks run [--profile quick|full] [-k FILTER] [--output PATH]
+                             [--save-baseline NAME] [--compare NAME|PATH] [--threshold 0.2]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.2]
+    python -m benchmarks list
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Aynı girdiyle tekrarlanan ölçümler paylaşılan analiz önbelleğinden dönmesin
+os.environ.setdefault("ANALYSIS_CACHE", "false")
+
+from benchmarks import runner  # noqa: E402
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+GROUP_MODULES = ("bench_indicators", "bench_analyzers", "bench_storage", "bench_api")
+
+
+def load_benchmarks():
+    import importlib
+    for module in GROUP_MODULES:
+        importlib.import_module(f"benchmarks.{module}")
+    return runner.registered()
+
+
+def baseline_path(name_or_path: str) -> str:
+    if os.path.exists(name_or_path):
+        return name_or_path
+    return os.path.join(BASELINE_DIR, f"{name_or_path}.json")
+
+
+def cmd_run(args) -> int:
+    # Analiz modülleri INFO seviyesinde yoğun log basar; ölçümü bozmasın
+    logging.disable(logging.CRITICAL)
+    benchmarks = load_benchmarks()
+    if args.group:
+        benchmarks = [b for b in benchmarks if b.group in args.group]
+
+    print(f"Benchmark profili: {args.profile}")
+    try:
+        document = runner.run(benchmarks, profile=args.profile, pattern=args.filter,
+                              repeat=args.repeat, min_time=args.min_time)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    output = args.output or os.path.join(RESULTS_DIR, "latest.json")
+    runner.save(document, output)
+    print(f"Sonuçlar: {output}")
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        runner.save(document, path)
+        print(f"Baseline: {path}")
+
+    if args.compare:
+        return report(runner.load(baseline_path(args.compare)), document, args.threshold)
+    return 1 if any("error" in r for r in document["results"].values()) else 0
+
+
+def cmd_compare(args) -> int:
+    return report(runner.load(baseline_path(args.baseline)), runner.load(args.current), args.threshold)
+
+
+def cmd_list(args) -> int:
+    for bench in load_benchmarks():
+        print(f"{bench.group}.{bench.name}: {', '.join(bench.sizes)}")
+    return 0
+
+
+def report(baseline, current, threshold) -> int:
+    base_meta, cur_meta = baseline.get("meta", {}), current.get("meta", {})
+    print(f"\nBaseline: {base_meta.get('commit')} ({base_meta.get('created')}, {base_meta.get('profile')})")
+    print(f"Current:  {cur_meta.get('commit')} ({cur_meta.get('created')}, {cur_meta.get('profile')})")
+    if (base_meta.get("machine"), base_meta.get("python")) != (cur_meta.get("machine"), cur_meta.get("python")):
+        print("UYARI: baseline farklı makine/Python sürümünde alınmış, oranlar yanıltıcı olabilir")
+    rows = runner.compare(baseline, current, threshold)
+    print(runner.format_report(rows, threshold))
+    return 1 if runner.has_regressions(rows) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Gold Price Analyzer benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Benchmark'ları çalıştır")
+    run.add_argument("--profile", choices=sorted(runner.PROFILES), default="quick")
+    run.add_argument("-k", "--filter", help="Anahtarında bu metin geçen benchmark'lar")
+    run.add_argument("--group", action="append", help="Sadece bu grup(lar): indicators, analyzers, strategy, storage, api")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--min-time", type=float, default=0.2, help="Bir örneğin en kısa süresi (saniye)")
+    run.add_argument("--output", help="Sonuç JSON yolu (varsayılan benchmarks/results/latest.json)")
+    run.add_argument("--save-baseline", metavar="NAME", help="Sonucu benchmarks/baselines/NAME.json olarak da kaydet")
+    run.add_argument("--compare", metavar="BASELINE", help="Baseline adı veya JSON yolu")
+    run.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD)
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="İki sonuç dosyasını karşılaştır")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=runner.DEFAULT_THRESHOLD)
+    compare.set_defaults(func=cmd_compare)
+
+    listing = sub.add_parser("list", help="Kayıtlı benchmark'ları listele")
+    listing.set_defaults(func=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
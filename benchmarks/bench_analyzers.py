@@ -0,0 +1,45 @@
+"""
+Analizör ve HybridStrategy.analyze benchmark'ları
+"""
+from benchmarks.datasets import CANDLE_SIZES, gram_candles, market_data
+from benchmarks.runner import benchmark
+from analyzers.currency_risk_analyzer import CurrencyRiskAnalyzer
+from analyzers.global_trend_analyzer import GlobalTrendAnalyzer
+from analyzers.gram_altin_analyzer import GramAltinAnalyzer
+from analyzers.multi_day_pattern import MultiDayPatternAnalyzer
+from strategies.hybrid_strategy import HybridStrategy
+
+@benchmark("analyzers", CANDLE_SIZES)
+def gram_altin(size):
+    candles = gram_candles(size)
+    analyzer = GramAltinAnalyzer()
+    return lambda: analyzer.analyze(candles)
+
+
+@benchmark("analyzers", CANDLE_SIZES)
+def global_trend(size):
+    data = market_data(size)
+    analyzer = GlobalTrendAnalyzer()
+    return lambda: analyzer.analyze(data)
+
+
+@benchmark("analyzers", CANDLE_SIZES)
+def currency_risk(size):
+    data = market_data(size)
+    analyzer = CurrencyRiskAnalyzer()
+    return lambda: analyzer.analyze(data)
+
+
+@benchmark("analyzers", CANDLE_SIZES)
+def multi_day_pattern(size):
+    candles = gram_candles(size)
+    analyzer = MultiDayPatternAnalyzer()
+    return lambda: analyzer.analyze(candles)
+
+
+@benchmark("strategy", CANDLE_SIZES)
+def hybrid_analyze(size):
+    candles = gram_candles(size)
+    data = market_data(min(size, 1000))
+    strategy = HybridStrategy()
+    return lambda: strategy.analyze(candles, data, "1h")
@@ -0,0 +1,86 @@
+"""
+FastAPI route benchmark'ları - TestClient ile, önbellek her çağrıda temizlenir
+"""
+import os
+
+from benchmarks.datasets import TICK_SIZES, price_db
+from benchmarks.runner import benchmark
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_client = None
+
+
+def _bind(size):
+    """web_server'ı tick veritabanına bağlı olarak içe aktar, TestClient döndür"""
+    global _client
+    storage = price_db(size)
+    if _client is None:
+        # Route modülleri içe aktarılırken çalışma dizinindeki gold_prices.db'yi,
+        # static/ ve templates/ dizinlerini açar
+        cwd = os.getcwd()
+        workdir = os.path.dirname(storage.db_path)
+        for name in ("static", "templates"):
+            link = os.path.join(workdir, name)
+            if not os.path.exists(link):
+                os.symlink(os.path.join(PROJECT_ROOT, name), link)
+        os.chdir(workdir)
+        try:
+            from fastapi.testclient import TestClient
+            from web_server import app
+        finally:
+            os.chdir(cwd)
+        _client = TestClient(app)
+
+    # Farklı boyuttaki veritabanına geçiş
+    from storage.async_storage import AsyncSQLiteStorage
+    from web.routes import analysis, api
+    for module in (api, analysis):
+        if module.storage.db_path != storage.db_path:
+            module.storage = storage
+            module.storage.enable_candle_store(persist=False, auto_sync=True)
+            module.db = AsyncSQLiteStorage(storage)
+    return _client
+
+
+def _get(size, url):
+    from web.utils import cache
+    client = _bind(size)
+
+    def call():
+        cache.clear()
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} -> HTTP {response.status_code}")
+        return response
+    return call
+
+
+@benchmark("api", TICK_SIZES)
+def prices_latest(size):
+    return _get(size, "/api/prices/latest")
+
+
+@benchmark("api", TICK_SIZES)
+def gram_candles_1h(size):
+    return _get(size, "/api/gram-candles/1h")
+
+
+@benchmark("api", TICK_SIZES)
+def signals_recent(size):
+    return _get(size, "/api/signals/recent")
+
+
+@benchmark("api", TICK_SIZES)
+def analysis_history(size):
+    return _get(size, "/api/analysis/history?per_page=50")
+
+
+@benchmark("api", TICK_SIZES)
+def analysis_indicators(size):
+    return _get(size, "/api/analysis/indicators/1h")
+
+
+@benchmark("api", TICK_SIZES)
+def stats(size):
+    return _get(size, "/api/stats")
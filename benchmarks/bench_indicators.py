@@ -0,0 +1,114 @@
+"""
+Gösterge benchmark'ları - her gösterge sınıfının tam hesaplaması
+"""
+from benchmarks.datasets import CANDLE_SIZES, gram_candles, ohlc_frame
+from benchmarks.runner import benchmark
+from indicators.advanced_patterns import AdvancedPatternRecognition
+from indicators.atr import ATRIndicator
+from indicators.bollinger_bands import BollingerBandsIndicator
+from indicators.cci import CCI
+from indicators.divergence_detector import AdvancedDivergenceDetector
+from indicators.fibonacci_retracement import FibonacciRetracement
+from indicators.macd import MACDIndicator
+from indicators.market_regime import MarketRegimeDetector
+from indicators.mfi import MFI
+from indicators.pattern_recognition import PatternRecognition
+from indicators.rsi import RSIIndicator
+from indicators.smart_money_concepts import SmartMoneyConcepts
+from indicators.stochastic import StochasticIndicator
+
+@benchmark("indicators", CANDLE_SIZES)
+def rsi(size):
+    prices = [float(c.close) for c in gram_candles(size)]
+    indicator = RSIIndicator()
+    return lambda: indicator.calculate(prices)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def macd(size):
+    candles = gram_candles(size)
+    indicator = MACDIndicator()
+    return lambda: indicator.calculate(candles)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def bollinger(size):
+    candles = gram_candles(size)
+    indicator = BollingerBandsIndicator()
+    return lambda: indicator.calculate(candles)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def atr(size):
+    candles = gram_candles(size)
+    indicator = ATRIndicator()
+    return lambda: indicator.calculate(candles)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def stochastic(size):
+    candles = gram_candles(size)
+    indicator = StochasticIndicator()
+    return lambda: indicator.calculate(candles)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def pattern_recognition(size):
+    candles = gram_candles(size)
+    indicator = PatternRecognition()
+    return lambda: indicator.detect_patterns(candles)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def cci(size):
+    df = ohlc_frame(size)
+    indicator = CCI()
+    return lambda: indicator.get_analysis(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def mfi(size):
+    df = ohlc_frame(size)
+    indicator = MFI()
+    return lambda: indicator.get_analysis(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def advanced_patterns(size):
+    df = ohlc_frame(size)
+    indicator = AdvancedPatternRecognition()
+    return lambda: indicator.comprehensive_pattern_analysis(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def smart_money_concepts(size):
+    df = ohlc_frame(size)
+    return lambda: SmartMoneyConcepts().analyze(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def fibonacci(size):
+    df = ohlc_frame(size)
+    return lambda: FibonacciRetracement().analyze(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def market_regime(size):
+    df = ohlc_frame(size)
+    # Detektör geçmiş biriktirir; her çağrı temiz örnekle ölçülür
+    return lambda: MarketRegimeDetector().analyze_market_regime(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def divergence(size):
+    df = ohlc_frame(size)
+    detector = AdvancedDivergenceDetector()
+    return lambda: detector.analyze(df)
+
+
+@benchmark("indicators", CANDLE_SIZES)
+def divergence_full_window(size):
+    # Backtest kullanımı: 200 mumluk varsayılan pencere yerine tüm seri
+    df = ohlc_frame(size)
+    detector = AdvancedDivergenceDetector()
+    return lambda: detector.analyze(df, lookback=size)
@@ -0,0 +1,52 @@
+"""
+SQLite depolama benchmark'ları - tick veritabanı üzerinde okuma yolları
+"""
+from datetime import timedelta
+
+from benchmarks.datasets import TICK_SIZES, price_db
+from benchmarks.runner import benchmark
+from storage.candle_store import CandleStore
+from utils import timezone
+
+
+@benchmark("storage", TICK_SIZES)
+def generate_gram_candles_15m(size):
+    storage = price_db(size)
+    return lambda: storage.generate_gram_candles(15, 200)
+
+
+@benchmark("storage", TICK_SIZES)
+def generate_gram_candles_1h(size):
+    storage = price_db(size)
+    return lambda: storage.generate_gram_candles(60, 200)
+
+
+@benchmark("storage", TICK_SIZES)
+def candle_store_get_candles(size):
+    storage = price_db(size)
+    # Süreç içi paylaşılan depo yerine ayrı örnek: ısınma maliyeti setup'ta kalır
+    store = CandleStore(storage, persist=False)
+    store.warm_up()
+    return lambda: store.get_candles(60, 200)
+
+
+@benchmark("storage", TICK_SIZES)
+def hybrid_analysis_history(size):
+    storage = price_db(size)
+    return lambda: storage.get_hybrid_analysis_history(limit=50)
+
+
+@benchmark("storage", TICK_SIZES)
+def hybrid_analysis_history_filtered(size):
+    storage = price_db(size)
+    end = timezone.utc_now()
+    return lambda: storage.get_hybrid_analysis_history(
+        limit=50, offset=100, timeframe="1h", signal_type="BUY", start_date=end - timedelta(days=30), end_date=end
+    )
+
+
+@benchmark("storage", TICK_SIZES)
+def iter_price_ticks_1d(size):
+    storage = price_db(size)
+    end = timezone.utc_now()
+    return lambda: sum(1 for _ in storage.iter_price_ticks(end - timedelta(days=1), end))
@@ -0,0 +1,186 @@
+"""
+Benchmark veri setleri - sabit seed'li, tekrarlanabilir
+
+Mum serileri ve piyasa verisi bellekte üretilir ve süreç içinde önbelleklenir.
+Tick veritabanları benchmarks/.data altında bir kez kurulur; en yeni tick
+"şimdi"ye göre eskidiyse (generate_gram_candles son N periyoda bakar) yeniden
+üretilir.
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from models.market_data import GramAltinCandle, MarketData
+from storage.candle_store import GRAMS_PER_OUNCE
+from storage.sqlite_storage import INSERT_HYBRID_ANALYSIS_SQL, INSERT_PRICE_SQL, SQLiteStorage
+from utils import timezone
+
+SEED = 42
+
+# Mum serisi boyutları ve tick veritabanı boyutları
+CANDLE_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+TICK_SIZES = {"100k-ticks": 100_000, "1m-ticks": 1_000_000}
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+
+TICK_SECONDS = 5
+HYBRID_ROWS = 5_000
+# Bu kadar eski bir veritabanı yeniden üretilir
+MAX_DB_AGE = timedelta(hours=6)
+
+
+@lru_cache(maxsize=None)
+def ohlc_arrays(size: int, seed: int = SEED) -> Dict[str, np.ndarray]:
+    """Rastgele yürüyüşlü OHLCV dizileri (gram altın fiyat bandında)"""
+    rng = np.random.default_rng(seed)
+    # Trend + rejim değişimli gürültü: formasyon ve swing dedektörleri gerçekçi iş yapsın
+    drift = np.repeat(rng.normal(0, 0.4, size // 250 + 1), 250)[:size]
+    close = 2400 + np.cumsum(drift + rng.normal(0, 4, size))
+    open_ = np.concatenate(([close[0]], close[:-1])) + rng.normal(0, 0.5, size)
+    high = np.maximum(open_, close) + rng.uniform(0.2, 5, size)
+    low = np.minimum(open_, close) - rng.uniform(0.2, 5, size)
+    volume = rng.integers(500, 5000, size)
+    return {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+
+@lru_cache(maxsize=None)
+def ohlc_frame(size: int) -> pd.DataFrame:
+    """pandas tabanlı göstergeler için DataFrame"""
+    arrays = ohlc_arrays(size)
+    index = pd.date_range(end="2025-03-20 12:00", periods=size, freq="1h", tz="UTC")
+    return pd.DataFrame(arrays, index=index)
+
+
+@lru_cache(maxsize=None)
+def gram_candles(size: int, interval: str = "1h") -> List[GramAltinCandle]:
+    """Analizörlerin kullandığı Decimal fiyatlı mumlar"""
+    arrays = ohlc_arrays(size)
+    end = timezone.UTC_TZ.localize(datetime(2025, 3, 20, 12, 0))
+    start = end - timedelta(hours=size - 1)
+    return [
+        GramAltinCandle(
+            timestamp=start + timedelta(hours=i),
+            open=Decimal(str(round(arrays["open"][i], 3))),
+            high=Decimal(str(round(arrays["high"][i], 3))),
+            low=Decimal(str(round(arrays["low"][i], 3))),
+            close=Decimal(str(round(arrays["close"][i], 3))),
+            volume=int(arrays["volume"][i]),
+            interval=interval
+        )
+        for i in range(size)
+    ]
+
+
+@lru_cache(maxsize=None)
+def market_data(size: int) -> List[MarketData]:
+    """Global trend / kur riski analizörleri için piyasa verisi"""
+    rng = np.random.default_rng(SEED + 1)
+    ons_usd = 2600 + np.cumsum(rng.normal(0, 3, size))
+    usd_try = 34 + np.cumsum(rng.normal(0.002, 0.02, size))
+    end = timezone.UTC_TZ.localize(datetime(2025, 3, 20, 12, 0))
+    return [
+        MarketData(
+            timestamp=end - timedelta(minutes=15 * (size - 1 - i)),
+            gram_altin=Decimal(str(round(ons_usd[i] * usd_try[i] / GRAMS_PER_OUNCE, 3))),
+            ons_usd=Decimal(str(round(ons_usd[i], 3))),
+            usd_try=Decimal(str(round(usd_try[i], 4))),
+            ons_try=Decimal(str(round(ons_usd[i] * usd_try[i], 3)))
+        )
+        for i in range(size)
+    ]
+
+
+def price_db(ticks: int) -> SQLiteStorage:
+    """`ticks` adet fiyat tick'i ve HYBRID_ROWS hibrit analiz içeren veritabanı
+
+    Dosya kendi dizininde gold_prices.db adıyla durur; web modülleri varsayılan
+    yolu kullandığından API benchmark'ları bu dizinde içe aktarılabilir.
+    """
+    workdir = os.path.join(DATA_DIR, f"ticks_{ticks}_seed{SEED}")
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, "gold_prices.db")
+    if not _is_fresh(path):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        _build_price_db(SQLiteStorage(path), ticks)
+    return SQLiteStorage(path)
+
+
+def _is_fresh(path: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    try:
+        conn = sqlite3.connect(path)
+        try:
+            newest = conn.execute("SELECT MAX(timestamp) FROM price_data").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    if newest is None:
+        return False
+    return timezone.utc_now() - timezone.to_utc(timezone.parse_timestamp(newest)) < MAX_DB_AGE
+
+
+def _build_price_db(storage: SQLiteStorage, ticks: int, chunk_size: int = 50_000):
+    rng = np.random.default_rng(SEED + 2)
+    end = timezone.utc_now().replace(microsecond=0)
+    start = end - timedelta(seconds=TICK_SECONDS * (ticks - 1))
+
+    with storage.get_connection() as conn:
+        for offset in range(0, ticks, chunk_size):
+            n = min(chunk_size, ticks - offset)
+            ons_usd = 2600 + rng.normal(0, 0.3, n).cumsum() + offset * 1e-4
+            usd_try = 34 + rng.normal(0, 0.001, n).cumsum()
+            ons_try = ons_usd * usd_try
+            gram = ons_try / GRAMS_PER_OUNCE
+            conn.executemany(INSERT_PRICE_SQL, (
+                (str(start + timedelta(seconds=TICK_SECONDS * (offset + i))),
+                 float(ons_usd[i]), float(usd_try[i]), float(ons_try[i]), float(gram[i]), "benchmark")
+                for i in range(n)
+            ))
+
+        signals = ("BUY", "SELL", "HOLD")
+        timeframes = ("15m", "1h", "4h", "1d")
+        conn.executemany(INSERT_HYBRID_ANALYSIS_SQL, (
+            storage._hybrid_analysis_row(_hybrid_analysis(
+                end - timedelta(minutes=15 * (HYBRID_ROWS - i)), timeframes[i % 4], signals[i % 3], i
+            ))
+            for i in range(HYBRID_ROWS)
+        ))
+
+
+def _hybrid_analysis(timestamp: datetime, timeframe: str, signal: str, i: int) -> Dict:
+    price = 2500 + (i % 97) * 0.5
+    return {
+        "timestamp": timestamp,
+        "timeframe": timeframe,
+        "gram_price": price,
+        "signal": signal,
+        "signal_strength": "MODERATE",
+        "confidence": 0.5 + (i % 40) / 100,
+        "position_size": 0.5,
+        "stop_loss": price - 20,
+        "take_profit": price + 40,
+        "risk_reward_ratio": 2.0,
+        "gram_analysis": {
+            "indicators": {
+                "rsi": 30 + i % 40,
+                "macd": {"macd_line": 1.0, "histogram": (i % 11 - 5) / 10},
+                "bollinger": {"upper_band": price + 25, "lower_band": price - 25, "percent_b": (i % 10) / 10},
+                "atr": {"atr": 10.0 + i % 5}
+            },
+            "patterns": [{"name": "DOJI", "type": "NEUTRAL", "confidence": 0.5}]
+        },
+        "global_trend": {"trend_direction": "BULLISH", "trend_strength": "MODERATE"},
+        "currency_risk": {"risk_level": "LOW", "position_size_multiplier": 0.9},
+        "recommendations": ["benchmark"],
+        "summary": "benchmark"
+    }
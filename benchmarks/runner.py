@@ -0,0 +1,218 @@
+"""
+Benchmark kaydı, ölçüm, JSON sonuç dosyaları ve regresyon karşılaştırması
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Karşılaştırmada bu oranın üstündeki yavaşlama regresyon sayılır
+DEFAULT_THRESHOLD = 0.20
+
+# Profil -> çalıştırılacak veri boyutu etiketleri
+PROFILES = {
+    "quick": {"1k", "10k", "100k-ticks"},
+    "full": {"1k", "10k", "100k", "100k-ticks", "1m-ticks"},
+}
+
+
+@dataclass
+class Benchmark:
+    """Tek benchmark: setup(size) ölçülecek sıfır argümanlı fonksiyonu döndürür"""
+    group: str
+    name: str
+    setup: Callable[[int], Callable[[], object]]
+    sizes: Dict[str, int]
+
+    def key(self, label: str) -> str:
+        return f"{self.group}.{self.name}[{label}]"
+
+
+_registry: List[Benchmark] = []
+
+
+def benchmark(group: str, sizes: Dict[str, int], name: Optional[str] = None):
+    """Benchmark kaydı için dekoratör"""
+    def decorator(setup):
+        _registry.append(Benchmark(group, name or setup.__name__, setup, dict(sizes)))
+        return setup
+    return decorator
+
+
+def registered() -> List[Benchmark]:
+    return list(_registry)
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """Çağrı başına süre istatistikleri (saniye)
+
+    timeit.autorange gibi döngü sayısı bir örnek en az min_time sürecek şekilde
+    ayarlanır; repeat örneğin medyanı karşılaştırmada kullanılır.
+    """
+    func()  # Isınma: import, lazy cache ve JIT benzeri ilk çağrı maliyetleri
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / loops]
+    if elapsed > 5 * min_time:
+        # Tek çağrısı uzun süren benchmark'larda daha az örnek yeterli
+        repeat = min(repeat, 3)
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "samples": len(samples)
+    }
+
+
+def run(benchmarks: Iterable[Benchmark], profile: str = "quick", pattern: Optional[str] = None,
+        repeat: int = 5, min_time: float = 0.2, log: Callable[[str], None] = print) -> Dict:
+    """Seçilen benchmark'ları çalıştır, sonuç belgesini döndür"""
+    labels = PROFILES[profile]
+    results = {}
+    for bench in benchmarks:
+        for label, size in bench.sizes.items():
+            key = bench.key(label)
+            if label not in labels or (pattern and pattern not in key):
+                continue
+            try:
+                func = bench.setup(size)
+                results[key] = measure(func, repeat=repeat, min_time=min_time)
+                log(f"  {key:<55} {format_time(results[key]['median'])}")
+            except Exception as e:
+                results[key] = {"error": f"{type(e).__name__}: {e}"}
+                log(f"  {key:<55} HATA: {results[key]['error']}")
+    return {"meta": environment(profile), "results": results}
+
+
+def environment(profile: str) -> Dict[str, str]:
+    """Sonuçların karşılaştırılabilirliği için çalışma ortamı bilgisi"""
+    import numpy
+    import pandas
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "profile": profile,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save(document: Dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """Medyan sürelere göre karşılaştırma satırları
+
+    status: regression (> threshold yavaş), improved (> threshold hızlı), ok,
+    new (baseline'da yok), missing (bu çalıştırmada yok), error.
+    """
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+    rows = []
+    for key in sorted(set(base_results) | set(cur_results)):
+        base = base_results.get(key, {}).get("median")
+        cur = cur_results.get(key, {}).get("median")
+        row = {"benchmark": key, "baseline": base, "current": cur, "ratio": None}
+        if "error" in cur_results.get(key, {}):
+            row["status"] = "error"
+        elif cur is None:
+            row["status"] = "missing"
+        elif base is None:
+            row["status"] = "new"
+        else:
+            row["ratio"] = cur / base if base > 0 else float("inf")
+            if row["ratio"] > 1 + threshold:
+                row["status"] = "regression"
+            elif row["ratio"] < 1 / (1 + threshold):
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def has_regressions(rows: List[Dict]) -> bool:
+    return any(row["status"] in ("regression", "error") for row in rows)
+
+
+def format_report(rows: List[Dict], threshold: float = DEFAULT_THRESHOLD) -> str:
+    lines = [
+        f"{'benchmark':<55} {'baseline':>10} {'current':>10} {'ratio':>7}  status",
+        "-" * 95
+    ]
+    for row in rows:
+        if row["status"] == "missing":
+            continue
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        lines.append(
+            f"{row['benchmark']:<55} {format_time(row['baseline']):>10} {format_time(row['current']):>10} "
+            f"{ratio:>7}  {row['status'].upper() if row['status'] in ('regression', 'error') else row['status']}"
+        )
+    counts = _count(rows)
+    lines.append("-" * 95)
+    lines.append(
+        f"{counts.get('regression', 0)} regression, {counts.get('error', 0)} error, "
+        f"{counts.get('improved', 0)} improved, {counts.get('ok', 0)} ok, "
+        f"{counts.get('new', 0)} new, {counts.get('missing', 0)} not run (threshold {threshold:.0%})"
+    )
+    return "\n".join(lines)
+
+
+def _count(rows: List[Dict]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    return counts
+
+
+def format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
@@ -15,13 +15,16 @@ logger = logging.getLogger(__name__)
 class HaremPriceCollector:
     """HaremAltin API entegrasyonu"""
     
-    def __init__(self, harem_service):
+    def __init__(self, harem_service, candle_store=None, storage: Optional[SQLiteStorage] = None):
         """
         Args:
             harem_service: HaremAltinPriceService instance
+            candle_store: Opsiyonel CandleStore - her yeni fiyatla mumları günceller
+            storage: Opsiyonel SQLiteStorage - write-behind kuyruğunu paylaşmak için
         """
         self.harem_service = harem_service
-        self.storage = SQLiteStorage()
+        self.storage = storage or SQLiteStorage()
+        self.candle_store = candle_store
         self.is_running = False
         self.analysis_callbacks = []
         
@@ -98,6 +101,13 @@ class HaremPriceCollector:
             # Veritabanına kaydet
             self.storage.save_price(price_data)
             
+            # Açık mumları güncelle
+            if self.candle_store is not None:
+                try:
+                    self.candle_store.add_price(price_data)
+                except Exception as e:
+                    logger.error(f"Candle store update error: {e}")
+            
             # Analiz callback'lerini çağır
             logger.debug(f"Calling {len(self.analysis_callbacks)} analysis callbacks")
             for callback in self.analysis_callbacks:
@@ -22,6 +22,13 @@ class Settings(BaseSettings):
     analysis_interval_daily: int = int(os.getenv("ANALYSIS_INTERVAL_DAILY", "1440"))  # Günlük analiz
     data_retention_raw: int = int(os.getenv("DATA_RETENTION_RAW", "7"))
     data_retention_compressed: int = int(os.getenv("DATA_RETENTION_COMPRESSED", "30"))
+    # Hibrit analiz detay JSON'ları (kapalıysa yalnızca tipli sinyal kolonları yazılır)
+    store_analysis_blobs: bool = os.getenv("STORE_ANALYSIS_BLOBS", "true").lower() == "true"
+    # HybridStrategy.analyze aşama süreleri (/api/perf/stages)
+    stage_profiling: bool = os.getenv("STAGE_PROFILING", "false").lower() == "true"
+    # Analizör sonuçları için süreçler arası paylaşılan önbellek (analysis_cache tablosu)
+    analysis_cache: bool = os.getenv("ANALYSIS_CACHE", "true").lower() == "true"
+    analysis_cache_db: str = os.getenv("ANALYSIS_CACHE_DB", "gold_prices.db")
     
     # Analysis Settings
     support_resistance_lookback: int = int(os.getenv("SUPPORT_RESISTANCE_LOOKBACK", "100"))
@@ -15,6 +15,7 @@ warnings.filterwarnings('ignore')
 # Scipy opsiyonel - yoksa basit implementasyon kullan
 try:
     from scipy.signal import find_peaks
+    from indicators.swing_points import swing_index
     HAS_SCIPY = True
 except ImportError:
     HAS_SCIPY = False
@@ -68,7 +69,11 @@ class AdvancedPatternRecognition:
             (peaks_indices, valleys_indices) tuple'ı
         """
         try:
-            # Scipy kullanarak peak'leri bul
+            if HAS_SCIPY:
+                # Paylaşılan swing indeksi (scipy find_peaks ile aynı sonuç)
+                swings = swing_index(prices.values)
+                return swings.peaks(window), swings.valleys(window)
+            
             peaks, _ = find_peaks(prices.values, distance=window)
             valleys, _ = find_peaks(-prices.values, distance=window)
             
@@ -5,6 +5,7 @@ from typing import List, Dict, Optional, Tuple
 from decimal import Decimal
 import logging
 from models.price_data import PriceCandle
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -44,46 +45,23 @@ class ATRIndicator:
                 logger.warning(f"Not enough data for ATR. Need {self.period + 1}, got {len(candles)}")
                 return self._empty_result()
         
-            # True Range değerlerini hesapla
-            true_ranges = []
+            # True Range = max(High - Low, |High - Prev Close|, |Low - Prev Close|)
+            try:
+                true_ranges = kernels.true_range(
+                    kernels.candle_column(candles, "high"),
+                    kernels.candle_column(candles, "low"),
+                    kernels.candle_column(candles, "close")
+                )[1:]
+            except (AttributeError, ValueError, TypeError) as e:
+                logger.error(f"Error calculating true range: {e}")
+                return self._empty_result()
             
-            for i in range(1, len(candles)):
-                try:
-                    current = candles[i]
-                    previous = candles[i-1]
-                    
-                    # True Range = max(
-                    #   High - Low,
-                    #   abs(High - Previous Close),
-                    #   abs(Low - Previous Close)
-                    # )
-                    tr1 = float(current.high - current.low)
-                    tr2 = abs(float(current.high - previous.close))
-                    tr3 = abs(float(current.low - previous.close))
-                    
-                    true_range = max(tr1, tr2, tr3)
-                    true_ranges.append(true_range)
-                    
-                except (AttributeError, ValueError, TypeError) as e:
-                    logger.error(f"Error calculating true range at index {i}: {e}")
-                    continue
-        
-            # İlk ATR değeri: ilk N true range'in ortalaması
             if len(true_ranges) < self.period:
                 logger.warning(f"Not enough true ranges calculated: {len(true_ranges)}")
                 return self._empty_result()
             
-            # ATR hesaplama (Wilder's smoothing)
-            atr_values = []
-            
-            # İlk ATR
-            first_atr = sum(true_ranges[:self.period]) / self.period
-            atr_values.append(first_atr)
-            
-            # Sonraki ATR değerleri
-            for i in range(self.period, len(true_ranges)):
-                atr = (atr_values[-1] * (self.period - 1) + true_ranges[i]) / self.period
-                atr_values.append(atr)
+            # ATR hesaplama (Wilder's smoothing, ilk değer ilk N true range'in ortalaması)
+            atr_values = kernels.rma(true_ranges, self.period).tolist()
             
             current_atr = atr_values[-1]
             current_price = float(candles[-1].close)
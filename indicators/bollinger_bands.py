@@ -2,10 +2,10 @@
 Bollinger Bands Göstergesi
 """
 from typing import List, Dict, Optional, Tuple
-from decimal import Decimal
 import logging
-import statistics
+import numpy as np
 from models.price_data import PriceCandle
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -47,29 +47,23 @@ class BollingerBandsIndicator:
                 logger.warning(f"Not enough data for Bollinger Bands. Need {self.period}, got {len(candles)}")
                 return self._empty_result()
         
-            # Son period kadar kapanış fiyatı
-            closes = []
+            # Kapanış fiyatları
             try:
-                for candle in candles[-self.period:]:
-                    closes.append(float(candle.close))
-                current_price = float(candles[-1].close)
-            except (AttributeError, ValueError) as e:
+                all_closes = kernels.candle_column(candles, "close")
+            except (AttributeError, ValueError, TypeError) as e:
                 logger.error(f"Error extracting close prices: {e}")
                 return self._empty_result()
             
+            closes = all_closes[-self.period:]
+            current_price = float(all_closes[-1])
+            
             if len(closes) < 2:
                 logger.warning("Not enough close prices for standard deviation")
                 return self._empty_result()
             
-            # Orta bant (SMA)
-            middle_band = sum(closes) / self.period
-            
-            # Standart sapma
-            try:
-                std_dev = statistics.stdev(closes)
-            except statistics.StatisticsError as e:
-                logger.error(f"Error calculating standard deviation: {e}")
-                return self._empty_result()
+            # Orta bant (SMA) ve örneklem standart sapması
+            middle_band = float(closes.mean())
+            std_dev = float(closes.std(ddof=1))
             
             # Üst ve alt bantlar
             upper_band = middle_band + (std_dev * self.std_dev_multiplier)
@@ -87,7 +81,7 @@ class BollingerBandsIndicator:
                 percent_b = 0.5
             
             # Bollinger Squeeze tespiti (düşük volatilite)
-            historical_widths = self._calculate_historical_widths(candles)
+            historical_widths = self._calculate_historical_widths(all_closes)
             squeeze = self._detect_squeeze(band_width, historical_widths)
             
             # Pozisyon belirleme (altın için daha hassas)
@@ -123,33 +117,18 @@ class BollingerBandsIndicator:
             logger.error(f"Unexpected error in Bollinger Bands calculation: {e}", exc_info=True)
             return self._empty_result()
     
-    def _calculate_historical_widths(self, candles: List[PriceCandle]) -> List[float]:
-        """Geçmiş band genişliklerini hesapla"""
+    def _calculate_historical_widths(self, closes) -> List[float]:
+        """Geçmiş band genişliklerini hesapla (son mum hariç her pencere için)"""
         try:
-            if len(candles) < self.period + 20:
-                return []
+            if not isinstance(closes, np.ndarray):
+                closes = kernels.candle_column(closes, "close")
             
-            widths = []
-            for i in range(self.period, len(candles)):
-                try:
-                    period_candles = candles[i-self.period:i]
-                    closes = [float(c.close) for c in period_candles]
-                    
-                    if len(closes) < 2:
-                        continue
-                    
-                    mean = sum(closes) / len(closes)
-                    std_dev = statistics.stdev(closes)
-                    
-                    # Band genişliği hesapla (upper - lower)
-                    width = 2 * std_dev * self.std_dev_multiplier
-                    widths.append(width)
-                    
-                except (statistics.StatisticsError, ValueError) as e:
-                    logger.debug(f"Error calculating historical width at index {i}: {e}")
-                    continue
+            if len(closes) < self.period + 20:
+                return []
             
-            return widths
+            # Pencereler closes[i-period:i], i = period..n-1
+            std_devs = kernels.rolling_std(closes[:-1], self.period)
+            return (2 * std_devs * self.std_dev_multiplier).tolist()
             
         except Exception as e:
             logger.error(f"Error calculating historical widths: {e}")
@@ -8,6 +8,7 @@ import numpy as np
 from typing import Tuple, Optional
 from decimal import Decimal
 import logging
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -43,20 +44,16 @@ class CCI:
             CCI değerlerini içeren Series
         """
         try:
-            # Typical Price hesapla
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            
-            # Simple Moving Average
-            sma = typical_price.rolling(window=self.period).mean()
-            
-            # Mean Absolute Deviation
-            mad = typical_price.rolling(window=self.period).apply(
-                lambda x: np.abs(x - x.mean()).mean()
-            )
+            # Typical Price, SMA ve Mean Absolute Deviation
+            n = len(df)
+            typical_price = kernels.typical_price(df['high'], df['low'], df['close'])
+            sma = kernels.pad_left(kernels.rolling_mean(typical_price, self.period), n)
+            mad = kernels.pad_left(kernels.rolling_mean_abs_dev(typical_price, self.period), n)
             
             # CCI hesapla
             # Sabit 0.015, CCI'nin %70-80'inin +100 ile -100 arasında kalmasını sağlar
-            cci = (typical_price - sma) / (0.015 * mad)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cci = pd.Series((typical_price - sma) / (0.015 * mad), index=df.index)
             
             return cci
             
@@ -8,7 +8,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass, field
-from scipy.signal import argrelextrema
+from indicators.swing_points import swing_index
 from utils.logger import logger
 import ta
 
@@ -52,6 +52,51 @@ class DivergenceAnalysis:
     invalidation_levels: List[float] = field(default_factory=list)
 
 
+# Fiyat ve indicator swing'lerinin aynı nokta sayılacağı en büyük indeks farkı
+SWING_ALIGNMENT_TOLERANCE = 3
+
+
+def _aligned_swing_pairs(price_points: List[Tuple[int, float]],
+                         indicator_points: List[Tuple[int, float]],
+                         tolerance: int = SWING_ALIGNMENT_TOLERANCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    price[i]~ind[j] ve price[i+1]~ind[j+1] (±tolerance) olan (i, j) çiftleri
+    
+    Indicator swing indeksleri sıralıysa (find_swing_points çıktısı) her fiyat
+    swing'i için aday aralık np.searchsorted ile bulunur; iş eşleşme sayısıyla
+    orantılıdır. Sıralı değilse tüm çiftler maskeyle karşılaştırılır. Çiftler
+    (i, j) sözlük sırasıyla döner.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(price_points) < 2 or len(indicator_points) < 2:
+        return empty, empty
+    
+    p = np.array([point[0] for point in price_points])
+    q = np.array([point[0] for point in indicator_points])
+    p1, q1 = p[:-1], q[:-1]
+    
+    if np.all(q1[1:] >= q1[:-1]):
+        lo = np.searchsorted(q1, p1 - tolerance, side='left')
+        hi = np.searchsorted(q1, p1 + tolerance, side='right')
+        counts = hi - lo
+        i = np.repeat(np.arange(len(p1)), counts)
+        # Her i için lo[i], lo[i]+1, ..., hi[i]-1
+        j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - lo, counts)
+    else:
+        i, j = np.nonzero(np.abs(p1[:, None] - q1[None, :]) <= tolerance)
+    
+    keep = np.abs(p[i + 1] - q[j + 1]) <= tolerance
+    return i[keep], j[keep]
+
+
+def _angles(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> np.ndarray:
+    """calculate_angle'ın dizi sürümü (derece; x1 == x2 ise ±90)"""
+    angles = np.degrees(np.arctan((y2 - y1) / (x2 - x1)))
+    vertical = x2 == x1
+    angles[vertical] = np.where(y2[vertical] > y1[vertical], 90.0, -90.0)
+    return angles
+
+
 class AdvancedDivergenceDetector:
     """Gelişmiş Divergence Tespit Sistemi"""
     
@@ -161,9 +206,10 @@ class AdvancedDivergenceDetector:
         try:
             values = series.values
             
-            # Scipy ile local extrema bul
-            high_indices = argrelextrema(values, np.greater, order=order)[0]
-            low_indices = argrelextrema(values, np.less, order=order)[0]
+            # Local extrema (paylaşılan swing indeksinden)
+            swings = swing_index(values)
+            high_indices = swings.highs(order)
+            low_indices = swings.lows(order)
             
             # Minimum mesafe filtresi uygula
             def filter_by_distance(indices, values_array):
@@ -239,101 +285,15 @@ class AdvancedDivergenceDetector:
         Returns:
             Tespit edilen regular divergence'lar
         """
-        divergences = []
-        
         try:
             # Bearish Regular Divergence: Fiyat HH, Indicator LH
-            if len(price_highs) >= 2 and len(indicator_highs) >= 2:
-                for i in range(len(price_highs) - 1):
-                    for j in range(len(indicator_highs) - 1):
-                        price_point1 = price_highs[i]
-                        price_point2 = price_highs[i + 1]
-                        ind_point1 = indicator_highs[j]
-                        ind_point2 = indicator_highs[j + 1]
-                        
-                        # Zaman uyumu kontrolü (yaklaşık aynı indeksler)
-                        if (abs(price_point1[0] - ind_point1[0]) <= 3 and 
-                            abs(price_point2[0] - ind_point2[0]) <= 3):
-                            
-                            # Period kontrolü
-                            period = abs(price_point2[0] - price_point1[0])
-                            if period < self.MIN_DIVERGENCE_PERIOD:
-                                continue
-                            
-                            # Bearish regular divergence: Price HH, Indicator LH
-                            if (price_point2[1] > price_point1[1] and  # Higher High
-                                ind_point2[1] < ind_point1[1]):  # Lower High
-                                
-                                # Açıları hesapla
-                                price_angle = self.calculate_angle(price_point1, price_point2)
-                                ind_angle = self.calculate_angle(ind_point1, ind_point2)
-                                angle_diff = abs(price_angle - ind_angle)
-                                
-                                if angle_diff >= self.MIN_ANGLE_DIFFERENCE:
-                                    divergence = Divergence(
-                                        type="regular_bearish",
-                                        indicator=indicator_name,
-                                        strength=0.0,
-                                        price_points=[
-                                            DivergencePoint(price_point1[0], price_point1[1], 0),
-                                            DivergencePoint(price_point2[0], price_point2[1], 0)
-                                        ],
-                                        indicator_points=[
-                                            DivergencePoint(ind_point1[0], 0, ind_point1[1]),
-                                            DivergencePoint(ind_point2[0], 0, ind_point2[1])
-                                        ],
-                                        angle_price=price_angle,
-                                        angle_indicator=ind_angle,
-                                        angle_difference=angle_diff
-                                    )
-                                    divergences.append(divergence)
-            
+            divergences = self._match_divergences(
+                price_highs, indicator_highs, indicator_name, "regular_bearish", price_rising=True
+            )
             # Bullish Regular Divergence: Fiyat LL, Indicator HL
-            if len(price_lows) >= 2 and len(indicator_lows) >= 2:
-                for i in range(len(price_lows) - 1):
-                    for j in range(len(indicator_lows) - 1):
-                        price_point1 = price_lows[i]
-                        price_point2 = price_lows[i + 1]
-                        ind_point1 = indicator_lows[j]
-                        ind_point2 = indicator_lows[j + 1]
-                        
-                        # Zaman uyumu kontrolü
-                        if (abs(price_point1[0] - ind_point1[0]) <= 3 and 
-                            abs(price_point2[0] - ind_point2[0]) <= 3):
-                            
-                            # Period kontrolü
-                            period = abs(price_point2[0] - price_point1[0])
-                            if period < self.MIN_DIVERGENCE_PERIOD:
-                                continue
-                            
-                            # Bullish regular divergence: Price LL, Indicator HL
-                            if (price_point2[1] < price_point1[1] and  # Lower Low
-                                ind_point2[1] > ind_point1[1]):  # Higher Low
-                                
-                                # Açıları hesapla
-                                price_angle = self.calculate_angle(price_point1, price_point2)
-                                ind_angle = self.calculate_angle(ind_point1, ind_point2)
-                                angle_diff = abs(price_angle - ind_angle)
-                                
-                                if angle_diff >= self.MIN_ANGLE_DIFFERENCE:
-                                    divergence = Divergence(
-                                        type="regular_bullish",
-                                        indicator=indicator_name,
-                                        strength=0.0,
-                                        price_points=[
-                                            DivergencePoint(price_point1[0], price_point1[1], 0),
-                                            DivergencePoint(price_point2[0], price_point2[1], 0)
-                                        ],
-                                        indicator_points=[
-                                            DivergencePoint(ind_point1[0], 0, ind_point1[1]),
-                                            DivergencePoint(ind_point2[0], 0, ind_point2[1])
-                                        ],
-                                        angle_price=price_angle,
-                                        angle_indicator=ind_angle,
-                                        angle_difference=angle_diff
-                                    )
-                                    divergences.append(divergence)
-            
+            divergences += self._match_divergences(
+                price_lows, indicator_lows, indicator_name, "regular_bullish", price_rising=False
+            )
             return divergences
             
         except Exception as e:
@@ -359,107 +319,77 @@ class AdvancedDivergenceDetector:
         Returns:
             Tespit edilen hidden divergence'lar
         """
-        divergences = []
-        
         try:
             # Bullish Hidden Divergence: Fiyat HL, Indicator LL (uptrend devamı)
-            if len(price_lows) >= 2 and len(indicator_lows) >= 2:
-                for i in range(len(price_lows) - 1):
-                    for j in range(len(indicator_lows) - 1):
-                        price_point1 = price_lows[i]
-                        price_point2 = price_lows[i + 1]
-                        ind_point1 = indicator_lows[j]
-                        ind_point2 = indicator_lows[j + 1]
-                        
-                        # Zaman uyumu kontrolü
-                        if (abs(price_point1[0] - ind_point1[0]) <= 3 and 
-                            abs(price_point2[0] - ind_point2[0]) <= 3):
-                            
-                            # Period kontrolü
-                            period = abs(price_point2[0] - price_point1[0])
-                            if period < self.MIN_DIVERGENCE_PERIOD:
-                                continue
-                            
-                            # Bullish hidden: Price HL, Indicator LL
-                            if (price_point2[1] > price_point1[1] and  # Higher Low
-                                ind_point2[1] < ind_point1[1]):  # Lower Low
-                                
-                                # Açıları hesapla
-                                price_angle = self.calculate_angle(price_point1, price_point2)
-                                ind_angle = self.calculate_angle(ind_point1, ind_point2)
-                                angle_diff = abs(price_angle - ind_angle)
-                                
-                                if angle_diff >= self.MIN_ANGLE_DIFFERENCE:
-                                    divergence = Divergence(
-                                        type="hidden_bullish",
-                                        indicator=indicator_name,
-                                        strength=0.0,
-                                        price_points=[
-                                            DivergencePoint(price_point1[0], price_point1[1], 0),
-                                            DivergencePoint(price_point2[0], price_point2[1], 0)
-                                        ],
-                                        indicator_points=[
-                                            DivergencePoint(ind_point1[0], 0, ind_point1[1]),
-                                            DivergencePoint(ind_point2[0], 0, ind_point2[1])
-                                        ],
-                                        angle_price=price_angle,
-                                        angle_indicator=ind_angle,
-                                        angle_difference=angle_diff
-                                    )
-                                    divergences.append(divergence)
-            
+            divergences = self._match_divergences(
+                price_lows, indicator_lows, indicator_name, "hidden_bullish", price_rising=True
+            )
             # Bearish Hidden Divergence: Fiyat LH, Indicator HH (downtrend devamı)
-            if len(price_highs) >= 2 and len(indicator_highs) >= 2:
-                for i in range(len(price_highs) - 1):
-                    for j in range(len(indicator_highs) - 1):
-                        price_point1 = price_highs[i]
-                        price_point2 = price_highs[i + 1]
-                        ind_point1 = indicator_highs[j]
-                        ind_point2 = indicator_highs[j + 1]
-                        
-                        # Zaman uyumu kontrolü
-                        if (abs(price_point1[0] - ind_point1[0]) <= 3 and 
-                            abs(price_point2[0] - ind_point2[0]) <= 3):
-                            
-                            # Period kontrolü
-                            period = abs(price_point2[0] - price_point1[0])
-                            if period < self.MIN_DIVERGENCE_PERIOD:
-                                continue
-                            
-                            # Bearish hidden: Price LH, Indicator HH
-                            if (price_point2[1] < price_point1[1] and  # Lower High
-                                ind_point2[1] > ind_point1[1]):  # Higher High
-                                
-                                # Açıları hesapla
-                                price_angle = self.calculate_angle(price_point1, price_point2)
-                                ind_angle = self.calculate_angle(ind_point1, ind_point2)
-                                angle_diff = abs(price_angle - ind_angle)
-                                
-                                if angle_diff >= self.MIN_ANGLE_DIFFERENCE:
-                                    divergence = Divergence(
-                                        type="hidden_bearish",
-                                        indicator=indicator_name,
-                                        strength=0.0,
-                                        price_points=[
-                                            DivergencePoint(price_point1[0], price_point1[1], 0),
-                                            DivergencePoint(price_point2[0], price_point2[1], 0)
-                                        ],
-                                        indicator_points=[
-                                            DivergencePoint(ind_point1[0], 0, ind_point1[1]),
-                                            DivergencePoint(ind_point2[0], 0, ind_point2[1])
-                                        ],
-                                        angle_price=price_angle,
-                                        angle_indicator=ind_angle,
-                                        angle_difference=angle_diff
-                                    )
-                                    divergences.append(divergence)
-            
+            divergences += self._match_divergences(
+                price_highs, indicator_highs, indicator_name, "hidden_bearish", price_rising=False
+            )
             return divergences
             
         except Exception as e:
             logger.error(f"Hidden divergence tespit hatası: {e}")
             return []
     
+    def _match_divergences(self,
+                           price_points: List[Tuple[int, float]],
+                           indicator_points: List[Tuple[int, float]],
+                           indicator_name: str,
+                           divergence_type: str,
+                           price_rising: bool) -> List[Divergence]:
+        """
+        Ardışık fiyat ve indicator swing çiftlerini eşleştirip divergence üret
+        
+        price_rising=True: fiyat yükselirken indicator düşer (HH/LH, HL/LL);
+        False: fiyat düşerken indicator yükselir. Sonuç sırası eski iç içe
+        döngülerle (fiyat çifti dışta, indicator çifti içte) aynıdır.
+        """
+        i, j = _aligned_swing_pairs(price_points, indicator_points)
+        if len(i) == 0:
+            return []
+        
+        price = np.array(price_points, dtype=np.float64)
+        ind = np.array(indicator_points, dtype=np.float64)
+        px1, py1, px2, py2 = price[i, 0], price[i, 1], price[i + 1, 0], price[i + 1, 1]
+        ix1, iy1, ix2, iy2 = ind[j, 0], ind[j, 1], ind[j + 1, 0], ind[j + 1, 1]
+        
+        if price_rising:
+            direction = (py2 > py1) & (iy2 < iy1)
+        else:
+            direction = (py2 < py1) & (iy2 > iy1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_angle = _angles(px1, py1, px2, py2)
+            ind_angle = _angles(ix1, iy1, ix2, iy2)
+            angle_diff = np.abs(price_angle - ind_angle)
+        valid = (direction & (np.abs(px2 - px1) >= self.MIN_DIVERGENCE_PERIOD)
+                 & (angle_diff >= self.MIN_ANGLE_DIFFERENCE))
+        
+        divergences = []
+        for k in np.flatnonzero(valid):
+            price_point1, price_point2 = price_points[i[k]], price_points[i[k] + 1]
+            ind_point1, ind_point2 = indicator_points[j[k]], indicator_points[j[k] + 1]
+            divergences.append(Divergence(
+                type=divergence_type,
+                indicator=indicator_name,
+                strength=0.0,
+                price_points=[
+                    DivergencePoint(price_point1[0], price_point1[1], 0),
+                    DivergencePoint(price_point2[0], price_point2[1], 0)
+                ],
+                indicator_points=[
+                    DivergencePoint(ind_point1[0], 0, ind_point1[1]),
+                    DivergencePoint(ind_point2[0], 0, ind_point2[1])
+                ],
+                angle_price=price_angle[k],
+                angle_indicator=ind_angle[k],
+                angle_difference=angle_diff[k]
+            ))
+        return divergences
+    
     def calculate_divergence_strength(self, divergence: Divergence, df: pd.DataFrame) -> float:
         """
         Divergence gücünü hesapla (0-100)
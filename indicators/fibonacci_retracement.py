@@ -7,7 +7,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from scipy.signal import argrelextrema
+from indicators.swing_points import swing_index
 from utils.logger import logger
 
 
@@ -69,9 +69,9 @@ class FibonacciRetracement:
             highs = df['high'].values
             lows = df['low'].values
             
-            # Local extrema bulma
-            high_indices = argrelextrema(highs, np.greater, order=window)[0]
-            low_indices = argrelextrema(lows, np.less, order=window)[0]
+            # Local extrema (paylaşılan swing indeksinden)
+            high_indices = swing_index(highs).highs(window)
+            low_indices = swing_index(lows).lows(window)
             
             # Güç filtreleme
             swing_highs = []
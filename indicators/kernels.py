@@ -0,0 +1,164 @@
+"""
+Vektörel gösterge çekirdekleri (float64)
+
+Göstergelerin ortak yapı taşları: EMA, Wilder RMA, kayan pencere
+ortalama/toplam/std/min/max, true range, yönlü hareket ve typical price.
+Özyinelemeli filtreler Python döngüsü yerine scipy.signal.lfilter ile,
+kayan pencereler numpy sliding_window_view ile hesaplanır.
+
+Kayan pencere fonksiyonları "valid" uzunlukta (n - window + 1) sonuç döner;
+pandas ile hizalamak için pad_left kullanılır.
+"""
+from typing import Any, Iterable, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+def as_float_array(values: Iterable[Any]) -> np.ndarray:
+    """Liste / Decimal / Series girdisini float64 diziye çevir"""
+    if isinstance(values, np.ndarray) and values.dtype == np.float64:
+        return values
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy(dtype=np.float64)
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        values = list(values)
+    return np.asarray(values, dtype=np.float64)
+
+
+def candle_column(candles, name: str) -> np.ndarray:
+    """Mum listesinden (veya CandleFrame'den) tek kolonu float64 dizi olarak al"""
+    column = getattr(candles, name, None)
+    if isinstance(column, np.ndarray):
+        return column
+    return np.fromiter((float(getattr(c, name)) for c in candles), dtype=np.float64, count=len(candles))
+
+
+def pad_left(values: np.ndarray, length: int) -> np.ndarray:
+    """Diziyi başına NaN ekleyerek length uzunluğuna tamamla (pandas hizalaması)"""
+    missing = length - len(values)
+    if missing <= 0:
+        return values
+    return np.concatenate((np.full(missing, np.nan), values))
+
+
+# ----------------------------------------------------------------------
+# Özyinelemeli yumuşatma
+# ----------------------------------------------------------------------
+def recursive_smooth(values, alpha: float, seed: float) -> np.ndarray:
+    """y[i] = alpha * x[i] + (1 - alpha) * y[i-1], y[-1] = seed"""
+    x = as_float_array(values)
+    if len(x) == 0:
+        return x
+    decay = 1.0 - alpha
+    y, _ = lfilter([alpha], [1.0, -decay], x, zi=[decay * seed])
+    return y
+
+
+def ema(values, period: int) -> np.ndarray:
+    """İlk değeri SMA olan EMA; uzunluk n - period + 1 (veri yetersizse boş)"""
+    x = as_float_array(values)
+    if period <= 0 or len(x) < period:
+        return np.empty(0)
+    seed = x[:period].mean()
+    tail = recursive_smooth(x[period:], 2.0 / (period + 1), seed)
+    return np.concatenate(([seed], tail))
+
+
+def ema_adjustless(values, alpha: float) -> np.ndarray:
+    """İlk değeri x[0] olan EMA (pandas ewm(adjust=False) ile aynı); uzunluk n"""
+    x = as_float_array(values)
+    if len(x) == 0:
+        return x
+    return np.concatenate(([x[0]], recursive_smooth(x[1:], alpha, x[0])))
+
+
+def rma(values, period: int) -> np.ndarray:
+    """Wilder yumuşatması (alpha = 1/period, SMA tohumlu); uzunluk n - period + 1"""
+    x = as_float_array(values)
+    if period <= 0 or len(x) < period:
+        return np.empty(0)
+    seed = x[:period].mean()
+    tail = recursive_smooth(x[period:], 1.0 / period, seed)
+    return np.concatenate(([seed], tail))
+
+
+def rma_last(values, period: int) -> float:
+    """Wilder yumuşatmasının sadece son değeri (veri yetersizse NaN)"""
+    smoothed = rma(values, period)
+    return float(smoothed[-1]) if len(smoothed) else float("nan")
+
+
+# ----------------------------------------------------------------------
+# Kayan pencereler
+# ----------------------------------------------------------------------
+def _windows(values, window: int) -> np.ndarray:
+    x = as_float_array(values)
+    if window <= 0 or len(x) < window:
+        return np.empty((0, max(window, 1)))
+    return sliding_window_view(x, window)
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    return _windows(values, window).mean(axis=1)
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    return _windows(values, window).sum(axis=1)
+
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    if window <= ddof:
+        return np.empty(0)
+    return _windows(values, window).std(axis=1, ddof=ddof)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    return _windows(values, window).max(axis=1)
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    return _windows(values, window).min(axis=1)
+
+
+def rolling_mean_abs_dev(values, window: int) -> np.ndarray:
+    """Pencere ortalamasına göre ortalama mutlak sapma (CCI için)"""
+    windows = _windows(values, window)
+    if len(windows) == 0:
+        return np.empty(0)
+    return np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+
+
+# ----------------------------------------------------------------------
+# Fiyat türevleri
+# ----------------------------------------------------------------------
+def true_range(high, low, close) -> np.ndarray:
+    """True range; ilk mumda önceki kapanış olmadığından high - low kullanılır"""
+    high = as_float_array(high)
+    low = as_float_array(low)
+    close = as_float_array(close)
+    if len(close) == 0:
+        return np.empty(0)
+
+    tr = high - low
+    prev_close = close[:-1]
+    np.maximum(tr[1:], np.abs(high[1:] - prev_close), out=tr[1:])
+    np.maximum(tr[1:], np.abs(low[1:] - prev_close), out=tr[1:])
+    return tr
+
+
+def directional_movement(up_move, down_move) -> Tuple[np.ndarray, np.ndarray]:
+    """+DM / -DM: baskın ve pozitif olan hareket korunur, diğeri 0
+
+    Klasik Wilder tanımı için up_move = diff(high), down_move = -diff(low).
+    """
+    up = as_float_array(up_move)
+    down = as_float_array(down_move)
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    return plus_dm, minus_dm
+
+
+def typical_price(high, low, close) -> np.ndarray:
+    return (as_float_array(high) + as_float_array(low) + as_float_array(close)) / 3
@@ -2,9 +2,9 @@
 MACD (Moving Average Convergence Divergence) Göstergesi
 """
 from typing import List, Dict, Optional, Tuple
-from decimal import Decimal
 import logging
 from models.price_data import PriceCandle
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +36,14 @@ class MACDIndicator:
             "strength": 0.0
         }
     
-    def calculate_ema(self, values: List[Decimal], period: int) -> List[Decimal]:
-        """Exponential Moving Average hesapla"""
+    def calculate_ema(self, values: List[float], period: int) -> List[float]:
+        """Exponential Moving Average hesapla (ilk değer SMA)"""
         try:
-            if not values:
+            if period <= 0:
+                logger.error(f"Invalid EMA period: {period}")
+                return []
+            
+            if values is None or len(values) == 0:
                 logger.warning("Empty values list for EMA calculation")
                 return []
             
@@ -47,27 +51,7 @@ class MACDIndicator:
                 logger.debug(f"Insufficient data for EMA: need {period}, got {len(values)}")
                 return []
             
-            if period <= 0:
-                logger.error(f"Invalid EMA period: {period}")
-                return []
-            
-            ema_values = []
-            multiplier = Decimal(2) / (period + 1)
-            
-            # İlk EMA değeri SMA olarak başlar
-            sma = sum(values[:period]) / period
-            ema_values.append(sma)
-            
-            # Sonraki EMA değerleri
-            for i in range(period, len(values)):
-                try:
-                    ema = (values[i] - ema_values[-1]) * multiplier + ema_values[-1]
-                    ema_values.append(ema)
-                except (IndexError, TypeError) as e:
-                    logger.error(f"Error calculating EMA at index {i}: {e}")
-                    break
-            
-            return ema_values
+            return kernels.ema(values, period).tolist()
             
         except Exception as e:
             logger.error(f"Unexpected error in EMA calculation: {e}")
@@ -87,56 +71,39 @@ class MACDIndicator:
                 return self._empty_result()
         
             # Kapanış fiyatlarını al
-            closes = []
-            for candle in candles:
-                try:
-                    closes.append(candle.close)
-                except AttributeError as e:
-                    logger.error(f"Invalid candle data: {e}")
-                    return self._empty_result()
+            try:
+                closes = kernels.candle_column(candles, "close")
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.error(f"Invalid candle data: {e}")
+                return self._empty_result()
             
             # EMA'ları hesapla
-            ema_fast = self.calculate_ema(closes, self.fast_period)
-            ema_slow = self.calculate_ema(closes, self.slow_period)
+            ema_fast = kernels.ema(closes, self.fast_period)
+            ema_slow = kernels.ema(closes, self.slow_period)
             
-            if not ema_fast or not ema_slow:
+            if len(ema_fast) == 0 or len(ema_slow) == 0:
                 logger.warning("Failed to calculate EMAs")
                 return self._empty_result()
             
-            # MACD hattını hesapla (fast EMA - slow EMA)
-            # EMA'lar farklı uzunlukta olacak, eşitle
+            # MACD hattı (fast EMA - slow EMA); fast EMA daha erken başladığı için hizala
             start_idx = self.slow_period - self.fast_period
-            macd_line = []
+            macd_values = ema_fast[start_idx:start_idx + len(ema_slow)] - ema_slow
             
-            try:
-                for i in range(len(ema_slow)):
-                    if start_idx + i < len(ema_fast):
-                        macd_line.append(ema_fast[start_idx + i] - ema_slow[i])
-            except IndexError as e:
-                logger.error(f"Index error calculating MACD line: {e}")
-                return self._empty_result()
-            
-            if not macd_line:
+            if len(macd_values) == 0:
                 logger.warning("Failed to calculate MACD line")
                 return self._empty_result()
             
-            # Signal hattını hesapla (MACD'nin 9 günlük EMA'sı)
-            signal_line = self.calculate_ema(macd_line, self.signal_period)
+            # Signal hattı (MACD'nin EMA'sı) ve histogram
+            signal_values = kernels.ema(macd_values, self.signal_period)
             
-            if not signal_line:
+            if len(signal_values) == 0:
                 logger.warning("Failed to calculate signal line")
                 return self._empty_result()
             
-            # Histogram hesapla (MACD - Signal)
-            histogram = []
-            try:
-                for i in range(len(signal_line)):
-                    hist_idx = len(macd_line) - len(signal_line) + i
-                    if 0 <= hist_idx < len(macd_line):
-                        histogram.append(macd_line[hist_idx] - signal_line[i])
-            except IndexError as e:
-                logger.error(f"Index error calculating histogram: {e}")
-                return self._empty_result()
+            histogram = (macd_values[-len(signal_values):] - signal_values).tolist()
+            macd_line = macd_values.tolist()
+            signal_line = signal_values.tolist()
+            closes = closes.tolist()
             
             # Crossover tespiti
             crossover = self._detect_crossover(histogram)
@@ -172,7 +139,7 @@ class MACDIndicator:
             logger.error(f"Unexpected error in MACD calculation: {e}", exc_info=True)
             return self._empty_result()
     
-    def _detect_crossover(self, histogram: List[Decimal]) -> Optional[str]:
+    def _detect_crossover(self, histogram: List[float]) -> Optional[str]:
         """Crossover tespiti"""
         try:
             if not histogram or len(histogram) < 2:
@@ -195,7 +162,7 @@ class MACDIndicator:
             logger.error(f"Error detecting crossover: {e}")
             return None
     
-    def _detect_divergence(self, prices: List[Decimal], macd_values: List[Decimal]) -> Optional[str]:
+    def _detect_divergence(self, prices: List[float], macd_values: List[float]) -> Optional[str]:
         """Divergence (uyumsuzluk) tespiti"""
         try:
             if not prices or not macd_values:
@@ -263,7 +230,7 @@ class MACDIndicator:
             logger.error(f"Error detecting divergence: {e}")
             return None
     
-    def _determine_trend(self, histogram: List[Decimal]) -> str:
+    def _determine_trend(self, histogram: List[float]) -> str:
         """MACD trendi belirle"""
         try:
             if not histogram or len(histogram) < 5:
@@ -303,7 +270,7 @@ class MACDIndicator:
             logger.error(f"Error determining MACD trend: {e}")
             return "NEUTRAL"
     
-    def _calculate_strength(self, histogram: List[Decimal]) -> float:
+    def _calculate_strength(self, histogram: List[float]) -> float:
         """MACD sinyal gücü (0-1 arası)"""
         try:
             if not histogram:
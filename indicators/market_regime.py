@@ -9,6 +9,7 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from scipy.stats import percentileofscore
 from utils.logger import logger
+from indicators import kernels
 
 
 @dataclass
@@ -88,31 +89,14 @@ class MarketRegimeDetector:
             if len(df) < period + 1:
                 return []
             
-            # True Range hesaplama
-            df = df.copy()
-            df['prev_close'] = df['close'].shift(1)
-            df['tr1'] = df['high'] - df['low']
-            df['tr2'] = (df['high'] - df['prev_close']).abs()
-            df['tr3'] = (df['low'] - df['prev_close']).abs()
-            df['true_range'] = df[['tr1', 'tr2', 'tr3']].max(axis=1)
-            
-            # ATR hesaplama (Wilder's smoothing)
-            atr_values = []
-            true_ranges = df['true_range'].dropna().values
+            # True Range (ilk mumda high - low) ve Wilder's smoothing
+            true_ranges = kernels.true_range(df['high'], df['low'], df['close'])
+            true_ranges = true_ranges[~np.isnan(true_ranges)]
             
             if len(true_ranges) < period:
                 return []
             
-            # İlk ATR değeri
-            first_atr = np.mean(true_ranges[:period])
-            atr_values.append(first_atr)
-            
-            # Sonraki ATR değerleri
-            for i in range(period, len(true_ranges)):
-                atr = (atr_values[-1] * (period - 1) + true_ranges[i]) / period
-                atr_values.append(atr)
-                
-            return atr_values
+            return kernels.rma(true_ranges, period).tolist()
             
         except Exception as e:
             logger.error(f"ATR hesaplama hatası: {e}")
@@ -133,62 +117,44 @@ class MarketRegimeDetector:
             if len(df) < period * 2:
                 return {'adx': [], 'plus_di': [], 'minus_di': []}
             
-            df = df.copy()
-            
-            # Directional Movement hesaplama
-            df['high_diff'] = df['high'].diff()
-            df['low_diff'] = df['low'].diff()
+            n = len(df)
+            high = kernels.as_float_array(df['high'])
+            low = kernels.as_float_array(df['low'])
             
-            df['plus_dm'] = np.where(
-                (df['high_diff'] > df['low_diff']) & (df['high_diff'] > 0),
-                df['high_diff'], 0
-            )
-            df['minus_dm'] = np.where(
-                (df['low_diff'] > df['high_diff']) & (df['low_diff'] > 0),
-                df['low_diff'], 0
-            )
+            # Directional Movement (ilk mumda hareket yok)
+            plus_dm, minus_dm = kernels.directional_movement(np.diff(high), np.diff(low))
+            plus_dm = np.concatenate(([0.0], plus_dm))
+            minus_dm = np.concatenate(([0.0], minus_dm))
             
             # True Range
-            df['prev_close'] = df['close'].shift(1)
-            df['tr1'] = df['high'] - df['low']
-            df['tr2'] = (df['high'] - df['prev_close']).abs()
-            df['tr3'] = (df['low'] - df['prev_close']).abs()
-            df['true_range'] = df[['tr1', 'tr2', 'tr3']].max(axis=1)
-            
-            # Smoothed values
-            df['plus_dm_smooth'] = df['plus_dm'].rolling(window=period).mean()
-            df['minus_dm_smooth'] = df['minus_dm'].rolling(window=period).mean()
-            df['tr_smooth'] = df['true_range'].rolling(window=period).mean()
-            
-            # DI hesaplama
-            df['plus_di'] = (df['plus_dm_smooth'] / df['tr_smooth']) * 100
-            df['minus_di'] = (df['minus_dm_smooth'] / df['tr_smooth']) * 100
-            
-            # ADX hesaplama
-            df['di_diff'] = (df['plus_di'] - df['minus_di']).abs()
-            df['di_sum'] = df['plus_di'] + df['minus_di']
-            df['dx'] = (df['di_diff'] / df['di_sum']) * 100
-            
-            # ADX smoothing
-            adx_values = []
-            dx_values = df['dx'].dropna().values
+            true_ranges = kernels.true_range(high, low, df['close'])
+            
+            # Smoothed values (basit hareketli ortalama)
+            plus_dm_smooth = kernels.pad_left(kernels.rolling_mean(plus_dm, period), n)
+            minus_dm_smooth = kernels.pad_left(kernels.rolling_mean(minus_dm, period), n)
+            tr_smooth = kernels.pad_left(kernels.rolling_mean(true_ranges, period), n)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # DI hesaplama
+                plus_di = plus_dm_smooth / tr_smooth * 100
+                minus_di = minus_dm_smooth / tr_smooth * 100
+                
+                # DX = |+DI - -DI| / (+DI + -DI) * 100
+                dx = np.abs(plus_di - minus_di) / (plus_di + minus_di) * 100
+            
+            # pandas dropna ile aynı: NaN değerleri at
+            dx_values = dx[~np.isnan(dx)]
             
             if len(dx_values) < period:
                 return {'adx': [], 'plus_di': [], 'minus_di': []}
             
-            # İlk ADX
-            first_adx = np.mean(dx_values[:period])
-            adx_values.append(first_adx)
-            
-            # Sonraki ADX değerleri
-            for i in range(period, len(dx_values)):
-                adx = (adx_values[-1] * (period - 1) + dx_values[i]) / period
-                adx_values.append(adx)
+            # ADX smoothing (Wilder)
+            adx_values = kernels.rma(dx_values, period).tolist()
             
             return {
                 'adx': adx_values,
-                'plus_di': df['plus_di'].dropna().tolist()[-len(adx_values):],
-                'minus_di': df['minus_di'].dropna().tolist()[-len(adx_values):]
+                'plus_di': plus_di[~np.isnan(plus_di)].tolist()[-len(adx_values):],
+                'minus_di': minus_di[~np.isnan(minus_di)].tolist()[-len(adx_values):]
             }
             
         except Exception as e:
@@ -394,42 +360,25 @@ class MarketRegimeDetector:
                     reversal_potential=0.0
                 )
             
-            # RSI hesaplama
-            closes = df['close'].values
+            # RSI hesaplama (Wilder)
+            closes = kernels.as_float_array(df['close'])
             deltas = np.diff(closes)
             gains = np.where(deltas > 0, deltas, 0)
             losses = np.where(deltas < 0, -deltas, 0)
             
-            avg_gain = np.mean(gains[:rsi_period])
-            avg_loss = np.mean(losses[:rsi_period])
-            
-            for i in range(rsi_period, len(gains)):
-                avg_gain = (avg_gain * (rsi_period - 1) + gains[i]) / rsi_period
-                avg_loss = (avg_loss * (rsi_period - 1) + losses[i]) / rsi_period
+            avg_gain = kernels.rma_last(gains, rsi_period)
+            avg_loss = kernels.rma_last(losses, rsi_period)
             
             rs = avg_gain / avg_loss if avg_loss != 0 else 100
             current_rsi = 100 - (100 / (1 + rs))
             
-            # MACD hesaplama
-            exp1 = closes.copy().astype(float)
-            exp2 = closes.copy().astype(float)
-            
-            # EMA hesaplama
-            alpha_fast = 2.0 / (macd_fast + 1)
-            alpha_slow = 2.0 / (macd_slow + 1)
-            
-            for i in range(1, len(exp1)):
-                exp1[i] = alpha_fast * closes[i] + (1 - alpha_fast) * exp1[i-1]
-                exp2[i] = alpha_slow * closes[i] + (1 - alpha_slow) * exp2[i-1]
-            
+            # MACD hesaplama (ilk değer tohumlu EMA)
+            exp1 = kernels.ema_adjustless(closes, 2.0 / (macd_fast + 1))
+            exp2 = kernels.ema_adjustless(closes, 2.0 / (macd_slow + 1))
             macd_line = exp1 - exp2
             
             # Signal line
-            signal_line = macd_line.copy()
-            alpha_signal = 2.0 / (macd_signal + 1)
-            
-            for i in range(1, len(signal_line)):
-                signal_line[i] = alpha_signal * macd_line[i] + (1 - alpha_signal) * signal_line[i-1]
+            signal_line = kernels.ema_adjustless(macd_line, 2.0 / (macd_signal + 1))
             
             histogram = macd_line - signal_line
             
@@ -9,6 +9,7 @@ import numpy as np
 from typing import Tuple, Optional
 from decimal import Decimal
 import logging
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -84,26 +85,19 @@ class MFI:
                 logger.info("Hacim verisi bulunamadı, simüle ediliyor...")
                 volume = self._simulate_volume(df)
             
-            # Typical Price
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
+            # Typical Price ve Raw Money Flow
+            typical_price = kernels.typical_price(df['high'], df['low'], df['close'])
+            raw_money_flow = typical_price * kernels.as_float_array(volume)
             
-            # Raw Money Flow
-            raw_money_flow = typical_price * volume
-            
-            # Positive ve Negative Money Flow
-            money_flow_positive = pd.Series(0, index=df.index, dtype=float)
-            money_flow_negative = pd.Series(0, index=df.index, dtype=float)
-            
-            # İlk değerden sonraki değerler için
-            for i in range(1, len(df)):
-                if typical_price.iloc[i] > typical_price.iloc[i-1]:
-                    money_flow_positive.iloc[i] = raw_money_flow.iloc[i]
-                elif typical_price.iloc[i] < typical_price.iloc[i-1]:
-                    money_flow_negative.iloc[i] = raw_money_flow.iloc[i]
+            # Positive ve Negative Money Flow (typical price yönüne göre)
+            tp_change = np.diff(typical_price, prepend=typical_price[:1])
+            money_flow_positive = np.where(tp_change > 0, raw_money_flow, 0.0)
+            money_flow_negative = np.where(tp_change < 0, raw_money_flow, 0.0)
             
             # Money Flow Ratio
-            positive_flow = money_flow_positive.rolling(self.period).sum()
-            negative_flow = money_flow_negative.rolling(self.period).sum()
+            n = len(df)
+            positive_flow = pd.Series(kernels.pad_left(kernels.rolling_sum(money_flow_positive, self.period), n), index=df.index)
+            negative_flow = pd.Series(kernels.pad_left(kernels.rolling_sum(money_flow_negative, self.period), n), index=df.index)
             
             # Sıfıra bölme koruması
             money_flow_ratio = positive_flow / negative_flow.replace(0, 0.0001)
@@ -4,6 +4,7 @@ Pattern Recognition - Teknik analiz formasyonları tanıma
 from typing import List, Dict, Optional, Tuple
 from decimal import Decimal
 import logging
+from indicators.swing_points import swing_index
 from models.price_data import PriceCandle
 
 logger = logging.getLogger(__name__)
@@ -332,22 +333,11 @@ class PatternRecognition:
             if len(candles) < 20:
                 return None
             
-            # Son 20 mumda local high/low bul
-            highs = []
-            lows = []
-            
-            for i in range(1, len(candles) - 1):
-                try:
-                    # Local high
-                    if candles[i].high > candles[i-1].high and candles[i].high > candles[i+1].high:
-                        highs.append((i, float(candles[i].high)))
-                    
-                    # Local low
-                    if candles[i].low < candles[i-1].low and candles[i].low < candles[i+1].low:
-                        lows.append((i, float(candles[i].low)))
-                except (IndexError, AttributeError) as e:
-                    logger.debug(f"Error finding local extremes at index {i}: {e}")
-                    continue
+            # Local high/low: iki komşusundan kesin büyük/küçük mumlar (paylaşılan swing indeksi)
+            high_values = [float(c.high) for c in candles]
+            low_values = [float(c.low) for c in candles]
+            highs = [(i, high_values[i]) for i in swing_index(high_values).highs(1).tolist()]
+            lows = [(i, low_values[i]) for i in swing_index(low_values).lows(1).tolist()]
         
             # Double Top kontrolü
             if len(highs) >= 2:
@@ -4,6 +4,7 @@ RSI (Relative Strength Index) göstergesi
 from typing import List, Tuple, Optional
 import numpy as np
 import logging
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -36,24 +37,13 @@ class RSIIndicator:
                 return None, None
             
             # Fiyat değişimleri
-            price_array = np.array(prices)
-            deltas = np.diff(price_array)
+            deltas = np.diff(kernels.as_float_array(prices))
             
-            # Kazanç ve kayıpları ayır
-            gains = deltas.copy()
-            losses = deltas.copy()
-            gains[gains < 0] = 0
-            losses[losses > 0] = 0
-            losses = np.abs(losses)
-            
-            # İlk ortalamalar
-            avg_gain = np.mean(gains[:self.period])
-            avg_loss = np.mean(losses[:self.period])
-            
-            # Wilder's smoothing
-            for i in range(self.period, len(gains)):
-                avg_gain = (avg_gain * (self.period - 1) + gains[i]) / self.period
-                avg_loss = (avg_loss * (self.period - 1) + losses[i]) / self.period
+            # Kazanç ve kayıplar, Wilder's smoothing
+            gains = np.where(deltas > 0, deltas, 0.0)
+            losses = np.where(deltas < 0, -deltas, 0.0)
+            avg_gain = kernels.rma_last(gains, self.period)
+            avg_loss = kernels.rma_last(losses, self.period)
             
             # RSI hesapla
             if avg_loss == 0:
@@ -8,9 +8,17 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
+
+from indicators.kernels import as_float_array
+from indicators.swing_points import swing_index
 from utils.logger import logger
 
 
+def _columns(df: pd.DataFrame, *names: str) -> Tuple[np.ndarray, ...]:
+    """İstenen kolonlar float64 dizi olarak (satır satır df.iloc yerine)"""
+    return tuple(as_float_array(df[name]) for name in names)
+
+
 @dataclass
 class OrderBlock:
     """Order Block bilgisi"""
@@ -84,61 +92,38 @@ class SmartMoneyConcepts:
             if len(df) < lookback:
                 return order_blocks
             
-            for i in range(lookback, len(df) - 1):
-                # Bullish Order Block: Down move sonrası güçlü up move
-                if i >= 2:
-                    # Son 3 mum kontrolü
-                    prev_candle = df.iloc[i-1]
-                    current_candle = df.iloc[i]
-                    next_candle = df.iloc[i+1] if i+1 < len(df) else None
-                    
-                    if next_candle is not None:
-                        # Bullish OB: Düşüş sonrası güçlü yükseliş
-                        down_move = prev_candle['close'] < prev_candle['open']
-                        strong_up = next_candle['close'] > current_candle['high']
-                        
-                        if down_move and strong_up:
-                            # Order block gücünü hesapla
-                            move_strength = abs(next_candle['close'] - current_candle['low']) / current_candle['low'] * 100
-                            
-                            if move_strength >= min_strength / 100:
-                                ob = OrderBlock(
-                                    type="bullish",
-                                    start_idx=i-1,
-                                    end_idx=i,
-                                    high=current_candle['high'],
-                                    low=current_candle['low'],
-                                    mid_point=(current_candle['high'] + current_candle['low']) / 2,
-                                    strength=min(move_strength * 100, 100),
-                                    touched=False,
-                                    broken=False
-                                )
-                                order_blocks.append(ob)
-                        
-                        # Bearish OB: Yükseliş sonrası güçlü düşüş
-                        up_move = prev_candle['close'] > prev_candle['open']
-                        strong_down = next_candle['close'] < current_candle['low']
-                        
-                        if up_move and strong_down:
-                            # Order block gücünü hesapla
-                            move_strength = abs(current_candle['high'] - next_candle['close']) / current_candle['high'] * 100
-                            
-                            if move_strength >= min_strength / 100:
-                                ob = OrderBlock(
-                                    type="bearish",
-                                    start_idx=i-1,
-                                    end_idx=i,
-                                    high=current_candle['high'],
-                                    low=current_candle['low'],
-                                    mid_point=(current_candle['high'] + current_candle['low']) / 2,
-                                    strength=min(move_strength * 100, 100),
-                                    touched=False,
-                                    broken=False
-                                )
-                                order_blocks.append(ob)
-            
-            # En son ve en güçlü order block'ları tut (max 5)
-            order_blocks = sorted(order_blocks, key=lambda x: x.strength, reverse=True)[:5]
+            o, h, l, c = _columns(df, 'open', 'high', 'low', 'close')
+            # i: order block mumu, i-1 önceki mum, i+1 sonraki mum
+            i = np.arange(max(lookback, 2), len(df) - 1)
+            prev_open, prev_close = o[i - 1], c[i - 1]
+            cur_high, cur_low, next_close = h[i], l[i], c[i + 1]
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Bullish OB: Düşüş sonrası güçlü yükseliş
+                bull_move = np.abs(next_close - cur_low) / cur_low * 100
+                # Bearish OB: Yükseliş sonrası güçlü düşüş
+                bear_move = np.abs(cur_high - next_close) / cur_high * 100
+            bullish = (prev_close < prev_open) & (next_close > cur_high) & (bull_move >= min_strength / 100)
+            bearish = (prev_close > prev_open) & (next_close < cur_low) & (bear_move >= min_strength / 100)
+            
+            # Bir mum aynı anda hem düşüş hem yükseliş olamaz; mum sırası korunur
+            found = np.flatnonzero(bullish | bearish)
+            moves = np.where(bullish, bull_move, bear_move)[found]
+            
+            # En güçlü 5 order block; sorted(reverse=True) gibi kararlı (eşitlikte önceki mum)
+            for j in np.argsort(-np.minimum(moves * 100, 100), kind='stable')[:5]:
+                idx = int(i[found[j]])
+                order_blocks.append(OrderBlock(
+                    type="bullish" if bullish[found[j]] else "bearish",
+                    start_idx=idx-1,
+                    end_idx=idx,
+                    high=h[idx],
+                    low=l[idx],
+                    mid_point=(h[idx] + l[idx]) / 2,
+                    strength=min(moves[j] * 100, 100),
+                    touched=False,
+                    broken=False
+                ))
             
             # Order block'ların durumunu güncelle
             current_price = df['close'].iloc[-1]
@@ -182,42 +167,43 @@ class SmartMoneyConcepts:
             if len(df) < 3:
                 return gaps
             
-            for i in range(1, len(df) - 1):
-                prev_candle = df.iloc[i-1]
-                current_candle = df.iloc[i]
-                next_candle = df.iloc[i+1]
-                
+            h, l = _columns(df, 'high', 'low')
+            # i: ortadaki mum; 1. mum i-1, 3. mum i+1
+            prev_high, prev_low = h[:-2], l[:-2]
+            next_high, next_low = h[2:], l[2:]
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
                 # Bullish FVG: 3. mum low > 1. mum high
-                if next_candle['low'] > prev_candle['high']:
-                    gap_size = (next_candle['low'] - prev_candle['high']) / prev_candle['high']
-                    
-                    if gap_size >= min_gap_size:
-                        fvg = FairValueGap(
-                            type="bullish",
-                            idx=i,
-                            high=next_candle['low'],
-                            low=prev_candle['high'],
-                            size=gap_size * 100,
-                            filled=False,
-                            fill_percentage=0.0
-                        )
-                        gaps.append(fvg)
-                
+                bull_size = (next_low - prev_high) / prev_high
                 # Bearish FVG: 3. mum high < 1. mum low
-                if next_candle['high'] < prev_candle['low']:
-                    gap_size = (prev_candle['low'] - next_candle['high']) / next_candle['high']
-                    
-                    if gap_size >= min_gap_size:
-                        fvg = FairValueGap(
-                            type="bearish",
-                            idx=i,
-                            high=prev_candle['low'],
-                            low=next_candle['high'],
-                            size=gap_size * 100,
-                            filled=False,
-                            fill_percentage=0.0
-                        )
-                        gaps.append(fvg)
+                bear_size = (prev_low - next_high) / next_high
+            bullish = (next_low > prev_high) & (bull_size >= min_gap_size)
+            bearish = (next_high < prev_low) & (bear_size >= min_gap_size)
+            
+            # Mum sırası, aynı mumda önce bullish; dolma durumu yalnızca tutulan son 10 için gerekir
+            order = np.concatenate((np.flatnonzero(bullish) * 2, np.flatnonzero(bearish) * 2 + 1))
+            for key in np.sort(order)[-10:]:
+                j = int(key // 2)
+                if key % 2 == 0:
+                    gaps.append(FairValueGap(
+                        type="bullish",
+                        idx=j + 1,
+                        high=next_low[j],
+                        low=prev_high[j],
+                        size=bull_size[j] * 100,
+                        filled=False,
+                        fill_percentage=0.0
+                    ))
+                else:
+                    gaps.append(FairValueGap(
+                        type="bearish",
+                        idx=j + 1,
+                        high=prev_low[j],
+                        low=next_high[j],
+                        size=bear_size[j] * 100,
+                        filled=False,
+                        fill_percentage=0.0
+                    ))
             
             # FVG'lerin dolma durumunu kontrol et
             current_price = df['close'].iloc[-1]
@@ -237,8 +223,7 @@ class SmartMoneyConcepts:
                     elif current_price > gap.low:
                         gap.fill_percentage = ((current_price - gap.low) / gap_range) * 100
             
-            # En son 10 FVG'yi tut
-            return gaps[-10:] if len(gaps) > 10 else gaps
+            return gaps
             
         except Exception as e:
             logger.error(f"FVG tespit hatası: {e}")
@@ -273,18 +258,12 @@ class SmartMoneyConcepts:
                     choch_level=None
                 )
             
-            # Swing high/low bul
-            highs = []
-            lows = []
-            
-            for i in range(swing_lookback, len(df) - swing_lookback):
-                # Swing high
-                if df['high'].iloc[i] == df['high'].iloc[i-swing_lookback:i+swing_lookback+1].max():
-                    highs.append((i, df['high'].iloc[i]))
-                
-                # Swing low
-                if df['low'].iloc[i] == df['low'].iloc[i-swing_lookback:i+swing_lookback+1].min():
-                    lows.append((i, df['low'].iloc[i]))
+            # Swing high/low bul: merkezli pencerenin ekstremumuna eşit mumlar
+            high, low = _columns(df, 'high', 'low')
+            high_idx = swing_index(high).highs(swing_lookback, strict=False)
+            low_idx = swing_index(low).lows(swing_lookback, strict=False)
+            highs = list(zip(high_idx.tolist(), high[high_idx]))
+            lows = list(zip(low_idx.tolist(), low[low_idx]))
             
             if len(highs) < 2 or len(lows) < 2:
                 return MarketStructure(
@@ -300,24 +279,12 @@ class SmartMoneyConcepts:
                 )
             
             # Structure analizi
-            hh_count = 0  # Higher highs
-            hl_count = 0  # Higher lows
-            lh_count = 0  # Lower highs
-            ll_count = 0  # Lower lows
-            
-            # High analizi
-            for i in range(1, len(highs)):
-                if highs[i][1] > highs[i-1][1]:
-                    hh_count += 1
-                else:
-                    lh_count += 1
-            
-            # Low analizi
-            for i in range(1, len(lows)):
-                if lows[i][1] > lows[i-1][1]:
-                    hl_count += 1
-                else:
-                    ll_count += 1
+            # Ardışık swing'ler: yükselmeyen her adım lower high / lower low sayılır
+            high_values, low_values = high[high_idx], low[low_idx]
+            hh_count = int(np.count_nonzero(high_values[1:] > high_values[:-1]))
+            lh_count = len(high_values) - 1 - hh_count
+            hl_count = int(np.count_nonzero(low_values[1:] > low_values[:-1]))
+            ll_count = len(low_values) - 1 - hl_count
             
             # Trend belirleme
             if hh_count > lh_count and hl_count > ll_count:
@@ -414,24 +381,25 @@ class SmartMoneyConcepts:
                         'description': f"{count} kez test edilmiş destek (stop-loss yığılması)"
                     })
             
-            # Relative highs/lows (Swing points)
+            # Relative highs/lows (Swing points); aynı mumda önce high
             window = 5
-            for i in range(window, len(recent_df) - window):
-                # Relative high
-                if recent_df['high'].iloc[i] == recent_df['high'].iloc[i-window:i+window+1].max():
+            high, low = _columns(recent_df, 'high', 'low')
+            swings = np.concatenate((swing_index(high).highs(window, strict=False) * 2,
+                                     swing_index(low).lows(window, strict=False) * 2 + 1))
+            for key in np.sort(swings):
+                i = int(key // 2)
+                if key % 2 == 0:
                     zones.append({
                         'type': 'swing_high_liquidity',
-                        'level': recent_df['high'].iloc[i],
+                        'level': high[i],
                         'touches': 1,
                         'strength': 50,
                         'description': "Swing high (potansiyel stop-loss bölgesi)"
                     })
-                
-                # Relative low
-                if recent_df['low'].iloc[i] == recent_df['low'].iloc[i-window:i+window+1].min():
+                else:
                     zones.append({
                         'type': 'swing_low_liquidity',
-                        'level': recent_df['low'].iloc[i],
+                        'level': low[i],
                         'touches': 1,
                         'strength': 50,
                         'description': "Swing low (potansiyel stop-loss bölgesi)"
@@ -2,9 +2,10 @@
 Stochastic Oscillator Göstergesi
 """
 from typing import List, Dict, Optional, Tuple
-from decimal import Decimal
 import logging
+import numpy as np
 from models.price_data import PriceCandle
+from indicators import kernels
 
 logger = logging.getLogger(__name__)
 
@@ -48,59 +49,35 @@ class StochasticIndicator:
                 logger.warning(f"Not enough data for Stochastic. Need {min_required}, got {len(candles)}")
                 return self._empty_result()
         
-            # Raw %K değerlerini hesapla
-            raw_k_values = []
+            # Raw %K = (Current Close - Lowest Low) / (Highest High - Lowest Low) * 100
+            try:
+                highs = kernels.candle_column(candles, "high")
+                lows = kernels.candle_column(candles, "low")
+                closes = kernels.candle_column(candles, "close")
+            except (AttributeError, ValueError, TypeError) as e:
+                logger.error(f"Error extracting stochastic inputs: {e}")
+                return self._empty_result()
             
-            for i in range(self.k_period - 1, len(candles)):
-                try:
-                    period_candles = candles[i - self.k_period + 1:i + 1]
-                    
-                    if not period_candles:
-                        continue
-                    
-                    # Period içindeki en yüksek ve en düşük
-                    highest_high = max(c.high for c in period_candles)
-                    lowest_low = min(c.low for c in period_candles)
-                    
-                    # Raw %K = (Current Close - Lowest Low) / (Highest High - Lowest Low) * 100
-                    if highest_high != lowest_low:
-                        raw_k = ((period_candles[-1].close - lowest_low) / (highest_high - lowest_low)) * 100
-                    else:
-                        raw_k = 50  # Eğer high ve low eşitse nötr değer
-                    
-                    raw_k_values.append(float(raw_k))
-                    
-                except (AttributeError, ValueError, TypeError) as e:
-                    logger.error(f"Error calculating raw K at index {i}: {e}")
-                    continue
-        
-            if not raw_k_values:
+            highest_high = kernels.rolling_max(highs, self.k_period)
+            lowest_low = kernels.rolling_min(lows, self.k_period)
+            price_range = highest_high - lowest_low
+            period_closes = closes[self.k_period - 1:]
+            
+            with np.errstate(divide="ignore", invalid="ignore"):
+                raw_k = np.where(
+                    price_range != 0,
+                    (period_closes - lowest_low) / price_range * 100,
+                    50.0  # Eğer high ve low eşitse nötr değer
+                )
+            
+            if len(raw_k) == 0:
                 logger.warning("No raw K values calculated")
                 return self._empty_result()
             
-            # %K değerlerini yumuşat (SMA)
-            k_values = []
-            for i in range(self.smooth_k - 1, len(raw_k_values)):
-                try:
-                    smooth_period = raw_k_values[i - self.smooth_k + 1:i + 1]
-                    if smooth_period:
-                        k = sum(smooth_period) / len(smooth_period)
-                        k_values.append(k)
-                except (IndexError, ValueError) as e:
-                    logger.debug(f"Error smoothing K values at index {i}: {e}")
-                    continue
-            
-            # %D değerlerini hesapla (%K'nın SMA'sı)
-            d_values = []
-            for i in range(self.d_period - 1, len(k_values)):
-                try:
-                    d_period = k_values[i - self.d_period + 1:i + 1]
-                    if d_period:
-                        d = sum(d_period) / len(d_period)
-                        d_values.append(d)
-                except (IndexError, ValueError) as e:
-                    logger.debug(f"Error calculating D values at index {i}: {e}")
-                    continue
+            # %K değerlerini yumuşat (SMA), %D = %K'nın SMA'sı
+            k_array = kernels.rolling_mean(raw_k, self.smooth_k)
+            k_values = k_array.tolist()
+            d_values = kernels.rolling_mean(k_array, self.d_period).tolist()
             
             # Mevcut ve önceki değerler
             current_k = k_values[-1] if k_values else None
@@ -0,0 +1,457 @@
+"""
+Artımlı (streaming) göstergeler
+
+Her gösterge EMA/RMA/kayan pencere durumunu tutar; yeni kapanan mum
+update() ile, hâlâ açık olan mumun güncellenmiş hali replace_last() ile
+işlenir. İki işlem de mum geçmişinin uzunluğundan bağımsızdır.
+
+Aynı mum dizisiyle beslendiğinde değerler toplu (batch) gösterge
+sınıflarıyla aynıdır.
+"""
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.constants import ANALYSIS_INTERVALS
+
+
+class _SeededAverage:
+    """İlk period değerin SMA'sı ile tohumlanan özyinelemeli ortalama (EMA / Wilder RMA)"""
+
+    __slots__ = ("period", "alpha", "count", "seed_sum", "value", "_prev")
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+        self._prev = None
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def feed(self, x: float, replace: bool = False):
+        if replace and self._prev is not None:
+            self.count, self.seed_sum, self.value = self._prev
+        self._prev = (self.count, self.seed_sum, self.value)
+
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += x
+        elif self.count == self.period:
+            self.seed_sum += x
+            self.value = self.seed_sum / self.period
+        else:
+            self.value = self.value + (x - self.value) * self.alpha
+
+
+class _Window:
+    """Sabit boyutlu kayan pencere; son elemanı değiştirmek O(1)"""
+
+    __slots__ = ("size", "values", "total")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def feed(self, x: float, replace: bool = False):
+        if replace and self.values:
+            self.total += x - self.values[-1]
+            self.values[-1] = x
+            return
+        if self.full:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+    def std(self, ddof: int = 1) -> float:
+        return float(np.std(np.fromiter(self.values, dtype=np.float64, count=len(self.values)), ddof=ddof))
+
+    def __getitem__(self, index: int) -> float:
+        return self.values[index]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class StreamingIndicator:
+    """Artımlı gösterge tabanı"""
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, candle: Any):
+        """Yeni (kapanmış) mumu ekle"""
+        self.count += 1
+        self._feed(candle, replace=False)
+
+    def replace_last(self, candle: Any):
+        """Son mumu güncellenmiş haliyle değiştir (açık mum)"""
+        if self.count == 0:
+            self.update(candle)
+        else:
+            self._feed(candle, replace=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _feed(self, candle: Any, replace: bool):
+        raise NotImplementedError
+
+
+class StreamingRSI(StreamingIndicator):
+    """Artımlı RSI (Wilder) - RSIIndicator ile aynı sonuç"""
+
+    def __init__(self, period: int = 14, oversold_level: float = 40, overbought_level: float = 60):
+        super().__init__()
+        self.period = period
+        self.oversold_level = oversold_level
+        self.overbought_level = overbought_level
+        self._closes = _Window(2)
+        self._gain = _SeededAverage(period, 1.0 / period)
+        self._loss = _SeededAverage(period, 1.0 / period)
+
+    def _feed(self, candle, replace):
+        self._closes.feed(float(candle.close), replace)
+        if len(self._closes) < 2:
+            return
+        delta = self._closes[-1] - self._closes[-2]
+        self._gain.feed(max(delta, 0.0), replace)
+        self._loss.feed(max(-delta, 0.0), replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._gain.ready:
+            return {"rsi": None, "signal": None}
+
+        avg_loss = self._loss.value
+        rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + self._gain.value / avg_loss))
+
+        if rsi < self.oversold_level:
+            signal = "oversold"
+        elif rsi > self.overbought_level:
+            signal = "overbought"
+        else:
+            signal = "neutral"
+        return {"rsi": round(rsi, 2), "signal": signal}
+
+
+class StreamingMACD(StreamingIndicator):
+    """Artımlı MACD - MACDIndicator ile aynı hat değerleri"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self._fast = _SeededAverage(fast_period, 2.0 / (fast_period + 1))
+        self._slow = _SeededAverage(slow_period, 2.0 / (slow_period + 1))
+        self._signal = _SeededAverage(signal_period, 2.0 / (signal_period + 1))
+        self._histogram = _Window(2)
+
+    def _feed(self, candle, replace):
+        close = float(candle.close)
+        self._fast.feed(close, replace)
+        self._slow.feed(close, replace)
+        if not self._slow.ready:
+            return
+
+        self._signal.feed(self._fast.value - self._slow.value, replace)
+        if self._signal.ready:
+            self._histogram.feed(self._fast.value - self._slow.value - self._signal.value, replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        macd_line = self._fast.value - self._slow.value if self._slow.ready else None
+        histogram = self._histogram[-1] if len(self._histogram) else None
+        histogram_prev = self._histogram[-2] if len(self._histogram) > 1 else None
+
+        crossover = None
+        if histogram is not None and histogram_prev is not None:
+            if histogram > 0 and histogram_prev <= 0:
+                crossover = "BULLISH_CROSSOVER"
+            elif histogram < 0 and histogram_prev >= 0:
+                crossover = "BEARISH_CROSSOVER"
+
+        return {
+            "macd_line": macd_line,
+            "signal_line": self._signal.value if self._signal.ready else None,
+            "histogram": histogram,
+            "histogram_prev": histogram_prev,
+            "crossover": crossover
+        }
+
+
+class StreamingATR(StreamingIndicator):
+    """Artımlı ATR (Wilder) - ATRIndicator ile aynı sonuç"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self._closes = _Window(2)
+        self._atr = _SeededAverage(period, 1.0 / period)
+
+    def _feed(self, candle, replace):
+        high, low = float(candle.high), float(candle.low)
+        self._closes.feed(float(candle.close), replace)
+        if len(self._closes) < 2:
+            return
+        prev_close = self._closes[-2]
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self._atr.feed(true_range, replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._atr.ready:
+            return {"atr": None, "atr_percent": None}
+        price = self._closes[-1]
+        atr = self._atr.value
+        return {
+            "atr": atr,
+            "atr_percent": (atr / price) * 100 if price > 0 else 0,
+            "suggested_stop_distance": atr * 2
+        }
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Artımlı Bollinger Bands - BollingerBandsIndicator ile aynı bantlar"""
+
+    def __init__(self, period: int = 20, std_dev_multiplier: float = 2.0):
+        super().__init__()
+        self.std_dev_multiplier = std_dev_multiplier
+        self._closes = _Window(period)
+
+    def _feed(self, candle, replace):
+        self._closes.feed(float(candle.close), replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._closes.full:
+            return {"upper_band": None, "middle_band": None, "lower_band": None,
+                    "band_width": None, "percent_b": None}
+
+        middle = self._closes.mean()
+        offset = self._closes.std() * self.std_dev_multiplier
+        upper, lower = middle + offset, middle - offset
+        band_width = upper - lower
+        percent_b = (self._closes[-1] - lower) / band_width if band_width > 0 else 0.5
+
+        return {
+            "upper_band": upper,
+            "middle_band": middle,
+            "lower_band": lower,
+            "band_width": band_width,
+            "percent_b": percent_b
+        }
+
+
+class StreamingStochastic(StreamingIndicator):
+    """Artımlı Stochastic - StochasticIndicator ile aynı %K / %D"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3, smooth_k: int = 3):
+        super().__init__()
+        self._highs = _Window(k_period)
+        self._lows = _Window(k_period)
+        self._raw_k = _Window(smooth_k)
+        self._k = _Window(d_period)
+        self._k_out = _Window(2)
+        self._d_out = _Window(2)
+
+    def _feed(self, candle, replace):
+        self._highs.feed(float(candle.high), replace)
+        self._lows.feed(float(candle.low), replace)
+        if not self._highs.full:
+            return
+
+        highest, lowest = max(self._highs.values), min(self._lows.values)
+        close = float(candle.close)
+        raw_k = (close - lowest) / (highest - lowest) * 100 if highest != lowest else 50.0
+        self._raw_k.feed(raw_k, replace)
+        if not self._raw_k.full:
+            return
+
+        k = self._raw_k.mean()
+        self._k.feed(k, replace)
+        self._k_out.feed(k, replace)
+        if self._k.full:
+            self._d_out.feed(self._k.mean(), replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        k = self._k_out[-1] if len(self._k_out) else None
+        zone = None
+        if k is not None:
+            zone = "OVERBOUGHT" if k >= 80 else "OVERSOLD" if k <= 20 else "NEUTRAL"
+        return {
+            "k": k,
+            "d": self._d_out[-1] if len(self._d_out) else None,
+            "k_prev": self._k_out[-2] if len(self._k_out) > 1 else None,
+            "d_prev": self._d_out[-2] if len(self._d_out) > 1 else None,
+            "zone": zone
+        }
+
+
+class StreamingCCI(StreamingIndicator):
+    """Artımlı CCI - CCI.calculate'in son değeri"""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self._typical = _Window(period)
+
+    def _feed(self, candle, replace):
+        typical = (float(candle.high) + float(candle.low) + float(candle.close)) / 3
+        self._typical.feed(typical, replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._typical.full:
+            return {"cci": None}
+        window = np.fromiter(self._typical.values, dtype=np.float64, count=len(self._typical))
+        mean = window.mean()
+        mad = np.abs(window - mean).mean()
+        return {"cci": float((window[-1] - mean) / (0.015 * mad)) if mad > 0 else None}
+
+
+class StreamingMFI(StreamingIndicator):
+    """Artımlı MFI - hacim yoksa MFI ile aynı şekilde simüle edilir"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self._closes = _Window(2)
+        self._typical = _Window(2)
+        self._positive = _Window(period)
+        self._negative = _Window(period)
+
+    def _feed(self, candle, replace):
+        high, low, close = float(candle.high), float(candle.low), float(candle.close)
+        typical = (high + low + close) / 3
+        self._closes.feed(close, replace)
+        self._typical.feed(typical, replace)
+
+        if len(self._typical) < 2:
+            # İlk mumda yön yok, akış 0
+            self._positive.feed(0.0, replace)
+            self._negative.feed(0.0, replace)
+            return
+
+        volume = getattr(candle, "volume", None)
+        if volume:
+            volume = float(volume)
+        else:
+            price_change = abs(close / self._closes[-2] - 1)
+            volume = price_change * ((high - low) / close) * typical * 1000000
+
+        flow = typical * volume
+        change = typical - self._typical[-2]
+        self._positive.feed(flow if change > 0 else 0.0, replace)
+        self._negative.feed(flow if change < 0 else 0.0, replace)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._positive.full:
+            return {"mfi": None}
+        negative = self._negative.total or 0.0001
+        return {"mfi": 100 - (100 / (1 + self._positive.total / negative))}
+
+
+class StreamingIndicatorSet:
+    """Bir zaman dilimi için tüm artımlı göstergeler"""
+
+    def __init__(self):
+        self.indicators: Dict[str, StreamingIndicator] = {
+            "rsi": StreamingRSI(),
+            "macd": StreamingMACD(),
+            "atr": StreamingATR(),
+            "bollinger": StreamingBollingerBands(),
+            "stochastic": StreamingStochastic(),
+            "cci": StreamingCCI(),
+            "mfi": StreamingMFI()
+        }
+        self.last_timestamp = None
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Any]) -> "StreamingIndicatorSet":
+        indicator_set = cls()
+        for candle in candles:
+            indicator_set.on_candle(candle)
+        return indicator_set
+
+    def update(self, candle: Any):
+        for indicator in self.indicators.values():
+            indicator.update(candle)
+        self.last_timestamp = getattr(candle, "timestamp", None)
+
+    def replace_last(self, candle: Any):
+        for indicator in self.indicators.values():
+            indicator.replace_last(candle)
+
+    def on_candle(self, candle: Any):
+        """Zaman damgasına göre yeni mum ekle veya açık mumu güncelle; eski mumları yok say"""
+        timestamp = candle.timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.update(candle)
+        elif timestamp == self.last_timestamp:
+            self.replace_last(candle)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.last_timestamp,
+            **{name: indicator.snapshot() for name, indicator in self.indicators.items()}
+        }
+
+
+class LiveIndicatorTracker:
+    """CandleStore'daki her zaman dilimi için artımlı göstergeleri güncel tutar
+
+    refresh() okuma anında çağrılır (bkz. /api/indicators/live); ısınmadan sonra
+    her çağrı son işlenen mumdan itibaren tüm mumları işler. Eşzamanlı istekler
+    için kilitlidir.
+    """
+
+    def __init__(self, candle_store, timeframes: Optional[Dict[str, int]] = None, warm_up_candles: int = 200):
+        self.candle_store = candle_store
+        self.timeframes = timeframes or ANALYSIS_INTERVALS
+        self.warm_up_candles = warm_up_candles
+        self.sets: Dict[str, StreamingIndicatorSet] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Son mumları işle: ilk çağrıda ısınır, sonrakilerde son işlenen mumdan itibaren"""
+        with self._lock:
+            for timeframe, interval in self.timeframes.items():
+                indicator_set = self.sets.get(timeframe)
+                if indicator_set is None or indicator_set.last_timestamp is None:
+                    self._warm_up(timeframe, interval)
+                    continue
+
+                candles = self._candles_since(interval, indicator_set.last_timestamp)
+                if candles is None:
+                    # Isınma penceresinden uzun boşluk: baştan ısın
+                    self._warm_up(timeframe, interval)
+                    continue
+
+                # Son okunan (o an açık) mum kapanış değerleriyle yeniden işlenir
+                for candle in candles:
+                    if candle.timestamp >= indicator_set.last_timestamp:
+                        indicator_set.on_candle(candle)
+
+    def _warm_up(self, timeframe: str, interval: int):
+        candles = self.candle_store.get_recent_candles(interval, self.warm_up_candles)
+        self.sets[timeframe] = StreamingIndicatorSet.from_candles(candles)
+
+    def _candles_since(self, interval: int, last_timestamp) -> Optional[List[Any]]:
+        """last_timestamp'ı kapsayan son mumlar; ısınma penceresini aşan boşlukta None"""
+        count = 2
+        while True:
+            candles = self.candle_store.get_recent_candles(interval, count)
+            if not candles or candles[0].timestamp <= last_timestamp:
+                return candles
+            if len(candles) < count or count >= self.warm_up_candles:
+                return None
+            count = min(count * 4, self.warm_up_candles)
+
+    def snapshot(self, timeframe: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            indicator_set = self.sets.get(timeframe)
+            return indicator_set.snapshot() if indicator_set else None
@@ -0,0 +1,169 @@
+"""
+Paylaşılan swing noktası (pivot) indeksi
+
+Fibonacci, SMC, divergence ve formasyon modülleri aynı high/low/close
+serilerinde pivot arar. swing_index(values) seri içeriğine göre süreç içinde
+tek bir SwingIndex döndürür; her (tür, order) pivot listesi ilk istendiğinde
+hesaplanıp saklanır. Böylece bir analiz turunda aynı seri bir kez taranır.
+
+Yeni mum eklenmiş bir seri (eski seri ön eki) istendiğinde önceki indeks
+genişletilir: yalnızca sağ penceresi değişebilecek son pivotlar yeniden
+hesaplanır.
+
+Türler:
+    highs/lows(order, strict=True)   argrelextrema(np.greater/np.less, order) ile aynı
+    highs/lows(order, strict=False)  [i-order, i+order] penceresinin max/min'ine eşit
+                                     iç noktalar (NaN'lar pandas gibi atlanır)
+    peaks/valleys(distance)          scipy.signal.find_peaks(distance=...) ile aynı
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import argrelextrema, find_peaks
+
+from indicators.kernels import as_float_array
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _strict_extrema(values: np.ndarray, order: int, high: bool) -> np.ndarray:
+    return argrelextrema(values, np.greater if high else np.less, order=order)[0].astype(np.int64)
+
+
+def _window_extrema(values: np.ndarray, order: int, high: bool) -> np.ndarray:
+    window = 2 * order + 1
+    if order < 0 or len(values) < window:
+        return _EMPTY
+    reducer = np.fmax if high else np.fmin
+    extrema = reducer.reduce(sliding_window_view(values, window), axis=1)
+    return np.flatnonzero(values[order:len(values) - order] == extrema) + order
+
+
+class SwingIndex:
+    """Tek bir seri için tür ve order bazında saklanan pivot indeksleri"""
+
+    def __init__(self, values):
+        self.values = as_float_array(values)
+        self._pivots: Dict[Tuple[str, int, bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def highs(self, order: int, strict: bool = True) -> np.ndarray:
+        return self._get(("high", order, strict))
+
+    def lows(self, order: int, strict: bool = True) -> np.ndarray:
+        return self._get(("low", order, strict))
+
+    def peaks(self, distance: int) -> np.ndarray:
+        return self._get(("peak", distance, True))
+
+    def valleys(self, distance: int) -> np.ndarray:
+        return self._get(("valley", distance, True))
+
+    def _get(self, key: Tuple[str, int, bool]) -> np.ndarray:
+        with self._lock:
+            pivots = self._pivots.get(key)
+        if pivots is None:
+            pivots = self._compute(self.values, key)
+            pivots.flags.writeable = False
+            with self._lock:
+                self._pivots[key] = pivots
+        return pivots
+
+    @staticmethod
+    def _compute(values: np.ndarray, key: Tuple[str, int, bool]) -> np.ndarray:
+        kind, order, strict = key
+        if kind == "peak":
+            return find_peaks(values, distance=order)[0].astype(np.int64)
+        if kind == "valley":
+            return find_peaks(-values, distance=order)[0].astype(np.int64)
+        if strict:
+            return _strict_extrema(values, order, kind == "high")
+        return _window_extrema(values, order, kind == "high")
+
+    def extend(self, values) -> "SwingIndex":
+        """Sonuna mum eklenmiş seri için indeks; kesinleşmiş pivotlar taşınır
+
+        order penceresi eski verinin içinde kalan pivotlar değişmez. Geri kalanı
+        son 2*order mumluk bağlamla yeniden hesaplanır. find_peaks'in mesafe
+        budaması tüm seriye bağlı olduğundan peaks/valleys taşınmaz.
+        """
+        extended = SwingIndex(values)
+        n_old = len(self.values)
+        with self._lock:
+            items = list(self._pivots.items())
+        for key, pivots in items:
+            kind, order, strict = key
+            if kind in ("peak", "valley"):
+                continue
+            start = max(0, n_old - 2 * order)
+            tail = self._compute(extended.values[start:], key) + start
+            if start > 0:
+                # Bağlamın sol kenarı kırpıldığından yalnızca tam pencereli yeni adaylar
+                tail = tail[tail >= n_old - order]
+                kept = pivots[pivots < n_old - order]
+            else:
+                kept = _EMPTY
+            merged = np.concatenate((kept, tail))
+            merged.flags.writeable = False
+            extended._pivots[key] = merged
+        return extended
+
+
+def _digest(values: np.ndarray) -> bytes:
+    return hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).digest()
+
+
+class SwingIndexCache:
+    """İçerik özetine göre SwingIndex LRU'su (ön ek eşleşmesinde genişletir)"""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, bytes], SwingIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "extended": 0, "misses": 0}
+
+    def get(self, values) -> SwingIndex:
+        values = as_float_array(values)
+        key = (len(values), _digest(values))
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return index
+            candidates = [(k, idx) for k, idx in reversed(self._entries.items()) if k[0] < len(values)]
+
+        index = None
+        for (length, digest), previous in candidates[:4]:
+            if _digest(values[:length]) == digest:
+                index = previous.extend(values)
+                self.stats["extended"] += 1
+                break
+        if index is None:
+            index = SwingIndex(values)
+            self.stats["misses"] += 1
+
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = SwingIndexCache()
+
+
+def swing_index(values, cache: Optional[SwingIndexCache] = None) -> SwingIndex:
+    """values içeriği için paylaşılan SwingIndex"""
+    return (cache or _cache).get(values)
@@ -17,12 +17,15 @@ from utils.timezone import now, format_for_display
 from services.harem_altin_service import HaremAltinPriceService
 from collectors.harem_price_collector import HaremPriceCollector
 from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage, get_loop_lag_monitor
+from storage.retention import PriceCompactor
 from models.price_data import PriceData
-from models.market_data import GramAltinCandle
 from strategies.hybrid_strategy import HybridStrategy
+from strategies.analysis_pool import AnalysisProcessPool
 from config import settings
 from analyzers.timeframe_analyzer import TimeframeAnalyzer
 from utils.logger import setup_logger
+from utils.stage_profiler import STAGE_SNAPSHOT_NAME, get_stage_profiler
 from utils.constants import CANDLE_REQUIREMENTS, ANALYSIS_INTERVALS
 from simulation.simulation_manager import SimulationManager
 from models.simulation import StrategyType
@@ -40,22 +43,44 @@ class HybridGoldAnalyzer:
     
     def __init__(self):
         # Memory optimization: Use slots for fixed attributes
-        self.__slots__ = ['harem_service', 'collector', 'storage', 'strategy', 
+        self.__slots__ = ['harem_service', 'collector', 'storage', 'candle_store', 'strategy', 
                          'timeframe_analyzer', 'simulation_manager', 'last_analysis_times', 
-                         'analysis_intervals', '_analysis_cache', '_memory_threshold']
+                         'analysis_intervals', '_analysis_cache', '_memory_threshold', 'compactor']
         
         # HaremAltin servisi - Optimized refresh interval
         self.harem_service = HaremAltinPriceService(refresh_interval=10)  # Increased from 5 to 10
         
-        # Collector
-        self.collector = HaremPriceCollector(self.harem_service)
-        
         # Storage
         self.storage = SQLiteStorage()
+        # Async akıştaki sorgular event loop'u bloklamasın diye thread havuzunda çalışır
+        self.db = AsyncSQLiteStorage(self.storage)
+        
+        # Tick/analiz/sinyal yazmaları toplu transaction'larla diske yazılır
+        self.storage.enable_write_behind()
+        self.storage.store_analysis_blobs = settings.store_analysis_blobs
+        
+        # Eski ham tick'ler 1m/15m rollup'lara sıkıştırılır
+        self.compactor = PriceCompactor(
+            self.storage,
+            raw_days=settings.data_retention_raw,
+            rollup_days=settings.data_retention_compressed
+        )
+        
+        # Artımlı mum deposu - generate_gram_candles okumaları bellekten yapılır
+        self.candle_store = self.storage.enable_candle_store()
+        
+        # Collector
+        self.collector = HaremPriceCollector(
+            self.harem_service, candle_store=self.candle_store, storage=self.storage
+        )
         
         # Hibrit strateji
         self.strategy = HybridStrategy(storage=self.storage)
         
+        # Timeframe analizleri ayrı süreçlerde paralel çalışır (havuz çökerse self.strategy ile)
+        self.analysis_pool = AnalysisProcessPool(fallback_strategy=self.strategy)
+        self.stage_profiler = get_stage_profiler()
+        
         # Timeframe analyzer (farklı zaman dilimleri için)
         self.timeframe_analyzer = TimeframeAnalyzer(self.storage)
         
@@ -117,7 +142,7 @@ class HybridGoldAnalyzer:
             interval_minutes = self.analysis_intervals.get(timeframe, 15)
             
             # Gram altın mumlarını oluştur - optimized call
-            gram_candles = self.storage.generate_gram_candles(interval_minutes, required_candles)
+            gram_candles = await self.db.generate_gram_candles(interval_minutes, required_candles)
             
             if len(gram_candles) < required_candles * 0.6:  # Reduced threshold to 60%
                 logger.debug(f"Not enough gram candles for {timeframe}: {len(gram_candles)}/{required_candles}")
@@ -130,29 +155,15 @@ class HybridGoldAnalyzer:
             
             # Use latest prices for better performance
             market_data_size = min(200, len(gram_candles) * 2)  # Adaptive size
-            market_data = self.storage.get_latest_prices(market_data_size)
+            market_data = await self.db.get_latest_prices(market_data_size)
             
             if len(market_data) < 30:  # Reduced minimum requirement
                 logger.debug(f"Not enough market data: {len(market_data)}")
                 return
             
-            # Memory-efficient model conversion - using generator where possible
             try:
-                # Optimized model conversion with memory reuse
-                gram_candle_models = []
-                for candle in gram_candles:
-                    model = GramAltinCandle(
-                        timestamp=candle.timestamp,
-                        open=candle.open,
-                        high=candle.high,
-                        low=candle.low,
-                        close=candle.close,
-                        interval=candle.interval
-                    )
-                    gram_candle_models.append(model)
-                
-                # Hibrit analiz - timeframe parametresi ile
-                analysis_result = self.strategy.analyze(gram_candle_models, market_data, timeframe)
+                # Hibrit analiz - CPU yoğun, event loop'u bloklamaması için süreç havuzunda
+                analysis_result = await self.analysis_pool.analyze(gram_candles, market_data, timeframe)
                 
                 # Timeframe ekle (yedek)
                 analysis_result["timeframe"] = timeframe
@@ -168,7 +179,11 @@ class HybridGoldAnalyzer:
                     del self._analysis_cache[oldest_key]
                 
                 # Sonucu kaydet
-                self.storage.save_hybrid_analysis(analysis_result)
+                await self.db.save_hybrid_analysis(analysis_result)
+                
+                # Aşama süreleri web sunucusuna (/api/perf/stages) veritabanı üzerinden aktarılır
+                if self.stage_profiler.enabled:
+                    await self.db.save_perf_snapshot(STAGE_SNAPSHOT_NAME, self.stage_profiler.snapshot())
                 
                 # Sinyali göster (only for important signals)
                 if analysis_result.get("signal") != "HOLD":
@@ -176,7 +191,7 @@ class HybridGoldAnalyzer:
                 
             finally:
                 # Explicit cleanup for large objects
-                del gram_candle_models
+                del gram_candles
                 del market_data
                 gc.collect()
             
@@ -271,8 +286,8 @@ class HybridGoldAnalyzer:
                 # Advanced memory management
                 await self._memory_management()
                 
-                stats = self.storage.get_statistics()
-                latest_analysis = self.storage.get_latest_hybrid_analysis()
+                stats = await self.db.get_statistics()
+                latest_analysis = await self.db.get_latest_hybrid_analysis()
                 
                 # Memory usage info
                 memory_info = self._get_memory_info()
@@ -284,6 +299,16 @@ class HybridGoldAnalyzer:
                     print(f"Memory Usage: {memory_info['used']:.1f}MB (Peak: {memory_info['peak']:.1f}MB)")
                     print(f"CPU Usage: {memory_info['cpu']:.1f}%")
                     print(f"Cache Size: {len(self._analysis_cache)} entries")
+                    pool_stats = self.analysis_pool.get_stats()
+                    print(f"Analysis Pool: {pool_stats['calls']:,} analyses, avg {pool_stats['avg_ms']:.0f}ms ({pool_stats['workers']} workers)")
+                    write_stats = self.storage.write_queue.get_stats()
+                    print(f"Write Queue: {write_stats['written']:,} writes in {write_stats['flushes']:,} flushes (pending {write_stats['pending']})")
+                    feed = self.harem_service.get_stats()
+                    print(f"Price Feed: {feed['requests']:,} requests, p95 {feed['latency'].get('p95_ms', 0):.0f}ms, "
+                          f"{feed['not_modified']:,} not modified, interval {feed['current_interval']:.1f}s")
+                    loop_lag = get_loop_lag_monitor().get_metrics()
+                    if loop_lag.get("samples"):
+                        print(f"Loop Lag: avg {loop_lag['avg_ms']:.1f}ms, p95 {loop_lag['p95_ms']:.1f}ms, max {loop_lag['max_ms']:.1f}ms")
                     
                     if latest_analysis:
                         print(f"\nSon Analiz:")
@@ -295,19 +320,40 @@ class HybridGoldAnalyzer:
             except Exception as e:
                 logger.error(f"Statistics error: {e}")
     
+    async def compact_price_history(self):
+        """Ham fiyat verisini saatte bir rollup'lara sıkıştır"""
+        while True:
+            try:
+                await self.db.run(self.compactor.run)
+            except Exception as e:
+                logger.error(f"Price compaction error: {e}")
+            await asyncio.sleep(3600)
+    
     async def start(self):
         """Sistemi başlat"""
         logger.info("Hybrid Gold Price Analyzer starting...")
         
+        # Event loop gecikmesini ölç
+        get_loop_lag_monitor().start()
+        
         # Analiz callback'ini ekle
         self.collector.add_analysis_callback(self.analyze_price)
         
+        # Kapanmış mumları yükle, açık mumları ham veriden yeniden kur
+        await asyncio.to_thread(self.candle_store.warm_up)
+        
+        # Analiz worker'larını ilk tick'ten önce hazırla
+        await asyncio.to_thread(self.analysis_pool.start)
+        
         # Collector'ı başlat
         await self.collector.start()
         
         # İstatistik gösterimi
         asyncio.create_task(self.show_statistics())
         
+        # Katmanlı veri saklama
+        asyncio.create_task(self.compact_price_history())
+        
         # Simülasyon sistemini başlat
         logger.info("Starting SimulationManager...")
         asyncio.create_task(self.simulation_manager.start())
@@ -332,6 +378,9 @@ class HybridGoldAnalyzer:
         await self.collector.stop()
         await self.harem_service.stop()
         await self.simulation_manager.stop()
+        await asyncio.to_thread(self.analysis_pool.shutdown)
+        # Bekleyen yazmaları diske yaz
+        await asyncio.to_thread(self.storage.write_queue.close)
         logger.info("System stopped")
     
     def _check_memory_usage(self) -> bool:
@@ -0,0 +1,100 @@
+"""
+Kolon bazlı (columnar) mum veri kabı
+
+Bir analiz turunda mum listesi tek sefer float64 dizilere çevrilir; tüm
+analizörler ve göstergeler aynı dizileri / DataFrame görünümünü paylaşır.
+"""
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+OHLC_COLUMNS = ("open", "high", "low", "close")
+OHLCV_COLUMNS = OHLC_COLUMNS + ("volume",)
+
+
+class CandleFrame:
+    """Değiştirilemez OHLCV dizileri (float64) + epoch saniye zaman damgaları (int64)"""
+
+    __slots__ = ("open", "high", "low", "close", "volume", "timestamps", "interval", "_df")
+
+    def __init__(self, open: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: Optional[np.ndarray] = None,
+                 timestamps: Optional[np.ndarray] = None, interval: Optional[str] = None):
+        n = len(close)
+        self.open = self._freeze(open, np.float64)
+        self.high = self._freeze(high, np.float64)
+        self.low = self._freeze(low, np.float64)
+        self.close = self._freeze(close, np.float64)
+        self.volume = self._freeze(volume if volume is not None else np.zeros(n), np.float64)
+        self.timestamps = self._freeze(timestamps if timestamps is not None else np.zeros(n), np.int64)
+        self.interval = interval
+        self._df: Optional[pd.DataFrame] = None
+
+        if not (len(self.open) == len(self.high) == len(self.low) == n == len(self.volume) == len(self.timestamps)):
+            raise ValueError("CandleFrame kolon uzunlukları eşit olmalı")
+
+    @staticmethod
+    def _freeze(values: Any, dtype) -> np.ndarray:
+        # Salt okunur görünüm: kopya yok ve çağıranın dizisi kilitlenmez
+        view = np.asarray(values, dtype=dtype).view()
+        view.flags.writeable = False
+        return view
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Any]) -> "CandleFrame":
+        """GramAltinCandle / PriceCandle benzeri nesnelerden tek geçişte oluştur"""
+        candles = candles if isinstance(candles, Sequence) else list(candles)
+        n = len(candles)
+
+        ohlcv = np.empty((5, n), dtype=np.float64)
+        timestamps = np.zeros(n, dtype=np.int64)
+        interval = None
+
+        for i, candle in enumerate(candles):
+            ohlcv[0, i] = float(candle.open)
+            ohlcv[1, i] = float(candle.high)
+            ohlcv[2, i] = float(candle.low)
+            ohlcv[3, i] = float(candle.close)
+            volume = getattr(candle, "volume", None)
+            ohlcv[4, i] = float(volume) if volume is not None else 0.0
+            ts = getattr(candle, "timestamp", None)
+            if ts is not None:
+                timestamps[i] = int(ts.timestamp())
+
+        if n:
+            interval = getattr(candles[-1], "interval", None)
+
+        return cls(ohlcv[0], ohlcv[1], ohlcv[2], ohlcv[3], ohlcv[4], timestamps, interval)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, interval: Optional[str] = None) -> "CandleFrame":
+        """open/high/low/close(/volume) kolonlu DataFrame'den oluştur"""
+        volume = df["volume"].to_numpy() if "volume" in df.columns else None
+        return cls(df["open"].to_numpy(), df["high"].to_numpy(), df["low"].to_numpy(),
+                   df["close"].to_numpy(), volume, interval=interval)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def has_volume(self) -> bool:
+        return bool(len(self.volume)) and bool(self.volume.any())
+
+    def to_dataframe(self, columns: Sequence[str] = OHLC_COLUMNS) -> pd.DataFrame:
+        """Paylaşılan dizilere kopyasız DataFrame görünümü
+
+        Her çağrı sığ bir kopya döner; Copy-on-Write sayesinde analizörlerin
+        kolon ekleme / değiştirme işlemleri ortak veriyi etkilemez.
+        """
+        if self._df is None:
+            self._df = pd.DataFrame(
+                {name: getattr(self, name) for name in OHLCV_COLUMNS},
+                copy=False
+            )
+        return self._df[list(columns)]
+
+    def tail(self, n: int) -> "CandleFrame":
+        """Son n mumun görünümü (kopyasız dilim)"""
+        return CandleFrame(self.open[-n:], self.high[-n:], self.low[-n:], self.close[-n:],
+                           self.volume[-n:], self.timestamps[-n:], self.interval)
@@ -7,58 +7,150 @@ Bu dosya JavaScript kodundaki AJAX cagrilarini Python'a cevirir:
 - https://canlipiyasalar.haremaltin.com/tmp/altin.json?dil_kodu=tr
 - Basit HTTP JSON API
 - Periyodik fiyat guncellemeleri
+
+Tek, uzun omurlu bir ClientSession kullanilir (keep-alive + DNS cache), her
+poll'da TCP/TLS kurulumu tekrarlanmaz. Istekler ETag/Last-Modified ile kosullu
+yapilir; 304 yanitinda callback'ler cagrilmaz. Gecici hatalar jitter'li ustel
+geri cekilme ile tekrar denenir. Yenileme araligi adaptiftir: fiyat hareket
+ettikce min_interval'a iner, fiyat sabitken max_interval'a kadar uzar, piyasa
+kapaliyken closed_interval kullanilir.
 """
 
 import json
 import time
 import asyncio
 import logging
+import random
 import signal
 import sys
 import os
-from typing import Dict, Optional, Any, Callable
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional, Any, Callable, Deque, Tuple
 from datetime import datetime, timedelta
 
 import aiohttp
 import ssl
 
+from utils import timezone
+
 # Logging ayarlari - sadece uyarı ve hata mesajları
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+DEFAULT_API_URL = "https://canlipiyasalar.haremaltin.com/tmp/altin.json"
+
+# Hareket kontrolunde bakilan urunler (collector'in kullandigi fiyatlar)
+TRACKED_CODES = ("ALTIN", "USDTRY", "ONS")
+
+# Tekrar denenen HTTP durumlari
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LatencyHistogram:
+    """Istek gecikmeleri icin sabit kovali histogram (ms)"""
+
+    BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, history: int = 500):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._samples: Deque[float] = deque(maxlen=history)
+
+    def record(self, latency_ms: float):
+        self.counts[bisect_left(self.BUCKETS_MS, latency_ms)] += 1
+        self._samples.append(latency_ms)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in self.BUCKETS_MS] + ["inf"]
+        metrics: Dict[str, Any] = {"count": sum(self.counts), "buckets": dict(zip(labels, self.counts))}
+        if self._samples:
+            ordered = sorted(self._samples)
+            metrics.update({
+                "p50_ms": round(ordered[len(ordered) // 2], 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+                "max_ms": round(ordered[-1], 1)
+            })
+        return metrics
+
+
 class HaremAltinPriceService:
     """HaremAltin canli fiyat servisi - REST API tabanli"""
     
     _instance = None
     
-    def __new__(cls, refresh_interval: int = 3):
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(HaremAltinPriceService, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
     
-    def __init__(self, refresh_interval: int = 3):
+    def __init__(self, refresh_interval: int = 3, api_url: str = DEFAULT_API_URL,
+                 min_interval: Optional[float] = None, max_interval: Optional[float] = None,
+                 closed_interval: float = 300, request_timeout: float = 10,
+                 max_retries: int = 2, retry_backoff: float = 0.5,
+                 cache_file: str = os.path.join("data", "gold_price_cache.json"),
+                 snapshot_delay: float = 2.0):
         """
         Args:
-            refresh_interval: Saniye cinsinden guncelleme araligi (varsayilan: 3 saniye)
+            refresh_interval: Saniye cinsinden temel guncelleme araligi (varsayilan: 3 saniye)
+            api_url: Fiyat JSON adresi (testlerde yerel stub sunucu)
+            min_interval: Fiyat hareket ederken kullanilan aralik (varsayilan: refresh_interval / 2)
+            max_interval: Fiyat sabitken cikilabilecek en uzun aralik (varsayilan: refresh_interval * 4)
+            closed_interval: Piyasa kapaliyken (hafta sonu) kullanilan aralik
+            request_timeout: Tek istek icin toplam zaman asimi (saniye)
+            max_retries: Gecici hatalarda ek deneme sayisi
+            retry_backoff: Geri cekilme taban suresi (saniye), her denemede ikiye katlanir
+            cache_file: Son bilinen fiyatlarin saklandigi snapshot dosyasi
+            snapshot_delay: Degisiklikten sonra snapshot yazilmadan once beklenen sure (debounce)
         """
         if self._initialized:
             return
             
         self._initialized = True
-        self.api_url = "https://canlipiyasalar.haremaltin.com/tmp/altin.json"
+        self.api_url = api_url
         self.refresh_interval = refresh_interval
+        self.min_interval = min_interval if min_interval is not None else max(1.0, refresh_interval / 2)
+        self.max_interval = max_interval if max_interval is not None else refresh_interval * 4
+        self.closed_interval = closed_interval
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.current_interval = float(refresh_interval)
         self.is_running = False
         self.callbacks = []
         self.last_prices = {}
         
+        # Paylasilan HTTP oturumu ve kosullu istek basliklari
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Metrikler
+        self.latency = LatencyHistogram()
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "retries": 0,
+            "failures": 0,
+            "moves": 0,
+            "flat_polls": 0,
+            "cache_writes": 0
+        }
+        
         # Cache ayarlari
         self._cached_prices = {}
         self._last_update = None
         self._cache_duration = 300  # 5 dakika cache
+        self.cache_file = cache_file
+        self.snapshot_delay = snapshot_delay
+        # Diske yazilmis son fiyatlarin parmak izi - degismediyse tekrar yazilmaz
+        self._snapshot_fingerprint: Optional[str] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
         
         # Cache dizini olustur
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
         
         # Cache'den yukle
         self._load_from_cache()
@@ -93,30 +185,123 @@ class HaremAltinPriceService:
         if callback in self.callbacks:
             self.callbacks.remove(callback)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Uzun omurlu oturum - loop degistiyse (orn. testler) yeniden olusturulur"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                ssl=self.ssl_context,
+                limit=4,
+                ttl_dns_cache=300,
+                keepalive_timeout=max(60, self.max_interval * 2)
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout, connect=self.request_timeout / 2)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """HTTP oturumunu kapat, bekleyen fiyat snapshot'ini yaz"""
+        await self.flush_snapshot()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     async def fetch_prices(self) -> Optional[Dict]:
-        """API'den fiyatlari cek"""
-        try:
-            params = {"dil_kodu": "tr"}
-            connector = aiohttp.TCPConnector(ssl=self.ssl_context)
+        """API'den fiyatlari cek (304 yanitinda son fiyatlar dondurulur)"""
+        status, data = await self._fetch()
+        if status == 304:
+            return self.last_prices or None
+        return data
+
+    async def _fetch(self) -> Tuple[Optional[int], Optional[Dict]]:
+        """Kosullu GET - (HTTP durumu, veri) dondurur, hata halinde (None, None)"""
+        params = {"dil_kodu": "tr"}
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                # Full jitter: [0, taban * 2^deneme)
+                await asyncio.sleep(random.uniform(0, self.retry_backoff * (2 ** (attempt - 1))))
             
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(self.api_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # API response formati: {"meta": {...}, "data": {...}}
-                        if "data" in data:
-                            return data["data"]
-                        else:
-                            logger.warning("API yaniti 'data' field'i icermiyor")
-                            return None
-                    else:
+            started = time.perf_counter()
+            try:
+                session = await self._get_session()
+                async with session.get(self.api_url, params=params, headers=headers) as response:
+                    if response.status == 304:
+                        self.stats["not_modified"] += 1
+                        return 304, None
+                    if response.status in RETRY_STATUSES:
+                        logger.debug(f"API gecici hata: {response.status} (deneme {attempt + 1})")
+                        continue
+                    if response.status != 200:
                         logger.error(f"API istegi basarisiz: {response.status}")
-                        return None
-                        
-        except Exception as e:
-            logger.error(f"Fiyat cekme hatasi: {e}")
-            return None
+                        break
+                    
+                    data = await response.json(content_type=None)
+                    self._etag = response.headers.get("ETag") or self._etag
+                    self._last_modified = response.headers.get("Last-Modified") or self._last_modified
+                    
+                    # API response formati: {"meta": {...}, "data": {...}}
+                    if "data" in data:
+                        return 200, data["data"]
+                    logger.warning("API yaniti 'data' field'i icermiyor")
+                    return 200, None
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug(f"Fiyat cekme hatasi (deneme {attempt + 1}): {e!r}")
+            except Exception as e:
+                logger.error(f"Fiyat cekme hatasi: {e}")
+                break
+            finally:
+                self.stats["requests"] += 1
+                self.latency.record((time.perf_counter() - started) * 1000)
+        
+        self.stats["failures"] += 1
+        return None, None
+
+    @staticmethod
+    def _has_movement(compared_prices: Dict) -> bool:
+        """Takip edilen urunlerden birinin alis/satis fiyati degisti mi"""
+        for code in TRACKED_CODES:
+            price = compared_prices.get(code, {})
+            if price.get("alis_direction") in ("up", "down") or price.get("satis_direction") in ("up", "down"):
+                return True
+        return False
+
+    def is_market_closed(self, now: Optional[datetime] = None) -> bool:
+        """Hafta sonu (Istanbul saatiyle Cumartesi/Pazar) piyasa kapali kabul edilir"""
+        return (now or timezone.now()).weekday() >= 5
+
+    def _next_interval(self, status: Optional[int], moved: bool) -> float:
+        """Bir sonraki poll'a kadar beklenecek sure"""
+        if self.is_market_closed():
+            self.current_interval = self.closed_interval
+        elif status is None:
+            # Hata: tekrar denemeler bitti, temel araliga don
+            self.current_interval = max(self.refresh_interval, min(self.current_interval, self.max_interval))
+        elif moved:
+            self.current_interval = self.min_interval
+        else:
+            # Sabit fiyat / 304: araligi kademeli olarak uzat
+            self.current_interval = min(self.max_interval, max(self.current_interval, self.min_interval) * 1.5)
+        return self.current_interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Poll ve istek metrikleri"""
+        return {
+            **self.stats,
+            "current_interval": self.current_interval,
+            "latency": self.latency.get_metrics()
+        }
 
     def _compare_prices(self, new_prices: Dict) -> Dict:
         """Yeni fiyatlari eskilerle karsilastir ve degisim yonunu belirle"""
@@ -170,10 +355,10 @@ class HaremAltinPriceService:
 
     async def _notify_callbacks(self, prices: Dict):
         """Callback'leri fiyat guncellemesi ile bilgilendir"""
-        # Cache'i guncelle
+        # Cache'i guncelle - diske yazma debounce'lu ve event loop disinda
         self._cached_prices = prices
         self._last_update = datetime.now()
-        self._save_to_cache()
+        self._schedule_snapshot()
         
         for callback in self.callbacks:
             try:
@@ -184,33 +369,48 @@ class HaremAltinPriceService:
             except Exception as e:
                 logger.error(f"Callback hatasi: {e}")
 
+    async def poll_once(self) -> float:
+        """Tek poll turu - bir sonraki poll'a kadar beklenecek sureyi dondurur"""
+        status, new_prices = await self._fetch()
+        moved = False
+        
+        if status == 200 and new_prices:
+            # Degisimleri karsilastir
+            compared_prices = self._compare_prices(new_prices)
+            moved = self._has_movement(compared_prices)
+            self.stats["moves" if moved else "flat_polls"] += 1
+            
+            # Callback'leri bilgilendir
+            if compared_prices:
+                logger.debug(f"Fiyat guncellemesi: {len(compared_prices)} urun")
+                await self._notify_callbacks(compared_prices)
+            
+            # Son fiyatlari guncelle
+            self.last_prices = new_prices
+        elif status == 304:
+            self.stats["flat_polls"] += 1
+        else:
+            # Bu mesajı da debug seviyesine çevirelim, çok sık tekrar ediyor
+            logger.debug("Fiyat verisi alinamadi")
+        
+        return self._next_interval(status, moved)
+
     async def start(self):
         """Servisi baslat - periyodik fiyat cekmeye basla"""
         self.is_running = True
-        logger.debug(f"Canli fiyat servisi basladi (her {self.refresh_interval} saniyede guncelleme)")
+        self._stop_event = asyncio.Event()
+        logger.debug(f"Canli fiyat servisi basladi ({self.min_interval}-{self.max_interval} saniye arasi adaptif guncelleme)")
         
         try:
             while self.is_running:
-                # Fiyatlari cek
-                new_prices = await self.fetch_prices()
-                
-                if new_prices:
-                    # Degisimleri karsilastir
-                    compared_prices = self._compare_prices(new_prices)
-                    
-                    # Callback'leri bilgilendir
-                    if compared_prices:
-                        logger.debug(f"Fiyat guncellemesi: {len(compared_prices)} urun")
-                        await self._notify_callbacks(compared_prices)
-                    
-                    # Son fiyatlari guncelle
-                    self.last_prices = new_prices
-                else:
-                    # Bu mesajı da debug seviyesine çevirelim, çok sık tekrar ediyor
-                    logger.debug("Fiyat verisi alinamadi")
+                interval = await self.poll_once()
                 
-                # Bekleme
-                await asyncio.sleep(self.refresh_interval)
+                # Bekleme - stop() beklemeyi hemen keser
+                waiter = asyncio.ensure_future(self._stop_event.wait())
+                try:
+                    await asyncio.wait({waiter}, timeout=interval)
+                finally:
+                    waiter.cancel()
                 
         except asyncio.CancelledError:
             logger.debug("Servis durduruldu")
@@ -218,10 +418,13 @@ class HaremAltinPriceService:
             logger.error(f"Servis hatasi: {e}")
         finally:
             self.is_running = False
+            await self.close()
 
     async def stop(self):
         """Servisi durdur"""
         self.is_running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
         logger.debug("Servis durdurma sinyali gonderildi")
 
     async def get_current_prices(self) -> Optional[Dict]:
@@ -335,28 +538,74 @@ class HaremAltinPriceService:
         logger.warning(f"Fallback fiyat kullaniliyor: {price_type} = {fallback}")
         return fallback
     
+    @staticmethod
+    def _fingerprint(prices: Dict) -> str:
+        """Yon alanlari haric fiyat degerlerinin parmak izi"""
+        values = {
+            code: {k: v for k, v in data.items() if not k.endswith("_direction")}
+            for code, data in prices.items()
+            if isinstance(data, dict)
+        }
+        return json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+
+    def _schedule_snapshot(self) -> None:
+        """Fiyatlar degistiyse snapshot_delay sonra yazilacak tek bir snapshot planla"""
+        if self._fingerprint(self._cached_prices) == self._snapshot_fingerprint:
+            return
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.get_running_loop().create_task(self._delayed_snapshot())
+
+    async def _delayed_snapshot(self) -> None:
+        try:
+            await asyncio.sleep(self.snapshot_delay)
+        finally:
+            # Iptal edilse bile (kapanis) son durum yazilir
+            await asyncio.to_thread(self._save_to_cache)
+
+    async def flush_snapshot(self) -> None:
+        """Bekleyen snapshot'i hemen yaz"""
+        task = self._snapshot_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._snapshot_task = None
+
     def _save_to_cache(self) -> None:
-        """Tum fiyatlari onbellige kaydeder"""
+        """Tum fiyatlari onbellege atomik olarak kaydeder (temp dosya + fsync + rename)"""
         try:
-            os.makedirs("data", exist_ok=True)
+            prices = self._cached_prices
+            fingerprint = self._fingerprint(prices)
+            if fingerprint == self._snapshot_fingerprint:
+                return
+            
             cache_data = {
-                'prices': self._cached_prices,
+                'prices': prices,
                 'last_update': self._last_update.isoformat() if self._last_update else None
             }
-            with open('data/gold_price_cache.json', 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            # Yarim yazilmis dosya hicbir zaman cache_file adini almaz
+            os.replace(tmp_file, self.cache_file)
+            
+            self._snapshot_fingerprint = fingerprint
+            self.stats["cache_writes"] += 1
         except Exception as e:
             logger.error(f"Onbellek kaydetme hatasi: {str(e)}")
     
     def _load_from_cache(self) -> None:
         """Fiyatlari onbellekten yukler"""
         try:
-            cache_file = 'data/gold_price_cache.json'
-            if not os.path.exists(cache_file):
+            if not os.path.exists(self.cache_file):
                 logger.debug("Onbellek dosyasi bulunamadi")
                 return
             
-            with open(cache_file, 'r', encoding='utf-8') as f:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
                 cache_data = json.load(f)
                 
             self._cached_prices = cache_data.get('prices', {})
@@ -364,6 +613,7 @@ class HaremAltinPriceService:
             
             if update_time:
                 self._last_update = datetime.fromisoformat(update_time)
+            self._snapshot_fingerprint = self._fingerprint(self._cached_prices)
                 
             logger.debug(f"Onbellek yuklendi: {len(self._cached_prices)} urun, son guncelleme: {self._last_update}")
             
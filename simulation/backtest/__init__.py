@@ -0,0 +1,12 @@
+"""
+Geçmiş fiyat verisi üzerinde offline backtest
+"""
+from .engine import BacktestEngine
+from .portfolio import BacktestPortfolio, BacktestResult
+from .shared_ticks import SharedTickArray
+from .sweep import ParameterSweep, grid_search, random_search
+
+__all__ = [
+    'BacktestEngine', 'BacktestPortfolio', 'BacktestResult',
+    'SharedTickArray', 'ParameterSweep', 'grid_search', 'random_search'
+]
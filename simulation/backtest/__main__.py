@@ -0,0 +1,47 @@
+"""
+Aktif simülasyon konfigürasyonlarını geçmiş veri üzerinde çalıştır
+
+    python -m simulation.backtest --days 30
+    python -m simulation.backtest --start 2025-01-01 --end 2025-03-01 --db gold_prices.db
+"""
+import argparse
+import json
+import logging
+from datetime import timedelta
+
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+
+from .cli import load_configs, parse_date
+from .engine import BacktestEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline backtest")
+    parser.add_argument("--db", default="gold_prices.db")
+    parser.add_argument("--start", help="Başlangıç (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Bitiş (YYYY-MM-DD, varsayılan: şimdi)")
+    parser.add_argument("--days", type=int, default=30, help="--start verilmezse geriye gidilecek gün")
+    parser.add_argument("--timeframes", default="15m,1h,4h")
+    parser.add_argument("--positions", action="store_true", help="İşlemleri de yazdır")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    end = parse_date(args.end) if args.end else timezone.now()
+    start = parse_date(args.start) if args.start else end - timedelta(days=args.days)
+
+    storage = SQLiteStorage(args.db)
+    engine = BacktestEngine(storage, load_configs(storage), timeframes=args.timeframes.split(","))
+    results = engine.run(start, end)
+
+    print(json.dumps({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "run": engine.stats,
+        "results": [r.to_dict(include_positions=args.positions) for r in results]
+    }, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
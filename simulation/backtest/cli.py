@@ -0,0 +1,24 @@
+"""
+Backtest komut satırı yardımcıları
+"""
+import json
+
+from models.simulation import SimulationStatus
+from simulation.simulation_manager import SimulationManager
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+
+
+def load_configs(storage: SQLiteStorage):
+    """simulations tablosundaki aktif konfigürasyonlar"""
+    with storage.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT config FROM simulations WHERE status = ? ORDER BY id",
+            (SimulationStatus.ACTIVE.value,)
+        ).fetchall()
+    return [SimulationManager.config_from_dict(json.loads(row[0])) for row in rows]
+
+
+def parse_date(value: str):
+    """YYYY-MM-DD veya tam tarih-saat (Türkiye saati)"""
+    return timezone.parse_datetime(value, "%Y-%m-%d" if len(value) == 10 else None)
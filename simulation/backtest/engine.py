@@ -0,0 +1,198 @@
+"""
+Geçmiş veri üzerinde offline backtest motoru
+
+price_data tablosundaki tick'leri sırayla akıtır, her timeframe için mumları
+artımlı olarak kurar ve her mum kapanışında HybridStrategy.analyze'ı canlı
+analizörle aynı girdilerle bir kez çağırır. Üretilen sinyal tüm simülasyon
+konfigürasyonlarına uygulanır; pozisyonlar veritabanı yerine bellekte tutulur.
+
+    engine = BacktestEngine(storage, [SimulationConfig(...), ...])
+    results = engine.run(start, end)
+"""
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from models.market_data import GramAltinCandle
+from models.price_data import PriceData
+from models.simulation import SimulationConfig
+from simulation.signal_analyzer import SignalAnalyzer
+from storage.candle_store import GRAMS_PER_OUNCE, _OpenBucket
+from utils import timezone
+from utils.constants import ANALYSIS_INTERVALS, CANDLE_REQUIREMENTS
+
+from .portfolio import BacktestPortfolio, BacktestResult
+
+logger = logging.getLogger(__name__)
+
+# main.py analiz döngüsüyle aynı sınırlar
+MAX_CANDLES = 150
+MIN_CANDLE_RATIO = 0.6
+MAX_MARKET_DATA = 200
+MIN_MARKET_DATA = 30
+
+
+def warmup_period(timeframes: Iterable[str]) -> timedelta:
+    """İlk analizden önce gereken geçmiş veri süresi"""
+    return timedelta(minutes=max(
+        (min(CANDLE_REQUIREMENTS.get(tf, 100), MAX_CANDLES) + 1) * ANALYSIS_INTERVALS[tf] for tf in timeframes
+    ))
+
+
+class BacktestEngine:
+    """price_data'yı HybridStrategy ve simülasyon mantığı üzerinden yeniden oynatır"""
+
+    def __init__(self, storage, configs: Iterable[SimulationConfig],
+                 timeframes: Iterable[str] = ("15m", "1h", "4h"), strategy=None):
+        """
+        Args:
+            storage: iter_price_ticks sağlayan kaynak (SQLiteStorage veya SharedTickArray)
+            configs: Test edilecek simülasyon konfigürasyonları
+            timeframes: Analiz edilecek timeframe'ler
+            strategy: analyze(candles, market_data, timeframe) sağlayan nesne
+                (varsayılan: veritabanına ve paylaşılan analiz önbelleğine bağlı
+                olmayan HybridStrategy)
+        """
+        if strategy is None:
+            from storage.analysis_cache import AnalysisCache
+            from strategies.hybrid_strategy import HybridStrategy
+            # Geçmiş barlar canlı analysis_cache tablosunu okumamalı / tahliye etmemeli
+            strategy = HybridStrategy(analysis_cache=AnalysisCache(db_path=None, enabled=False))
+
+        self.storage = storage
+        self.configs = list(configs)
+        self.timeframes = [tf for tf in timeframes if tf in ANALYSIS_INTERVALS]
+        self.strategy = strategy
+
+        self.required_candles = {
+            tf: min(CANDLE_REQUIREMENTS.get(tf, 100), MAX_CANDLES) for tf in self.timeframes
+        }
+        self.stats: Dict[str, Any] = {}
+
+    def run(self, start_time: datetime, end_time: datetime, warmup: bool = True) -> List[BacktestResult]:
+        """
+        [start_time, end_time) aralığını yeniden oynat
+
+        Args:
+            warmup: True ise mumlar start_time öncesindeki veriyle doldurulur,
+                işlemler yine de start_time'dan itibaren açılır
+
+        Returns:
+            Her konfigürasyon için BacktestResult (configs sırasıyla)
+        """
+        portfolios = [
+            BacktestPortfolio(config, self.timeframes, simulation_id=i + 1)
+            for i, config in enumerate(self.configs)
+        ]
+
+        stream_start = start_time - warmup_period(self.timeframes) if warmup else start_time
+        trading_start = timezone.to_utc(start_time).timestamp()
+
+        sizes = {tf: ANALYSIS_INTERVALS[tf] * 60 for tf in self.timeframes}
+        open_buckets: Dict[str, Optional[_OpenBucket]] = {tf: None for tf in self.timeframes}
+        candles: Dict[str, Deque[GramAltinCandle]] = {
+            tf: deque(maxlen=self.required_candles[tf]) for tf in self.timeframes
+        }
+        market_data: Deque[PriceData] = deque(maxlen=MAX_MARKET_DATA)
+
+        ticks = analyses = 0
+        started = time.perf_counter()
+
+        for epoch, ons_usd, usd_try, ons_try, gram_altin in self.storage.iter_price_ticks(stream_start, end_time):
+            price = gram_altin or (ons_try / GRAMS_PER_OUNCE if ons_try else None)
+            if price is None:
+                continue
+            ticks += 1
+
+            # Önce kapanan mumları analiz et: kapanış kararı bir önceki tick'in
+            # bilgisiyle verilir, canlıdaki sıraya uygun
+            for tf in self.timeframes:
+                bucket = open_buckets[tf]
+                bucket_start = epoch // sizes[tf] * sizes[tf]
+                if bucket is None:
+                    open_buckets[tf] = _OpenBucket(bucket_start, price)
+                    continue
+                if bucket.start == bucket_start:
+                    bucket.update(price)
+                    continue
+
+                candles[tf].append(self._to_candle(bucket, tf))
+                open_buckets[tf] = _OpenBucket(bucket_start, price)
+
+                close_epoch = bucket.start + sizes[tf]
+                if close_epoch >= trading_start and self._analyze(tf, candles[tf], market_data, close_epoch, portfolios):
+                    analyses += 1
+
+            market_data.append(PriceData(
+                timestamp=datetime.fromtimestamp(epoch, timezone.UTC_TZ),
+                ons_usd=Decimal(str(ons_usd)),
+                usd_try=Decimal(str(usd_try)),
+                ons_try=Decimal(str(ons_try)),
+                gram_altin=Decimal(str(gram_altin)) if gram_altin else None
+            ))
+
+            if epoch >= trading_start:
+                tick_time = None
+                tick_price = None
+                for portfolio in portfolios:
+                    if portfolio.open_positions:
+                        if tick_time is None:
+                            tick_time = self._to_time(epoch)
+                            tick_price = Decimal(str(price))
+                        portfolio.on_tick(tick_time, tick_price)
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            "ticks": ticks,
+            "analyses": analyses,
+            "elapsed_seconds": round(elapsed, 3),
+            "ticks_per_second": round(ticks / elapsed, 1) if elapsed > 0 else 0.0
+        }
+        logger.info(f"Backtest completed: {ticks} ticks, {analyses} analyses in {elapsed:.1f}s")
+
+        return [portfolio.get_result() for portfolio in portfolios]
+
+    def _analyze(self, timeframe: str, candles: Deque[GramAltinCandle], market_data: Deque[PriceData],
+                 close_epoch: int, portfolios: List[BacktestPortfolio]) -> bool:
+        """Kapanan mumda tek analiz yap ve sinyali tüm portföylere uygula"""
+        if len(candles) < self.required_candles[timeframe] * MIN_CANDLE_RATIO:
+            return False
+
+        market_data_size = min(MAX_MARKET_DATA, len(candles) * 2)
+        if len(market_data) < MIN_MARKET_DATA:
+            return False
+
+        # get_latest_prices gibi yeni->eski sırada
+        recent = list(market_data)[-market_data_size:]
+        recent.reverse()
+
+        try:
+            analysis = self.strategy.analyze(list(candles), recent, timeframe)
+        except Exception as e:
+            logger.error(f"Backtest analysis error ({timeframe}): {e}")
+            return False
+
+        analysis["timeframe"] = timeframe
+        signal_data = SignalAnalyzer.build_signal_data(analysis)
+        current_time = self._to_time(close_epoch)
+
+        for portfolio in portfolios:
+            portfolio.on_signal(timeframe, signal_data, analysis, current_time)
+        return True
+
+    @staticmethod
+    def _to_time(epoch: int) -> datetime:
+        return timezone.to_turkey_time(datetime.fromtimestamp(epoch, timezone.UTC_TZ))
+
+    def _to_candle(self, bucket: _OpenBucket, timeframe: str) -> GramAltinCandle:
+        return GramAltinCandle(
+            timestamp=self._to_time(bucket.start),
+            open=Decimal(str(bucket.open)),
+            high=Decimal(str(bucket.high)),
+            low=Decimal(str(bucket.low)),
+            close=Decimal(str(bucket.close)),
+            interval=timeframe
+        )
@@ -0,0 +1,370 @@
+"""
+Backtest için bellek içi simülasyon portföyü
+
+SimulationManager'ın giriş / çıkış / trailing stop akışını veritabanına
+yazmadan, backtest saatine göre uygular. Karar mantığı SignalAnalyzer,
+PositionManager ve (HIGH_COST_* stratejilerinde) HighCostPositionManager'dan
+gelir; istatistikler StatisticsManager ile aynı formüllerle hesaplanır.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from models.simulation import (
+    ExitReason,
+    PositionStatus,
+    SimulationConfig,
+    SimulationPosition,
+    TimeframeCapital
+)
+from simulation.high_cost_position_manager import HighCostPositionManager
+from simulation.position_manager import PositionManager
+from simulation.signal_analyzer import SignalAnalyzer
+from simulation.statistics_manager import summarize_trades
+
+logger = logging.getLogger(__name__)
+
+# SimulationManager ile aynı eşikler
+DAILY_LOSS_LIMIT_PCT = -2.0
+CONFIDENCE_DROP_THRESHOLD = 0.4
+DEFAULT_STARTING_CAPITAL = 1000.0
+
+
+@dataclass
+class BacktestResult:
+    """Tek simülasyon konfigürasyonunun backtest sonucu"""
+    config: SimulationConfig
+    statistics: Dict[str, Any]
+    timeframe_capitals: Dict[str, Dict[str, float]]
+    daily_performance: List[Dict[str, Any]]
+    positions: List[SimulationPosition] = field(default_factory=list)
+    max_drawdown: float = 0.0
+
+    def to_dict(self, include_positions: bool = False) -> Dict[str, Any]:
+        result = {
+            "name": self.config.name,
+            "strategy_type": self.config.strategy_type.value,
+            "statistics": self.statistics,
+            "max_drawdown": self.max_drawdown,
+            "timeframe_capitals": self.timeframe_capitals,
+            "daily_performance": self.daily_performance
+        }
+        if include_positions:
+            result["positions"] = [
+                {
+                    "timeframe": p.timeframe,
+                    "position_type": p.position_type,
+                    "entry_time": p.entry_time.isoformat(),
+                    "entry_price": float(p.entry_price),
+                    "exit_time": p.exit_time.isoformat() if p.exit_time else None,
+                    "exit_price": float(p.exit_price) if p.exit_price is not None else None,
+                    "exit_reason": p.exit_reason.value if p.exit_reason else None,
+                    "net_profit_loss": float(p.net_profit_loss) if p.net_profit_loss is not None else None
+                }
+                for p in self.positions
+            ]
+        return result
+
+
+class BacktestPortfolio:
+    """Tek SimulationConfig için bellek içi pozisyon ve sermaye takibi"""
+
+    def __init__(self, config: SimulationConfig, timeframes: List[str], simulation_id: int = 0):
+        self.config = config
+        self.simulation_id = simulation_id
+        self.signal_analyzer = SignalAnalyzer()
+        self.position_manager = PositionManager(storage=None)
+        self.high_cost_manager = (
+            HighCostPositionManager()
+            if config.strategy_type.value.startswith("HIGH_COST") else None
+        )
+
+        self.capitals: Dict[str, TimeframeCapital] = {
+            tf: TimeframeCapital(
+                timeframe=tf,
+                allocated_capital=config.capital_distribution[tf],
+                current_capital=config.capital_distribution[tf]
+            )
+            for tf in timeframes if tf in config.capital_distribution
+        }
+        self.open_positions: Dict[str, SimulationPosition] = {}
+        self.closed_positions: List[SimulationPosition] = []
+        self._next_position_id = 1
+
+        # Günlük performans (sim_daily_performance ile aynı alanlar)
+        self._daily: Dict[date, Dict[str, Any]] = {}
+        self._last_ending_capital: Optional[float] = None
+
+        # Kapanışlar üzerinden sermaye eğrisi
+        self._peak_capital = float(self.total_capital())
+        self._max_drawdown = 0.0
+
+    # ------------------------------------------------------------------
+    # Olaylar
+    # ------------------------------------------------------------------
+    def on_tick(self, current_time: datetime, price: Decimal):
+        """Her tick'te sadece SL/TP kontrolü (SimulationManager._check_sl_tp_only)"""
+        for position in list(self.open_positions.values()):
+            exit_reason = None
+            exit_price = price
+            if position.position_type == "LONG":
+                if price <= position.stop_loss:
+                    exit_reason, exit_price = ExitReason.STOP_LOSS, position.stop_loss
+                elif price >= position.take_profit:
+                    exit_reason, exit_price = ExitReason.TAKE_PROFIT, position.take_profit
+            else:
+                if price >= position.stop_loss:
+                    exit_reason, exit_price = ExitReason.STOP_LOSS, position.stop_loss
+                elif price <= position.take_profit:
+                    exit_reason, exit_price = ExitReason.TAKE_PROFIT, position.take_profit
+
+            if exit_reason:
+                self._close_position(position, exit_price, exit_reason, current_time)
+
+    def on_signal(self, timeframe: str, signal_data: Dict, analysis: Dict, current_time: datetime):
+        """Bar kapanışındaki analiz sinyalini işle (SimulationManager._process_single_simulation)"""
+        tf_capital = self.capitals.get(timeframe)
+        if tf_capital is None or signal_data.get('price') is None:
+            return
+
+        position = self.open_positions.get(timeframe)
+        if position is not None:
+            self._check_position_exit(position, signal_data, current_time)
+        elif self._should_open_position(timeframe, signal_data, analysis, tf_capital):
+            self._open_position(timeframe, signal_data, analysis, tf_capital, current_time)
+
+    # ------------------------------------------------------------------
+    # Giriş
+    # ------------------------------------------------------------------
+    def _should_open_position(self, timeframe: str, signal_data: Dict, analysis: Dict,
+                              tf_capital: TimeframeCapital) -> bool:
+        if self.high_cost_manager is None:
+            return self.signal_analyzer.should_open_position(self.config, signal_data, timeframe)
+
+        should_enter, reason = self.high_cost_manager.should_enter_position(
+            {**signal_data, 'expected_risk_reward': analysis.get('risk_reward_ratio') or self.config.risk_reward_ratio},
+            self._market_conditions(signal_data, analysis),
+            {'available_capital': float(tf_capital.available_capital())}
+        )
+        logger.debug(f"High-cost entry check {timeframe}: {reason}")
+        return should_enter
+
+    def _open_position(self, timeframe: str, signal_data: Dict, analysis: Dict,
+                       tf_capital: TimeframeCapital, current_time: datetime):
+        # Günlük kayıp limiti
+        today = self._daily.get(current_time.date())
+        if today and today["daily_pnl_pct"] <= DAILY_LOSS_LIMIT_PCT:
+            return
+
+        atr = signal_data['indicators'].get('atr')
+        if not atr:
+            return
+        atr_dict = atr if isinstance(atr, dict) else {'atr': atr}
+
+        current_price = Decimal(str(signal_data['price']))
+        position_type = "LONG" if signal_data['signal'] == 'BUY' else "SHORT"
+        config = self.config
+
+        stop_loss = self.position_manager.calculate_stop_loss(position_type, current_price, atr_dict, config)
+        take_profit = self.position_manager.calculate_take_profit(position_type, current_price, stop_loss, config)
+
+        if self.high_cost_manager is not None:
+            sizing = self.high_cost_manager.calculate_position_size(
+                tf_capital.current_capital, current_price, stop_loss,
+                signal_data['confidence'], config.strategy_type.value
+            )
+            position_size = Decimal(str(sizing.get('position_size', 0)))
+            if position_size <= 0:
+                return
+        else:
+            position_size = self.position_manager.calculate_position_size(
+                config, tf_capital.current_capital, current_price, atr_dict
+            )
+
+        position = SimulationPosition(
+            id=self._next_position_id,
+            simulation_id=self.simulation_id,
+            timeframe=timeframe,
+            position_type=position_type,
+            status=PositionStatus.OPEN,
+            entry_time=current_time,
+            entry_price=current_price,
+            entry_spread=config.spread,
+            entry_commission=position_size * current_price * Decimal(str(config.commission_rate)),
+            position_size=position_size,
+            allocated_capital=tf_capital.current_capital,
+            risk_amount=tf_capital.current_capital * Decimal(str(config.max_risk)),
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            entry_confidence=signal_data['confidence'],
+            entry_indicators=signal_data['indicators']
+        )
+        self._next_position_id += 1
+
+        self.open_positions[timeframe] = position
+        tf_capital.in_position = True
+        tf_capital.open_position_id = position.id
+        tf_capital.last_trade_time = current_time
+
+    # ------------------------------------------------------------------
+    # Çıkış
+    # ------------------------------------------------------------------
+    def _check_position_exit(self, position: SimulationPosition, signal_data: Dict, current_time: datetime):
+        current_price = Decimal(str(signal_data['price']))
+        exit_reason = None
+        exit_price = current_price
+
+        if self.high_cost_manager is not None:
+            should_exit, reason, _ = self.high_cost_manager.should_exit_position(
+                position, current_price,
+                {
+                    'rsi': signal_data['indicators'].get('rsi') or 50,
+                    'signal_confidence': signal_data.get('confidence', 1.0)
+                },
+                current_time=current_time
+            )
+            if should_exit:
+                exit_reason = reason
+        else:
+            reason = self.signal_analyzer.check_exit_conditions(
+                position, current_price, signal_data, self.config, current_time=current_time
+            )
+            if reason:
+                exit_reason = ExitReason[reason]
+
+        if exit_reason == ExitReason.STOP_LOSS:
+            exit_price = position.stop_loss
+        elif exit_reason == ExitReason.TAKE_PROFIT:
+            exit_price = position.take_profit
+        elif exit_reason == ExitReason.TRAILING_STOP:
+            exit_price = position.trailing_stop
+
+        if not exit_reason:
+            new_trailing = self.signal_analyzer.update_trailing_stop(position, current_price, self.config)
+            if new_trailing:
+                position.trailing_stop = new_trailing
+
+            if signal_data.get('confidence', 1) < CONFIDENCE_DROP_THRESHOLD:
+                exit_reason = ExitReason.CONFIDENCE_DROP
+
+        if exit_reason:
+            self._close_position(position, exit_price, exit_reason, current_time, signal_data.get('indicators'))
+
+    def _close_position(self, position: SimulationPosition, exit_price: Decimal, exit_reason: ExitReason,
+                        current_time: datetime, exit_indicators: Optional[Dict] = None):
+        """SimulationManager._close_position ile aynı PnL hesabı"""
+        config = self.config
+        exit_spread = config.spread
+        exit_commission = exit_price * position.position_size * Decimal(str(config.commission_rate))
+
+        if position.position_type == "LONG":
+            gross_pnl_tl = (exit_price - position.entry_price) * position.position_size
+        else:
+            gross_pnl_tl = (position.entry_price - exit_price) * position.position_size
+
+        total_costs = position.entry_spread + position.entry_commission + exit_spread + exit_commission
+        net_pnl_tl = gross_pnl_tl - total_costs
+        net_pnl_gram = net_pnl_tl / exit_price
+
+        position.status = PositionStatus.CLOSED
+        position.exit_time = current_time
+        position.exit_price = exit_price
+        position.exit_spread = exit_spread
+        position.exit_commission = exit_commission
+        position.exit_reason = exit_reason
+        position.gross_profit_loss = gross_pnl_tl
+        position.net_profit_loss = net_pnl_tl
+        position.profit_loss_pct = float(net_pnl_tl / position.allocated_capital * 100)
+        position.holding_period_minutes = int((current_time - position.entry_time).total_seconds() / 60)
+        position.exit_indicators = exit_indicators
+
+        self.capitals[position.timeframe].update_capital(net_pnl_gram)
+        del self.open_positions[position.timeframe]
+        self.closed_positions.append(position)
+
+        self._record_daily(position, current_time)
+        self._update_drawdown()
+
+    # ------------------------------------------------------------------
+    # İstatistikler
+    # ------------------------------------------------------------------
+    def total_capital(self) -> Decimal:
+        return sum((tf.current_capital for tf in self.capitals.values()), Decimal("0"))
+
+    def _market_conditions(self, signal_data: Dict, analysis: Dict) -> Dict[str, Any]:
+        atr = signal_data['indicators'].get('atr')
+        atr_value = atr.get('atr', 0) if isinstance(atr, dict) else (atr or 0)
+        price = float(signal_data.get('price') or 0)
+        return {
+            'volatility': float(atr_value) / price if price else 0,
+            'risk_level': analysis.get('currency_risk', {}).get('risk_level', 'MEDIUM'),
+            'global_trend': analysis.get('global_trend', {}).get('trend_direction', 'NEUTRAL')
+        }
+
+    def _record_daily(self, position: SimulationPosition, current_time: datetime):
+        """StatisticsManager.update_daily_performance ile aynı alanlar"""
+        day = current_time.date()
+        record = self._daily.get(day)
+        if record is None:
+            starting = self._last_ending_capital if self._last_ending_capital is not None else DEFAULT_STARTING_CAPITAL
+            record = {
+                "date": day.isoformat(), "starting_capital": starting, "ending_capital": starting,
+                "daily_pnl": 0.0, "daily_pnl_pct": 0.0,
+                "total_trades": 0, "winning_trades": 0, "losing_trades": 0,
+                "trades_15m": 0, "trades_1h": 0, "trades_4h": 0, "trades_1d": 0,
+                "pnl_15m": 0.0, "pnl_1h": 0.0, "pnl_4h": 0.0, "pnl_1d": 0.0
+            }
+            self._daily[day] = record
+
+        pnl = float(position.net_profit_loss)
+        record["total_trades"] += 1
+        record["winning_trades"] += pnl > 0
+        record["losing_trades"] += pnl < 0
+        record["daily_pnl"] += pnl
+        if f"trades_{position.timeframe}" in record:
+            record[f"trades_{position.timeframe}"] += 1
+            record[f"pnl_{position.timeframe}"] += pnl
+
+        record["ending_capital"] = float(self.total_capital())
+        starting = record["starting_capital"]
+        record["daily_pnl_pct"] = record["daily_pnl"] / starting * 100 if starting > 0 else 0
+        self._last_ending_capital = record["ending_capital"]
+
+    def _update_drawdown(self):
+        capital = float(self.total_capital())
+        self._peak_capital = max(self._peak_capital, capital)
+        if self._peak_capital > 0:
+            self._max_drawdown = max(self._max_drawdown, (self._peak_capital - capital) / self._peak_capital * 100)
+
+    def get_result(self) -> BacktestResult:
+        """StatisticsManager.update_simulation_stats ile aynı özet"""
+        pnls = [float(p.net_profit_loss) for p in self.closed_positions]
+        wins = [p for p in pnls if p > 0]
+        losses = [abs(p) for p in pnls if p < 0]
+
+        statistics = summarize_trades(
+            len(pnls), len(wins), len(losses),
+            sum(wins) / len(wins) if wins else None,
+            sum(losses) / len(losses) if losses else None,
+            sum(pnls),
+            total_capital=self.total_capital()
+        )
+        statistics["open_positions"] = len(self.open_positions)
+
+        return BacktestResult(
+            config=self.config,
+            statistics=statistics,
+            timeframe_capitals={
+                tf: {
+                    "allocated_capital": float(c.allocated_capital),
+                    "current_capital": float(c.current_capital),
+                    "in_position": c.in_position
+                }
+                for tf, c in self.capitals.items()
+            },
+            daily_performance=[self._daily[d] for d in sorted(self._daily)],
+            positions=self.closed_positions + list(self.open_positions.values()),
+            max_drawdown=round(self._max_drawdown, 4)
+        )
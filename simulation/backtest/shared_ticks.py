@@ -0,0 +1,75 @@
+"""
+Paylaşılan bellekte fiyat tick dizisi
+
+Parametre taramasında price_data bir kez okunup float64 (n, 5) dizisi olarak
+SharedMemory'ye yazılır. Worker süreçleri diziyi isimle bağlar; veri görev
+başına pickle edilmez. Dizi SQLiteStorage.iter_price_ticks ile aynı arayüzü
+sunduğu için BacktestEngine'e storage yerine verilebilir.
+"""
+import logging
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Kolonlar: epoch, ons_usd, usd_try, ons_try, gram_altin (NaN = yok)
+TICK_COLUMNS = 5
+
+
+class SharedTickArray:
+    """SharedMemory üzerinde tutulan tick dizisi"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, length: int, owner: bool = False):
+        self._shm = shm
+        self._owner = owner
+        self.length = length
+        self.ticks = np.ndarray((length, TICK_COLUMNS), dtype=np.float64, buffer=shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def from_storage(cls, storage, start_time, end_time) -> "SharedTickArray":
+        """Aralıktaki tick'leri veritabanından okuyup paylaşılan belleğe yaz"""
+        rows = [
+            (epoch, ons_usd, usd_try, ons_try, np.nan if gram_altin is None else gram_altin)
+            for epoch, ons_usd, usd_try, ons_try, gram_altin in storage.iter_price_ticks(start_time, end_time)
+        ]
+        data = np.array(rows, dtype=np.float64).reshape(-1, TICK_COLUMNS)
+        return cls.from_array(data)
+
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> "SharedTickArray":
+        shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        shared = cls(shm, len(data), owner=True)
+        shared.ticks[:] = data
+        logger.info(f"Shared tick array created: {len(data)} ticks, {data.nbytes / 1024 / 1024:.1f} MB")
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, length: int) -> "SharedTickArray":
+        """Başka bir süreçte oluşturulan diziyi bağla (kopyalamaz)"""
+        return cls(shared_memory.SharedMemory(name=name), length)
+
+    def iter_price_ticks(self, start_time, end_time, chunk_size: int = 5000
+                         ) -> Iterator[Tuple[int, float, float, float, Optional[float]]]:
+        """SQLiteStorage.iter_price_ticks ile aynı tuple'lar, [start_time, end_time)"""
+        epochs = self.ticks[:, 0]
+        lo = int(np.searchsorted(epochs, timezone.to_utc(start_time).timestamp(), side="left"))
+        hi = int(np.searchsorted(epochs, timezone.to_utc(end_time).timestamp(), side="left"))
+
+        for chunk_start in range(lo, hi, chunk_size):
+            for epoch, ons_usd, usd_try, ons_try, gram_altin in self.ticks[chunk_start:min(chunk_start + chunk_size, hi)].tolist():
+                yield int(epoch), ons_usd, usd_try, ons_try, None if gram_altin != gram_altin else gram_altin
+
+    def close(self):
+        """Bağlantıyı kapat; oluşturan süreçte belleği de serbest bırak"""
+        self.ticks = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
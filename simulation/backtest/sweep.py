@@ -0,0 +1,275 @@
+"""
+HybridStrategy parametre taraması
+
+Elle ayarlanmış ağırlık ve eşikleri grid / random search ile dener. Her
+parametre seti bir ProcessPoolExecutor worker'ında tam backtest olarak
+çalışır; fiyat geçmişi SharedTickArray üzerinden paylaşıldığı için görev
+başına sadece parametre sözlüğü pickle edilir. Sonuçlar backtest_results
+tablosuna yazılır.
+
+Parametre anahtarları:
+    module_weights.<modül>        HybridStrategy.module_weights
+    combiner.<attr>.<anahtar>     SignalCombiner sözlük attribute'ları (örn. pattern_priority)
+    min_confidence.<timeframe>    strategies.constants.MIN_CONFIDENCE_THRESHOLDS
+    timeframe_weights.<timeframe> strategies.constants.TIMEFRAME_WEIGHTS
+    transaction_cost              strategies.constants.TRANSACTION_COST_PERCENTAGE
+    sim.<alan>                    SimulationConfig alanları (örn. sim.min_confidence)
+
+    python -m simulation.backtest.sweep --days 30 --workers 8 \\
+        --grid '{"module_weights.gram_analysis": [0.4, 0.5, 0.6], "transaction_cost": [0.3, 0.45]}'
+"""
+import argparse
+import importlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from models.simulation import SimulationConfig
+from strategies import constants as strategy_constants
+
+from .engine import BacktestEngine, warmup_period
+from .shared_ticks import SharedTickArray
+
+logger = logging.getLogger(__name__)
+
+# TRANSACTION_COST_PERCENTAGE'ı değer olarak import eden modüller
+TRANSACTION_COST_MODULES = ("strategies.constants", "strategies.signal_combiner", "strategies.hybrid_strategy")
+
+
+def grid_search(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Tüm kombinasyonlar"""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_search(space: Dict[str, Any], n: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """n adet rastgele set; (min, max) tuple'ı aralıktan, liste ise elemanlarından seçilir"""
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(n):
+        params = {}
+        for key, values in space.items():
+            if isinstance(values, tuple) and len(values) == 2:
+                params[key] = round(rng.uniform(*values), 4)
+            else:
+                params[key] = rng.choice(list(values))
+        sets.append(params)
+    return sets
+
+
+@contextmanager
+def applied_parameters(strategy, configs: List[SimulationConfig], parameters: Dict[str, Any]):
+    """Parametreleri strateji ve konfigürasyonlara uygula, modül sabitlerini çıkışta geri al
+
+    Yields:
+        Parametreler uygulanmış SimulationConfig kopyaları
+    """
+    restore = []
+    sim_overrides = {}
+    try:
+        for key, value in parameters.items():
+            group, _, name = key.partition(".")
+            if group == "module_weights":
+                strategy.module_weights[name] = value
+            elif group == "combiner":
+                attr, _, item = name.partition(".")
+                getattr(strategy.signal_combiner, attr)[item] = value
+            elif group in ("min_confidence", "timeframe_weights"):
+                table = (strategy_constants.MIN_CONFIDENCE_THRESHOLDS if group == "min_confidence"
+                         else strategy_constants.TIMEFRAME_WEIGHTS)
+                restore.append((table.__setitem__, name, table.get(name)))
+                table[name] = value
+            elif key == "transaction_cost":
+                for module_name in TRANSACTION_COST_MODULES:
+                    module = importlib.import_module(module_name)
+                    restore.append((module.__setattr__, "TRANSACTION_COST_PERCENTAGE", module.TRANSACTION_COST_PERCENTAGE))
+                    module.TRANSACTION_COST_PERCENTAGE = value
+            elif group == "sim":
+                sim_overrides[name] = value
+            else:
+                raise ValueError(f"Unknown sweep parameter: {key}")
+
+        yield [replace(config, **sim_overrides) for config in configs]
+    finally:
+        for setter, name, value in reversed(restore):
+            setter(name, value)
+
+
+# Worker süreç durumu (_init_worker ile bir kez kurulur)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(shm_name: str, length: int, configs: List[SimulationConfig],
+                 timeframes: List[str], log_level: int):
+    from storage.analysis_cache import get_analysis_cache
+
+    logging.getLogger().setLevel(log_level)
+    # Worker'lar canlı analysis_cache tablosuna erişmemeli (N süreç canlı analizörle yazma yarışına girer)
+    get_analysis_cache().enabled = False
+    _worker_state.update(
+        ticks=SharedTickArray.attach(shm_name, length),
+        configs=configs,
+        timeframes=timeframes
+    )
+
+
+def _run_parameter_set(parameters: Dict[str, Any], start_time, end_time) -> List[Dict[str, Any]]:
+    """Tek parametre seti için backtest (worker içinde çalışır)"""
+    from strategies.hybrid_strategy import HybridStrategy
+
+    started = time.perf_counter()
+    strategy = HybridStrategy()
+    with applied_parameters(strategy, _worker_state["configs"], parameters) as configs:
+        engine = BacktestEngine(_worker_state["ticks"], configs, _worker_state["timeframes"], strategy)
+        results = engine.run(start_time, end_time)
+    elapsed = time.perf_counter() - started
+
+    return [
+        {
+            "config_name": result.config.name,
+            "parameters": parameters,
+            "start_time": str(start_time),
+            "end_time": str(end_time),
+            "total_trades": result.statistics["total_trades"],
+            "win_rate": result.statistics["win_rate"],
+            "total_profit_loss": result.statistics["total_profit_loss"],
+            "total_profit_loss_pct": result.statistics["total_profit_loss_pct"],
+            "profit_factor": result.statistics["profit_factor"],
+            "max_drawdown": result.max_drawdown,
+            "elapsed_seconds": round(elapsed, 3)
+        }
+        for result in results
+    ]
+
+
+class ParameterSweep:
+    """Parametre setlerini süreç havuzunda paralel backtest eder"""
+
+    def __init__(self, storage, configs: Iterable[SimulationConfig],
+                 timeframes: Iterable[str] = ("15m", "1h", "4h"),
+                 max_workers: Optional[int] = None, log_level: int = logging.WARNING):
+        """
+        Args:
+            storage: SQLiteStorage instance (tick okuma ve sonuç yazma)
+            configs: Her parametre setinde çalıştırılacak simülasyon konfigürasyonları
+            max_workers: Worker süreç sayısı (varsayılan: CPU sayısı)
+            log_level: Worker'lardaki log seviyesi (strateji INFO'da çok log üretir)
+        """
+        self.storage = storage
+        self.configs = list(configs)
+        self.timeframes = list(timeframes)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.log_level = log_level
+        self.stats: Dict[str, Any] = {}
+
+    def run(self, parameter_sets: Iterable[Dict[str, Any]], start_time, end_time,
+            sweep_id: Optional[str] = None, save: bool = True) -> List[Dict[str, Any]]:
+        """
+        Tüm setleri çalıştır
+
+        Returns:
+            Sonuç satırları, total_profit_loss_pct'ye göre azalan sırada
+        """
+        parameter_sets = list(parameter_sets)
+        sweep_id = sweep_id or uuid.uuid4().hex[:12]
+        started = time.perf_counter()
+
+        ticks = SharedTickArray.from_storage(self.storage, start_time - warmup_period(self.timeframes), end_time)
+        rows: List[Dict[str, Any]] = []
+        failed = 0
+        try:
+            # Ana süreçte thread'ler (write-behind, sqlite-io) çalıştığı için fork yerine spawn;
+            # tick'ler paylaşılan bellekte olduğundan worker'a sadece segment adı gider
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, max(len(parameter_sets), 1)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(ticks.name, ticks.length, self.configs, self.timeframes, self.log_level)
+            ) as pool:
+                futures = {
+                    pool.submit(_run_parameter_set, params, start_time, end_time): params
+                    for params in parameter_sets
+                }
+                for future in as_completed(futures):
+                    try:
+                        rows.extend(future.result())
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"Sweep parameter set failed {futures[future]}: {e}")
+        finally:
+            ticks.close()
+
+        if save and rows:
+            self.storage.save_backtest_results(sweep_id, rows)
+
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            "sweep_id": sweep_id,
+            "parameter_sets": len(parameter_sets),
+            "failed": failed,
+            "ticks": ticks.length,
+            "workers": self.max_workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "sets_per_minute": round(len(parameter_sets) / elapsed * 60, 2) if elapsed > 0 else 0.0
+        }
+        logger.info(f"Sweep {sweep_id} completed: {len(parameter_sets)} sets in {elapsed:.1f}s")
+
+        return sorted(rows, key=lambda r: r["total_profit_loss_pct"], reverse=True)
+
+
+def main():
+    from datetime import timedelta
+
+    from storage.sqlite_storage import SQLiteStorage
+    from utils import timezone
+
+    from .cli import load_configs, parse_date
+
+    parser = argparse.ArgumentParser(description="HybridStrategy parametre taraması")
+    parser.add_argument("--db", default="gold_prices.db")
+    parser.add_argument("--start", help="Başlangıç (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Bitiş (YYYY-MM-DD, varsayılan: şimdi)")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--timeframes", default="15m,1h,4h")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--grid", help="JSON: {anahtar: [değerler]}")
+    parser.add_argument("--random", help="JSON: {anahtar: [min, max] veya [değerler]}")
+    parser.add_argument("--samples", type=int, default=20, help="--random için set sayısı")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.grid:
+        parameter_sets = grid_search(json.loads(args.grid))
+    elif args.random:
+        space = {
+            k: tuple(v) if len(v) == 2 and all(isinstance(x, (int, float)) for x in v) else v
+            for k, v in json.loads(args.random).items()
+        }
+        parameter_sets = random_search(space, args.samples, args.seed)
+    else:
+        parser.error("--grid veya --random gerekli")
+
+    end = parse_date(args.end) if args.end else timezone.now()
+    start = parse_date(args.start) if args.start else end - timedelta(days=args.days)
+
+    storage = SQLiteStorage(args.db)
+    sweep = ParameterSweep(storage, load_configs(storage), args.timeframes.split(","), args.workers)
+    results = sweep.run(parameter_sets, start, end)
+
+    print(json.dumps({"run": sweep.stats, "top": results[:args.top]}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -130,9 +130,12 @@ class HighCostPositionManager:
     def should_exit_position(self,
                            position: SimulationPosition,
                            current_price: Decimal,
-                           market_data: Dict) -> Tuple[bool, ExitReason, str]:
+                           market_data: Dict,
+                           current_time: Optional[datetime] = None) -> Tuple[bool, ExitReason, str]:
         """
         Yüksek maliyet koşullarında pozisyon kapatılmalı mı?
+        
+        current_time verilmezse şimdiki zaman kullanılır (backtest kendi saatini verir).
         """
         try:
             # Mevcut P&L hesapla
@@ -168,7 +171,7 @@ class HighCostPositionManager:
                 return True, ExitReason.VOLATILITY_SPIKE, "Protecting profit from volatility spike"
             
             # Zaman limiti kontrolü
-            holding_time = (now() - position.entry_time).total_seconds() / 3600  # saat
+            holding_time = ((current_time or now()) - position.entry_time).total_seconds() / 3600  # saat
             max_holding_time = self._get_max_holding_time(position.timeframe)
             
             if holding_time > max_holding_time:
@@ -14,17 +14,22 @@ from models.simulation import (
     SimulationConfig
 )
 from storage.sqlite_storage import SQLiteStorage
+from storage.trade_stats import record_closed_trade
 
 logger = logging.getLogger("gold_analyzer")
 
 
 class PositionManager:
-    """Pozisyon açma, kapatma ve yönetim işlemleri"""
+    """Pozisyon açma, kapatma ve yönetim işlemleri
+
+    Veritabanı metodları senkrondur; SimulationManager bunları db.run ile
+    sqlite-io havuzunda çağırır.
+    """
     
     def __init__(self, storage: SQLiteStorage):
         self.storage = storage
     
-    async def save_position(self, position: SimulationPosition) -> int:
+    def save_position(self, position: SimulationPosition) -> int:
         """Pozisyonu veritabanına kaydet"""
         try:
             with self.storage.get_connection() as conn:
@@ -58,14 +63,44 @@ class PositionManager:
                     json.dumps(position.entry_indicators) if position.entry_indicators else None
                 ))
                 
-                conn.commit()
                 return cursor.lastrowid
         
         except Exception as e:
             logger.error(f"Pozisyon kaydetme hatası: {str(e)}")
             raise
     
-    async def get_position(self, position_id: int) -> Optional[SimulationPosition]:
+    @staticmethod
+    def _row_to_position(data: Dict) -> SimulationPosition:
+        """sim_positions satırından (kolon adı -> değer) SimulationPosition"""
+        position = SimulationPosition(
+            id=data['id'],
+            simulation_id=data['simulation_id'],
+            timeframe=data['timeframe'],
+            position_type=data['position_type'],
+            status=PositionStatus(data['status']),
+            entry_time=parse_timestamp(data['entry_time']),
+            entry_price=Decimal(str(data['entry_price'])),
+            entry_spread=Decimal(str(data['entry_spread'])),
+            entry_commission=Decimal(str(data['entry_commission'])),
+            position_size=Decimal(str(data['position_size'])),
+            allocated_capital=Decimal(str(data['allocated_capital'])),
+            risk_amount=Decimal(str(data['risk_amount'])),
+            stop_loss=Decimal(str(data['stop_loss'])),
+            take_profit=Decimal(str(data['take_profit'])),
+            entry_confidence=data['entry_confidence']
+        )
+        
+        # Opsiyonel alanlar
+        if data.get('trailing_stop'):
+            position.trailing_stop = Decimal(str(data['trailing_stop']))
+        if data.get('max_profit'):
+            position.max_profit = Decimal(str(data['max_profit']))
+        if data.get('entry_indicators'):
+            position.entry_indicators = json.loads(data['entry_indicators'])
+        
+        return position
+    
+    def get_position(self, position_id: int) -> Optional[SimulationPosition]:
         """Pozisyon bilgilerini al"""
         with self.storage.get_connection() as conn:
             cursor = conn.cursor()
@@ -78,52 +113,33 @@ class PositionManager:
             if row:
                 # SQLite Row nesnesini dictionary'e çevir
                 col_names = [desc[0] for desc in cursor.description]
-                data = dict(zip(col_names, row))
-                
-                position = SimulationPosition(
-                    id=data['id'],
-                    simulation_id=data['simulation_id'],
-                    timeframe=data['timeframe'],
-                    position_type=data['position_type'],
-                    status=PositionStatus(data['status']),
-                    entry_time=parse_timestamp(data['entry_time']),
-                    entry_price=Decimal(str(data['entry_price'])),
-                    entry_spread=Decimal(str(data['entry_spread'])),
-                    entry_commission=Decimal(str(data['entry_commission'])),
-                    position_size=Decimal(str(data['position_size'])),
-                    allocated_capital=Decimal(str(data['allocated_capital'])),
-                    risk_amount=Decimal(str(data['risk_amount'])),
-                    stop_loss=Decimal(str(data['stop_loss'])),
-                    take_profit=Decimal(str(data['take_profit'])),
-                    entry_confidence=data['entry_confidence']
-                )
-                
-                # Opsiyonel alanlar
-                if data.get('trailing_stop'):
-                    position.trailing_stop = Decimal(str(data['trailing_stop']))
-                if data.get('max_profit'):
-                    position.max_profit = Decimal(str(data['max_profit']))
-                if data.get('entry_indicators'):
-                    position.entry_indicators = json.loads(data['entry_indicators'])
-                
-                return position
+                return self._row_to_position(dict(zip(col_names, row)))
         
         return None
     
-    async def update_position_trailing_stop(self, position_id: int, trailing_stop: Decimal):
-        """Trailing stop güncelle"""
+    def get_open_positions(self) -> Dict[int, SimulationPosition]:
+        """Tüm simülasyonların açık pozisyonları tek sorguda ({pozisyon id: pozisyon})"""
         with self.storage.get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
+                SELECT * FROM sim_positions WHERE status = 'OPEN'
+            """)
+            
+            col_names = [desc[0] for desc in cursor.description]
+            positions = (self._row_to_position(dict(zip(col_names, row))) for row in cursor.fetchall())
+            return {position.id: position for position in positions}
+    
+    def update_position_trailing_stop(self, position_id: int, trailing_stop: Decimal):
+        """Trailing stop güncelle (simülasyon döngüsünün transaction'ında)"""
+        with self.storage.get_connection() as conn:
+            conn.execute("""
                 UPDATE sim_positions
                 SET trailing_stop = ?, updated_at = ?
                 WHERE id = ?
             """, (float(trailing_stop), utc_now(), position_id))
-            
-            conn.commit()
     
-    async def update_position_close(self, position: SimulationPosition):
+    def update_position_close(self, position: SimulationPosition):
         """Pozisyon kapanışını güncelle"""
         with self.storage.get_connection() as conn:
             cursor = conn.cursor()
@@ -152,7 +168,17 @@ class PositionManager:
                 position.id
             ))
             
-            conn.commit()
+            # İstatistik özeti aynı işlemde artımlı güncellenir
+            if cursor.rowcount:
+                record_closed_trade(
+                    cursor,
+                    position.simulation_id,
+                    position.timeframe,
+                    position.exit_reason.value,
+                    position.net_profit_loss,
+                    position.profit_loss_pct,
+                    position.exit_time
+                )
     
     def calculate_position_size(
         self, 
@@ -229,7 +255,7 @@ class PositionManager:
         else:
             return entry_price - reward
     
-    async def get_open_positions_by_simulation(self, simulation_id: int) -> list:
+    def get_open_positions_by_simulation(self, simulation_id: int) -> list:
         """Simülasyonun açık pozisyonlarını getir"""
         with self.storage.get_connection() as conn:
             cursor = conn.cursor()
@@ -25,6 +25,9 @@ def reset_simulations():
         deleted_daily = cursor.rowcount
         logger.info(f"{deleted_daily} günlük performans kaydı silindi")
         
+        # İşlem istatistikleri özetini sil
+        cursor.execute("DELETE FROM sim_trade_stats")
+        
         # 3. Timeframe sermayelerini sıfırla
         cursor.execute("""
             UPDATE sim_timeframe_capital 
@@ -3,8 +3,11 @@ Sinyal analizi ve strateji filtreleme modülü
 """
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
 from decimal import Decimal
+
+import numpy as np
+
 from utils.timezone import now
 
 from models.simulation import (
@@ -18,6 +21,62 @@ logger = logging.getLogger("gold_analyzer")
 class SignalAnalyzer:
     """Sinyal analizi ve strateji filtreleme işlemleri"""
     
+    @staticmethod
+    def build_signal_data(analysis: Dict) -> Dict:
+        """Hibrit analiz sonucunu simülasyonun kullandığı sinyal yapısına çevir"""
+        # gram_analysis details.gram içinde olabilir
+        gram_analysis = analysis.get('gram_analysis', {})
+        if not gram_analysis and 'details' in analysis:
+            gram_analysis = analysis['details'].get('gram', {})
+        
+        return {
+            'signal': analysis.get('signal'),
+            'confidence': analysis.get('confidence', 0),
+            'price': analysis.get('gram_price'),
+            'indicators': {
+                'rsi': gram_analysis.get('indicators', {}).get('rsi'),
+                'macd': gram_analysis.get('indicators', {}).get('macd'),
+                'bb': gram_analysis.get('indicators', {}).get('bollinger'),
+                'atr': gram_analysis.get('indicators', {}).get('atr'),
+                'patterns': gram_analysis.get('patterns', [])
+            },
+            'stop_loss': analysis.get('stop_loss'),
+            'take_profit': analysis.get('take_profit'),
+            'position_size': analysis.get('position_size')
+        }
+    
+    @staticmethod
+    def build_signal_data_from_columns(row: Dict) -> Dict:
+        """get_latest_hybrid_signal'in tipli kolonlarından sinyal yapısı (JSON parse edilmez)"""
+        pattern = None
+        if row.get('pattern_name'):
+            pattern = {
+                'name': row['pattern_name'],
+                'type': row.get('pattern_type'),
+                'confidence': row.get('pattern_confidence')
+            }
+        
+        return {
+            'signal': row.get('signal'),
+            'confidence': row.get('confidence', 0),
+            'price': row.get('gram_price'),
+            'indicators': {
+                'rsi': row.get('rsi'),
+                'macd': {'histogram': row['macd_histogram']} if row.get('macd_histogram') is not None else None,
+                'bb': {'percent_b': row['bb_position']} if row.get('bb_position') is not None else None,
+                'atr': row.get('atr'),
+                'patterns': [pattern] if pattern else [],
+                'market_regime': row.get('market_regime'),
+                'divergence': row.get('divergence_type')
+            },
+            'stop_loss': row.get('stop_loss'),
+            'take_profit': row.get('take_profit'),
+            'position_size': {
+                'lots': row.get('position_size'),
+                'multiplier': row.get('position_multiplier')
+            }
+        }
+    
     def should_open_position(
         self,
         config: SimulationConfig,
@@ -52,6 +111,38 @@ class SignalAnalyzer:
         logger.info(f"✅ Should open position for {timeframe}: {signal} @ confidence {confidence}")
         return True
     
+    def should_open_positions(
+        self,
+        configs: Sequence[SimulationConfig],
+        signal_data: Dict,
+        timeframe: str
+    ) -> np.ndarray:
+        """Aynı sinyal için simülasyon başına should_open_position kararları (bool dizisi)
+        
+        Sinyal kontrolü bir kez, güven eşikleri dizi karşılaştırmasıyla yapılır.
+        CONSERVATIVE dışındaki filtreler yalnızca sinyale bağlı olduğundan strateji
+        tipi başına bir kez çalıştırılır.
+        """
+        decisions = np.zeros(len(configs), dtype=bool)
+        signal = signal_data.get('signal')
+        if not configs or not signal or signal == 'HOLD':
+            return decisions
+        
+        confidence = signal_data.get('confidence', 0)
+        min_confidence = np.array([config.min_confidence for config in configs], dtype=float)
+        strategies = np.array([config.strategy_type.value for config in configs])
+        decisions = confidence >= min_confidence
+        
+        for strategy in np.unique(strategies[decisions]):
+            mask = decisions & (strategies == strategy)
+            if strategy == StrategyType.CONSERVATIVE.value:
+                decisions[mask] = confidence >= min_confidence[mask] * 1.5
+            elif not self._apply_strategy_filter(configs[int(np.argmax(mask))], signal_data, timeframe):
+                decisions[mask] = False
+        
+        logger.debug(f"{timeframe} - {int(decisions.sum())}/{len(configs)} simulations should open: {signal}")
+        return decisions
+    
     def _apply_strategy_filter(
         self,
         config: SimulationConfig,
@@ -98,6 +189,13 @@ class SignalAnalyzer:
                 logger.debug(f"{timeframe} - MEAN_REVERSION: No BB data")
                 return False
             
+            # Tipli kolonlardan gelen sinyalde yalnızca %B var: bant dışı = %B < 0 veya > 1
+            percent_b = bb.get('percent_b')
+            if percent_b is not None and not (bb.get('upper_band') or bb.get('upper')):
+                result = percent_b > 1 or percent_b < 0
+                logger.debug(f"{timeframe} - MEAN_REVERSION: %B={percent_b} outside bands? {result}")
+                return result
+            
             price = signal_data.get('price')
             # BB verisi 'upper_band'/'lower_band' veya 'upper'/'lower' olabilir
             upper = bb.get('upper_band') or bb.get('upper')
@@ -119,9 +217,13 @@ class SignalAnalyzer:
         position,
         current_price: Decimal,
         current_signal: Dict,
-        config: SimulationConfig
+        config: SimulationConfig,
+        current_time: Optional[datetime] = None
     ) -> Optional[str]:
-        """Pozisyon çıkış koşullarını kontrol et"""
+        """Pozisyon çıkış koşullarını kontrol et
+        
+        current_time verilmezse şimdiki zaman kullanılır (backtest kendi saatini verir).
+        """
         exit_reason = None
         
         # 1. Stop loss kontrolü
@@ -162,7 +264,7 @@ class SignalAnalyzer:
         # 5. Zaman limiti kontrolü
         if not exit_reason:
             time_limit = config.time_limits.get(position.timeframe, 168)
-            holding_hours = (now() - position.entry_time).total_seconds() / 3600
+            holding_hours = ((current_time or now()) - position.entry_time).total_seconds() / 3600
             if holding_hours >= time_limit:
                 exit_reason = "TIME_LIMIT"
         
@@ -18,6 +18,7 @@ from models.simulation import (
 )
 from models.trading_signal import SignalType
 from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage
 from utils.risk_management import KellyRiskManager
 
 # Yeni modülleri import et
@@ -33,6 +34,7 @@ class SimulationManager:
     
     def __init__(self, storage: SQLiteStorage):
         self.storage = storage
+        self.db = AsyncSQLiteStorage(storage)
         self.risk_manager = KellyRiskManager()
         self.active_simulations: Dict[int, SimulationConfig] = {}
         self.timeframe_capitals: Dict[int, Dict[str, TimeframeCapital]] = {}
@@ -61,41 +63,7 @@ class SimulationManager:
             )
             
             # Veritabanına kaydet
-            with self.storage.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT INTO simulations (
-                        name, strategy_type, status, initial_capital,
-                        min_confidence, max_risk, spread, commission_rate,
-                        current_capital, start_date, last_update, config
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    config.name,
-                    config.strategy_type.value,
-                    SimulationStatus.ACTIVE.value,
-                    float(config.initial_capital),
-                    config.min_confidence,
-                    config.max_risk,
-                    float(config.spread),
-                    config.commission_rate,
-                    float(config.initial_capital),
-                    now(),
-                    now(),
-                    json.dumps(config.to_dict())
-                ))
-                
-                simulation_id = cursor.lastrowid
-                
-                # Timeframe sermayelerini oluştur
-                for timeframe, capital in config.capital_distribution.items():
-                    cursor.execute("""
-                        INSERT INTO sim_timeframe_capital (
-                            simulation_id, timeframe, allocated_capital, current_capital
-                        ) VALUES (?, ?, ?, ?)
-                    """, (simulation_id, timeframe, float(capital), float(capital)))
-                
-                conn.commit()
+            simulation_id = await self.db.run(self._insert_simulation, config)
             
             # Memory'de sakla
             self.active_simulations[simulation_id] = config
@@ -108,6 +76,46 @@ class SimulationManager:
             logger.error(f"Simülasyon oluşturma hatası: {str(e)}")
             raise
     
+    def _insert_simulation(self, config: SimulationConfig) -> int:
+        """Simülasyon ve timeframe sermaye satırlarını yaz (sqlite-io havuzunda)"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO simulations (
+                    name, strategy_type, status, initial_capital,
+                    min_confidence, max_risk, spread, commission_rate,
+                    current_capital, start_date, last_update, config
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                config.name,
+                config.strategy_type.value,
+                SimulationStatus.ACTIVE.value,
+                float(config.initial_capital),
+                config.min_confidence,
+                config.max_risk,
+                float(config.spread),
+                config.commission_rate,
+                float(config.initial_capital),
+                now(),
+                now(),
+                json.dumps(config.to_dict())
+            ))
+            
+            simulation_id = cursor.lastrowid
+            
+            # Timeframe sermayelerini oluştur
+            for timeframe, capital in config.capital_distribution.items():
+                cursor.execute("""
+                    INSERT INTO sim_timeframe_capital (
+                        simulation_id, timeframe, allocated_capital, current_capital
+                    ) VALUES (?, ?, ?, ?)
+                """, (simulation_id, timeframe, float(capital), float(capital)))
+            
+            conn.commit()
+        
+        return simulation_id
+    
     def _init_timeframe_capitals(self, simulation_id: int, config: SimulationConfig):
         """Timeframe sermayelerini başlat"""
         self.timeframe_capitals[simulation_id] = {}
@@ -145,62 +153,70 @@ class SimulationManager:
                 logger.error(f"Simülasyon döngü hatası: {str(e)}", exc_info=True)
                 await asyncio.sleep(5)
     
+    @staticmethod
+    def config_from_dict(config_dict: Dict) -> SimulationConfig:
+        """simulations.config JSON'undan SimulationConfig oluştur"""
+        # Config nesnesini oluştur
+        config = SimulationConfig(
+            name=config_dict['name'],
+            strategy_type=StrategyType(config_dict['strategy_type']),
+            initial_capital=Decimal(str(config_dict['initial_capital'])),
+            min_confidence=config_dict['min_confidence'],
+            max_risk=config_dict['max_risk'],
+            spread=Decimal(str(config_dict['spread'])),
+            commission_rate=config_dict['commission_rate']
+        )
+
+        # Capital distribution
+        if 'capital_distribution' in config_dict:
+            config.capital_distribution = {
+                k: Decimal(str(v)) 
+                for k, v in config_dict['capital_distribution'].items()
+            }
+
+        # Time limits
+        if 'time_limits' in config_dict:
+            config.time_limits = config_dict['time_limits']
+
+        # Other config parameters
+        if 'trading_hours' in config_dict:
+            config.trading_hours = config_dict['trading_hours']
+        if 'atr_multiplier_sl' in config_dict:
+            config.atr_multiplier_sl = config_dict['atr_multiplier_sl']
+        if 'risk_reward_ratio' in config_dict:
+            config.risk_reward_ratio = config_dict['risk_reward_ratio']
+        
+        return config
+    
     async def _load_active_simulations(self):
         """Aktif simülasyonları veritabanından yükle"""
         try:
-            with self.storage.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT id, config FROM simulations
-                    WHERE status = ?
-                """, (SimulationStatus.ACTIVE.value,))
-                
-                for row in cursor.fetchall():
-                    sim_id, config_json = row
-                    config_dict = json.loads(config_json)
-                    
-                    # Config nesnesini oluştur
-                    config = SimulationConfig(
-                        name=config_dict['name'],
-                        strategy_type=StrategyType(config_dict['strategy_type']),
-                        initial_capital=Decimal(str(config_dict['initial_capital'])),
-                        min_confidence=config_dict['min_confidence'],
-                        max_risk=config_dict['max_risk'],
-                        spread=Decimal(str(config_dict['spread'])),
-                        commission_rate=config_dict['commission_rate']
-                    )
-                    
-                    # Capital distribution
-                    if 'capital_distribution' in config_dict:
-                        config.capital_distribution = {
-                            k: Decimal(str(v)) 
-                            for k, v in config_dict['capital_distribution'].items()
-                        }
-                    
-                    # Time limits
-                    if 'time_limits' in config_dict:
-                        config.time_limits = config_dict['time_limits']
-                    
-                    # Other config parameters
-                    if 'trading_hours' in config_dict:
-                        config.trading_hours = config_dict['trading_hours']
-                    if 'atr_multiplier_sl' in config_dict:
-                        config.atr_multiplier_sl = config_dict['atr_multiplier_sl']
-                    if 'risk_reward_ratio' in config_dict:
-                        config.risk_reward_ratio = config_dict['risk_reward_ratio']
-                    
-                    self.active_simulations[sim_id] = config
-                    
-                    # Timeframe sermayelerini yükle
-                    await self._load_timeframe_capitals(sim_id)
-                
-                logger.info(f"{len(self.active_simulations)} aktif simülasyon yüklendi")
+            await self.db.run(self._read_active_simulations)
+            logger.info(f"{len(self.active_simulations)} aktif simülasyon yüklendi")
             
         except Exception as e:
             logger.error(f"Simülasyon yükleme hatası: {str(e)}")
     
-    async def _load_timeframe_capitals(self, simulation_id: int):
+    def _read_active_simulations(self):
+        """Aktif simülasyonları ve sermayelerini oku (sqlite-io havuzunda)"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, config FROM simulations
+                WHERE status = ?
+            """, (SimulationStatus.ACTIVE.value,))
+            
+            for row in cursor.fetchall():
+                sim_id, config_json = row
+                config = self.config_from_dict(json.loads(config_json))
+                
+                self.active_simulations[sim_id] = config
+                
+                # Timeframe sermayelerini yükle
+                self._load_timeframe_capitals(sim_id)
+    
+    def _load_timeframe_capitals(self, simulation_id: int):
         """Timeframe sermayelerini yükle"""
         try:
             with self.storage.get_connection() as conn:
@@ -259,12 +275,50 @@ class SimulationManager:
         
         logger.info(f"Processing {len(self.active_simulations)} active simulations")
         
-        # Her simülasyon için
-        for sim_id, config in self.active_simulations.items():
+        # Sinyaller ve açık pozisyonlar döngü başına bir kez yüklenir, tüm simülasyonlar paylaşır
+        signals = await self._get_latest_signals()
+        open_positions = defaultdict(dict)
+        for position in (await self.db.run(self.position_manager.get_open_positions)).values():
+            open_positions[position.simulation_id][position.id] = position
+        sim_ids = list(self.active_simulations)
+        entries = self._evaluate_entries(sim_ids, signals)
+
+        await self.db.run(self._run_cycle, sim_ids, current_time, signals, open_positions, entries)
+
+    def _run_cycle(
+        self,
+        sim_ids: List[int],
+        current_time,
+        signals: Dict[str, Dict],
+        open_positions: Dict[int, Dict[int, SimulationPosition]],
+        entries: Dict[str, Any]
+    ):
+        """Döngünün tüm pozisyon / sermaye / istatistik yazmaları tek transaction'da (sqlite-io havuzunda)"""
+        with self.storage.get_connection():
+            for row, sim_id in enumerate(sim_ids):
+                try:
+                    self._process_single_simulation(
+                        sim_id,
+                        self.active_simulations[sim_id],
+                        current_time,
+                        signals,
+                        open_positions.get(sim_id, {}),
+                        {timeframe: bool(mask[row]) for timeframe, mask in entries.items()}
+                    )
+                except Exception as e:
+                    logger.error(f"Simülasyon {sim_id} işleme hatası: {str(e)}")
+    
+    def _evaluate_entries(self, sim_ids: List[int], signals: Dict[str, Dict]) -> Dict[str, Any]:
+        """Timeframe başına tüm simülasyonların giriş kararları (sim_ids sırasıyla bool dizisi)"""
+        configs = [self.active_simulations[sim_id] for sim_id in sim_ids]
+        entries = {}
+        for timeframe, signal_data in signals.items():
             try:
-                await self._process_single_simulation(sim_id, config, current_time)
+                entries[timeframe] = self.signal_analyzer.should_open_positions(configs, signal_data, timeframe)
             except Exception as e:
-                logger.error(f"Simülasyon {sim_id} işleme hatası: {str(e)}")
+                logger.error(f"Giriş değerlendirme hatası ({timeframe}): {str(e)}")
+                entries[timeframe] = [False] * len(sim_ids)
+        return entries
     
     def _is_trading_hours(self, current_time) -> bool:
         """İşlem saatleri içinde mi?"""
@@ -274,20 +328,23 @@ class SimulationManager:
         # # Varsayılan 09:00-17:00
         # return 9 <= current_hour < 17
     
-    async def _process_single_simulation(
+    def _process_single_simulation(
         self,
         sim_id: int,
         config: SimulationConfig,
-        current_time
+        current_time,
+        signals: Dict[str, Dict],
+        open_positions: Dict[int, SimulationPosition],
+        entries: Dict[str, bool]
     ):
-        """Tek bir simülasyonu işle"""
+        """Tek bir simülasyonu döngünün paylaşılan verisiyle işle
+        
+        open_positions bu simülasyonun açık pozisyonları ({id: pozisyon}), entries
+        timeframe başına giriş kararlarıdır.
+        """
         logger.debug(f"Processing simulation {sim_id}: {config.name}")
         logger.debug(f"Config - Strategy: {config.strategy_type.value}, Min confidence: {config.min_confidence}")
         
-        # Son sinyalleri al
-        signals = await self._get_latest_signals()
-        logger.debug(f"Got signals for timeframes: {list(signals.keys())}")
-        
         # Her timeframe için
         for timeframe, signal_data in signals.items():
             if timeframe not in self.timeframe_capitals[sim_id]:
@@ -301,31 +358,31 @@ class SimulationManager:
             
             # Açık pozisyon varsa kontrol et
             if tf_capital.in_position and tf_capital.open_position_id:
-                logger.debug(f"Checking open position {tf_capital.open_position_id} for exit")
-                await self._check_position_exit(
-                    sim_id, tf_capital.open_position_id, signal_data
-                )
+                position = open_positions.get(tf_capital.open_position_id)
+                if position is None:
+                    logger.debug(f"Position {tf_capital.open_position_id} not found or not open")
+                    continue
+                logger.debug(f"Checking open position {position.id} for exit")
+                self._check_position_exit(sim_id, position, signal_data)
             else:
                 # Önce aynı timeframe için açık pozisyon olup olmadığını kontrol et
-                has_open_position = await self._check_open_position_exists(sim_id, timeframe)
-                if has_open_position:
+                if any(p.timeframe == timeframe for p in open_positions.values()):
                     logger.warning(f"Open position already exists for {sim_id}-{timeframe}, skipping")
                     # Timeframe capital'i güncelle
                     tf_capital.in_position = True
                     continue
                 
-                # Yeni pozisyon açma kontrolü
-                logger.debug(f"Checking if should open position for {timeframe}")
-                if self._should_open_position(config, signal_data, timeframe):
+                # Yeni pozisyon açma kontrolü (döngü başında tüm simülasyonlar için değerlendirildi)
+                if entries.get(timeframe):
                     logger.info(f"✅ Opening position for sim {sim_id} - {timeframe}")
-                    await self._open_position(
+                    self._open_position(
                         sim_id, config, timeframe, signal_data, tf_capital
                     )
                 else:
                     logger.debug(f"❌ Not opening position for {timeframe} - conditions not met")
         
         # Günlük performansı güncelle
-        await self._update_daily_performance(sim_id)
+        self._update_daily_performance(sim_id)
     
     async def _get_latest_signals(self) -> Dict[str, Dict]:
         """Son sinyalleri al"""
@@ -335,31 +392,11 @@ class SimulationManager:
             timeframes = ['15m', '1h', '4h']  # '1d' removed temporarily
             
             for timeframe in timeframes:
-                # Son hybrid analizi al
-                analysis = self.storage.get_latest_hybrid_analysis(timeframe)
+                # Son hybrid analizin tipli kolonları - JSON blob'lar okunmaz
+                analysis = await self.db.get_latest_hybrid_signal(timeframe)
                 if analysis:
                     logger.debug(f"Found analysis for {timeframe} - Signal: {analysis.get('signal')}, Confidence: {analysis.get('confidence')}")
-                    
-                    # gram_analysis details.gram içinde olabilir
-                    gram_analysis = analysis.get('gram_analysis', {})
-                    if not gram_analysis and 'details' in analysis:
-                        gram_analysis = analysis['details'].get('gram', {})
-                    
-                    signals[timeframe] = {
-                        'signal': analysis.get('signal'),
-                        'confidence': analysis.get('confidence', 0),
-                        'price': analysis.get('gram_price'),
-                        'indicators': {
-                            'rsi': gram_analysis.get('indicators', {}).get('rsi'),
-                            'macd': gram_analysis.get('indicators', {}).get('macd'),
-                            'bb': gram_analysis.get('indicators', {}).get('bollinger'),
-                            'atr': gram_analysis.get('indicators', {}).get('atr'),
-                            'patterns': gram_analysis.get('patterns', [])
-                        },
-                        'stop_loss': analysis.get('stop_loss'),
-                        'take_profit': analysis.get('take_profit'),
-                        'position_size': analysis.get('position_size')
-                    }
+                    signals[timeframe] = self.signal_analyzer.build_signal_data_from_columns(analysis)
                 else:
                     logger.debug(f"No analysis found for {timeframe}")
             
@@ -388,18 +425,7 @@ class SimulationManager:
         """Strateji tipine göre sinyal filtrele"""
         return self.signal_analyzer._apply_strategy_filter(config, signal_data, timeframe)
     
-    async def _check_open_position_exists(self, sim_id: int, timeframe: str) -> bool:
-        """Belirli bir timeframe için açık pozisyon var mı kontrol et"""
-        with self.storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM sim_positions
-                WHERE simulation_id = ? AND timeframe = ? AND status = 'OPEN'
-            """, (sim_id, timeframe))
-            count = cursor.fetchone()[0]
-            return count > 0
-    
-    async def _open_position(
+    def _open_position(
         self,
         sim_id: int,
         config: SimulationConfig,
@@ -480,7 +506,7 @@ class SimulationManager:
             )
             
             # Veritabanına kaydet
-            position_id = await self._save_position(position)
+            position_id = self._save_position(position)
             
             # Timeframe sermayesini güncelle
             tf_capital.in_position = True
@@ -488,7 +514,7 @@ class SimulationManager:
             tf_capital.last_trade_time = now()
             
             # Timeframe capital'i veritabanında güncelle
-            await self._update_timeframe_capital(sim_id, timeframe, tf_capital)
+            self._update_timeframe_capital(sim_id, timeframe, tf_capital)
             
             logger.info(
                 f"Pozisyon açıldı: Sim#{sim_id} {timeframe} "
@@ -498,20 +524,15 @@ class SimulationManager:
         except Exception as e:
             logger.error(f"Pozisyon açma hatası: {str(e)}")
     
-    async def _check_position_exit(
+    def _check_position_exit(
         self,
         sim_id: int,
-        position_id: int,
+        position: SimulationPosition,
         current_signal: Dict
     ):
         """Açık pozisyon çıkış kontrolü"""
         try:
-            # Pozisyonu al
-            position = await self._get_position(position_id)
-            if not position or position.status != PositionStatus.OPEN:
-                logger.debug(f"Position {position_id} not found or not open")
-                return
-            
+            position_id = position.id
             current_price = Decimal(str(current_signal['price']))
             config = self.active_simulations[sim_id]
             
@@ -540,7 +561,7 @@ class SimulationManager:
                     position, current_price, config
                 )
                 if new_trailing:
-                    await self._update_position_trailing_stop(position_id, new_trailing)
+                    self._update_position_trailing_stop(position_id, new_trailing)
                     logger.info(f"Trailing stop güncellendi: {new_trailing}")
             
             # Güven düşüşü kontrolü (signal_analyzer içinde yok, burada bırakalım)
@@ -551,7 +572,7 @@ class SimulationManager:
             # Pozisyonu kapat
             if exit_reason:
                 logger.info(f"🔴 Closing position {position_id}: Reason={exit_reason.value}, Exit price={exit_price}")
-                await self._close_position(
+                self._close_position(
                     sim_id,
                     position,
                     exit_price,
@@ -564,7 +585,7 @@ class SimulationManager:
         except Exception as e:
             logger.error(f"Pozisyon çıkış kontrolü hatası: {str(e)}")
     
-    async def _close_position(
+    def _close_position(
         self,
         sim_id: int,
         position: SimulationPosition,
@@ -613,17 +634,17 @@ class SimulationManager:
             position.exit_indicators = exit_indicators
             
             # Veritabanında güncelle
-            await self._update_position_close(position)
+            self._update_position_close(position)
             
             # Timeframe sermayesini güncelle (gram cinsinden)
             tf_capital = self.timeframe_capitals[sim_id][position.timeframe]
             tf_capital.update_capital(net_pnl_gram)  # Gram cinsinden güncelle
             tf_capital.in_position = False
             tf_capital.open_position_id = None
-            await self._update_timeframe_capital(sim_id, position.timeframe, tf_capital)
+            self._update_timeframe_capital(sim_id, position.timeframe, tf_capital)
             
             # Simülasyon istatistiklerini güncelle
-            await self._update_simulation_stats(sim_id)
+            self._update_simulation_stats(sim_id)
             
             # Risk manager'a işlem sonucunu ekle
             self.risk_manager.add_trade_result(
@@ -650,13 +671,14 @@ class SimulationManager:
                     # Güncel fiyatı al
                     current_price = await self._get_current_price()
                     if current_price:
-                        await self._check_sl_tp_only(
+                        await self.db.run(
+                            self._check_sl_tp_only,
                             sim_id,
                             tf_capital.open_position_id,
                             current_price
                         )
     
-    async def _check_sl_tp_only(
+    def _check_sl_tp_only(
         self,
         sim_id: int,
         position_id: int,
@@ -664,7 +686,7 @@ class SimulationManager:
     ):
         """Sadece SL/TP kontrolü"""
         try:
-            position = await self._get_position(position_id)
+            position = self._get_position(position_id)
             if not position or position.status != PositionStatus.OPEN:
                 return
             
@@ -688,7 +710,7 @@ class SimulationManager:
                     exit_price = position.take_profit
             
             if exit_reason:
-                await self._close_position(sim_id, position, exit_price, exit_reason)
+                self._close_position(sim_id, position, exit_price, exit_reason)
                 
         except Exception as e:
             logger.error(f"SL/TP kontrol hatası: {str(e)}")
@@ -697,7 +719,7 @@ class SimulationManager:
         """Güncel gram altın fiyatını al"""
         try:
             # Son fiyat verisini al
-            latest = self.storage.get_latest_price()
+            latest = await self.db.get_latest_price()
             if latest and latest.gram_altin:
                 return latest.gram_altin
             return None
@@ -706,84 +728,92 @@ class SimulationManager:
             return None
     
     # Veritabanı işlemleri
-    async def _save_position(self, position: SimulationPosition) -> int:
+    def _save_position(self, position: SimulationPosition) -> int:
         """Pozisyonu veritabanına kaydet"""
-        return await self.position_manager.save_position(position)
+        return self.position_manager.save_position(position)
     
-    async def _get_position(self, position_id: int) -> Optional[SimulationPosition]:
+    def _get_position(self, position_id: int) -> Optional[SimulationPosition]:
         """Pozisyonu veritabanından al"""
-        return await self.position_manager.get_position(position_id)
+        return self.position_manager.get_position(position_id)
     
-    async def _update_position_trailing_stop(self, position_id: int, trailing_stop: Decimal):
+    def _update_position_trailing_stop(self, position_id: int, trailing_stop: Decimal):
         """Trailing stop güncelle"""
-        await self.position_manager.update_position_trailing_stop(position_id, trailing_stop)
+        self.position_manager.update_position_trailing_stop(position_id, trailing_stop)
     
-    async def _update_position_close(self, position: SimulationPosition):
+    def _update_position_close(self, position: SimulationPosition):
         """Pozisyon kapanışını güncelle"""
-        await self.position_manager.update_position_close(position)
+        self.position_manager.update_position_close(position)
     
-    async def _update_timeframe_capital(
+    def _update_timeframe_capital(
         self,
         sim_id: int,
         timeframe: str,
         tf_capital: TimeframeCapital
     ):
         """Timeframe sermayesini güncelle"""
-        await self.statistics_manager.update_timeframe_capital(sim_id, timeframe, tf_capital)
+        self.statistics_manager.update_timeframe_capital(sim_id, timeframe, tf_capital)
     
-    async def _update_simulation_stats(self, sim_id: int):
+    def _update_simulation_stats(self, sim_id: int):
         """Simülasyon istatistiklerini güncelle"""
-        await self.statistics_manager.update_simulation_stats(sim_id, self.timeframe_capitals)
+        self.statistics_manager.update_simulation_stats(sim_id, self.timeframe_capitals)
     
-    async def _update_daily_performance(self, sim_id: int):
+    def _update_daily_performance(self, sim_id: int):
         """Günlük performansı güncelle"""
-        await self.statistics_manager.update_daily_performance(sim_id, self.timeframe_capitals, self.active_simulations)
+        self.statistics_manager.update_daily_performance(sim_id, self.timeframe_capitals, self.active_simulations)
     
     # Public metodlar
     async def get_simulation_status(self, sim_id: int) -> Optional[SimulationSummary]:
         """Simülasyon durumunu al"""
         try:
-            with self.storage.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Simülasyon bilgilerini al
-                cursor.execute("""
-                    SELECT * FROM simulations WHERE id = ?
-                """, (sim_id,))
-                
-                sim_row = cursor.fetchone()
-                if not sim_row:
-                    return None
-                
-                col_names = [desc[0] for desc in cursor.description]
-                sim_data = dict(zip(col_names, sim_row))
-                
-                # Timeframe sermayelerini al
-                tf_capitals = {}
-                for tf, capital in self.timeframe_capitals.get(sim_id, {}).items():
-                    tf_capitals[tf] = {
-                        'allocated': float(capital.allocated_capital),
-                        'current': float(capital.current_capital),
-                        'in_position': capital.in_position
-                    }
-                
-                # Açık pozisyonları say
-                cursor.execute("""
-                    SELECT COUNT(*) FROM sim_positions
-                    WHERE simulation_id = ? AND status = 'OPEN'
-                """, (sim_id,))
-                open_positions = cursor.fetchone()[0]
-                
-                # Günlük performans
-                today_start = get_day_start()
-                cursor.execute("""
-                    SELECT COUNT(*), SUM(net_profit_loss)
-                    FROM sim_positions
-                    WHERE simulation_id = ? AND exit_time >= ?
-                """, (sim_id, today_start))
-                daily_trades, daily_pnl = cursor.fetchone()
-                
-                return SimulationSummary(
+            return await self.db.run(self._query_simulation_status, sim_id)
+            
+        except Exception as e:
+            logger.error(f"Simülasyon durumu alma hatası: {str(e)}")
+            return None
+    
+    def _query_simulation_status(self, sim_id: int) -> Optional[SimulationSummary]:
+        """get_simulation_status sorguları (sqlite-io havuzunda)"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Simülasyon bilgilerini al
+            cursor.execute("""
+                SELECT * FROM simulations WHERE id = ?
+            """, (sim_id,))
+            
+            sim_row = cursor.fetchone()
+            if not sim_row:
+                return None
+            
+            col_names = [desc[0] for desc in cursor.description]
+            sim_data = dict(zip(col_names, sim_row))
+            
+            # Timeframe sermayelerini al
+            tf_capitals = {}
+            for tf, capital in self.timeframe_capitals.get(sim_id, {}).items():
+                tf_capitals[tf] = {
+                    'allocated': float(capital.allocated_capital),
+                    'current': float(capital.current_capital),
+                    'in_position': capital.in_position
+                }
+            
+            # Açık pozisyonları say
+            cursor.execute("""
+                SELECT COUNT(*) FROM sim_positions
+                WHERE simulation_id = ? AND status = 'OPEN'
+            """, (sim_id,))
+            open_positions = cursor.fetchone()[0]
+            
+            # Günlük performans
+            today_start = get_day_start()
+            cursor.execute("""
+                SELECT COUNT(*), SUM(net_profit_loss)
+                FROM sim_positions
+                WHERE simulation_id = ? AND exit_time >= ?
+            """, (sim_id, today_start))
+            daily_trades, daily_pnl = cursor.fetchone()
+            
+            return SimulationSummary(
                 simulation_id=sim_id,
                 name=sim_data['name'],
                 strategy_type=sim_data['strategy_type'],
@@ -813,10 +843,6 @@ class SimulationManager:
                 daily_trades=daily_trades or 0,
                 daily_risk_used=0.0  # TODO: Hesapla
             )
-            
-        except Exception as e:
-            logger.error(f"Simülasyon durumu alma hatası: {str(e)}")
-            return None
     
     async def stop(self):
         """Simülasyon sistemini durdur"""
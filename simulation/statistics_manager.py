@@ -6,18 +6,46 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Dict
 
+from storage import trade_stats
 from storage.sqlite_storage import SQLiteStorage
 
 logger = logging.getLogger("gold_analyzer")
 
 
+def summarize_trades(total_trades, winning_trades, losing_trades, avg_win, avg_loss,
+                     total_pnl, total_capital) -> Dict[str, float]:
+    """simulations tablosundaki özet metrikleri hesapla (canlı simülasyon ve backtest ortak)"""
+    total_trades = total_trades or 0
+    winning_trades = winning_trades or 0
+    losing_trades = losing_trades or 0
+    avg_win = avg_win or 0
+    avg_loss = avg_loss or 0
+    total_pnl = total_pnl or 0
+    
+    win_rate = winning_trades / total_trades if total_trades > 0 else 0
+    profit_factor = (winning_trades * avg_win) / (losing_trades * avg_loss) if losing_trades > 0 and avg_loss > 0 else 0
+    
+    return {
+        "current_capital": float(total_capital),
+        "total_trades": total_trades,
+        "winning_trades": winning_trades,
+        "losing_trades": losing_trades,
+        "total_profit_loss": float(total_pnl),
+        "total_profit_loss_pct": float((total_capital - 1000) / 10),  # %
+        "win_rate": win_rate,
+        "profit_factor": float(profit_factor),
+        "avg_win": float(avg_win),
+        "avg_loss": float(avg_loss)
+    }
+
+
 class StatisticsManager:
     """Simülasyon istatistikleri güncelleme işlemleri"""
     
     def __init__(self, storage: SQLiteStorage):
         self.storage = storage
     
-    async def update_simulation_stats(self, sim_id: int, timeframe_capitals: Dict):
+    def update_simulation_stats(self, sim_id: int, timeframe_capitals: Dict):
         """Simülasyon istatistiklerini güncelle"""
         try:
             with self.storage.get_connection() as conn:
@@ -29,31 +57,17 @@ class StatisticsManager:
                     for tf in timeframe_capitals[sim_id].values()
                 )
                 
-                # İşlem istatistikleri
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        SUM(CASE WHEN net_profit_loss > 0 THEN 1 ELSE 0 END) as winning_trades,
-                        SUM(CASE WHEN net_profit_loss < 0 THEN 1 ELSE 0 END) as losing_trades,
-                        AVG(CASE WHEN net_profit_loss > 0 THEN net_profit_loss ELSE NULL END) as avg_win,
-                        AVG(CASE WHEN net_profit_loss < 0 THEN ABS(net_profit_loss) ELSE NULL END) as avg_loss,
-                        SUM(net_profit_loss) as total_pnl
-                    FROM sim_positions
-                    WHERE simulation_id = ? AND status = 'CLOSED'
-                """, (sim_id,))
-                
-                stats = cursor.fetchone()
+                # İşlem istatistikleri (kapanışta güncellenen özet tablodan)
+                stats = trade_stats.get_bucket(cursor, sim_id)
                 
                 # Metrikleri hesapla
-                total_trades = stats[0] or 0
-                winning_trades = stats[1] or 0
-                losing_trades = stats[2] or 0
-                avg_win = stats[3] or 0
-                avg_loss = stats[4] or 0
-                total_pnl = stats[5] or 0
-                
-                win_rate = winning_trades / total_trades if total_trades > 0 else 0
-                profit_factor = (winning_trades * avg_win) / (losing_trades * avg_loss) if losing_trades > 0 and avg_loss > 0 else 0
+                summary = summarize_trades(
+                    stats["total_trades"], stats["winning_trades"], stats["losing_trades"],
+                    stats["avg_win"], stats["avg_loss"], stats["total_pnl"],
+                    total_capital=total_capital
+                )
+                total_trades = summary["total_trades"]
+                total_pnl = summary["total_profit_loss"]
                 
                 # Simülasyonu güncelle
                 cursor.execute("""
@@ -61,30 +75,31 @@ class StatisticsManager:
                     SET current_capital = ?, total_trades = ?, winning_trades = ?,
                         losing_trades = ?, total_profit_loss = ?, total_profit_loss_pct = ?,
                         win_rate = ?, profit_factor = ?, avg_win = ?, avg_loss = ?,
-                        last_update = ?
+                        max_drawdown = ?, sharpe_ratio = ?, last_update = ?
                     WHERE id = ?
                 """, (
-                    float(total_capital),
-                    total_trades,
-                    winning_trades,
-                    losing_trades,
-                    float(total_pnl),
-                    float((total_capital - 1000) / 10),  # %
-                    win_rate,
-                    profit_factor,
-                    float(avg_win),
-                    float(avg_loss),
+                    summary["current_capital"],
+                    summary["total_trades"],
+                    summary["winning_trades"],
+                    summary["losing_trades"],
+                    summary["total_profit_loss"],
+                    summary["total_profit_loss_pct"],
+                    summary["win_rate"],
+                    summary["profit_factor"],
+                    summary["avg_win"],
+                    summary["avg_loss"],
+                    float(stats["max_drawdown"]),
+                    float(stats["sharpe_ratio"]),
                     datetime.now(),
                     sim_id
                 ))
                 
-                conn.commit()
                 logger.debug(f"Updated stats for sim {sim_id}: trades={total_trades}, pnl={total_pnl}, capital={total_capital}")
                 
         except Exception as e:
             logger.error(f"Simülasyon istatistik güncelleme hatası: {str(e)}")
     
-    async def update_daily_performance(self, sim_id: int, timeframe_capitals: Dict, active_simulations: Dict):
+    def update_daily_performance(self, sim_id: int, timeframe_capitals: Dict, active_simulations: Dict):
         """Günlük performansı güncelle"""
         try:
             today = datetime.now().date()
@@ -112,34 +127,17 @@ class StatisticsManager:
                 row = cursor.fetchone()
                 starting_capital = row[0] if row else 1000.0
                 
-                # Bugünkü işlemleri al - timeframe bazlı
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total,
-                        SUM(CASE WHEN net_profit_loss > 0 THEN 1 ELSE 0 END) as wins,
-                        SUM(CASE WHEN net_profit_loss < 0 THEN 1 ELSE 0 END) as losses,
-                        SUM(net_profit_loss) as total_pnl,
-                        SUM(CASE WHEN timeframe = '15m' THEN 1 ELSE 0 END) as trades_15m,
-                        SUM(CASE WHEN timeframe = '1h' THEN 1 ELSE 0 END) as trades_1h,
-                        SUM(CASE WHEN timeframe = '4h' THEN 1 ELSE 0 END) as trades_4h,
-                        SUM(CASE WHEN timeframe = '1d' THEN 1 ELSE 0 END) as trades_1d,
-                        SUM(CASE WHEN timeframe = '15m' THEN net_profit_loss ELSE 0 END) as pnl_15m,
-                        SUM(CASE WHEN timeframe = '1h' THEN net_profit_loss ELSE 0 END) as pnl_1h,
-                        SUM(CASE WHEN timeframe = '4h' THEN net_profit_loss ELSE 0 END) as pnl_4h,
-                        SUM(CASE WHEN timeframe = '1d' THEN net_profit_loss ELSE 0 END) as pnl_1d
-                    FROM sim_positions
-                    WHERE simulation_id = ? 
-                    AND DATE(exit_time) = ?
-                    AND status = 'CLOSED'
-                """, (sim_id, today))
-                
-                stats = cursor.fetchone()
-                
-                # Debug log
-                if stats:
-                    logger.debug(f"Daily performance stats for sim {sim_id}: {list(stats)}")
-                else:
-                    logger.debug(f"No daily performance stats for sim {sim_id}")
+                # Bugünkü işlemler - kapanışta güncellenen günlük özet kovalarından
+                day = today.isoformat()
+                daily = trade_stats.get_bucket(cursor, sim_id, "day", day)
+                by_timeframe = trade_stats.get_buckets(cursor, sim_id, "day_timeframe", f"{day}|")
+                timeframe_stats = [by_timeframe.get(f"{day}|{tf}", {}) for tf in ("15m", "1h", "4h", "1d")]
+                stats = (
+                    [daily["total_trades"], daily["winning_trades"], daily["losing_trades"], daily["total_pnl"]]
+                    + [tf.get("total_trades", 0) for tf in timeframe_stats]
+                    + [tf.get("total_pnl", 0.0) for tf in timeframe_stats]
+                )
+                logger.debug(f"Daily performance stats for sim {sim_id}: {stats}")
                 
                 # Değerleri al
                 total_trades = stats[0] or 0
@@ -187,14 +185,12 @@ class StatisticsManager:
                         float(stats[8] or 0), float(stats[9] or 0), float(stats[10] or 0), float(stats[11] or 0)
                     ))
                 
-                conn.commit()
-                
         except Exception as e:
             import traceback
             logger.error(f"Günlük performans güncelleme hatası: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
     
-    async def update_timeframe_capital(self, sim_id: int, timeframe: str, tf_capital):
+    def update_timeframe_capital(self, sim_id: int, timeframe: str, tf_capital):
         """Timeframe sermayesini güncelle"""
         with self.storage.get_connection() as conn:
             cursor = conn.cursor()
@@ -210,8 +206,6 @@ class StatisticsManager:
                 sim_id,
                 timeframe
             ))
-            
-            conn.commit()
     
     def get_simulation_summary(self, sim_id: int, config) -> dict:
         """Simülasyon özet bilgilerini getir"""
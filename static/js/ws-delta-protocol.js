@@ -0,0 +1,71 @@
+// Kompakt WebSocket fiyat protokolü (delta1) istemci çözücüsü
+// Sunucu tarafı düzen: web/handlers/delta_protocol.py
+//
+// Kullanım:
+//   const decoder = new DeltaPriceDecoder();
+//   const ws = new WebSocket(decoder.url(`${protocol}//${location.host}/ws`));
+//   ws.binaryType = 'arraybuffer';
+//   ws.onmessage = (event) => {
+//       const msg = decoder.decode(event.data);  // {type: 'price', data: {t, g, o, u}} veya JSON mesajı
+//   };
+
+class DeltaPriceDecoder {
+    static PROTOCOL = 'delta1';
+    static SNAPSHOT = 0x01;
+    static DELTA = 0x02;
+    static SCALE = 10000;
+
+    constructor() {
+        this.stream = null;  // Sunucu süreci değişince farklıdır, since yok sayılır
+        this.seq = null;
+        this.state = null;  // [ts_ms, gram, ons_usd, usd_try] - sabit noktalı BigInt
+    }
+
+    // Yeniden bağlanırken akış kimliği ve son seq gönderilir, sunucu kaçan deltaları tekrar oynatır
+    url(baseUrl) {
+        const since = this.seq !== null ? `&stream=${this.stream}&since=${this.seq}` : '';
+        return `${baseUrl}?proto=${DeltaPriceDecoder.PROTOCOL}${since}`;
+    }
+
+    decode(payload) {
+        if (typeof payload === 'string') {
+            return JSON.parse(payload);
+        }
+
+        const view = new DataView(payload);
+        const type = view.getUint8(0);
+        let seq;
+
+        if (type === DeltaPriceDecoder.SNAPSHOT) {
+            this.stream = view.getUint32(1);
+            seq = view.getUint32(5);
+            this.state = [1, 2, 3, 4].map(i => view.getBigInt64(9 + (i - 1) * 8));
+        } else if (type === DeltaPriceDecoder.DELTA && this.state) {
+            seq = view.getUint32(1);
+            this.state = [
+                this.state[0] + BigInt(view.getUint32(5)),
+                this.state[1] + BigInt(view.getInt32(9)),
+                this.state[2] + BigInt(view.getInt32(13)),
+                this.state[3] + BigInt(view.getInt32(17))
+            ];
+        } else {
+            return null;  // Snapshot gelmeden delta - yeniden bağlanınca düzelir
+        }
+        this.seq = seq;
+
+        const missing = -(2n ** 63n);
+        const price = (value) => value === missing ? null : Number(value) / DeltaPriceDecoder.SCALE;
+        return {
+            type: 'price',
+            seq,
+            data: {
+                t: new Date(Number(this.state[0])).toISOString(),
+                g: price(this.state[1]),
+                o: price(this.state[2]),
+                u: price(this.state[3])
+            }
+        };
+    }
+}
+
+window.DeltaPriceDecoder = DeltaPriceDecoder;
@@ -0,0 +1,272 @@
+"""
+İçerik adresli analiz sonucu önbelleği
+
+Anahtar (modül, parametreler, girdi mumlarının OHLC baytları) üzerinden
+hesaplanır; aynı mumlarla yapılan aynı analiz hangi süreçte olursa olsun bir
+kez hesaplanır. İki katmanlıdır:
+
+- Süreç içi LRU (JSON metni olarak, her isabette yeni kopya döner)
+- Veritabanındaki analysis_cache tablosu: analyzer süreci (ve worker'ları) ile
+  web süreci aynı SQLite dosyasını paylaştığı için sonuçlar süreçler arası
+  ortaktır. Satır sayısı max_rows'u aşınca en az kullanılanlar silinir.
+
+Okuma yolu veritabanına yazmaz: isabetlerin kullanım zamanı bellekte tutulur
+ve en fazla touch_interval saniyede bir (ya da sonraki kayıtla birlikte) toplu
+yazılır. LRU tahliyesi her kayıtta değil, max_rows'un onda biri kadar kayıtta
+bir çalışır; tablo geçici olarak max_rows'u bu kadar aşabilir.
+
+Market regime sonucu önbelleklenmez: stratejinin dedektörü rejim geçmişini
+günceller ve sonuç o geçmişe bağlıdır.
+
+Yeni bir mum kapandığında (veya son mum güncellendiğinde) girdi baytları
+değişir ve anahtar kendiliğinden değişir; eski kayıtlar LRU ile ve max_age
+sonunda düşer.
+
+    cache = get_analysis_cache()
+    result = cache.get_or_compute("smc", df, lambda: analyzer.analyze(df))
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from storage.connection_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Analizör çıktı formatı değiştiğinde artırılır; eski kayıtlar okunmaz
+CACHE_VERSION = 1
+
+KEY_COLUMNS = ("open", "high", "low", "close")
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        key TEXT PRIMARY KEY,
+        module TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    )
+"""
+
+
+def frame_key(module: str, data: Any, params: Optional[Dict[str, Any]] = None) -> str:
+    """(modül, parametreler, OHLC içeriği) özeti
+
+    data: open/high/low/close kolonlu DataFrame veya CandleFrame. Analizörler
+    indeks ve hacim kullanmadığından anahtara yalnızca OHLC değerleri girer;
+    böylece API'nin DataFrame'i ile strateji CandleFrame'i aynı anahtarı üretir.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{CACHE_VERSION}:{module}:".encode())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    is_frame = hasattr(data, "columns")
+    for name in KEY_COLUMNS:
+        values = data[name].to_numpy() if is_frame else getattr(data, name)
+        digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return f"{module}:{digest.hexdigest()}"
+
+
+def _is_cacheable(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("status") not in ("error", "insufficient_data")
+
+
+class AnalysisCache:
+    """Süreç içi LRU + SQLite tablosu ile paylaşılan analiz sonuçları"""
+
+    def __init__(self, db_path: Optional[str] = "gold_prices.db", memory_size: int = 256,
+                 max_rows: int = 2000, max_age: float = 86400.0, enabled: bool = True,
+                 touch_interval: float = 30.0):
+        """
+        Args:
+            db_path: Paylaşılan veritabanı (None ise yalnızca süreç içi)
+            memory_size: Süreç içi LRU kapasitesi
+            max_rows: Tabloda tutulacak en fazla kayıt
+            max_age: Bu kadar saniyeden eski kayıtlar kullanılmaz
+            enabled: Kapalıyken get_or_compute doğrudan hesaplar
+            touch_interval: İsabet zamanlarının tabloya toplu yazılma aralığı (saniye)
+        """
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.enabled = enabled
+        self.touch_interval = touch_interval
+        self.evict_every = max(1, max_rows // 10)
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self._touched: Dict[str, float] = {}
+        self._last_touch_flush = time.time()
+        self._stores_since_evict = 0
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def get_or_compute(self, module: str, data: Any, compute: Callable[[], Any],
+                       params: Optional[Dict[str, Any]] = None,
+                       cacheable: Callable[[Any], bool] = _is_cacheable) -> Any:
+        """Önbellekte varsa kopyasını döndür, yoksa hesapla ve kaydet
+
+        Hata / yetersiz veri sonuçları kaydedilmez; compute'un fırlattığı
+        istisnalar çağırana aynen geçer.
+        """
+        if not self.enabled:
+            return compute()
+
+        key = frame_key(module, data, params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute()
+        if cacheable(result):
+            self.set(key, module, result)
+        return result
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                self._touched[key] = time.time()
+        if text is not None:
+            self._maybe_flush_touches()
+            return json.loads(text)
+
+        text = self._db_get(key)
+        if text is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["db_hits"] += 1
+            self._remember(key, text)
+            self._touched[key] = time.time()
+        self._maybe_flush_touches()
+        return json.loads(text)
+
+    def set(self, key: str, module: str, result: Any):
+        try:
+            text = json.dumps(result, separators=(",", ":"))
+        except (TypeError, ValueError):
+            # numpy / pandas nesneli sonuçlar paylaşılamaz; hesaplanan sonuç yine döner
+            return
+        with self._lock:
+            self._remember(key, text)
+            self.stats["stores"] += 1
+        self._db_set(key, module, text)
+
+    def flush_touches(self):
+        """Bellekte biriken isabet zamanlarını tabloya yaz"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._last_touch_flush = time.time()
+        if touched and self.db_path:
+            self._execute(lambda conn: self._write_touches(conn, touched))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+        if self.db_path:
+            self._execute(lambda conn: conn.execute("DELETE FROM analysis_cache"))
+
+    def _remember(self, key: str, text: str):
+        # Lock altında çağrılır
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _maybe_flush_touches(self):
+        if time.time() - self._last_touch_flush >= self.touch_interval:
+            self.flush_touches()
+
+    @staticmethod
+    def _write_touches(conn: sqlite3.Connection, touched: Dict[str, float]):
+        conn.executemany(
+            "UPDATE analysis_cache SET last_used = MAX(last_used, ?) WHERE key = ?",
+            [(used, key) for key, used in touched.items()]
+        )
+
+    def _db_get(self, key: str) -> Optional[str]:
+        if not self.db_path:
+            return None
+
+        row = self._execute(lambda conn: conn.execute(
+            "SELECT result FROM analysis_cache WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.max_age)
+        ).fetchone())
+        return row[0] if row is not None else None
+
+    def _db_set(self, key: str, module: str, text: str):
+        if not self.db_path:
+            return
+
+        with self._lock:
+            self._stores_since_evict += 1
+            evict = self._stores_since_evict >= self.evict_every
+            if evict:
+                # Tahliye sırası güncel olsun diye biriken isabet zamanları da yazılır
+                self._stores_since_evict = 0
+                touched, self._touched = self._touched, {}
+                self._last_touch_flush = time.time()
+            else:
+                touched = {}
+
+        def store(conn):
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, module, result, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, module, text, now, now)
+            )
+            if not evict:
+                return
+            if touched:
+                self._write_touches(conn, touched)
+            # LRU tahliyesi ve süresi geçen kayıtlar
+            conn.execute("""
+                DELETE FROM analysis_cache WHERE key IN (
+                    SELECT key FROM analysis_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                ) OR created_at < ?
+            """, (self.max_rows, now - self.max_age))
+
+        self._execute(store)
+
+    def _execute(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Paylaşılan tablo üzerinde işlem; hatalar analizi durdurmaz"""
+        try:
+            with get_pool(self.db_path).connection() as conn:
+                if not self._table_ready:
+                    conn.execute(CREATE_TABLE_SQL)
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache(last_used)"
+                    )
+                    self._table_ready = True
+                return func(conn)
+        except sqlite3.Error as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            logger.warning(f"Analiz önbelleği erişim hatası: {e}")
+            return None
+
+
+_analysis_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Süreç genelinde tek önbellek (ANALYSIS_CACHE / ANALYSIS_CACHE_DB ayarları)"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        from config import settings
+        _analysis_cache = AnalysisCache(settings.analysis_cache_db, enabled=settings.analysis_cache)
+    return _analysis_cache
@@ -0,0 +1,139 @@
+"""
+Asenkron SQLite depolama katmanı
+
+SQLiteStorage metodlarını ayrılmış bir thread havuzunda çalıştırarak event
+loop'un sorgular sırasında bloklanmasını önler. Metod yüzeyi SQLiteStorage
+ile aynıdır; tek fark çağrıların await edilmesidir:
+
+    db = AsyncSQLiteStorage(storage)
+    latest = await db.get_latest_price()
+
+Her worker thread connection_pool üzerinden kendi kalıcı bağlantısını
+kullanır. LoopLagMonitor, event loop gecikmesini ölçerek iyileşmeyi
+gözlemlemeyi sağlar.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Süreç içinde tüm veritabanı çağrılarının paylaştığı thread havuzu"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="sqlite-io")
+        return _executor
+
+
+class AsyncSQLiteStorage:
+    """SQLiteStorage için await edilebilir facade"""
+
+    def __init__(self, storage, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            storage: SQLiteStorage instance
+            executor: Sorguların çalışacağı havuz (varsayılan: paylaşılan sqlite-io havuzu)
+        """
+        self.storage = storage
+        self._executor = executor
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        return self._executor or get_db_executor()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Herhangi bir senkron fonksiyonu (örn. get_connection bloğu) havuzda çalıştır"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        # Metod her çağrıda storage'dan okunur (testlerde patch edilebilsin)
+        attr = getattr(self.storage, name)
+        if not callable(attr) or name == "get_connection":
+            return attr
+
+        async def method(*args, **kwargs):
+            return await self.run(getattr(self.storage, name), *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+
+class LoopLagMonitor:
+    """Event loop gecikmesini ölçer
+
+    Belirli aralıklarla uyuyup planlanan ile gerçekleşen uyanma zamanı
+    arasındaki farkı kaydeder; loop'u bloklayan senkron işler bu farkı artırır.
+    """
+
+    def __init__(self, interval: float = 0.5, history: int = 600):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=history)
+        self._max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        """Ölçüm task'ini başlat (çalışan loop içinde çağrılmalı)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(loop.time() - expected, 0.0))
+
+    def record(self, lag: float):
+        self._samples.append(lag)
+        if lag > self._max_lag:
+            self._max_lag = lag
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Gecikme istatistikleri (ms)"""
+        samples = np.fromiter(self._samples, dtype=np.float64, count=len(self._samples)) * 1000
+        if len(samples) == 0:
+            return {"samples": 0, "interval_ms": self.interval * 1000}
+        return {
+            "samples": len(samples),
+            "interval_ms": self.interval * 1000,
+            "avg_ms": round(float(samples.mean()), 3),
+            "p95_ms": round(float(np.percentile(samples, 95)), 3),
+            "p99_ms": round(float(np.percentile(samples, 99)), 3),
+            "last_ms": round(float(samples[-1]), 3),
+            "max_ms": round(self._max_lag * 1000, 3)
+        }
+
+
+_loop_lag_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    """Süreç genelinde tek loop lag monitörü"""
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = LoopLagMonitor()
+    return _loop_lag_monitor
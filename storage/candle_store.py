@@ -0,0 +1,323 @@
+"""
+Artımlı gram altın mum deposu
+
+Her fiyat tick'i açık mumu (15m/1h/4h/1d) O(1) maliyetle günceller, sadece
+kapanan mumlar gram_candles tablosuna yazılır ve okumalar bellekten yapılır.
+"""
+import logging
+import threading
+from collections import deque
+from itertools import islice
+from datetime import datetime
+from decimal import Decimal
+from typing import Deque, Dict, Iterable, List, Optional
+
+from models.price_data import PriceData, PriceCandle
+from utils import timezone
+from utils.constants import ANALYSIS_INTERVALS, INTERVAL_MINUTES_TO_STR
+
+logger = logging.getLogger(__name__)
+
+# Gram altın yoksa ONS/TRY'den türetmek için (generate_gram_candles ile aynı)
+GRAMS_PER_OUNCE = 31.1035
+
+
+class _OpenBucket:
+    """Henüz kapanmamış mumun ham OHLC durumu"""
+
+    __slots__ = ("start", "open", "high", "low", "close", "tick_count")
+
+    def __init__(self, start: int, price: float):
+        self.start = start
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.tick_count = 1
+
+    def update(self, price: float):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.tick_count += 1
+
+
+class CandleStore:
+    """Gram altın mumlarını bellekte artımlı olarak tutan depo"""
+
+    def __init__(self, storage, intervals: Optional[Iterable[int]] = None,
+                 max_candles: int = 200, persist: bool = True, auto_sync: bool = False,
+                 max_replay_hours: float = 48):
+        """
+        Args:
+            storage: SQLiteStorage instance
+            intervals: Takip edilecek mum aralıkları (dakika)
+            max_candles: Her aralık için bellekte tutulacak kapanmış mum sayısı
+            persist: Kapanan mumlar gram_candles tablosuna yazılsın mı
+            auto_sync: Okuma öncesi price_data'daki yeni tick'ler çekilsin mi
+                (collector'ı olmayan süreçler, örn. web sunucusu için)
+            max_replay_hours: Warm-up'ta ham tick'lerden yeniden kurulacak en uzun süre;
+                daha eski kapanmış mumlar SQL agregasyonundan yüklenir
+        """
+        self.storage = storage
+        self.intervals = sorted(set(intervals or ANALYSIS_INTERVALS.values()))
+        self.max_candles = max_candles
+        self.persist = persist
+        self.auto_sync = auto_sync
+        self.max_replay_hours = max_replay_hours
+
+        self._closed: Dict[int, Deque[PriceCandle]] = {
+            interval: deque(maxlen=max_candles) for interval in self.intervals
+        }
+        self._open: Dict[int, Optional[_OpenBucket]] = {interval: None for interval in self.intervals}
+        # Her aralık için bu epoch'tan eski tick'ler yok sayılır (warm-up replay'i için)
+        self._resume_from: Dict[int, int] = {interval: 0 for interval in self.intervals}
+
+        # Son işlenen tick (UTC epoch); sync bu saniyeden itibaren okur
+        self._last_tick_epoch = 0.0
+        self._sync_from = 0.0
+        self._warmed_up = False
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Besleme
+    # ------------------------------------------------------------------
+    def add_price(self, price_data: PriceData):
+        """Collector'dan gelen yeni fiyatla açık mumları güncelle"""
+        price = self._price_of(
+            float(price_data.gram_altin) if price_data.gram_altin else None,
+            float(price_data.ons_try) if price_data.ons_try else None
+        )
+        if price is None:
+            return
+
+        timestamp = timezone.to_utc(price_data.timestamp)
+        with self._lock:
+            if not self._warmed_up:
+                self._warm_up_locked()
+            self._apply_tick(timestamp.timestamp(), price)
+
+    def sync(self) -> int:
+        """price_data tablosundaki yeni tick'leri işle, işlenen tick sayısını döndür"""
+        with self._lock:
+            if not self._warmed_up:
+                self._warm_up_locked()
+                return 0
+            return self._sync_locked()
+
+    def warm_up(self):
+        """Kapanmış mumları tablodan yükle ve açık mumları ham veriden yeniden kur"""
+        with self._lock:
+            self._warm_up_locked()
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def get_candles(self, interval_minutes: int, limit: int = 100) -> List[PriceCandle]:
+        """Son N mumu eski->yeni sırasıyla döndür (generate_gram_candles ile aynı sözleşme)"""
+        if interval_minutes not in self._closed:
+            return self.storage.aggregate_gram_candles(interval_minutes, limit)
+
+        limit = min(max(limit, 5), self.max_candles)
+
+        with self._lock:
+            if not self._warmed_up:
+                self._warm_up_locked()
+            elif self.auto_sync:
+                self._sync_locked()
+
+            candles = list(self._closed[interval_minutes])
+            bucket = self._open[interval_minutes]
+            if bucket is not None:
+                candles.append(self._to_candle(bucket, interval_minutes))
+
+        # generate_gram_candles ile aynı zaman penceresi: son limit * interval dakika
+        window_start = timezone.utc_now().timestamp() - limit * interval_minutes * 60
+        candles = [c for c in candles[-limit:] if c.timestamp.timestamp() > window_start]
+        return candles
+
+    def get_recent_candles(self, interval_minutes: int, count: int) -> List[PriceCandle]:
+        """Zaman penceresi filtresi olmadan son count mum (açık mum dahil)"""
+        with self._lock:
+            if not self._warmed_up:
+                self._warm_up_locked()
+            elif self.auto_sync:
+                self._sync_locked()
+
+            closed = self._closed.get(interval_minutes)
+            if closed is None:
+                return []
+            bucket = self._open[interval_minutes]
+            n_closed = max(count - (1 if bucket is not None else 0), 0)
+            candles = list(islice(closed, max(len(closed) - n_closed, 0), None))
+            if bucket is not None:
+                candles.append(self._to_candle(bucket, interval_minutes))
+            return candles[-count:] if count > 0 else []
+
+    def get_open_candle(self, interval_minutes: int) -> Optional[PriceCandle]:
+        """Hâlâ açık olan mumu döndür"""
+        with self._lock:
+            bucket = self._open.get(interval_minutes)
+            return self._to_candle(bucket, interval_minutes) if bucket else None
+
+    def get_stats(self) -> Dict[str, any]:
+        """Depo durumu"""
+        with self._lock:
+            return {
+                "warmed_up": self._warmed_up,
+                "last_tick": (str(datetime.fromtimestamp(self._last_tick_epoch, timezone.UTC_TZ))
+                              if self._last_tick_epoch else None),
+                "intervals": {
+                    INTERVAL_MINUTES_TO_STR.get(i, f"{i}m"): {
+                        "closed": len(self._closed[i]),
+                        "open_ticks": self._open[i].tick_count if self._open[i] else 0
+                    }
+                    for i in self.intervals
+                }
+            }
+
+    # ------------------------------------------------------------------
+    # İç işlemler
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _price_of(gram_altin: Optional[float], ons_try: Optional[float]) -> Optional[float]:
+        if gram_altin:
+            return gram_altin
+        if ons_try:
+            return ons_try / GRAMS_PER_OUNCE
+        return None
+
+    @staticmethod
+    def _bucket_start(epoch: float, interval_minutes: int) -> int:
+        """SQL tarafındaki strftime('%s') / (interval*60) * (interval*60) ile aynı hizalama"""
+        size = interval_minutes * 60
+        return int(epoch) // size * size
+
+    def _apply_tick(self, epoch: float, price: float) -> bool:
+        """Tek tick'i tüm aralıklara uygula - O(aralık sayısı); işlendiyse True"""
+        if epoch <= self._last_tick_epoch:
+            return False  # Aynı tick push ve sync ile iki kez gelebilir
+
+        self._last_tick_epoch = epoch
+
+        for interval in self.intervals:
+            if epoch < self._resume_from[interval]:
+                continue
+
+            start = self._bucket_start(epoch, interval)
+            bucket = self._open[interval]
+
+            if bucket is None:
+                self._open[interval] = _OpenBucket(start, price)
+            elif start == bucket.start:
+                bucket.update(price)
+            else:
+                self._close_bucket(interval, bucket)
+                self._open[interval] = _OpenBucket(start, price)
+        return True
+
+    def _close_bucket(self, interval: int, bucket: _OpenBucket):
+        """Kapanan mumu belleğe ekle ve kalıcı hale getir"""
+        candle = self._to_candle(bucket, interval)
+        closed = self._closed[interval]
+
+        # Warm-up sırasında tablodan gelen son mum yeniden kurulursa üzerine yaz
+        if closed and closed[-1].timestamp == candle.timestamp:
+            closed[-1] = candle
+        else:
+            closed.append(candle)
+
+        if self.persist:
+            try:
+                self.storage.save_gram_candle(candle, bucket.tick_count)
+            except Exception as e:
+                logger.error(f"Gram candle persist error ({candle.interval}): {e}")
+
+    @staticmethod
+    def _to_candle(bucket: _OpenBucket, interval: int) -> PriceCandle:
+        return PriceCandle(
+            timestamp=timezone.to_turkey_time(datetime.fromtimestamp(bucket.start, timezone.UTC_TZ)),
+            open=Decimal(str(bucket.open)),
+            high=Decimal(str(bucket.high)),
+            low=Decimal(str(bucket.low)),
+            close=Decimal(str(bucket.close)),
+            interval=INTERVAL_MINUTES_TO_STR.get(interval, f"{interval}m")
+        )
+
+    def _warm_up_locked(self):
+        self._warmed_up = True
+        now_epoch = timezone.utc_now().timestamp()
+        replay_floor = now_epoch - self.max_replay_hours * 3600
+
+        try:
+            for interval in self.intervals:
+                current_start = self._bucket_start(now_epoch, interval)
+                window_start = current_start - self.max_candles * interval * 60
+                stored = self.storage.get_stored_gram_candles(interval, self.max_candles)
+
+                closed = self._closed[interval]
+                closed.clear()
+                for candle in stored:
+                    if window_start <= candle.timestamp.timestamp() < current_start:
+                        closed.append(candle)
+
+                # Son kayıtlı mum yarım kalmış olabilir, onun başından itibaren yeniden kur;
+                # kayıt yoksa pencerenin tamamı ham tick'lerden üretilir
+                resume_from = (
+                    self._bucket_start(closed[-1].timestamp.timestamp(), interval)
+                    if closed else window_start
+                )
+                if resume_from < replay_floor:
+                    # Boş tablo / uzun kesinti (örn. 1d için 200 gün): mumlar tek SQL agregasyonundan,
+                    # ham tick'lerden sadece son (yarım olabilecek) mum yeniden kurulur
+                    closed.clear()
+                    for candle in self.storage.aggregate_gram_candles(interval, self.max_candles):
+                        if window_start <= candle.timestamp.timestamp() < current_start:
+                            closed.append(candle)
+                    if closed:
+                        resume_from = self._bucket_start(closed[-1].timestamp.timestamp(), interval)
+                self._resume_from[interval] = resume_from
+
+            self._sync_from = min(self._resume_from.values())
+            replayed = self._replay(self.storage.get_gram_ticks_since(self._sync_from))
+            logger.info(f"Candle store warmed up: {replayed} ticks replayed")
+
+        except Exception as e:
+            logger.error(f"Candle store warm-up error: {e}", exc_info=True)
+
+    def _sync_locked(self) -> int:
+        if not (self._last_tick_epoch or self._sync_from):
+            return 0  # Warm-up başarısız oldu
+        try:
+            since = max(self._last_tick_epoch, self._sync_from)
+            return self._replay(self.storage.get_gram_ticks_since(since))
+        except Exception as e:
+            logger.error(f"Candle store sync error: {e}")
+            return 0
+
+    def _replay(self, rows) -> int:
+        count = 0
+        for timestamp, gram_altin, ons_try in rows:
+            price = self._price_of(gram_altin, ons_try)
+            if price is None:
+                continue
+            ts = timezone.parse_timestamp(timestamp)
+            if self._apply_tick(ts.timestamp(), price):
+                count += 1
+        return count
+
+
+_stores: Dict[str, CandleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candle_store(storage, **kwargs) -> CandleStore:
+    """Aynı veritabanı için süreç içinde paylaşılan CandleStore döndür"""
+    with _stores_lock:
+        store = _stores.get(storage.db_path)
+        if store is None:
+            store = CandleStore(storage, **kwargs)
+            _stores[storage.db_path] = store
+        return store
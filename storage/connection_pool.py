@@ -0,0 +1,181 @@
+"""
+SQLite bağlantı havuzu
+
+Her thread veritabanı başına tek bir kalıcı bağlantı kullanır; pragmalar
+(auto_vacuum, WAL, synchronous=NORMAL, mmap_size, cache_size) bağlantı açılırken bir
+kez uygulanır. Bağlantı kapanmadığı için sqlite3'ün statement cache'i
+çağrılar arasında yeniden kullanılır.
+
+Aynı db_path için süreç içinde tek havuz paylaşılır (analyzer, collector
+ve web route'larının ayrı SQLiteStorage örnekleri dahil).
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    # Yalnızca henüz tablo içermeyen veritabanlarında etkili; journal_mode'dan önce gelmeli
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,  # 256 MB
+    "cache_size": -20000,  # ~20 MB (negatif değer KB cinsinden)
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000
+}
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "depth", "thread_id")
+
+    def __init__(self, conn: sqlite3.Connection, thread_id: int):
+        self.conn = conn
+        self.depth = 0
+        self.thread_id = thread_id
+
+
+class SQLiteConnectionPool:
+    """Thread başına kalıcı SQLite bağlantıları"""
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = 256, timeout: float = 30.0):
+        self.db_path = db_path
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._connections: Dict[int, _PooledConnection] = {}
+        self._lock = threading.Lock()
+
+        # Metrikler
+        self._checkouts = 0
+        self._connections_created = 0
+        self._connections_closed = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._in_use = 0
+
+    @contextmanager
+    def connection(self):
+        """Mevcut thread'in bağlantısını ver; en dıştaki blok commit/rollback yapar"""
+        start = time.perf_counter()
+        pooled = self._acquire()
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._checkouts += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+            if pooled.depth == 0:
+                self._in_use += 1
+
+        pooled.depth += 1
+        try:
+            yield pooled.conn
+            if pooled.depth == 1:
+                pooled.conn.commit()
+        except Exception:
+            if pooled.depth == 1:
+                pooled.conn.rollback()
+            raise
+        finally:
+            pooled.depth -= 1
+            if pooled.depth == 0:
+                with self._lock:
+                    self._in_use -= 1
+
+    def _acquire(self) -> _PooledConnection:
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is not None:
+            return pooled
+
+        thread_id = threading.get_ident()
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn)
+
+        pooled = _PooledConnection(conn, thread_id)
+        self._local.pooled = pooled
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[thread_id] = pooled
+            self._connections_created += 1
+        return pooled
+
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        for name, value in self.pragmas.items():
+            try:
+                conn.execute(f"PRAGMA {name}={value}")
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"PRAGMA {name} uygulanamadı ({self.db_path}): {e}")
+
+    def _prune_dead_threads(self):
+        """Sonlanmış thread'lerin bağlantılarını kapat (lock altında çağrılır)"""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in [tid for tid in self._connections if tid not in alive]:
+            pooled = self._connections.pop(thread_id)
+            try:
+                pooled.conn.close()
+            except sqlite3.Error:
+                pass
+            self._connections_closed += 1
+
+    def close_all(self):
+        """Tüm bağlantıları kapat (kapanış / testler için)"""
+        with self._lock:
+            for pooled in self._connections.values():
+                try:
+                    pooled.conn.close()
+                except sqlite3.Error:
+                    pass
+                self._connections_closed += 1
+            self._connections.clear()
+        self._local = threading.local()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Havuz metrikleri"""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "db_path": self.db_path,
+                "open_connections": len(self._connections),
+                "in_use": self._in_use,
+                "checkouts": checkouts,
+                "connections_created": self._connections_created,
+                "connections_closed": self._connections_closed,
+                "avg_wait_ms": round(self._wait_time_total / checkouts * 1000, 4) if checkouts else 0.0,
+                "max_wait_ms": round(self._wait_time_max * 1000, 4),
+                "journal_mode": self.pragmas.get("journal_mode")
+            }
+
+
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, **kwargs) -> SQLiteConnectionPool:
+    """Aynı veritabanı için süreç içinde paylaşılan havuzu döndür"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = SQLiteConnectionPool(db_path, **kwargs)
+            _pools[db_path] = pool
+        return pool
+
+
+def get_all_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Süreçteki tüm havuzların metrikleri"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.db_path: pool.get_metrics() for pool in pools}
@@ -5,6 +5,8 @@ import sqlite3
 import logging
 from pathlib import Path
 
+from storage import trade_stats
+
 logger = logging.getLogger(__name__)
 
 def create_simulation_tables(db_path: str = "gold_prices.db"):
@@ -169,6 +171,9 @@ def create_simulation_tables(db_path: str = "gold_prices.db"):
             )
         """)
         
+        # 5. sim_trade_stats - Kapanışta artımlı güncellenen işlem istatistikleri
+        cursor.execute(trade_stats.CREATE_TABLE_SQL)
+        
         # İndeksler
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_simulation_id ON sim_positions(simulation_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_status ON sim_positions(status)")
@@ -0,0 +1,201 @@
+"""
+Katmanlı veri saklama - price_data sıkıştırma
+
+data_retention_raw günden eski ham tick'ler 1 dakikalık ve 15 dakikalık OHLC
+rollup'larına (price_rollups) dönüştürülüp silinir. 1 dakikalık rollup'lar
+data_retention_compressed gün tutulur, 15 dakikalık rollup'lar kalıcıdır.
+Böylece veritabanı boyutu ve tarama maliyeti sınırlı kalırken geçmiş korunur.
+
+İş, 15 dakikalık sınırlara hizalı zaman pencereleri halinde yürür. Her pencere
+(rollup yazımı + ham satır silme) tek transaction'dır; yazma kilidi kısa
+tutulur ve yarıda kesilen bir çalıştırma kaldığı yerden devam eder.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from storage.candle_store import GRAMS_PER_OUNCE
+from storage.sqlite_storage import PRICE_EPOCH_SQL, PRICE_TIME_RANGE_SQL, price_time_range
+from utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Rollup aralıkları (dakika) ve price_rollups.interval değerleri
+ROLLUP_INTERVALS = {1: "1m", 15: "15m"}
+
+# Geç gelen tick'ler mevcut rollup'la birleştirilir (open korunur, close güncellenir)
+UPSERT_ROLLUP_SQL = """
+    INSERT INTO price_rollups (
+        timestamp, interval, open, high, low, close, tick_count,
+        ons_usd_close, usd_try_close, ons_try_close
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(interval, timestamp) DO UPDATE SET
+        high = MAX(high, excluded.high),
+        low = MIN(low, excluded.low),
+        close = excluded.close,
+        tick_count = tick_count + excluded.tick_count,
+        ons_usd_close = excluded.ons_usd_close,
+        usd_try_close = excluded.usd_try_close,
+        ons_try_close = excluded.ons_try_close
+"""
+
+
+class _Rollup:
+    """Tek rollup kovasının OHLC ve kapanış durumu"""
+
+    __slots__ = ("open", "high", "low", "close", "tick_count", "ons_usd", "usd_try", "ons_try")
+
+    def __init__(self, price: float):
+        self.open = self.high = self.low = self.close = price
+        self.tick_count = 0
+
+    def update(self, price: float, ons_usd: float, usd_try: float, ons_try: float):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.tick_count += 1
+        self.ons_usd, self.usd_try, self.ons_try = ons_usd, usd_try, ons_try
+
+
+class PriceCompactor:
+    """Ham price_data satırlarını rollup'lara sıkıştıran arka plan işi"""
+
+    def __init__(self, storage, raw_days: int = 7, rollup_days: int = 30,
+                 window_minutes: int = 360, vacuum_pages: int = 2000):
+        """
+        Args:
+            storage: SQLiteStorage instance
+            raw_days: Ham tick'lerin tutulacağı gün sayısı
+            rollup_days: 1 dakikalık rollup'ların tutulacağı gün sayısı
+            window_minutes: Tek transaction'da işlenen zaman penceresi (15'in katı)
+            vacuum_pages: Çalıştırma sonunda incremental_vacuum ile bırakılacak en fazla sayfa
+        """
+        if window_minutes % 15:
+            raise ValueError("window_minutes must be a multiple of 15")
+        self.storage = storage
+        self.raw_days = raw_days
+        self.rollup_days = rollup_days
+        self.window_minutes = window_minutes
+        self.vacuum_pages = vacuum_pages
+
+        self.stats = {
+            "runs": 0,
+            "ticks_compacted": 0,
+            "rollups_written": 0,
+            "rollups_pruned": 0,
+            "windows": 0,
+            "last_run_ms": 0.0
+        }
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Bir sıkıştırma turu - sqlite-io havuzunda (db.run) çalıştırılmalı"""
+        started = time.perf_counter()
+        now = timezone.to_utc(now or timezone.utc_now())
+        self.storage.flush_writes()
+
+        # Kesim 15 dakikalık sınıra hizalanır; böylece hiçbir kova iki tura bölünmez
+        cutoff = self._align(now - timedelta(days=self.raw_days))
+        ticks = rollups = windows = 0
+
+        window_start = self._oldest_raw_before(cutoff)
+        while window_start is not None and window_start < cutoff:
+            window_end = min(window_start + timedelta(minutes=self.window_minutes), cutoff)
+            compacted, written = self._compact_window(window_start, window_end)
+            ticks += compacted
+            rollups += written
+            windows += 1
+            window_start = window_end
+
+        pruned = self._prune_rollups(self._align(now - timedelta(days=self.rollup_days)))
+        self._maintain()
+
+        self.stats["runs"] += 1
+        self.stats["ticks_compacted"] += ticks
+        self.stats["rollups_written"] += rollups
+        self.stats["rollups_pruned"] += pruned
+        self.stats["windows"] += windows
+        self.stats["last_run_ms"] = (time.perf_counter() - started) * 1000
+
+        if ticks or pruned:
+            logger.info(f"Price compaction: {ticks} ticks -> {rollups} rollups in {windows} windows, "
+                        f"{pruned} 1m rollups pruned ({self.stats['last_run_ms']:.0f}ms)")
+        return {"ticks_compacted": ticks, "rollups_written": rollups, "rollups_pruned": pruned}
+
+    def get_stats(self) -> Dict[str, float]:
+        return dict(self.stats)
+
+    @staticmethod
+    def _align(dt: datetime, minutes: int = 15) -> datetime:
+        epoch = int(dt.timestamp()) // (minutes * 60) * (minutes * 60)
+        return datetime.fromtimestamp(epoch, timezone.UTC_TZ)
+
+    def _oldest_raw_before(self, cutoff: datetime) -> Optional[datetime]:
+        # Ham tick'ler +03:00 ofsetli olabilir; en eski kayıt epoch üzerinden bulunur
+        upper, cutoff_epoch = price_time_range(cutoff, cutoff)[1::2]
+        with self.storage.get_connection() as conn:
+            row = conn.execute(
+                f"SELECT MIN({PRICE_EPOCH_SQL}) FROM price_data WHERE timestamp < ? AND {PRICE_EPOCH_SQL} < ?",
+                (upper, cutoff_epoch)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        return self._align(datetime.fromtimestamp(row[0], timezone.UTC_TZ))
+
+    def _compact_window(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """[start, end) aralığındaki ham tick'leri rollup'la ve sil (tek transaction)"""
+        window = price_time_range(start, end)
+        with self.storage.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {PRICE_EPOCH_SQL}, ons_usd, usd_try, ons_try, gram_altin
+                FROM price_data
+                WHERE {PRICE_TIME_RANGE_SQL}
+                ORDER BY timestamp ASC
+            """, window).fetchall()
+            if not rows:
+                return 0, 0
+
+            params = self._rollup_rows(rows)
+            conn.executemany(UPSERT_ROLLUP_SQL, params)
+            conn.execute(f"DELETE FROM price_data WHERE {PRICE_TIME_RANGE_SQL}", window)
+        return len(rows), len(params)
+
+    @staticmethod
+    def _rollup_rows(rows) -> List[tuple]:
+        buckets: Dict[Tuple[int, int], _Rollup] = {}
+        for epoch, ons_usd, usd_try, ons_try, gram_altin in rows:
+            price = gram_altin if gram_altin is not None else (ons_try / GRAMS_PER_OUNCE if ons_try else None)
+            if price is None:
+                continue
+            for minutes in ROLLUP_INTERVALS:
+                key = (minutes, epoch // (minutes * 60) * (minutes * 60))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = _Rollup(price)
+                bucket.update(price, ons_usd, usd_try, ons_try)
+
+        return [
+            (
+                str(datetime.fromtimestamp(bucket_start, timezone.UTC_TZ)), ROLLUP_INTERVALS[minutes],
+                b.open, b.high, b.low, b.close, b.tick_count, b.ons_usd, b.usd_try, b.ons_try
+            )
+            for (minutes, bucket_start), b in buckets.items()
+        ]
+
+    def _prune_rollups(self, cutoff: datetime) -> int:
+        with self.storage.get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM price_rollups WHERE interval = '1m' AND timestamp < ?", (str(cutoff),)
+            )
+            return cursor.rowcount
+
+    def _maintain(self):
+        """Boşalan sayfaları geri ver ve sorgu planlayıcı istatistiklerini güncelle"""
+        with self.storage.get_connection() as conn:
+            # incremental_vacuum yalnızca auto_vacuum=INCREMENTAL veritabanlarında etkilidir
+            # (yeni veritabanları bu modda oluşturulur); diğerlerinde boş sayfalar yeniden kullanılır
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+            conn.execute("PRAGMA optimize")
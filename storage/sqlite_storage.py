@@ -7,37 +7,171 @@ from decimal import Decimal
 from typing import List, Optional, Dict, Tuple, Any
 import logging
 from utils import timezone
-from contextlib import contextmanager
 from models.price_data import PriceData, PriceCandle
 from models.analysis_result import AnalysisResult, TrendType, TrendStrength
 import json
 from dataclasses import asdict
 from utils.constants import INTERVAL_MINUTES_TO_STR
+from storage.connection_pool import get_pool
+from storage import trade_stats
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+INSERT_PRICE_SQL = """
+    INSERT OR REPLACE INTO price_data 
+    (timestamp, ons_usd, usd_try, ons_try, gram_altin, source)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_HYBRID_ANALYSIS_SQL = """
+    INSERT INTO hybrid_analysis (
+        timestamp, timeframe, gram_price, signal, signal_strength,
+        confidence, position_size, stop_loss, take_profit,
+        risk_reward_ratio, global_trend, global_trend_strength,
+        currency_risk_level, position_multiplier, recommendations,
+        analysis_summary, gram_analysis, global_analysis, currency_analysis,
+        advanced_indicators, pattern_analysis,
+        rsi, macd_histogram, atr, bb_position, market_regime,
+        divergence_type, divergence_strength, pattern_name, pattern_type, pattern_confidence
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+              ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TRADING_SIGNAL_SQL = """
+    INSERT INTO trading_signals (
+        timestamp, signal_type, price_level, confidence,
+        risk_level, target_price, stop_loss, reasons
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# /analysis/history listesi için okunan kolonlar (JSON blob'lar hariç)
+HYBRID_HISTORY_COLUMNS = (
+    "id", "timestamp", "timeframe", "gram_price", "signal", "signal_strength",
+    "confidence", "position_size", "position_multiplier", "stop_loss", "take_profit",
+    "risk_reward_ratio", "global_trend", "global_trend_strength", "currency_risk_level",
+    "recommendations", "analysis_summary"
+)
+
+# Liste görünümünde kullanılan detay alanları: details anahtarı -> (kolon, ((alias, JSON yolu), ...))
+HYBRID_DETAIL_FIELDS = {
+    "gram": ("gram_analysis", (
+        ("g_trend", "$.trend"),
+        ("g_rsi", "$.indicators.rsi"),
+        ("g_signal", "$.signal"),
+        ("g_stop_loss", "$.stop_loss"),
+        ("g_take_profit", "$.take_profit"),
+    )),
+    "global": ("global_analysis", (
+        ("gl_trend_direction", "$.trend_direction"),
+        ("gl_trend_strength", "$.trend_strength"),
+        ("gl_momentum_signal", "$.momentum.signal"),
+        ("gl_volatility_level", "$.volatility.level"),
+        ("gl_supportive", "$.supportive_of_signal"),
+    )),
+    "currency": ("currency_analysis", (
+        ("c_risk_level", "$.risk_level"),
+        ("c_volatility_level", "$.volatility.level"),
+        ("c_position_multiplier", "$.position_size_multiplier"),
+        ("c_intervention_risk", "$.intervention_risk.has_risk"),
+        ("c_trend_alignment", "$.trend_alignment"),
+    )),
+}
+
+# json_extract JSON true/false değerlerini 1/0 döndürür
+HYBRID_BOOLEAN_DETAILS = {"gl_supportive", "c_intervention_risk", "c_trend_alignment"}
+
+# Sinyal tüketicilerinin JSON parse etmeden okuduğu tipli kolonlar (blob'lar soğuk depolama)
+HYBRID_HOT_COLUMNS = (
+    ("rsi", "REAL"),
+    ("macd_histogram", "REAL"),
+    ("atr", "REAL"),
+    ("bb_position", "REAL"),  # Bollinger %B
+    ("market_regime", "TEXT"),
+    ("divergence_type", "TEXT"),
+    ("divergence_strength", "REAL"),
+    ("pattern_name", "TEXT"),
+    ("pattern_type", "TEXT"),
+    ("pattern_confidence", "REAL"),
+)
+
+# get_latest_hybrid_signal'in okuduğu kolonlar
+HYBRID_SIGNAL_COLUMNS = (
+    "id", "timestamp", "timeframe", "gram_price", "signal", "confidence",
+    "position_size", "position_multiplier", "stop_loss", "take_profit"
+) + tuple(name for name, _ in HYBRID_HOT_COLUMNS)
+
+# price_data zaman damgaları yazıldıkları ofsetle saklanır (collector: +03:00, eski kayıtlar: UTC).
+# Metin karşılaştırması ofseti yok saydığından aralık sorguları indeksi en geniş ofset payıyla
+# daraltır, kesin sınırı epoch üzerinden uygular (parametreler: price_time_range)
+PRICE_EPOCH_SQL = "CAST(strftime('%s', timestamp) AS INTEGER)"
+PRICE_TIME_RANGE_SQL = f"timestamp >= ? AND timestamp < ? AND {PRICE_EPOCH_SQL} >= ? AND {PRICE_EPOCH_SQL} < ?"
+TIMESTAMP_OFFSET_SLACK = timedelta(hours=14)
+
+
+def price_time_range(start: datetime, end: datetime) -> tuple:
+    """PRICE_TIME_RANGE_SQL parametreleri: [start, end) aralığı"""
+    start, end = timezone.to_utc(start), timezone.to_utc(end)
+    return (
+        (start - TIMESTAMP_OFFSET_SLACK).strftime("%Y-%m-%d %H:%M:%S"),
+        (end + TIMESTAMP_OFFSET_SLACK).strftime("%Y-%m-%d %H:%M:%S"),
+        int(start.timestamp()),
+        int(end.timestamp())
+    )
+
 
 class SQLiteStorage:
     """SQLite tabanlı fiyat veri depolama"""
     
     def __init__(self, db_path: str = "gold_prices.db"):
         self.db_path = db_path
+        self.pool = get_pool(db_path)
+        self.candle_store = None
+        self.write_queue = None
+        # Kapatılırsa hibrit analizlerde yalnızca tipli kolonlar yazılır, detay blob'ları NULL kalır
+        self.store_analysis_blobs = True
         self._init_database()
     
-    @contextmanager
+    def enable_candle_store(self, **kwargs):
+        """generate_gram_candles okumalarını bellekteki artımlı mum deposuna yönlendir
+        
+        Aynı db_path için süreç içinde tek bir CandleStore paylaşılır.
+        """
+        from storage.candle_store import get_candle_store
+        self.candle_store = get_candle_store(self, **kwargs)
+        return self.candle_store
+    
+    def enable_write_behind(self, **kwargs):
+        """save_price / save_hybrid_analysis / save_trading_signal yazmalarını kuyruğa al
+        
+        Aynı db_path için süreç içinde tek bir WriteBehindQueue paylaşılır.
+        """
+        from storage.write_behind import get_write_queue
+        self.write_queue = get_write_queue(self, **kwargs)
+        return self.write_queue
+    
+    def queue_write(self, sql: str, params):
+        """Yazmayı write-behind kuyruğuna ekle; kuyruk yoksa hemen yaz"""
+        if self.write_queue is not None:
+            self.write_queue.put(sql, params)
+            return
+        with self.get_connection() as conn:
+            conn.execute(sql, params)
+    
+    def flush_writes(self) -> int:
+        """Bekleyen yazmaları diske yaz (okuma öncesi tutarlılık için)"""
+        if self.write_queue is None:
+            return 0
+        return self.write_queue.flush()
+    
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+        """Context manager for database connections - thread başına havuzlanmış bağlantı"""
+        return self.pool.connection()
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Bağlantı havuzu metrikleri"""
+        return self.pool.get_metrics()
     
     def _init_database(self):
         """Veritabanı tablolarını oluştur"""
@@ -92,6 +226,23 @@ class SQLiteStorage:
                 )
             """)
             
+            # Sıkıştırılmış fiyat geçmişi (storage/retention.py) - gram OHLC + kapanış kurları
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_rollups (
+                    timestamp DATETIME NOT NULL,
+                    interval TEXT NOT NULL,  -- '1m' / '15m'
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    tick_count INTEGER NOT NULL,
+                    ons_usd_close REAL,
+                    usd_try_close REAL,
+                    ons_try_close REAL,
+                    PRIMARY KEY (interval, timestamp)
+                ) WITHOUT ROWID
+            """)
+            
             # Sinyal tablosu
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS trading_signals (
@@ -164,13 +315,58 @@ class SQLiteStorage:
                     gram_analysis TEXT,  -- JSON
                     global_analysis TEXT,  -- JSON
                     currency_analysis TEXT,  -- JSON
+                    advanced_indicators TEXT,  -- JSON
+                    pattern_analysis TEXT,  -- JSON
+                    rsi REAL,
+                    macd_histogram REAL,
+                    atr REAL,
+                    bb_position REAL,
+                    market_regime TEXT,
+                    divergence_type TEXT,
+                    divergence_strength REAL,
+                    pattern_name TEXT,
+                    pattern_type TEXT,
+                    pattern_confidence REAL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Backtest / parametre taraması sonuçları
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sweep_id TEXT NOT NULL,
+                    config_name TEXT NOT NULL,
+                    parameters TEXT NOT NULL,  -- JSON
+                    start_time DATETIME,
+                    end_time DATETIME,
+                    total_trades INTEGER DEFAULT 0,
+                    win_rate REAL DEFAULT 0,
+                    total_profit_loss REAL DEFAULT 0,
+                    total_profit_loss_pct REAL DEFAULT 0,
+                    profit_factor REAL DEFAULT 0,
+                    max_drawdown REAL DEFAULT 0,
+                    elapsed_seconds REAL,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
+            # Süreçler arası paylaşılan performans metrikleri (analyzer yazar, web okur)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS perf_snapshots (
+                    name TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,  -- JSON
+                    updated_at DATETIME NOT NULL
+                )
+            """)
+            
+            # Simülasyon işlem istatistikleri özeti (kapanışta artımlı güncellenir)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sim_trade_stats'")
+            trade_stats_existed = cursor.fetchone() is not None
+            cursor.execute(trade_stats.CREATE_TABLE_SQL)
+            
             # Optimized Index'ler - Performance Critical
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_timestamp ON price_data(timestamp DESC)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_gram_timestamp ON price_data(gram_altin, timestamp DESC) WHERE gram_altin IS NOT NULL")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_candle_timestamp ON price_candles(timestamp DESC, interval)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_gram_candle_timestamp ON gram_candles(timestamp DESC, interval)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_signal_timestamp ON trading_signals(timestamp DESC)")
@@ -178,14 +374,23 @@ class SQLiteStorage:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_hybrid_timestamp ON hybrid_analysis(timestamp DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_hybrid_signal_timeframe ON hybrid_analysis(signal, timeframe, timestamp DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_hybrid_timeframe_timestamp ON hybrid_analysis(timeframe, timestamp DESC)")
-            
-            # Simulation Performance Indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_status_time ON sim_positions(status, entry_time DESC, exit_time DESC)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_pnl ON sim_positions(net_profit_loss DESC) WHERE status = 'CLOSED'")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_backtest_sweep_pnl ON backtest_results(sweep_id, total_profit_loss_pct DESC)")
             
             # Eksik kolonları kontrol et ve ekle
             self._check_and_add_missing_columns(cursor)
             
+            # gram_altin kolonu migration ile eklendiği için index'i ondan sonra oluştur
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_gram_timestamp ON price_data(gram_altin, timestamp DESC) WHERE gram_altin IS NOT NULL")
+            
+            # Simulation Performance Indexes - tablolar create_simulation_tables ile oluşturuluyor
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sim_positions'")
+            if cursor.fetchone():
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_status_time ON sim_positions(status, entry_time DESC, exit_time DESC)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_sim_positions_pnl ON sim_positions(net_profit_loss DESC) WHERE status = 'CLOSED'")
+                if not trade_stats_existed:
+                    rebuilt = trade_stats.rebuild_trade_stats(cursor)
+                    logger.info(f"Created sim_trade_stats summary from {rebuilt} closed positions")
+            
             logger.info("Database initialized successfully")
     
     def _check_and_add_missing_columns(self, cursor):
@@ -214,26 +419,85 @@ class SQLiteStorage:
                 logger.info("Added missing 'gram_altin' column to price_data table")
             except Exception as e:
                 logger.debug(f"Could not add gram_altin column: {e}")
+        
+        # hybrid_analysis: JSON blob kolonları ve tipli sinyal kolonları
+        cursor.execute("PRAGMA table_info(hybrid_analysis)")
+        hybrid_columns = [col[1] for col in cursor.fetchall()]
+        
+        for name in ("advanced_indicators", "pattern_analysis"):
+            if name not in hybrid_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE hybrid_analysis ADD COLUMN {name} TEXT")
+                    logger.info(f"Added missing '{name}' column to hybrid_analysis table")
+                except Exception as e:
+                    logger.debug(f"Could not add {name} column: {e}")
+        
+        added_hot_columns = False
+        for name, sql_type in HYBRID_HOT_COLUMNS:
+            if name not in hybrid_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE hybrid_analysis ADD COLUMN {name} {sql_type}")
+                    added_hot_columns = True
+                except Exception as e:
+                    logger.debug(f"Could not add {name} column: {e}")
+        
+        if added_hot_columns:
+            updated = self._backfill_hybrid_hot_columns(cursor)
+            logger.info(f"Added typed signal columns to hybrid_analysis, backfilled {updated} rows")
+    
+    def _backfill_hybrid_hot_columns(self, cursor, batch_size: int = 500) -> int:
+        """Eski satırların tipli kolonlarını JSON blob'lardan bir kez doldur
+        
+        market_regime ve divergence alanları blob'larda saklanmadığından eski satırlarda NULL kalır.
+        """
+        assignments = ", ".join(f"{name} = ?" for name, _ in HYBRID_HOT_COLUMNS)
+        update_sql = f"UPDATE hybrid_analysis SET {assignments} WHERE id = ?"
+        
+        updated = 0
+        last_id = 0
+        while True:
+            # id üzerinden sayfalayarak blob'ların tamamı belleğe alınmaz
+            cursor.execute("""
+                SELECT id, gram_analysis, pattern_analysis FROM hybrid_analysis
+                WHERE id > ? ORDER BY id LIMIT ?
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            
+            params = []
+            for row_id, gram_json, pattern_json in rows:
+                try:
+                    analysis = {
+                        "gram_analysis": json.loads(gram_json) if gram_json else {},
+                        "pattern_analysis": json.loads(pattern_json) if pattern_json else {}
+                    }
+                except (TypeError, ValueError):
+                    continue
+                params.append(self._hybrid_hot_values(analysis) + (row_id,))
+            cursor.executemany(update_sql, params)
+            updated += len(params)
+        return updated
     
     def save_price(self, price_data: PriceData):
         """Tek bir fiyat verisi kaydet"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO price_data 
-                (timestamp, ons_usd, usd_try, ons_try, gram_altin, source)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                price_data.timestamp,
-                float(price_data.ons_usd),
-                float(price_data.usd_try),
-                float(price_data.ons_try),
-                float(price_data.gram_altin) if price_data.gram_altin else None,
-                price_data.source
-            ))
+        self.queue_write(INSERT_PRICE_SQL, self._price_row(price_data))
+    
+    @staticmethod
+    def _price_row(price_data: PriceData) -> tuple:
+        return (
+            price_data.timestamp,
+            float(price_data.ons_usd),
+            float(price_data.usd_try),
+            float(price_data.ons_try),
+            float(price_data.gram_altin) if price_data.gram_altin else None,
+            price_data.source
+        )
     
     def get_latest_price(self) -> Optional[PriceData]:
         """En son fiyat verisini getir"""
+        self.flush_writes()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -255,6 +519,7 @@ class SQLiteStorage:
     
     def get_price_range(self, start_time, end_time) -> List[PriceData]:
         """Belirli zaman aralığındaki fiyatları getir"""
+        self.flush_writes()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -280,6 +545,7 @@ class SQLiteStorage:
         # Input validation and limit capping
         limit = min(max(limit, 1), 500)
         
+        self.flush_writes()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             # Optimized query with covering index usage
@@ -359,6 +625,12 @@ class SQLiteStorage:
             return candles[::-1]  # reversed() yerine slice notation daha hızlı
     
     def generate_gram_candles(self, interval_minutes: int, limit: int = 100) -> List[PriceCandle]:
+        """Gram altın için OHLC mumları - CandleStore etkinse bellekten, değilse SQL ile"""
+        if self.candle_store is not None:
+            return self.candle_store.get_candles(interval_minutes, limit)
+        return self.aggregate_gram_candles(interval_minutes, limit)
+    
+    def aggregate_gram_candles(self, interval_minutes: int, limit: int = 100) -> List[PriceCandle]:
         """Gram altın için OHLC mumları oluştur - Highly Optimized"""
         interval_map = {
             15: "15m",
@@ -385,17 +657,26 @@ class SQLiteStorage:
                     FROM price_data 
                     WHERE timestamp > datetime('now', '-{limit * interval_minutes} minutes')
                     AND (gram_altin IS NOT NULL OR ons_try IS NOT NULL)
-                    ORDER BY timestamp DESC
+                ),
+                period_prices AS (
+                    -- Açılış/kapanış GROUP BY'dan önce hesaplanmalı, yoksa rastgele satır gelir
+                    SELECT 
+                        period_start,
+                        candle_time,
+                        price,
+                        FIRST_VALUE(price) OVER (PARTITION BY period_start ORDER BY timestamp ASC) as open,
+                        FIRST_VALUE(price) OVER (PARTITION BY period_start ORDER BY timestamp DESC) as close
+                    FROM candle_periods
                 ),
                 candle_data AS (
                     SELECT 
                         candle_time,
                         MIN(price) as low,
                         MAX(price) as high,
-                        FIRST_VALUE(price) OVER (PARTITION BY period_start ORDER BY timestamp ASC) as open,
-                        FIRST_VALUE(price) OVER (PARTITION BY period_start ORDER BY timestamp DESC) as close,
+                        MIN(open) as open,
+                        MIN(close) as close,
                         COUNT(*) as tick_count
-                    FROM candle_periods
+                    FROM period_prices
                     GROUP BY candle_time, period_start
                 )
                 SELECT DISTINCT candle_time, low, high, open, close, tick_count
@@ -446,6 +727,214 @@ class SQLiteStorage:
             
             return result
     
+    def save_gram_candle(self, candle: PriceCandle, tick_count: int = 0):
+        """Kapanmış tek bir gram altın mumunu kaydet"""
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO gram_candles 
+                (timestamp, interval, open, high, low, close, tick_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                candle.timestamp,
+                candle.interval,
+                float(candle.open),
+                float(candle.high),
+                float(candle.low),
+                float(candle.close),
+                tick_count
+            ))
+    
+    def get_stored_gram_candles(self, interval_minutes: int, limit: int = 200) -> List[PriceCandle]:
+        """gram_candles tablosundaki kayıtlı mumları eski->yeni sırasıyla getir"""
+        interval_str = INTERVAL_MINUTES_TO_STR.get(interval_minutes, f"{interval_minutes}m")
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT timestamp, open, high, low, close
+                FROM gram_candles
+                WHERE interval = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (interval_str, limit))
+            
+            candles = [
+                PriceCandle(
+                    timestamp=timezone.parse_timestamp(row[0]),
+                    open=Decimal(str(row[1])),
+                    high=Decimal(str(row[2])),
+                    low=Decimal(str(row[3])),
+                    close=Decimal(str(row[4])),
+                    interval=interval_str
+                )
+                for row in cursor.fetchall()
+            ]
+            return candles[::-1]
+    
+    def get_gram_ticks_since(self, since, until=None) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        """since (dahil, saniye hassasiyetinde) ile until (hariç) arasındaki ham tick'leri
+        (timestamp, gram_altin, ons_try) getir
+
+        Saklanan UTC offset'inden bağımsız olarak epoch ile karşılaştırılır; since ile aynı
+        saniyedeki tick'ler yeniden döner, tekrarları çağıran ayıklar.
+        """
+        if isinstance(since, (int, float)):
+            since = datetime.fromtimestamp(since, timezone.UTC_TZ)
+        until = until or timezone.utc_now() + timedelta(days=1)
+
+        self.flush_writes()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT timestamp, gram_altin, ons_try
+                FROM price_data
+                WHERE {PRICE_TIME_RANGE_SQL}
+                AND (gram_altin IS NOT NULL OR ons_try IS NOT NULL)
+                ORDER BY julianday(timestamp) ASC
+            """, price_time_range(since, until))
+            return [tuple(row) for row in cursor.fetchall()]
+    
+    def iter_price_ticks(self, start_time, end_time, chunk_size: int = 5000):
+        """Zaman aralığındaki tick'leri parça parça akıt (backtest için)
+
+        Ham tick'leri sıkıştırılmış (storage/retention.py) aralık için
+        price_rollups'tan üretilen sentetik tick'ler verilir.
+
+        Yields:
+            (epoch, ons_usd, usd_try, ons_try, gram_altin) tuple'ları, eski->yeni
+        """
+        start_time = timezone.to_utc(start_time)
+        end_time = timezone.to_utc(end_time)
+        self.flush_writes()
+
+        with self.get_connection() as conn:
+            oldest_raw = conn.execute("SELECT MIN(timestamp) FROM price_data").fetchone()[0]
+        oldest_raw = timezone.to_utc(timezone.parse_timestamp(oldest_raw)) if oldest_raw else None
+        if oldest_raw is None or oldest_raw > start_time:
+            rollup_end = end_time if oldest_raw is None else min(end_time, oldest_raw)
+            yield from self.iter_rollup_ticks(start_time, rollup_end, chunk_size)
+
+        with self.get_connection() as conn:
+            cursor = conn.execute(f"""
+                SELECT {PRICE_EPOCH_SQL} as epoch,
+                       ons_usd, usd_try, ons_try, gram_altin
+                FROM price_data
+                WHERE {PRICE_TIME_RANGE_SQL}
+                ORDER BY timestamp ASC
+            """, price_time_range(start_time, end_time))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(row)
+
+    def iter_rollup_ticks(self, start_time, end_time, chunk_size: int = 5000):
+        """price_rollups'tan sentetik tick akışı (iter_price_ticks ile aynı tuple düzeni)
+
+        Her rollup kovası için open -> low/high -> close sırasıyla dört tick üretilir;
+        böylece kovadan büyük mumların OHLC'si aynen korunur. 1 dakikalık rollup'ların
+        bulunduğu aralıkta onlar, daha eskisinde 15 dakikalık rollup'lar kullanılır.
+        """
+        start = timezone.to_utc(start_time)
+        end = timezone.to_utc(end_time)
+
+        with self.get_connection() as conn:
+            first_minute = conn.execute(
+                "SELECT MIN(timestamp) FROM price_rollups WHERE interval = '1m'"
+            ).fetchone()[0]
+            # 1m rollup'lar 15 dakikalık sınırlarda budanır, sınır kovası tamamen 1m'dir
+            boundary = end
+            if first_minute:
+                epoch = int(timezone.parse_timestamp(first_minute).timestamp()) // 900 * 900
+                boundary = min(end, datetime.fromtimestamp(epoch, timezone.UTC_TZ))
+
+            segments = ((("15m", 225), start, boundary), (("1m", 15), max(start, boundary), end))
+            start_epoch = int(start.timestamp())
+            for (interval, step), seg_start, seg_end in segments:
+                if seg_start >= seg_end:
+                    continue
+                # Başlangıcı içeren (daha önce açılmış) kova da dahil; tick'leri start'a kırpılır
+                seg_start -= timedelta(seconds=4 * step - 1)
+                cursor = conn.execute("""
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) as epoch,
+                           open, high, low, close, ons_usd_close, usd_try_close, ons_try_close
+                    FROM price_rollups
+                    WHERE interval = ? AND timestamp >= ? AND timestamp < ?
+                    ORDER BY timestamp ASC
+                """, (interval, str(seg_start), str(seg_end)))
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for epoch, open_, high, low, close, ons_usd, usd_try, ons_try in rows:
+                        middle = (low, high) if close >= open_ else (high, low)
+                        for i, price in enumerate((open_, *middle, close)):
+                            yield (max(epoch + i * step, start_epoch), ons_usd, usd_try, ons_try, price)
+
+    def save_backtest_results(self, sweep_id: str, results: List[Dict[str, Any]]):
+        """Parametre taraması sonuçlarını toplu kaydet"""
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO backtest_results (
+                    sweep_id, config_name, parameters, start_time, end_time,
+                    total_trades, win_rate, total_profit_loss, total_profit_loss_pct,
+                    profit_factor, max_drawdown, elapsed_seconds
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    sweep_id, r["config_name"], json.dumps(r["parameters"], sort_keys=True),
+                    r.get("start_time"), r.get("end_time"),
+                    r["total_trades"], r["win_rate"], r["total_profit_loss"], r["total_profit_loss_pct"],
+                    r["profit_factor"], r["max_drawdown"], r.get("elapsed_seconds")
+                )
+                for r in results
+            ])
+    
+    def get_backtest_results(self, sweep_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Taramanın en kârlı sonuçları"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT config_name, parameters, total_trades, win_rate, total_profit_loss,
+                       total_profit_loss_pct, profit_factor, max_drawdown, elapsed_seconds
+                FROM backtest_results
+                WHERE sweep_id = ?
+                ORDER BY total_profit_loss_pct DESC
+                LIMIT ?
+            """, (sweep_id, limit))
+            return [
+                {
+                    "config_name": row[0],
+                    "parameters": json.loads(row[1]),
+                    "total_trades": row[2],
+                    "win_rate": row[3],
+                    "total_profit_loss": row[4],
+                    "total_profit_loss_pct": row[5],
+                    "profit_factor": row[6],
+                    "max_drawdown": row[7],
+                    "elapsed_seconds": row[8]
+                }
+                for row in cursor.fetchall()
+            ]
+    
+    def save_perf_snapshot(self, name: str, payload: Dict[str, Any]):
+        """Performans metriği anlık görüntüsünü kaydet (isim başına tek satır)"""
+        self.queue_write(
+            "INSERT OR REPLACE INTO perf_snapshots (name, payload, updated_at) VALUES (?, ?, ?)",
+            (name, json.dumps(payload), timezone.utc_now().isoformat())
+        )
+    
+    def get_perf_snapshot(self, name: str) -> Optional[Dict[str, Any]]:
+        """Son performans anlık görüntüsü: {"payload": ..., "updated_at": ...}"""
+        self.flush_writes()
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT payload, updated_at FROM perf_snapshots WHERE name = ?", (name,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"payload": json.loads(row[0]), "updated_at": row[1]}
+    
     def cleanup_old_data(self, days_to_keep: int = 30):
         """Eski verileri temizle"""
         cutoff_date = timezone.now() - timedelta(days=days_to_keep)
@@ -604,46 +1093,92 @@ class SQLiteStorage:
     
     def save_hybrid_analysis(self, analysis: Dict[str, Any]):
         """Hibrit analiz sonucunu kaydet"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO hybrid_analysis (
-                    timestamp, timeframe, gram_price, signal, signal_strength,
-                    confidence, position_size, stop_loss, take_profit,
-                    risk_reward_ratio, global_trend, global_trend_strength,
-                    currency_risk_level, position_multiplier, recommendations,
-                    analysis_summary, gram_analysis, global_analysis, currency_analysis,
-                    advanced_indicators, pattern_analysis
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                analysis["timestamp"].isoformat() if hasattr(analysis["timestamp"], 'isoformat') else analysis["timestamp"],
-                analysis.get("timeframe", "15m"),
-                float(analysis.get("gram_price", 0)) if analysis.get("gram_price") else 0,
-                analysis["signal"],
-                analysis["signal_strength"],
-                analysis["confidence"],
-                float(analysis.get("position_size", 0)) if isinstance(analysis.get("position_size"), (int, float)) else analysis.get("position_details", {}).get("lots", 0),
-                float(analysis["stop_loss"]) if analysis.get("stop_loss") else None,
-                float(analysis["take_profit"]) if analysis.get("take_profit") else None,
-                analysis.get("risk_reward_ratio"),
-                analysis["global_trend"].get("trend_direction"),
-                analysis["global_trend"].get("trend_strength"),
-                analysis["currency_risk"].get("risk_level"),
-                analysis["currency_risk"].get("position_size_multiplier"),
-                json.dumps(analysis["recommendations"]),
-                analysis["summary"],
-                json.dumps(analysis["gram_analysis"], default=self._json_serializer),
-                json.dumps(analysis["global_trend"], default=self._json_serializer),
-                json.dumps(analysis["currency_risk"], default=self._json_serializer),
-                json.dumps(analysis.get("advanced_indicators", {}), default=self._json_serializer),
-                json.dumps(analysis.get("pattern_analysis", {}), default=self._json_serializer)
-            ))
-            
-            logger.info(f"Hybrid analysis saved: {analysis['signal']} - {analysis['signal_strength']} - Confidence: {analysis['confidence']:.2%}")
+        self.queue_write(INSERT_HYBRID_ANALYSIS_SQL, self._hybrid_analysis_row(analysis))
+        logger.info(f"Hybrid analysis saved: {analysis['signal']} - {analysis['signal_strength']} - Confidence: {analysis['confidence']:.2%}")
+    
+    def _hybrid_analysis_row(self, analysis: Dict[str, Any]) -> tuple:
+        return (
+            analysis["timestamp"].isoformat() if hasattr(analysis["timestamp"], 'isoformat') else analysis["timestamp"],
+            analysis.get("timeframe", "15m"),
+            float(analysis.get("gram_price", 0)) if analysis.get("gram_price") else 0,
+            analysis["signal"],
+            analysis["signal_strength"],
+            analysis["confidence"],
+            float(analysis.get("position_size", 0)) if isinstance(analysis.get("position_size"), (int, float)) else analysis.get("position_details", {}).get("lots", 0),
+            float(analysis["stop_loss"]) if analysis.get("stop_loss") else None,
+            float(analysis["take_profit"]) if analysis.get("take_profit") else None,
+            analysis.get("risk_reward_ratio"),
+            analysis["global_trend"].get("trend_direction"),
+            analysis["global_trend"].get("trend_strength"),
+            analysis["currency_risk"].get("risk_level"),
+            analysis["currency_risk"].get("position_size_multiplier"),
+            json.dumps(analysis["recommendations"]),
+            analysis["summary"]
+        ) + self._hybrid_blob_values(analysis) + self._hybrid_hot_values(analysis)
+    
+    def _hybrid_blob_values(self, analysis: Dict[str, Any]) -> tuple:
+        """Detay JSON blob'ları - store_analysis_blobs kapalıysa NULL yazılır"""
+        if not self.store_analysis_blobs:
+            return (None,) * 5
+        return (
+            json.dumps(analysis["gram_analysis"], default=self._json_serializer),
+            json.dumps(analysis["global_trend"], default=self._json_serializer),
+            json.dumps(analysis["currency_risk"], default=self._json_serializer),
+            json.dumps(analysis.get("advanced_indicators", {}), default=self._json_serializer),
+            json.dumps(analysis.get("pattern_analysis", {}), default=self._json_serializer)
+        )
+    
+    @staticmethod
+    def _hybrid_hot_values(analysis: Dict[str, Any]) -> tuple:
+        """Analiz dict'inden HYBRID_HOT_COLUMNS sırasıyla tipli değerler"""
+        def number(value) -> Optional[float]:
+            if isinstance(value, bool) or value is None:
+                return None
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        
+        indicators = (analysis.get("gram_analysis") or {}).get("indicators") or {}
+        macd = indicators.get("macd") or {}
+        bollinger = indicators.get("bollinger") or {}
+        atr = indicators.get("atr")
+        if isinstance(atr, dict):
+            atr = atr.get("atr", atr.get("value"))
+        
+        regime = analysis.get("market_regime_analysis") or {}
+        market_regime = (
+            (regime.get("overall_assessment") or {}).get("market_phase")
+            or (regime.get("trend_regime") or {}).get("type")
+            or regime.get("regime")
+        )
+        dominant = (analysis.get("divergence_analysis") or {}).get("dominant_divergence") or {}
+        
+        # Öncelik gelişmiş pattern analizinde, yoksa gram analizinin en güvenilir mum formasyonu
+        pattern_analysis = analysis.get("pattern_analysis") or {}
+        best = pattern_analysis.get("best_pattern") if pattern_analysis.get("pattern_found") else None
+        if best:
+            pattern = {"name": best.get("pattern"), "type": best.get("type"), "confidence": best.get("confidence")}
+        else:
+            candidates = (analysis.get("gram_analysis") or {}).get("patterns") or []
+            pattern = max(candidates, key=lambda p: number(p.get("confidence")) or 0, default={})
+        
+        return (
+            number(indicators.get("rsi")),
+            number(macd.get("histogram")),
+            number(atr),
+            number(bollinger.get("percent_b")),
+            str(market_regime) if market_regime else None,
+            str(dominant["type"]) if dominant.get("type") else None,
+            number(dominant.get("strength")) if dominant.get("type") else None,
+            pattern.get("name"),
+            pattern.get("type"),
+            number(pattern.get("confidence"))
+        )
     
     def get_latest_hybrid_analysis(self, timeframe: str = None) -> Optional[Dict[str, Any]]:
         """En son hibrit analiz sonucunu getir"""
+        self.flush_writes()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -666,10 +1201,34 @@ class SQLiteStorage:
                 return self._row_to_hybrid_analysis(row)
             return None
     
+    def get_latest_hybrid_signal(self, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Simülasyon sinyali için son analizin tipli kolonları (JSON blob okunmaz)"""
+        self.flush_writes()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {", ".join(HYBRID_SIGNAL_COLUMNS)} FROM hybrid_analysis
+                WHERE timeframe = ?
+                ORDER BY timestamp DESC
+                LIMIT 1
+            """, (timeframe,))
+            
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            signal = dict(row)
+            signal["timestamp"] = timezone.parse_timestamp(row["timestamp"])
+            signal["gram_price"] = Decimal(str(row["gram_price"]))
+            signal["stop_loss"] = Decimal(str(row["stop_loss"])) if row["stop_loss"] else None
+            signal["take_profit"] = Decimal(str(row["take_profit"])) if row["take_profit"] else None
+            return signal
+    
     def get_hybrid_analysis_history(self, limit: int = 10, offset: int = 0, timeframe: str = None, 
                                   start_date: datetime = None, end_date: datetime = None, 
                                   signal_type: str = None) -> List[Dict[str, Any]]:
         """Son hibrit analiz sonuçlarını getir - gelişmiş filtreleme ile"""
+        self.flush_writes()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -741,28 +1300,89 @@ class SQLiteStorage:
             cursor.execute(query, params)
             return cursor.fetchone()[0]
     
+    def get_hybrid_analysis_page(self, limit: int = 20, before: Optional[Tuple[str, int]] = None,
+                                 offset: int = 0, timeframe: str = None, start_date: datetime = None,
+                                 end_date: datetime = None, signal_type: str = None,
+                                 include_details: bool = True) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """
+        Hibrit analiz geçmişini (timestamp, id) anahtarıyla sayfalı getir
+
+        before verilirse OFFSET yerine index üzerinde doğrudan o noktadan
+        devam edilir; derin sayfalar ilk sayfa kadar ucuzdur. Yalnızca liste
+        için gereken kolonlar okunur, JSON detaylarından da sadece kullanılan
+        alanlar json_extract ile çekilir (blob'lar Python'da parse edilmez).
+
+        Args:
+            limit: Sayfa boyutu
+            before: Önceki sayfanın next_cursor değeri - (ham timestamp, id)
+            offset: before yoksa eski sayfa numarası uyumluluğu için OFFSET
+            include_details: False ise JSON detay alanları hiç okunmaz
+
+        Returns:
+            (analizler, sonraki sayfa imleci - son sayfadaysa None)
+        """
+        self.flush_writes()
+        columns = list(HYBRID_HISTORY_COLUMNS)
+        if include_details:
+            columns += [
+                f"json_extract({column}, '{path}') AS {alias}"
+                for column, fields in HYBRID_DETAIL_FIELDS.values()
+                for alias, path in fields
+            ]
+
+        query = f"SELECT {', '.join(columns)} FROM hybrid_analysis WHERE 1=1"
+        params: List[Any] = []
+
+        if timeframe:
+            query += " AND timeframe = ?"
+            params.append(timeframe)
+        if start_date:
+            query += " AND timestamp >= ?"
+            params.append(start_date.isoformat())
+        if end_date:
+            query += " AND timestamp <= ?"
+            params.append(end_date.isoformat())
+        if signal_type:
+            query += " AND signal = ?"
+            params.append(signal_type)
+        if before:
+            # Row-value karşılaştırması yerine açık yazım: timestamp index'inde aralık taraması kalır
+            query += " AND timestamp <= ? AND (timestamp < ? OR id < ?)"
+            params.extend([before[0], before[0], before[1]])
+
+        # Bir fazla satır, sonraki sayfa olup olmadığını gösterir
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        if offset and not before:
+            query += " OFFSET ?"
+            params.append(offset)
+
+        with self.get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        analyses = [self._row_to_hybrid_summary(row, include_details) for row in rows]
+        next_cursor = (rows[-1]["timestamp"], rows[-1]["id"]) if has_more and rows else None
+        return analyses, next_cursor
+
     def save_trading_signal(self, signal: Dict[str, Any]):
         """Trading sinyalini veritabanına kaydet"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO trading_signals (
-                    timestamp, signal_type, price_level, confidence,
-                    risk_level, target_price, stop_loss, reasons
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal["timestamp"].isoformat() if hasattr(signal["timestamp"], 'isoformat') else signal["timestamp"],
-                signal["signal_type"],
-                float(signal["price_level"]),
-                float(signal["confidence"]),
-                signal["risk_level"],
-                float(signal["target_price"]) if signal.get("target_price") else None,
-                float(signal["stop_loss"]) if signal.get("stop_loss") else None,
-                signal.get("reasons", "{}")
-            ))
-            
-            logger.info(f"Trading signal saved: {signal['signal_type']} at {signal['price_level']:.2f} - Confidence: {signal['confidence']:.2%}")
+        self.queue_write(INSERT_TRADING_SIGNAL_SQL, self._trading_signal_row(signal))
+        logger.info(f"Trading signal saved: {signal['signal_type']} at {signal['price_level']:.2f} - Confidence: {signal['confidence']:.2%}")
+    
+    @staticmethod
+    def _trading_signal_row(signal: Dict[str, Any]) -> tuple:
+        return (
+            signal["timestamp"].isoformat() if hasattr(signal["timestamp"], 'isoformat') else signal["timestamp"],
+            signal["signal_type"],
+            float(signal["price_level"]),
+            float(signal["confidence"]),
+            signal["risk_level"],
+            float(signal["target_price"]) if signal.get("target_price") else None,
+            float(signal["stop_loss"]) if signal.get("stop_loss") else None,
+            signal.get("reasons", "{}")
+        )
     
     def _row_to_analysis_result(self, row) -> AnalysisResult:
         """Veritabanı satırını AnalysisResult nesnesine dönüştür"""
@@ -821,6 +1441,52 @@ class SQLiteStorage:
             analysis_details=json.loads(row['analysis_details']) if row['analysis_details'] else {}
         )
     
+    def _row_to_hybrid_summary(self, row, include_details: bool) -> Dict[str, Any]:
+        """Projeksiyonlu satırı _row_to_hybrid_analysis ile aynı yapıya dönüştür"""
+        details = {"gram": {}, "global": {}, "currency": {}}
+        if include_details:
+            for name, (_, fields) in HYBRID_DETAIL_FIELDS.items():
+                target = details[name]
+                for alias, path in fields:
+                    value = row[alias]
+                    if value is None:
+                        continue
+                    if alias in HYBRID_BOOLEAN_DETAILS:
+                        value = bool(value)
+                    # '$.a.b' -> {"a": {"b": value}}
+                    keys = path[2:].split(".")
+                    node = target
+                    for key in keys[:-1]:
+                        node = node.setdefault(key, {})
+                    node[keys[-1]] = value
+
+        return {
+            "id": row["id"],
+            "timestamp": timezone.parse_timestamp(row["timestamp"]),
+            "timeframe": row["timeframe"],
+            "gram_price": Decimal(str(row["gram_price"])),
+            "signal": row["signal"],
+            "signal_strength": row["signal_strength"],
+            "confidence": row["confidence"],
+            "position_size": {
+                "lots": row["position_size"],
+                "multiplier": row["position_multiplier"]
+            },
+            "stop_loss": Decimal(str(row["stop_loss"])) if row["stop_loss"] else None,
+            "take_profit": Decimal(str(row["take_profit"])) if row["take_profit"] else None,
+            "risk_reward_ratio": row["risk_reward_ratio"],
+            "global_trend": {
+                "direction": row["global_trend"],
+                "strength": row["global_trend_strength"]
+            },
+            "currency_risk": {
+                "level": row["currency_risk_level"]
+            },
+            "recommendations": json.loads(row["recommendations"]) if row["recommendations"] else [],
+            "summary": row["analysis_summary"],
+            "details": details
+        }
+
     def _row_to_hybrid_analysis(self, row) -> Dict[str, Any]:
         """Veritabanı satırını hibrit analiz dict'ine dönüştür"""
         return {
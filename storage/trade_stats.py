@@ -0,0 +1,214 @@
+"""
+Simülasyon işlem istatistikleri özet tablosu (sim_trade_stats)
+
+Her kapanan pozisyon, simülasyonun birkaç kovasına O(1) upsert ile eklenir:
+
+    all            ''                 simülasyonun tamamı
+    timeframe      '15m'              timeframe bazlı
+    exit_reason    'STOP_LOSS'        çıkış nedeni bazlı
+    day            '2025-03-01'       günlük (sim_daily_performance için)
+    day_timeframe  '2025-03-01|15m'   günlük + timeframe
+    hour           '2025-03-01 14'    saatlik (son 24 saat / hafta / ay pencereleri)
+
+Kovalarda işlem/kazanç/kayıp sayısı, PnL toplamı ve kareler toplamı (Sharpe),
+kazanç/kayıp toplamları, en iyi/kötü işlem ve kümülatif PnL'nin zirvesi /
+en büyük düşüşü tutulur. Okuyucular sim_positions'ı taramaz; maliyet işlem
+geçmişi büyüdükçe artmaz. Saat ve gün anahtarları Türkiye saatine göredir.
+"""
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from utils.timezone import parse_timestamp
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS sim_trade_stats (
+        simulation_id INTEGER NOT NULL,
+        bucket TEXT NOT NULL,
+        bucket_key TEXT NOT NULL,
+        trades INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        sum_pnl REAL NOT NULL DEFAULT 0.0,
+        sum_pnl_sq REAL NOT NULL DEFAULT 0.0,
+        sum_win REAL NOT NULL DEFAULT 0.0,
+        sum_loss REAL NOT NULL DEFAULT 0.0,  -- kayıpların mutlak toplamı
+        sum_pnl_pct REAL NOT NULL DEFAULT 0.0,
+        best_trade REAL,
+        worst_trade REAL,
+        peak_equity REAL NOT NULL DEFAULT 0.0,  -- kümülatif PnL zirvesi (0'dan başlar)
+        max_drawdown REAL NOT NULL DEFAULT 0.0,
+        updated_at DATETIME,
+        PRIMARY KEY (simulation_id, bucket, bucket_key)
+    )
+"""
+
+# sum_pnl kümülatif PnL'dir; zirve / düşüş eski değerler üzerinden güncellenir
+# (SQLite UPDATE SET ifadelerinde kolonlar güncelleme öncesi değeri verir)
+UPSERT_SQL = """
+    INSERT INTO sim_trade_stats (
+        simulation_id, bucket, bucket_key, trades, wins, losses,
+        sum_pnl, sum_pnl_sq, sum_win, sum_loss, sum_pnl_pct,
+        best_trade, worst_trade, peak_equity, max_drawdown, updated_at
+    ) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, MAX(?, 0.0), MAX(-?, 0.0), ?)
+    ON CONFLICT(simulation_id, bucket, bucket_key) DO UPDATE SET
+        trades = trades + 1,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        sum_pnl = sum_pnl + excluded.sum_pnl,
+        sum_pnl_sq = sum_pnl_sq + excluded.sum_pnl_sq,
+        sum_win = sum_win + excluded.sum_win,
+        sum_loss = sum_loss + excluded.sum_loss,
+        sum_pnl_pct = sum_pnl_pct + excluded.sum_pnl_pct,
+        best_trade = MAX(best_trade, excluded.best_trade),
+        worst_trade = MIN(worst_trade, excluded.worst_trade),
+        peak_equity = MAX(peak_equity, sum_pnl + excluded.sum_pnl),
+        max_drawdown = MAX(max_drawdown, MAX(peak_equity, sum_pnl + excluded.sum_pnl) - (sum_pnl + excluded.sum_pnl)),
+        updated_at = excluded.updated_at
+"""
+
+# Kova satırından okunan kolonlar (summarize() bu sırayı bekler)
+STAT_COLUMNS = (
+    "trades", "wins", "losses", "sum_pnl", "sum_pnl_sq", "sum_win", "sum_loss",
+    "sum_pnl_pct", "best_trade", "worst_trade", "peak_equity", "max_drawdown"
+)
+
+
+def hour_key(value: Union[str, datetime]) -> str:
+    return parse_timestamp(value).strftime("%Y-%m-%d %H")
+
+
+def day_key(value: Union[str, datetime]) -> str:
+    return parse_timestamp(value).strftime("%Y-%m-%d")
+
+
+def _bucket_params(simulation_id: int, timeframe: str, exit_reason: Optional[str],
+                   net_pnl: float, pnl_pct: float, exit_time, updated_at) -> Iterable[Tuple]:
+    net_pnl = float(net_pnl or 0.0)
+    pnl_pct = float(pnl_pct or 0.0)
+    win = net_pnl if net_pnl > 0 else 0.0
+    loss = -net_pnl if net_pnl < 0 else 0.0
+    day = day_key(exit_time)
+    values = (
+        1 if net_pnl > 0 else 0, 1 if net_pnl < 0 else 0,
+        net_pnl, net_pnl * net_pnl, win, loss, pnl_pct,
+        net_pnl, net_pnl, net_pnl, net_pnl, updated_at
+    )
+    for bucket, key in (
+        ("all", ""),
+        ("timeframe", timeframe),
+        ("exit_reason", exit_reason or "UNKNOWN"),
+        ("day", day),
+        ("day_timeframe", f"{day}|{timeframe}"),
+        ("hour", hour_key(exit_time)),
+    ):
+        yield (simulation_id, bucket, key) + values
+
+
+def record_closed_trade(cursor, simulation_id: int, timeframe: str, exit_reason: Optional[str],
+                        net_pnl: float, pnl_pct: float, exit_time):
+    """Kapanan pozisyonu tüm kovalara ekle (pozisyon güncellemesiyle aynı işlemde)"""
+    cursor.executemany(UPSERT_SQL, list(_bucket_params(
+        simulation_id, timeframe, exit_reason, net_pnl, pnl_pct, exit_time, datetime.now()
+    )))
+
+
+def rebuild_trade_stats(cursor, simulation_id: Optional[int] = None) -> int:
+    """Özet tabloyu sim_positions'tan baştan oluştur (ilk kurulum / sıfırlama)
+
+    Kümülatif zirve ve düşüş kapanış sırasına bağlı olduğundan pozisyonlar
+    exit_time sırasıyla eklenir.
+    """
+    where, params = "", ()
+    if simulation_id is not None:
+        where, params = " AND simulation_id = ?", (simulation_id,)
+    cursor.execute(f"DELETE FROM sim_trade_stats WHERE 1 = 1{where}", params)
+    cursor.execute(f"""
+        SELECT simulation_id, timeframe, exit_reason, net_profit_loss, profit_loss_pct, exit_time
+        FROM sim_positions
+        WHERE status = 'CLOSED' AND exit_time IS NOT NULL{where}
+        ORDER BY exit_time, id
+    """, params)
+    now = datetime.now()
+    rows = cursor.fetchall()
+    cursor.executemany(UPSERT_SQL, [
+        bucket for row in rows for bucket in _bucket_params(*row, updated_at=now)
+    ])
+    return len(rows)
+
+
+def summarize(row: Optional[Sequence[Any]]) -> Dict[str, float]:
+    """Kova satırı (STAT_COLUMNS sırası) -> türetilmiş metrikler"""
+    if row is None or not row[0]:
+        return {
+            "total_trades": 0, "winning_trades": 0, "losing_trades": 0,
+            "total_pnl": 0.0, "avg_win": None, "avg_loss": None, "avg_pnl_pct": None,
+            "best_trade": None, "worst_trade": None, "sharpe_ratio": 0.0,
+            "peak_equity": 0.0, "max_drawdown": 0.0
+        }
+    (trades, wins, losses, sum_pnl, sum_pnl_sq, sum_win, sum_loss,
+     sum_pnl_pct, best, worst, peak, drawdown) = row
+    wins, losses = wins or 0, losses or 0
+
+    # İşlem başına Sharpe: ortalama / örneklem standart sapması
+    sharpe = 0.0
+    if trades > 1:
+        variance = (sum_pnl_sq - sum_pnl * sum_pnl / trades) / (trades - 1)
+        if variance > 1e-12:
+            sharpe = (sum_pnl / trades) / math.sqrt(variance)
+
+    return {
+        "total_trades": trades,
+        "winning_trades": wins,
+        "losing_trades": losses,
+        "total_pnl": sum_pnl or 0.0,
+        "avg_win": sum_win / wins if wins else None,
+        "avg_loss": sum_loss / losses if losses else None,
+        "avg_pnl_pct": sum_pnl_pct / trades,
+        "best_trade": best,
+        "worst_trade": worst,
+        "sharpe_ratio": sharpe,
+        "peak_equity": peak if peak is not None else 0.0,
+        "max_drawdown": drawdown if drawdown is not None else 0.0
+    }
+
+
+_COLUMNS_SQL = ", ".join(STAT_COLUMNS)
+
+
+def get_bucket(cursor, simulation_id: int, bucket: str = "all", key: str = "") -> Dict[str, float]:
+    cursor.execute(
+        f"SELECT {_COLUMNS_SQL} FROM sim_trade_stats WHERE simulation_id = ? AND bucket = ? AND bucket_key = ?",
+        (simulation_id, bucket, key)
+    )
+    return summarize(cursor.fetchone())
+
+
+def get_buckets(cursor, simulation_id: int, bucket: str, key_prefix: str = "") -> Dict[str, Dict[str, float]]:
+    """Bir kova türünün tüm anahtarları ({anahtar: özet})"""
+    cursor.execute(
+        f"SELECT bucket_key, {_COLUMNS_SQL} FROM sim_trade_stats "
+        "WHERE simulation_id = ? AND bucket = ? AND bucket_key >= ? AND bucket_key < ? "
+        "ORDER BY bucket_key",
+        (simulation_id, bucket, key_prefix, key_prefix + "\uffff")
+    )
+    return {row[0]: summarize(row[1:]) for row in cursor.fetchall()}
+
+
+def window_totals(cursor, since: datetime, simulation_id: Optional[int] = None) -> Dict[str, float]:
+    """since saatinden itibaren (saat kovası hassasiyetinde) tüm işlemlerin toplamı
+
+    Zirve / düşüş kovalar arasında toplanamadığından pencerede 0 döner; diğer
+    alanlar (Sharpe dahil) toplamlardan hesaplanır.
+    """
+    where, params = "", (hour_key(since),)
+    if simulation_id is not None:
+        where, params = " AND simulation_id = ?", params + (simulation_id,)
+    cursor.execute(f"""
+        SELECT SUM(trades), SUM(wins), SUM(losses), SUM(sum_pnl), SUM(sum_pnl_sq),
+               SUM(sum_win), SUM(sum_loss), SUM(sum_pnl_pct), MAX(best_trade), MIN(worst_trade),
+               0.0, 0.0
+        FROM sim_trade_stats
+        WHERE bucket = 'hour' AND bucket_key >= ?{where}
+    """, params)
+    return summarize(cursor.fetchone())
@@ -6,6 +6,8 @@ import logging
 from datetime import datetime
 from decimal import Decimal
 
+from storage import trade_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,6 +17,11 @@ def update_all_simulation_stats(db_path: str = "gold_prices.db"):
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
+        # İşlem istatistikleri özetini pozisyonlardan yeniden oluştur
+        cursor.execute(trade_stats.CREATE_TABLE_SQL)
+        rebuilt = trade_stats.rebuild_trade_stats(cursor)
+        logger.info(f"sim_trade_stats {rebuilt} kapanmış pozisyondan yeniden oluşturuldu")
+        
         # Tüm simülasyonları al
         cursor.execute("SELECT id FROM simulations")
         sim_ids = [row[0] for row in cursor.fetchall()]
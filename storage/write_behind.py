@@ -0,0 +1,224 @@
+"""
+Write-behind yazma kuyruğu
+
+Fiyat tick'leri, hibrit analizler, trading sinyalleri ve simülasyon pozisyon
+güncellemeleri tek tek transaction açmak yerine bu kuyrukta biriktirilir ve
+boyut/süre eşiğinde tek transaction içinde executemany ile yazılır. Böylece
+fsync sayısı tick başına bir yerine flush penceresi başına bire iner.
+
+Sıra korunur: ardışık aynı SQL'ler tek executemany'de birleştirilir, farklı
+SQL'ler geliş sırasıyla çalıştırılır. Kuyruk max_pending'e ulaşırsa yazan
+thread flush'ı kendisi yapar (backpressure). close() bekleyen her şeyi yazar.
+
+Yalnızca kilit/meşgul hataları sınırlı sayıda yeniden denenir; şema hatası
+gibi kalıcı hatalarda satırlar tek tek yazılır ve yazılamayan satır atlanır.
+"""
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PendingWrite = Tuple[str, Sequence[Any]]
+
+# Yeniden denemeye değer geçici SQLite hataları
+TRANSIENT_ERROR_MARKERS = ("database is locked", "database table is locked", "busy")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Kilit/meşgul kaynaklı, yeniden denenebilir hata mı?"""
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+class WriteBehindQueue:
+    """SQLite yazmalarını toplu transaction'lara birleştiren kuyruk"""
+
+    def __init__(self, storage, max_batch: int = 200, flush_interval: float = 1.0,
+                 max_pending: int = 5000, max_retries: int = 5):
+        """
+        Args:
+            storage: SQLiteStorage instance (get_connection kullanılır)
+            max_batch: Bu kadar yazma birikince flush tetiklenir
+            flush_interval: En fazla bu kadar saniyede bir flush yapılır
+            max_pending: Bu sınırda yazan taraf flush'ı kendisi yapar
+            max_retries: Kilit hatasında batch en fazla bu kadar yeniden denenir
+        """
+        self.storage = storage
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+
+        self._pending: List[PendingWrite] = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._retries = 0
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrikler
+        self._enqueued = 0
+        self._written = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._backpressure_flushes = 0
+        self._dropped = 0
+        self._retried_flushes = 0
+        self._last_flush_ms = 0.0
+        self._max_pending_seen = 0
+
+    def start(self):
+        """Arka plan flush thread'ini başlat"""
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="sqlite-write-behind", daemon=True)
+            self._thread.start()
+
+    def put(self, sql: str, params: Sequence[Any]):
+        """Yazmayı kuyruğa ekle"""
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._pending.append((sql, params))
+                self._enqueued += 1
+                pending = len(self._pending)
+                self._max_pending_seen = max(self._max_pending_seen, pending)
+                if pending >= self.max_batch:
+                    self._cond.notify()
+
+        if closed:
+            # Kapanıştan sonra gelen yazmalar kaybolmasın
+            self._write([(sql, params)])
+            return
+
+        if pending >= self.max_pending:
+            self._backpressure_flushes += 1
+            self.flush()
+
+    def flush(self) -> int:
+        """Bekleyen tüm yazmaları tek transaction'da yaz, yazılan satır sayısını döndür"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                self._write(batch)
+                written = len(batch)
+            except sqlite3.OperationalError as e:
+                self._failed_flushes += 1
+                if is_transient_error(e) and self._retries < self.max_retries:
+                    # Kilit / meşgul: bir sonraki flush'ta sırayla yeniden dene
+                    self._retries += 1
+                    self._retried_flushes += 1
+                    logger.warning(f"Write-behind flush error ({len(batch)} writes), "
+                                   f"retry {self._retries}/{self.max_retries}: {e}")
+                    with self._cond:
+                        self._pending[:0] = batch
+                    return 0
+                # Kalıcı hata ya da deneme sınırı: tek tek yaz, yazılamayanı atla
+                logger.error(f"Write-behind flush error, falling back to single writes: {e}")
+                written = self._write_individually(batch)
+            except Exception as e:
+                # Hatalı satır tüm batch'i düşürmesin: tek tek yaz, yazılamayanı atla
+                self._failed_flushes += 1
+                logger.error(f"Write-behind batch error, falling back to single writes: {e}")
+                written = self._write_individually(batch)
+
+            self._retries = 0
+            self._flushes += 1
+            self._written += written
+            self._last_flush_ms = (time.perf_counter() - start) * 1000
+            return written
+
+    def close(self, timeout: float = 10.0):
+        """Thread'i durdur ve bekleyen her şeyi diske yaz (durable shutdown)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kuyruk metrikleri"""
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "dropped": self._dropped,
+            "retried_flushes": self._retried_flushes,
+            "backpressure_flushes": self._backpressure_flushes,
+            "avg_batch_size": round(self._written / self._flushes, 2) if self._flushes else 0.0,
+            "last_flush_ms": round(self._last_flush_ms, 3),
+            "max_pending_seen": self._max_pending_seen,
+            "max_batch": self.max_batch,
+            "flush_interval": self.flush_interval
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _write(self, batch: List[PendingWrite]):
+        """Ardışık aynı SQL'leri executemany ile, hepsini tek transaction'da yaz"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+            run_sql, run_params = batch[0][0], []
+            for sql, params in batch:
+                if sql != run_sql:
+                    cursor.executemany(run_sql, run_params)
+                    run_sql, run_params = sql, []
+                run_params.append(params)
+            cursor.executemany(run_sql, run_params)
+
+    def _write_individually(self, batch: List[PendingWrite]) -> int:
+        written = 0
+        for item in batch:
+            try:
+                self._write([item])
+                written += 1
+            except Exception as e:
+                self._dropped += 1
+                logger.error(f"Write-behind dropped write: {e}")
+        return written
+
+
+_queues: Dict[str, WriteBehindQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(storage, **kwargs) -> WriteBehindQueue:
+    """Aynı veritabanı için süreç içinde paylaşılan, çalışan kuyruğu döndür"""
+    with _queues_lock:
+        queue = _queues.get(storage.db_path)
+        if queue is None:
+            queue = WriteBehindQueue(storage, **kwargs)
+            queue.start()
+            # Normal çıkışta bekleyen yazmalar kaybolmasın
+            atexit.register(queue.close)
+            _queues[storage.db_path] = queue
+        return queue
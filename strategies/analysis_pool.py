@@ -0,0 +1,209 @@
+"""
+HybridStrategy analizleri için süreç havuzu
+
+HybridStrategy.analyze tamamen CPU'da çalışır; event loop üzerinde
+gather() ile çağrıldığında timeframe'ler sırayla işlenir ve loop bu sürede
+tick / websocket işleyemez. AnalysisProcessPool her worker'da bir kez
+oluşturulan strateji ile analizi ayrı süreçlerde yapar:
+
+    pool = AnalysisProcessPool()
+    pool.start()
+    result = await pool.analyze(candles, market_data, "15m")
+
+Mumlar ve piyasa verisi float64 diziler olarak gönderilir, sonuç düz dict
+olarak döner. Havuz çökerse yeniden kurulur ve o çağrı yedek strateji ile
+thread'de çalışır.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models.market_data import GramAltinCandle
+from models.price_data import PriceData
+from utils import timezone
+from utils.constants import ANALYSIS_INTERVALS
+from utils.stage_profiler import get_stage_profiler
+
+logger = logging.getLogger(__name__)
+
+# Worker sürecindeki strateji (_init_worker ile bir kez oluşturulur)
+_worker_strategy = None
+
+
+def _init_worker():
+    global _worker_strategy
+    from strategies.hybrid_strategy import HybridStrategy
+    _worker_strategy = HybridStrategy()
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def encode_candles(candles: Sequence) -> np.ndarray:
+    """Mumları (n, 5) [epoch, open, high, low, close] dizisine çevir"""
+    return np.array(
+        [(c.timestamp.timestamp(), float(c.open), float(c.high), float(c.low), float(c.close)) for c in candles],
+        dtype=np.float64
+    ).reshape(-1, 5)
+
+
+def encode_market_data(market_data: Sequence[PriceData]) -> np.ndarray:
+    """Fiyatları (n, 5) [epoch, ons_usd, usd_try, ons_try, gram_altin|NaN] dizisine çevir"""
+    return np.array(
+        [
+            (p.timestamp.timestamp(), float(p.ons_usd), float(p.usd_try), float(p.ons_try),
+             float(p.gram_altin) if p.gram_altin is not None else np.nan)
+            for p in market_data
+        ],
+        dtype=np.float64
+    ).reshape(-1, 5)
+
+
+def decode_candles(data: np.ndarray, interval: str) -> List[GramAltinCandle]:
+    return [
+        GramAltinCandle(
+            timestamp=timezone.to_turkey_time(datetime.fromtimestamp(epoch, timezone.UTC_TZ)),
+            open=Decimal(str(o)), high=Decimal(str(h)), low=Decimal(str(l)), close=Decimal(str(c)),
+            interval=interval
+        )
+        for epoch, o, h, l, c in data.tolist()
+    ]
+
+
+def decode_market_data(data: np.ndarray) -> List[PriceData]:
+    return [
+        PriceData(
+            timestamp=datetime.fromtimestamp(epoch, timezone.UTC_TZ),
+            ons_usd=Decimal(str(ons_usd)),
+            usd_try=Decimal(str(usd_try)),
+            ons_try=Decimal(str(ons_try)),
+            gram_altin=None if gram != gram else Decimal(str(gram))
+        )
+        for epoch, ons_usd, usd_try, ons_try, gram in data.tolist()
+    ]
+
+
+def _analyze_in_worker(candle_data: np.ndarray, interval: str, market_array: np.ndarray,
+                       timeframe: str) -> Dict[str, Any]:
+    """Worker içinde analiz (strateji süreç başına bir kez kurulur)"""
+    if _worker_strategy is None:
+        _init_worker()
+    return _worker_strategy.analyze(decode_candles(candle_data, interval), decode_market_data(market_array), timeframe)
+
+
+class AnalysisProcessPool:
+    """HybridStrategy.analyze çağrılarını süreç havuzunda çalıştırır"""
+
+    def __init__(self, max_workers: Optional[int] = None, fallback_strategy=None):
+        """
+        Args:
+            max_workers: Worker sayısı (varsayılan: timeframe sayısı, CPU sayısıyla sınırlı)
+            fallback_strategy: Havuz kullanılamazsa thread'de çalışacak strateji
+        """
+        self.max_workers = max_workers or max(1, min(len(ANALYSIS_INTERVALS), os.cpu_count() or 1))
+        self.fallback_strategy = fallback_strategy
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Metrikler
+        self._calls = 0
+        self._fallbacks = 0
+        self._restarts = 0
+        self._in_flight = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def start(self):
+        """Worker'ları başlat ve stratejilerini önceden oluştur"""
+        executor = self._get_executor()
+        try:
+            wait([executor.submit(_warm_up) for _ in range(self.max_workers)], timeout=120)
+            logger.info(f"Analysis process pool ready ({self.max_workers} workers)")
+        except Exception as e:
+            logger.error(f"Analysis pool warm-up error: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Ana süreçte thread'ler (write-behind, sqlite-io) çalıştığı için fork yerine spawn
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self._restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def analyze(self, candles: Sequence, market_data: Sequence[PriceData], timeframe: str) -> Dict[str, Any]:
+        """Analizi bir worker'da çalıştır, sonucu await et"""
+        candle_data = encode_candles(candles)
+        interval = candles[-1].interval if candles else timeframe
+        market_array = encode_market_data(market_data)
+        loop = asyncio.get_running_loop()
+
+        started = time.perf_counter()
+        self._in_flight += 1
+        try:
+            executor = self._get_executor()
+            try:
+                result = await loop.run_in_executor(
+                    executor, _analyze_in_worker, candle_data, interval, market_array, timeframe
+                )
+                # Worker'da ölçülen aşama süreleri bu sürecin profil kaydına eklenir
+                timings = result.pop("stage_timings", None)
+                if timings:
+                    get_stage_profiler().merge_run(timeframe, timings)
+                return result
+            except BrokenProcessPool as e:
+                logger.error(f"Analysis pool broken, restarting: {e}")
+                self._restart(executor)
+                if self.fallback_strategy is None:
+                    raise
+                self._fallbacks += 1
+                result = await asyncio.to_thread(
+                    self.fallback_strategy.analyze,
+                    decode_candles(candle_data, interval), decode_market_data(market_array), timeframe
+                )
+                # Yedek strateji bu süreçte çalıştı, ölçümler zaten kaydedildi
+                result.pop("stage_timings", None)
+                return result
+        finally:
+            self._in_flight -= 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._calls += 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "calls": self._calls,
+            "in_flight": self._in_flight,
+            "fallbacks": self._fallbacks,
+            "restarts": self._restarts,
+            "avg_ms": round(self._total_ms / self._calls, 3) if self._calls else 0.0,
+            "max_ms": round(self._max_ms, 3)
+        }
@@ -6,6 +6,9 @@ import logging
 import numpy as np
 from collections import deque
 
+from indicators.kernels import candle_column
+from indicators.swing_points import swing_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,34 +96,22 @@ class StructureManager:
     
     def _find_swing_points(self, candles: List) -> List[Dict]:
         """Swing high ve low noktalarını bul"""
-        swing_points = []
+        # İki yanındaki ikişer mumdan kesin büyük high / küçük low (aynı mumda high öncelikli)
+        n = len(candles)
+        highs = swing_index(candle_column(candles, 'high')).highs(2)
+        lows = swing_index(candle_column(candles, 'low')).lows(2)
+        highs = highs[(highs >= 2) & (highs < n - 2)]
+        lows = lows[(lows >= 2) & (lows < n - 2)]
+        lows = lows[~np.isin(lows, highs)]
         
-        for i in range(2, len(candles) - 2):
-            # Swing High kontrolü
-            if (candles[i].high > candles[i-1].high and 
-                candles[i].high > candles[i-2].high and
-                candles[i].high > candles[i+1].high and 
-                candles[i].high > candles[i+2].high):
-                
-                swing_points.append({
-                    'type': 'HIGH',
-                    'price': float(candles[i].high),
-                    'index': i,
-                    'candle': candles[i]
-                })
-            
-            # Swing Low kontrolü
-            elif (candles[i].low < candles[i-1].low and 
-                  candles[i].low < candles[i-2].low and
-                  candles[i].low < candles[i+1].low and 
-                  candles[i].low < candles[i+2].low):
-                
-                swing_points.append({
-                    'type': 'LOW',
-                    'price': float(candles[i].low),
-                    'index': i,
-                    'candle': candles[i]
-                })
+        swing_points = []
+        for i, swing_type in sorted([(i, 'HIGH') for i in highs.tolist()] + [(i, 'LOW') for i in lows.tolist()]):
+            swing_points.append({
+                'type': swing_type,
+                'price': float(candles[i].high if swing_type == 'HIGH' else candles[i].low),
+                'index': i,
+                'candle': candles[i]
+            })
         
         # Minimum swing gücü filtresi
         filtered_swings = []
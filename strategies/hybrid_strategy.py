@@ -8,6 +8,7 @@ from collections import defaultdict
 from utils import timezone
 
 from models.market_data import MarketData, GramAltinCandle
+from models.candle_frame import CandleFrame, OHLCV_COLUMNS
 from analyzers.gram_altin_analyzer import GramAltinAnalyzer
 from analyzers.global_trend_analyzer import GlobalTrendAnalyzer
 from analyzers.currency_risk_analyzer import CurrencyRiskAnalyzer
@@ -26,6 +27,8 @@ from utils.constants import (
     GLOBAL_TREND_MISMATCH_PENALTY
 )
 from strategies.constants import TRANSACTION_COST_PERCENTAGE
+from utils.stage_profiler import get_stage_profiler
+from storage.analysis_cache import get_analysis_cache
 
 # Yeni modüller
 from indicators.fibonacci_retracement import FibonacciRetracement, calculate_fibonacci_analysis
@@ -47,7 +50,12 @@ logger = logging.getLogger(__name__)
 class HybridStrategy:
     """Tüm analizleri birleştiren hibrit strateji - Orchestrator"""
     
-    def __init__(self, storage=None):
+    def __init__(self, storage=None, analysis_cache=None):
+        """
+        Args:
+            storage: Veritabanı (opsiyonel)
+            analysis_cache: Analiz sonuç önbelleği (varsayılan: süreç geneli paylaşılan önbellek)
+        """
         # Ana analizörler
         self.gram_analyzer = GramAltinAnalyzer()
         self.global_analyzer = GlobalTrendAnalyzer()
@@ -80,6 +88,12 @@ class HybridStrategy:
         # Storage referansı
         self.storage = storage
         
+        # Aşama süreleri (STAGE_PROFILING kapalıyken maliyetsiz)
+        self.profiler = get_stage_profiler()
+        
+        # Aynı mumlarla yapılan analizler web süreciyle paylaşılır
+        self.analysis_cache = analysis_cache if analysis_cache is not None else get_analysis_cache()
+        
         # Cache için değişkenler
         self._last_fibonacci_analysis = None
         self._last_smc_analysis = None
@@ -98,10 +112,23 @@ class HybridStrategy:
         Returns:
             Birleşik analiz sonuçları ve sinyal
         """
+        with self.profiler.run(timeframe):
+            result = self._analyze(gram_candles, market_data, timeframe)
+        if self.profiler.enabled:
+            # Süreç havuzundaki worker'ın ölçümleri sonuçla ana sürece taşınır
+            result["stage_timings"] = self.profiler.last_run()
+        return result
+    
+    def _analyze(self, gram_candles: List[GramAltinCandle], 
+                 market_data: List[MarketData], timeframe: str) -> Dict[str, Any]:
+        stage = self.profiler.stage
         try:
             # 1. Gram altın analizi (ana sinyal)
             logger.info(f"Gram analizi başlıyor. Mum sayısı: {len(gram_candles)}")
-            gram_analysis = self.gram_analyzer.analyze(gram_candles)
+            # Mumlar tek sefer kolon bazlı diziye çevrilir, tüm alt analizler paylaşır
+            with stage("gram_analysis"):
+                frame = CandleFrame.from_candles(gram_candles)
+                gram_analysis = self.gram_analyzer.analyze(gram_candles, frame=frame)
             self._last_gram_analysis = gram_analysis  # RSI için sakla
             logger.info(f"Gram analizi tamamlandı. Fiyat: {gram_analysis.get('price')}")
             
@@ -115,27 +142,36 @@ class HybridStrategy:
                     return self._empty_result()
             
             # 2. Global trend analizi
-            global_analysis = self.global_analyzer.analyze(market_data)
+            with stage("global_trend"):
+                global_analysis = self.global_analyzer.analyze(market_data)
             
             # 3. Kur riski analizi
-            currency_analysis = self.currency_analyzer.analyze(market_data)
+            with stage("currency_risk"):
+                currency_analysis = self.currency_analyzer.analyze(market_data)
             
             # 4. Gelişmiş göstergeler (CCI ve MFI)
-            advanced_indicators = self._analyze_advanced_indicators(gram_candles)
+            with stage("advanced_indicators"):
+                advanced_indicators = self._analyze_advanced_indicators(frame)
             
             # 5. Pattern tanıma
-            pattern_analysis = self._analyze_patterns(gram_candles)
+            with stage("patterns"):
+                pattern_analysis = self._analyze_patterns(frame)
             
             # 6. Yeni modül analizleri
-            fibonacci_analysis = self._analyze_fibonacci(gram_candles)
-            smc_analysis = self._analyze_smc(gram_candles)
-            market_regime_analysis = self._analyze_market_regime(gram_candles)
-            divergence_analysis = self._analyze_advanced_divergence(gram_candles)
+            with stage("fibonacci"):
+                fibonacci_analysis = self._analyze_fibonacci(frame)
+            with stage("smc"):
+                smc_analysis = self._analyze_smc(frame)
+            with stage("market_regime"):
+                market_regime_analysis = self._analyze_market_regime(frame)
+            with stage("divergence"):
+                divergence_analysis = self._analyze_advanced_divergence(frame)
             
             # 7. Dip/Tepe detection logic
-            dip_peak_analysis = self._enhanced_dip_peak_detection(
-                gram_candles, gram_analysis, advanced_indicators, pattern_analysis
-            )
+            with stage("dip_peak"):
+                dip_peak_analysis = self._enhanced_dip_peak_detection(
+                    gram_candles, gram_analysis, advanced_indicators, pattern_analysis
+                )
             
             # 12. Volatilite kontrolü
             current_price = float(gram_analysis.get('price', 0))
@@ -150,23 +186,26 @@ class HybridStrategy:
             # 8. Enhanced Signal Combination - Tüm modülleri dahil et
             logger.debug(f"🔄 HYBRID: Calling enhanced signal combiner for {timeframe}")
             logger.debug(f"🔄 HYBRID: Gram signal = {gram_analysis.get('signal')}")
-            combined_signal = self._combine_signals_enhanced_v2(
-                gram_analysis, global_analysis, currency_analysis,
-                advanced_indicators, pattern_analysis, timeframe, market_volatility,
-                fibonacci_analysis, smc_analysis, market_regime_analysis, 
-                divergence_analysis, dip_peak_analysis
-            )
+            with stage("combiner"):
+                combined_signal = self._combine_signals_enhanced_v2(
+                    gram_analysis, global_analysis, currency_analysis,
+                    advanced_indicators, pattern_analysis, timeframe, market_volatility,
+                    fibonacci_analysis, smc_analysis, market_regime_analysis, 
+                    divergence_analysis, dip_peak_analysis
+                )
             logger.debug(f"🔄 HYBRID: Enhanced combined signal = {combined_signal.get('signal')}")
             
             # 7. Kelly Criterion ile pozisyon boyutu hesapla
-            position_details = self._calculate_kelly_position(
-                combined_signal, gram_analysis, currency_analysis
-            )
+            with stage("kelly"):
+                position_details = self._calculate_kelly_position(
+                    combined_signal, gram_analysis, currency_analysis
+                )
             
             # 8. Stop-loss ve take-profit ayarla
-            risk_levels = self._adjust_risk_levels(
-                gram_analysis, currency_analysis
-            )
+            with stage("risk_levels"):
+                risk_levels = self._adjust_risk_levels(
+                    gram_analysis, currency_analysis
+                )
             
             return {
                 "timestamp": timezone.utc_now(),
@@ -965,22 +1004,11 @@ class HybridStrategy:
             "recommendations": ["Veri bekleniyor"]
         }
     
-    def _analyze_advanced_indicators(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_advanced_indicators(self, frame: CandleFrame) -> Dict[str, Any]:
         """CCI ve MFI göstergelerini analiz et"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close),
-                    'open': float(candle.open),
-                    'volume': float(candle.volume) if hasattr(candle, 'volume') and candle.volume is not None else 0
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe(OHLCV_COLUMNS)
             
             # CCI analizi
             cci_analysis = self.cci.get_analysis(df)
@@ -1028,21 +1056,11 @@ class HybridStrategy:
                 'combined_confidence': 0
             }
     
-    def _analyze_patterns(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_patterns(self, frame: CandleFrame) -> Dict[str, Any]:
         """Pattern tanıma analizi"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close),
-                    'open': float(candle.open)
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe()
             
             # Pattern analizi
             pattern_result = self.pattern_recognizer.analyze_all_patterns(df)
@@ -1134,27 +1152,19 @@ class HybridStrategy:
                 'error': str(e)
             }
     
-    def _analyze_fibonacci(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_fibonacci(self, frame: CandleFrame) -> Dict[str, Any]:
         """Fibonacci Retracement analizi"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'open': float(candle.open),
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close)
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe()
             
             if len(df) < 50:
                 return {"status": "insufficient_data", "signal": "NEUTRAL", "strength": 0}
             
             # Fibonacci analizi yap
-            fib_result = self.fibonacci_analyzer.analyze(df)
+            fib_result = self.analysis_cache.get_or_compute(
+                "fibonacci", frame, lambda: self.fibonacci_analyzer.analyze(df)
+            )
             self._last_fibonacci_analysis = fib_result
             
             # Sinyali dönüştür
@@ -1186,27 +1196,19 @@ class HybridStrategy:
             logger.error(f"Fibonacci analiz hatası: {str(e)}")
             return {"status": "error", "signal": "NEUTRAL", "strength": 0}
     
-    def _analyze_smc(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_smc(self, frame: CandleFrame) -> Dict[str, Any]:
         """Smart Money Concepts analizi"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'open': float(candle.open),
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close)
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe()
             
             if len(df) < 50:
                 return {"status": "insufficient_data", "signal": "NEUTRAL", "strength": 0}
             
             # SMC analizi yap
-            smc_result = self.smc_analyzer.analyze(df)
+            smc_result = self.analysis_cache.get_or_compute(
+                "smc", frame, lambda: self.smc_analyzer.analyze(df)
+            )
             self._last_smc_analysis = smc_result
             
             # Sinyali dönüştür
@@ -1239,26 +1241,16 @@ class HybridStrategy:
             logger.error(f"SMC analiz hatası: {str(e)}")
             return {"status": "error", "signal": "NEUTRAL", "strength": 0}
     
-    def _analyze_market_regime(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_market_regime(self, frame: CandleFrame) -> Dict[str, Any]:
         """Market Regime Detection analizi"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'open': float(candle.open),
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close)
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe()
             
             if len(df) < 50:
                 return {"status": "insufficient_data", "regime": "unknown", "risk_level": "medium"}
             
-            # Market regime analizi yap
+            # Dedektör rejim geçmişini güncellediğinden (geçiş tespiti) sonuç önbelleklenmez
             regime_result = self.market_regime_detector.analyze_market_regime(df)
             self._last_market_regime = regime_result
             
@@ -1279,53 +1271,48 @@ class HybridStrategy:
             logger.error(f"Market regime analiz hatası: {str(e)}")
             return {"status": "error", "regime": "unknown", "risk_level": "medium"}
     
-    def _analyze_advanced_divergence(self, gram_candles: List[GramAltinCandle]) -> Dict[str, Any]:
+    def _analyze_advanced_divergence(self, frame: CandleFrame) -> Dict[str, Any]:
         """Advanced Divergence Detection analizi"""
         try:
-            # DataFrame'e çevir
-            import pandas as pd
-            data = []
-            for candle in gram_candles:
-                data.append({
-                    'open': float(candle.open),
-                    'high': float(candle.high),
-                    'low': float(candle.low),
-                    'close': float(candle.close)
-                })
-            
-            df = pd.DataFrame(data)
+            # Paylaşılan kolon verisinden kopyasız DataFrame
+            df = frame.to_dataframe()
             
             if len(df) < 50:
                 return {"status": "insufficient_data", "signal": "NEUTRAL", "strength": 0}
             
-            # Advanced divergence analizi yap
-            div_analysis = self.divergence_detector.analyze(df)
-            self._last_divergence_analysis = div_analysis
-            
-            # DivergenceAnalysis objesinden dict'e çevir
-            if div_analysis:
-                return {
-                    "status": "success",
-                    "overall_signal": div_analysis.overall_signal,
-                    "signal_strength": div_analysis.signal_strength,
-                    "confluence_score": div_analysis.confluence_score,
-                    "regular_divergences_count": len(div_analysis.regular_divergences),
-                    "hidden_divergences_count": len(div_analysis.hidden_divergences),
-                    "dominant_divergence": {
-                        "type": div_analysis.dominant_divergence.type if div_analysis.dominant_divergence else None,
-                        "strength": div_analysis.dominant_divergence.strength if div_analysis.dominant_divergence else 0,
-                        "class_rating": div_analysis.dominant_divergence.class_rating if div_analysis.dominant_divergence else "C"
-                    },
-                    "next_targets": div_analysis.next_targets,
-                    "invalidation_levels": div_analysis.invalidation_levels
-                }
-            else:
-                return {"status": "error", "signal": "NEUTRAL", "strength": 0}
+            # DivergenceAnalysis nesnesi JSON'a yazılamaz; özet dict önbelleklenir
+            return self.analysis_cache.get_or_compute(
+                "hybrid_divergence", frame, lambda: self._summarize_divergence(df)
+            )
                 
         except Exception as e:
             logger.error(f"Advanced divergence analiz hatası: {str(e)}")
             return {"status": "error", "signal": "NEUTRAL", "strength": 0}
     
+    def _summarize_divergence(self, df) -> Dict[str, Any]:
+        """Advanced divergence analizi ve hybrid özeti"""
+        div_analysis = self.divergence_detector.analyze(df)
+        self._last_divergence_analysis = div_analysis
+        
+        # DivergenceAnalysis objesinden dict'e çevir
+        if div_analysis:
+            return {
+                "status": "success",
+                "overall_signal": div_analysis.overall_signal,
+                "signal_strength": div_analysis.signal_strength,
+                "confluence_score": div_analysis.confluence_score,
+                "regular_divergences_count": len(div_analysis.regular_divergences),
+                "hidden_divergences_count": len(div_analysis.hidden_divergences),
+                "dominant_divergence": {
+                    "type": div_analysis.dominant_divergence.type if div_analysis.dominant_divergence else None,
+                    "strength": div_analysis.dominant_divergence.strength if div_analysis.dominant_divergence else 0,
+                    "class_rating": div_analysis.dominant_divergence.class_rating if div_analysis.dominant_divergence else "C"
+                },
+                "next_targets": div_analysis.next_targets,
+                "invalidation_levels": div_analysis.invalidation_levels
+            }
+        return {"status": "error", "signal": "NEUTRAL", "strength": 0}
+    
     def _analyze_simple_divergence(self, gram_candles, gram_analysis) -> Dict[str, Any]:
         """Basit divergence analizi - RSI tabanlı"""
         try:
@@ -12,6 +12,9 @@ project_root = os.path.dirname(os.path.dirname(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# Paylaşılan analiz önbelleği testler arasında (ve mock'lu analizörlerde) sonuç taşımasın
+os.environ.setdefault("ANALYSIS_CACHE", "false")
+
 
 @pytest.fixture(scope="session")
 def event_loop():
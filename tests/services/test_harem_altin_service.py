@@ -0,0 +1,193 @@
+"""
+HaremAltinPriceService testleri - yerel stub HTTP sunucusu ile
+"""
+from datetime import datetime
+
+import pytest
+from aiohttp import web
+
+from services.harem_altin_service import HaremAltinPriceService
+
+# Fixture is_market_closed'u sabitler; gerçek mantık ayrıca test edilir
+IS_MARKET_CLOSED = HaremAltinPriceService.is_market_closed
+
+
+class StubPriceServer:
+    """ETag destekli, hata enjekte edilebilen fiyat sunucusu"""
+
+    def __init__(self):
+        self.gram = 2500.0
+        self.fail_next = 0
+        self.requests = 0
+        self.client_ports = set()
+        self.runner = None
+        self.url = None
+
+    def payload(self):
+        return {
+            "meta": {},
+            "data": {
+                "ALTIN": {"alis": self.gram - 5, "satis": self.gram},
+                "USDTRY": {"alis": 34.0, "satis": 34.1},
+                "ONS": {"alis": 2640.0, "satis": 2650.0}
+            }
+        }
+
+    async def handle(self, request):
+        self.requests += 1
+        self.client_ports.add(request.transport.get_extra_info("peername")[1])
+        if self.fail_next:
+            self.fail_next -= 1
+            return web.Response(status=503)
+        etag = f'"{self.gram}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(self.payload(), headers={"ETag": etag})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/tmp/altin.json", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/tmp/altin.json"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    # Servis singleton; her test kendi örneğini kurar, önbellek dosyası geçici dizine yazılır
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(HaremAltinPriceService, "_instance", None)
+    monkeypatch.setattr(HaremAltinPriceService, "is_market_closed", lambda self, now=None: False)
+
+    def factory(url, **kwargs):
+        kwargs.setdefault("retry_backoff", 0.01)
+        return HaremAltinPriceService(refresh_interval=4, api_url=url, min_interval=1, max_interval=8, **kwargs)
+    return factory
+
+
+class TestHaremAltinPriceService:
+    """HTTP oturumu, koşullu istek ve adaptif yenileme testleri"""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_and_not_modified_skips_callbacks(self, make_service):
+        """Tek bağlantı kullanılmalı, 304 yanıtında callback çağrılmamalı"""
+        stub = StubPriceServer()
+        await stub.start()
+        service = make_service(stub.url)
+        received = []
+        service.add_callback(received.append)
+        try:
+            await service.poll_once()
+            await service.poll_once()
+            stub.gram = 2501.5
+            await service.poll_once()
+        finally:
+            await service.close()
+            await stub.stop()
+
+        assert stub.requests == 3
+        assert len(stub.client_ports) == 1
+        assert len(received) == 2
+        assert received[1]["ALTIN"]["satis_direction"] == "up"
+        assert service.stats["not_modified"] == 1
+        assert service.get_stats()["latency"]["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, make_service):
+        """503 yanıtları jitter'lı geri çekilme ile tekrar denenmeli"""
+        stub = StubPriceServer()
+        await stub.start()
+        stub.fail_next = 2
+        service = make_service(stub.url, max_retries=2)
+        try:
+            prices = await service.fetch_prices()
+            stub.fail_next = 3
+            assert await service.fetch_prices() is None
+        finally:
+            await service.close()
+            await stub.stop()
+
+        assert prices["ALTIN"]["satis"] == 2500.0
+        assert service.stats["retries"] == 4
+        assert service.stats["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_interval_adapts_to_movement(self, make_service):
+        """Hareket varken aralık kısalmalı, fiyat sabitken uzamalı"""
+        stub = StubPriceServer()
+        await stub.start()
+        service = make_service(stub.url)
+        try:
+            intervals = [await service.poll_once(), await service.poll_once()]  # ilk veri + 304
+            stub.gram += 1
+            intervals.append(await service.poll_once())
+            intervals.append(await service.poll_once())
+        finally:
+            await service.close()
+            await stub.stop()
+
+        assert intervals == [6.0, 8, 1, 1.5]
+        assert service.stats["moves"] == 1
+
+    def test_closed_market_uses_long_interval(self, make_service):
+        """Hafta sonu piyasa kapalı sayılmalı ve closed_interval kullanılmalı"""
+        service = make_service("http://127.0.0.1:9/unused", closed_interval=120)
+
+        assert not IS_MARKET_CLOSED(service, datetime(2025, 3, 21, 15, 0))  # Cuma
+        assert IS_MARKET_CLOSED(service, datetime(2025, 3, 22, 15, 0))  # Cumartesi
+
+        service.is_market_closed = lambda now=None: True
+        assert service._next_interval(200, moved=True) == 120
+
+
+class TestPriceCache:
+    """Son bilinen fiyatların debounce'lu, atomik snapshot testleri"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_written_only_on_change(self, make_service, tmp_path):
+        """Aynı fiyatlar tekrar yazılmamalı, değişince tek snapshot yazılmalı"""
+        stub = StubPriceServer()
+        await stub.start()
+        service = make_service(stub.url, snapshot_delay=0.05)
+        try:
+            await service.poll_once()
+            stub.gram = 2501.0
+            await service.poll_once()  # gecikme içinde değişiklik - aynı snapshot'a katılır
+            await service.flush_snapshot()
+            assert service.stats["cache_writes"] == 1
+
+            stub.gram = 2500.0
+            await service.poll_once()
+            stub.gram = 2501.0
+            await service.poll_once()  # diskteki değerlerle aynı - yazılmamalı
+            await service.flush_snapshot()
+            assert service.stats["cache_writes"] == 1
+        finally:
+            await service.close()
+            await stub.stop()
+
+        cache_file = tmp_path / "data" / "gold_price_cache.json"
+        assert cache_file.exists()
+        assert not (tmp_path / "data" / "gold_price_cache.json.tmp").exists()
+
+        # Yeni örnek snapshot'ı yükler
+        HaremAltinPriceService._instance = None
+        reloaded = make_service(stub.url)
+        assert reloaded._cached_prices["ALTIN"]["satis"] == 2501.0
+        assert reloaded._last_update is not None
+
+    def test_corrupt_snapshot_is_ignored(self, make_service, tmp_path):
+        """Bozuk snapshot başlangıcı engellememeli"""
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "gold_price_cache.json").write_text('{"prices": {"ALT')
+
+        service = make_service("http://127.0.0.1:9/unused")
+
+        assert service._cached_prices == {}
+        assert service._last_update is None
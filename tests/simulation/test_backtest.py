@@ -0,0 +1,134 @@
+"""
+Offline backtest motoru testleri
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.simulation import ExitReason, SimulationConfig, StrategyType
+from simulation.backtest import BacktestEngine
+from storage.sqlite_storage import INSERT_PRICE_SQL, SQLiteStorage
+from utils import timezone
+
+START = timezone.UTC_TZ.localize(datetime(2025, 1, 6, 6, 0))
+
+
+class FakeStrategy:
+    """Her mum kapanışında verilen sinyali üreten strateji"""
+
+    def __init__(self, signal="BUY", confidence=0.9, atr=5.0):
+        self.signal = signal
+        self.confidence = confidence
+        self.atr = atr
+        self.calls = []
+
+    def analyze(self, candles, market_data, timeframe):
+        self.calls.append((timeframe, candles[-1].timestamp, len(candles), len(market_data)))
+        return {
+            "signal": self.signal,
+            "confidence": self.confidence,
+            "gram_price": candles[-1].close,
+            "gram_analysis": {"indicators": {"rsi": 50, "atr": {"atr": self.atr}}}
+        }
+
+
+def seed_ticks(storage, start, minutes, price_at):
+    rows = []
+    for i in range(minutes):
+        ts = start + timedelta(minutes=i)
+        gram = price_at(i)
+        rows.append((ts, 2650.0, 34.0, gram * 31.1035, gram, "test"))
+    with storage.get_connection() as conn:
+        conn.executemany(INSERT_PRICE_SQL, rows)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteStorage(str(tmp_path / "backtest.db"))
+
+
+def make_config(name="main", **kwargs):
+    return SimulationConfig(name=name, strategy_type=StrategyType.MAIN, min_confidence=0.6, **kwargs)
+
+
+class TestBacktestEngine:
+    """BacktestEngine testleri"""
+
+    def test_analysis_runs_once_per_bar_and_is_shared(self, storage):
+        """Her kapanan mumda tek analiz yapılmalı, konfigürasyon sayısından bağımsız"""
+        seed_ticks(storage, START, 24 * 60, lambda i: 3000.0)
+        strategy = FakeStrategy(signal="HOLD")
+        engine = BacktestEngine(storage, [make_config("a"), make_config("b")], timeframes=["15m"], strategy=strategy)
+
+        results = engine.run(START + timedelta(hours=12), START + timedelta(hours=24))
+
+        # 12 saatte kapanan 48 adet 15m mumu, canlı analizle aynı girdi boyutları
+        assert len(strategy.calls) == 48
+        assert engine.stats["analyses"] == 48
+        assert all(n == 35 and m == 70 for _, _, n, m in strategy.calls)
+        assert all(r.statistics["total_trades"] == 0 for r in results)
+
+    def test_no_trades_during_warmup(self, storage):
+        """Warm-up verisi sadece mumları doldurmalı, işlem açmamalı"""
+        seed_ticks(storage, START, 24 * 60, lambda i: 3000.0 + i)
+        strategy = FakeStrategy()
+        engine = BacktestEngine(storage, [make_config()], timeframes=["15m"], strategy=strategy)
+        trading_start = START + timedelta(hours=12)
+
+        result = engine.run(trading_start, START + timedelta(hours=24))[0]
+
+        assert result.positions
+        assert min(p.entry_time for p in result.positions) >= trading_start
+        assert min(t for _, t, _, _ in strategy.calls) >= trading_start - timedelta(minutes=15)
+
+    def test_take_profit_hit_on_tick_updates_capital(self, storage):
+        """Yükselen fiyatta LONG pozisyon tick seviyesinde TP'den kapanmalı"""
+        seed_ticks(storage, START, 24 * 60, lambda i: 3000.0 + i * 0.5)
+        engine = BacktestEngine(storage, [make_config()], timeframes=["15m"], strategy=FakeStrategy(atr=2.0))
+
+        result = engine.run(START + timedelta(hours=12), START + timedelta(hours=24))[0]
+
+        closed = [p for p in result.positions if p.exit_reason is not None]
+        assert closed
+        assert all(p.exit_reason == ExitReason.TAKE_PROFIT for p in closed)
+        assert all(p.exit_price == p.take_profit for p in closed)
+        stats = result.statistics
+        assert stats["total_trades"] == len(closed)
+        assert stats["winning_trades"] == len(closed)
+        capital = result.timeframe_capitals["15m"]
+        assert capital["current_capital"] > capital["allocated_capital"]
+        assert sum(day["total_trades"] for day in result.daily_performance) == len(closed)
+
+    def test_hybrid_strategy_replay(self, storage):
+        """Gerçek HybridStrategy ile kısa bir aralık hatasız oynatılmalı"""
+        seed_ticks(storage, START, 12 * 60, lambda i: 3000.0 + 20 * ((i // 7) % 5) - i * 0.05)
+        engine = BacktestEngine(storage, [make_config()], timeframes=["1h"])
+
+        result = engine.run(START + timedelta(hours=2), START + timedelta(hours=12), warmup=False)[0]
+
+        assert engine.stats["ticks"] == 10 * 60
+        assert "win_rate" in result.statistics
+        assert result.to_dict()["name"] == "main"
+
+    def test_default_strategy_leaves_shared_analysis_cache_alone(self, storage, tmp_path, monkeypatch):
+        """Varsayılan strateji canlı analysis_cache tablosunu okumamalı / yazmamalı"""
+        from storage import analysis_cache
+
+        production_db = str(tmp_path / "production.db")
+        shared = analysis_cache.AnalysisCache(production_db)
+        monkeypatch.setattr(analysis_cache, "_analysis_cache", shared)
+
+        seed_ticks(storage, START, 20 * 60, lambda i: 3000.0 + 20 * ((i // 7) % 5) - i * 0.05)
+        engine = BacktestEngine(storage, [make_config()], timeframes=["15m"])
+        # 50+ mumla SMC / fibonacci / divergence analizleri de çalışır
+        engine.required_candles["15m"] = 60
+        engine.run(START, START + timedelta(hours=20), warmup=False)
+
+        assert engine.strategy.analysis_cache is not shared
+        assert engine.strategy._last_smc_analysis is not None
+        assert shared.stats == {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+        with sqlite3.connect(production_db) as conn:
+            assert conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'analysis_cache'"
+            ).fetchone()[0] == 0
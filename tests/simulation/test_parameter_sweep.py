@@ -0,0 +1,148 @@
+"""
+Parametre taraması testleri
+"""
+import logging
+import sqlite3
+from datetime import timedelta
+
+import pytest
+
+from simulation.backtest import ParameterSweep, SharedTickArray, grid_search, random_search
+from simulation.backtest.sweep import applied_parameters
+from storage.sqlite_storage import SQLiteStorage
+from strategies import constants as strategy_constants
+from strategies import signal_combiner
+from strategies.hybrid_strategy import HybridStrategy
+
+from .test_backtest import START, make_config, seed_ticks
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "sweep.db"))
+    seed_ticks(storage, START, 12 * 60, lambda i: 3000.0 + 20 * ((i // 7) % 5) - i * 0.05)
+    return storage
+
+
+class TestParameterSets:
+    """Grid / random search üretimi"""
+
+    def test_grid_search_product(self):
+        sets = grid_search({"module_weights.gram_analysis": [0.4, 0.5], "transaction_cost": [0.3, 0.45, 0.6]})
+        assert len(sets) == 6
+        assert {"module_weights.gram_analysis": 0.5, "transaction_cost": 0.6} in sets
+
+    def test_random_search_is_reproducible(self):
+        space = {"min_confidence.15m": (0.4, 0.6), "sim.risk_reward_ratio": [2.0, 3.0]}
+        sets = random_search(space, 5, seed=7)
+        assert sets == random_search(space, 5, seed=7)
+        assert all(0.4 <= s["min_confidence.15m"] <= 0.6 for s in sets)
+        assert all(s["sim.risk_reward_ratio"] in (2.0, 3.0) for s in sets)
+
+
+class TestAppliedParameters:
+    """Parametre uygulama ve geri alma"""
+
+    def test_module_constants_restored(self):
+        """Modül sabitleri blok sonunda eski değerlerine dönmeli"""
+        strategy = HybridStrategy()
+        old_threshold = strategy_constants.MIN_CONFIDENCE_THRESHOLDS["1h"]
+        old_cost = signal_combiner.TRANSACTION_COST_PERCENTAGE
+        params = {
+            "module_weights.smc": 0.2,
+            "min_confidence.1h": 0.9,
+            "transaction_cost": 0.1,
+            "sim.min_confidence": 0.7
+        }
+
+        with applied_parameters(strategy, [make_config()], params) as configs:
+            assert strategy.module_weights["smc"] == 0.2
+            assert strategy_constants.MIN_CONFIDENCE_THRESHOLDS["1h"] == 0.9
+            assert signal_combiner.TRANSACTION_COST_PERCENTAGE == 0.1
+            assert configs[0].min_confidence == 0.7
+
+        assert strategy_constants.MIN_CONFIDENCE_THRESHOLDS["1h"] == old_threshold
+        assert signal_combiner.TRANSACTION_COST_PERCENTAGE == old_cost
+
+    def test_unknown_parameter_rejected(self):
+        with pytest.raises(ValueError):
+            with applied_parameters(HybridStrategy(), [], {"unknown.key": 1}):
+                pass
+
+
+class TestParameterSweep:
+    """ParameterSweep testleri"""
+
+    def test_shared_ticks_match_storage(self, storage):
+        """Paylaşılan dizi storage ile aynı tick'leri vermeli"""
+        start, end = START + timedelta(hours=1), START + timedelta(hours=3)
+        shared = SharedTickArray.from_storage(storage, START, START + timedelta(hours=12))
+        try:
+            assert list(shared.iter_price_ticks(start, end)) == list(storage.iter_price_ticks(start, end))
+        finally:
+            shared.close()
+
+    def test_sweep_runs_in_workers_and_saves_results(self, storage):
+        """Setler worker süreçlerde çalışmalı, sonuçlar tabloya yazılmalı"""
+        sweep = ParameterSweep(storage, [make_config("a"), make_config("b")], timeframes=["15m"], max_workers=2)
+        parameter_sets = grid_search({"module_weights.gram_analysis": [0.4, 0.6]})
+
+        rows = sweep.run(parameter_sets, START + timedelta(hours=6), START + timedelta(hours=12), sweep_id="t1")
+
+        assert len(rows) == 4
+        assert sweep.stats["failed"] == 0
+        assert {r["config_name"] for r in rows} == {"a", "b"}
+        saved = storage.get_backtest_results("t1")
+        assert len(saved) == 4
+        assert saved[0]["parameters"]["module_weights.gram_analysis"] in (0.4, 0.6)
+
+    def test_workers_use_spawn_context(self, storage, monkeypatch):
+        """Ana süreçteki thread'ler ve SQLite bağlantısı fork ile kopyalanmamalı"""
+        from concurrent.futures import ThreadPoolExecutor
+        from simulation.backtest import sweep as sweep_module
+
+        contexts = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def __init__(self, max_workers, mp_context, initializer, initargs):
+                contexts.append(mp_context.get_start_method())
+                super().__init__(max_workers, initializer=initializer, initargs=initargs)
+
+        monkeypatch.setattr(sweep_module, "ProcessPoolExecutor", RecordingExecutor)
+        monkeypatch.setattr(sweep_module, "_worker_state", {})
+        sweep = ParameterSweep(storage, [make_config()], timeframes=["15m"], max_workers=1)
+        sweep.run([{}], START + timedelta(hours=6), START + timedelta(hours=7), save=False)
+
+        assert contexts == ["spawn"]
+
+    def test_workers_leave_shared_analysis_cache_alone(self, tmp_path, monkeypatch):
+        """Worker'lar canlı analysis_cache tablosunu okumamalı / yazmamalı"""
+        from simulation.backtest import sweep as sweep_module
+        from storage import analysis_cache
+        from utils import constants
+
+        production_db = str(tmp_path / "production.db")
+        monkeypatch.setattr(analysis_cache, "_analysis_cache", analysis_cache.AnalysisCache(production_db))
+        monkeypatch.setattr(sweep_module, "_worker_state", {})
+        # 50+ mumla SMC / fibonacci / divergence analizleri de çalışır
+        monkeypatch.setitem(constants.CANDLE_REQUIREMENTS, "15m", 60)
+
+        storage = SQLiteStorage(str(tmp_path / "ticks.db"))
+        seed_ticks(storage, START, 20 * 60, lambda i: 3000.0 + 20 * ((i // 7) % 5) - i * 0.05)
+        ticks = SharedTickArray.from_storage(storage, START, START + timedelta(hours=20))
+        try:
+            # Worker başlangıcı ve görevi süreç içinde çalıştırılır (spawn'da monkeypatch taşınmaz)
+            sweep_module._init_worker(ticks.name, ticks.length, [make_config()], ["15m"], logging.WARNING)
+            rows = sweep_module._run_parameter_set(
+                {"module_weights.smc": 0.1}, START + timedelta(hours=16), START + timedelta(hours=20)
+            )
+            sweep_module._worker_state["ticks"].close()
+        finally:
+            ticks.close()
+
+        assert len(rows) == 1
+        assert analysis_cache.get_analysis_cache().enabled is False
+        with sqlite3.connect(production_db) as conn:
+            assert conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'analysis_cache'"
+            ).fetchone()[0] == 0
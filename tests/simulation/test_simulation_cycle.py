@@ -0,0 +1,150 @@
+"""
+Paylaşılan simülasyon döngüsü testleri (tek sinyal okuma, toplu giriş kararları)
+"""
+import itertools
+import threading
+
+import numpy as np
+import pytest
+
+from models.simulation import SimulationConfig, StrategyType
+from simulation.signal_analyzer import SignalAnalyzer
+from simulation.simulation_manager import SimulationManager
+from storage.create_simulation_tables import create_simulation_tables
+from storage.sqlite_storage import SQLiteStorage
+
+TIMEFRAMES = ("15m", "1h", "4h")
+
+
+def signal_row(signal, confidence, rsi=50.0, price=3000.0):
+    """get_latest_hybrid_signal'in tipli kolon satırı"""
+    return {"signal": signal, "confidence": confidence, "gram_price": price, "rsi": rsi, "atr": 15.0}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_path = str(tmp_path / "cycle.db")
+    create_simulation_tables(db_path)
+    return SimulationManager(SQLiteStorage(db_path))
+
+
+def use_signals(manager, rows):
+    """Sinyal kaynağını sabit satırlarla değiştir; timeframe başına okuma sayısını döndür"""
+    calls = {tf: 0 for tf in TIMEFRAMES}
+
+    async def get_latest_hybrid_signal(timeframe):
+        calls[timeframe] += 1
+        return rows.get(timeframe)
+
+    # Yazmalar için db.run (sqlite-io havuzu) gerçek kalır
+    manager.db.get_latest_hybrid_signal = get_latest_hybrid_signal
+    return calls
+
+
+def open_positions(manager):
+    with manager.storage.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT simulation_id, timeframe, position_type FROM sim_positions WHERE status = 'OPEN'"
+        ).fetchall()
+    return {(row[0], row[1]): row[2] for row in rows}
+
+
+class TestShouldOpenPositions:
+    """Toplu giriş kararları tekil kontrolle aynı olmalı"""
+
+    def test_matches_should_open_position(self):
+        rng = np.random.default_rng(11)
+        analyzer = SignalAnalyzer()
+        configs = [
+            SimulationConfig(name=f"s{i}", strategy_type=strategy, min_confidence=round(float(conf), 2))
+            for i, (strategy, conf) in enumerate(zip(
+                itertools.cycle(StrategyType), rng.uniform(0.3, 0.7, 60)
+            ))
+        ]
+        signals = [
+            {"signal": signal, "confidence": confidence, "price": 3000.0,
+             "indicators": {"rsi": rsi, "bb": bb}}
+            for signal, confidence, rsi, bb in itertools.product(
+                ("BUY", "SELL", "HOLD", None), (0.2, 0.5, 0.8, 0.95), (None, 25.0, 50.0, 80.0),
+                (None, {"percent_b": 1.2}, {"percent_b": 0.5})
+            )
+        ]
+
+        for signal_data in signals:
+            expected = [analyzer.should_open_position(config, signal_data, "1h") for config in configs]
+            assert analyzer.should_open_positions(configs, signal_data, "1h").tolist() == expected
+
+        assert analyzer.should_open_positions([], signals[0], "1h").tolist() == []
+
+
+class TestSimulationCycle:
+    """_process_simulations: sinyaller bir kez okunur, kararlar simülasyon başına uygulanır"""
+
+    @pytest.mark.asyncio
+    async def test_cycle_shares_signals_across_simulations(self, manager):
+        variants = [(StrategyType.MAIN, 0.5), (StrategyType.CONSERVATIVE, 0.5),
+                    (StrategyType.CONSERVATIVE, 0.6), (StrategyType.MOMENTUM, 0.5)] * 5
+        sim_ids = [
+            await manager.create_simulation(f"v{i}", strategy, min_confidence=min_conf)
+            for i, (strategy, min_conf) in enumerate(variants)
+        ]
+
+        calls = use_signals(manager, {
+            "15m": signal_row("BUY", 0.8, rsi=75.0),
+            "1h": signal_row("SELL", 0.8, rsi=50.0),
+            "4h": signal_row("HOLD", 0.9)
+        })
+        await manager._process_simulations()
+
+        # Simülasyon sayısından bağımsız olarak timeframe başına tek okuma
+        assert calls == {"15m": 1, "1h": 1, "4h": 1}
+
+        # MAIN her iki sinyalde, CONSERVATIVE yalnızca 0.8 >= 1.5 * min_conf iken,
+        # MOMENTUM yalnızca RSI 30-70 dışındayken girer
+        expected = {}
+        for sim_id, (strategy, min_conf) in zip(sim_ids, variants):
+            for timeframe, position_type, rsi in (("15m", "LONG", 75.0), ("1h", "SHORT", 50.0)):
+                if (strategy == StrategyType.MAIN
+                        or (strategy == StrategyType.CONSERVATIVE and 0.8 >= min_conf * 1.5)
+                        or (strategy == StrategyType.MOMENTUM and not 30 <= rsi <= 70)):
+                    expected[(sim_id, timeframe)] = position_type
+        assert open_positions(manager) == expected
+
+        # Ters sinyal tüm açık 15m pozisyonlarını kapatır; kapanışlar kalıcı olmalı
+        calls = use_signals(manager, {"15m": signal_row("SELL", 0.3), "1h": signal_row("SELL", 0.8)})
+        await manager._process_simulations()
+        assert calls["15m"] == 1
+        assert open_positions(manager) == {key: value for key, value in expected.items() if key[1] == "1h"}
+
+        with manager.storage.get_connection() as conn:
+            closed = conn.execute(
+                "SELECT COUNT(*) FROM sim_positions WHERE status = 'CLOSED' AND exit_reason = 'REVERSE_SIGNAL'"
+            ).fetchone()[0]
+            recorded = conn.execute(
+                "SELECT SUM(trades) FROM sim_trade_stats WHERE bucket = 'all'"
+            ).fetchone()[0]
+        assert closed == recorded == sum(1 for key in expected if key[1] == "15m")
+
+    @pytest.mark.asyncio
+    async def test_cycle_queries_run_off_the_event_loop(self, manager):
+        """Oluşturma, yükleme ve döngü sorguları sqlite-io havuzunda çalışmalı"""
+        threads = []
+        get_connection = manager.storage.get_connection
+
+        def tracking_get_connection(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return get_connection(*args, **kwargs)
+
+        manager.storage.get_connection = tracking_get_connection
+        await manager.create_simulation("main", StrategyType.MAIN, min_confidence=0.5)
+        manager.active_simulations.clear()
+        await manager._load_active_simulations()
+
+        use_signals(manager, {"15m": signal_row("BUY", 0.8), "1h": signal_row("HOLD", 0.9)})
+        await manager._process_simulations()
+        use_signals(manager, {"15m": signal_row("SELL", 0.8)})
+        await manager._process_simulations()
+        status = await manager.get_simulation_status(next(iter(manager.active_simulations)))
+
+        assert status.total_trades == 1
+        assert threads and threading.main_thread() not in threads
@@ -0,0 +1,125 @@
+"""
+İçerik adresli analiz önbelleği (AnalysisCache) testleri
+"""
+import sqlite3
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.candle_frame import CandleFrame
+from storage.analysis_cache import AnalysisCache, frame_key
+
+
+def make_df(n=120, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 2400 + np.cumsum(rng.normal(0, 3, n))
+    return pd.DataFrame({
+        "open": close - 1, "high": close + 2, "low": close - 2, "close": close
+    }, index=pd.date_range("2025-03-01", periods=n, freq="1h"))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+class TestAnalysisCache:
+    """AnalysisCache testleri"""
+
+    def test_shared_between_instances_and_input_types(self, db_path):
+        """Farklı süreçleri temsil eden iki örnek ve DataFrame/CandleFrame aynı sonucu paylaşmalı"""
+        df = make_df()
+        compute = Mock(return_value={"status": "success", "signals": {"action": "BUY", "strength": 70}})
+
+        analyzer_side = AnalysisCache(db_path)
+        first = analyzer_side.get_or_compute("smc", CandleFrame.from_dataframe(df), compute)
+
+        web_side = AnalysisCache(db_path)
+        second = web_side.get_or_compute("smc", df.reset_index(drop=True), compute)
+        third = web_side.get_or_compute("smc", df, compute)
+
+        assert compute.call_count == 1
+        assert first == second == third
+        assert web_side.stats["db_hits"] == 1 and web_side.stats["memory_hits"] == 1
+
+        # İsabetler kopya döner; çağıranın değişikliği önbelleği bozmamalı
+        third["signals"]["action"] = "SELL"
+        assert web_side.get_or_compute("smc", df, compute)["signals"]["action"] == "BUY"
+
+    def test_new_bar_and_params_change_key(self, db_path):
+        """Yeni mum, farklı modül veya parametre yeni anahtar üretmeli"""
+        df = make_df()
+        extended = make_df(121)
+        assert frame_key("smc", df) != frame_key("smc", extended)
+        assert frame_key("smc", df) != frame_key("fibonacci", df)
+        assert frame_key("smc", df) != frame_key("smc", df, {"lookback": 50})
+
+        cache = AnalysisCache(db_path)
+        compute = Mock(side_effect=lambda: {"status": "success", "n": compute.call_count})
+        assert cache.get_or_compute("smc", df, compute)["n"] == 1
+        assert cache.get_or_compute("smc", extended, compute)["n"] == 2
+
+    def test_lru_eviction_and_uncacheable_results(self, db_path):
+        """Tablo max_rows'ta kalmalı; hata sonuçları kaydedilmemeli; kapalıyken hep hesaplanmalı"""
+        cache = AnalysisCache(db_path, memory_size=1, max_rows=2)
+        frames = [make_df(seed=seed) for seed in range(3)]
+        for df in frames:
+            cache.get_or_compute("regime", df, lambda: {"status": "success"})
+
+        fresh = AnalysisCache(db_path)
+        compute = Mock(return_value={"status": "success"})
+        fresh.get_or_compute("regime", frames[0], compute)
+        fresh.get_or_compute("regime", frames[2], compute)
+        assert compute.call_count == 1  # En eski kayıt tahliye edilmiş
+
+        failing = Mock(return_value={"status": "error", "message": "x"})
+        cache.get_or_compute("regime", make_df(seed=99), failing)
+        cache.get_or_compute("regime", make_df(seed=99), failing)
+        assert failing.call_count == 2
+
+        disabled = AnalysisCache(db_path, enabled=False)
+        disabled.get_or_compute("regime", frames[2], compute)
+        assert compute.call_count == 2
+
+    def test_hits_do_not_write_until_touch_flush(self, db_path):
+        """İsabetler tabloya yazmamalı; kullanım zamanları toplu yazılmalı, tahliye seyrek çalışmalı"""
+        df = make_df()
+        key = frame_key("smc", df)
+        AnalysisCache(db_path).get_or_compute("smc", df, lambda: {"status": "success"})
+
+        def last_used():
+            with sqlite3.connect(db_path) as conn:
+                return conn.execute("SELECT last_used FROM analysis_cache WHERE key = ?", (key,)).fetchone()[0]
+
+        stored = last_used()
+        reader = AnalysisCache(db_path, touch_interval=3600)
+        with sqlite3.connect(db_path) as conn:
+            changes_before = conn.execute("PRAGMA data_version").fetchone()[0]
+            for _ in range(5):
+                assert reader.get(key) == {"status": "success"}
+            assert conn.execute("PRAGMA data_version").fetchone()[0] == changes_before
+        assert last_used() == stored
+
+        reader.flush_touches()
+        assert last_used() > stored
+
+        # max_rows=20: tahliye her 2 kayıtta bir, tablo en fazla max_rows + 1 satır
+        cache = AnalysisCache(db_path, max_rows=20)
+        assert cache.evict_every == 2
+        for seed in range(30):
+            cache.get_or_compute("smc", make_df(seed=100 + seed), lambda: {"status": "success"})
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] <= 21
+
+    def test_strategy_regime_history_not_skipped(self, db_path):
+        """Durumlu rejim dedektörü aynı mumlarda da her analizde geçmişini güncellemeli"""
+        from strategies.hybrid_strategy import HybridStrategy
+
+        strategy = HybridStrategy()
+        strategy.analysis_cache = AnalysisCache(db_path)
+        frame = CandleFrame.from_dataframe(make_df(150))
+        for _ in range(2):
+            assert strategy._analyze_market_regime(frame)["status"] == "success"
+        assert len(strategy.market_regime_detector.historical_regime_data["regimes"]) == 2
@@ -0,0 +1,80 @@
+"""
+Asenkron depolama facade'ı ve loop lag monitörü testleri
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from storage.async_storage import AsyncSQLiteStorage, LoopLagMonitor
+from storage.sqlite_storage import SQLiteStorage
+
+
+class TestAsyncSQLiteStorage:
+    """AsyncSQLiteStorage testleri"""
+
+    @pytest.mark.asyncio
+    async def test_methods_run_off_loop_thread(self, tmp_path):
+        """Sorgular event loop thread'i dışında çalışmalı"""
+        storage = SQLiteStorage(str(tmp_path / "async.db"))
+        db = AsyncSQLiteStorage(storage)
+        loop_thread = threading.get_ident()
+
+        def which_thread():
+            return threading.get_ident()
+
+        assert await db.run(which_thread) != loop_thread
+        assert await db.get_latest_price() is None
+        assert (await db.get_statistics())["total_records"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_query_does_not_block_loop(self):
+        """Yavaş sorgu sürerken loop diğer işleri yürütebilmeli"""
+        class SlowStorage:
+            def slow_query(self):
+                time.sleep(0.3)
+                return "done"
+
+        db = AsyncSQLiteStorage(SlowStorage())
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        result, _ = await asyncio.gather(db.slow_query(), ticker())
+        assert result == "done"
+        assert ticks == 5
+
+    def test_non_callable_attributes_passthrough(self, tmp_path):
+        """Metod olmayan alanlar olduğu gibi dönmeli"""
+        storage = SQLiteStorage(str(tmp_path / "attrs.db"))
+        db = AsyncSQLiteStorage(storage)
+
+        assert db.db_path == storage.db_path
+        assert db.get_connection == storage.get_connection
+
+
+class TestLoopLagMonitor:
+    """LoopLagMonitor testleri"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_increases_lag(self):
+        """Loop'u bloklayan senkron çağrı gecikme olarak ölçülmeli"""
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        time.sleep(0.1)  # Loop'u blokla
+        await asyncio.sleep(0.03)
+        monitor.stop()
+
+        metrics = monitor.get_metrics()
+        assert metrics["samples"] > 0
+        assert metrics["max_ms"] >= 50
+
+    def test_empty_metrics(self):
+        assert LoopLagMonitor().get_metrics()["samples"] == 0
@@ -0,0 +1,154 @@
+"""
+Artımlı gram altın mum deposu (CandleStore) testleri
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from models.price_data import PriceData
+from storage.sqlite_storage import SQLiteStorage
+from storage.candle_store import CandleStore
+from utils import timezone
+
+
+def make_price(ts, gram):
+    """Test için PriceData oluştur"""
+    return PriceData(
+        timestamp=ts,
+        ons_usd=Decimal("2000"),
+        usd_try=Decimal("30"),
+        ons_try=Decimal("60000"),
+        gram_altin=Decimal(str(gram)),
+        source="test"
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Geçici veritabanlı storage"""
+    return SQLiteStorage(str(tmp_path / "test.db"))
+
+
+@pytest.fixture
+def ticks():
+    """Son ~3 saate yayılmış, 5 dakikada bir gelen tick'ler"""
+    start = timezone.utc_now() - timedelta(hours=3)
+    return [
+        (start + timedelta(minutes=5 * i), 2400 + (i % 7) * 1.5 - (i % 3))
+        for i in range(36)
+    ]
+
+
+class TestCandleStore:
+    """CandleStore testleri"""
+
+    def test_matches_sql_aggregation(self, storage, ticks):
+        """Bellekte üretilen mumlar SQL agregasyonu ile aynı olmalı"""
+        store = CandleStore(storage, intervals=[15, 60], persist=False)
+        store.warm_up()
+
+        for ts, gram in ticks:
+            price = make_price(ts, gram)
+            storage.save_price(price)
+            store.add_price(price)
+
+        for interval in (15, 60):
+            expected = storage.aggregate_gram_candles(interval, 50)
+            actual = store.get_candles(interval, 50)
+
+            assert len(actual) == len(expected)
+            for a, e in zip(actual, expected):
+                assert a.timestamp == e.timestamp
+                assert (a.open, a.high, a.low, a.close) == (e.open, e.high, e.low, e.close)
+
+    def test_only_closed_candles_persisted(self, storage, ticks):
+        """Açık mum tabloya yazılmamalı, kapananlar yazılmalı"""
+        store = CandleStore(storage, intervals=[60])
+        store.warm_up()
+
+        for ts, gram in ticks:
+            store.add_price(make_price(ts, gram))
+
+        stored = storage.get_stored_gram_candles(60, 50)
+        open_candle = store.get_open_candle(60)
+
+        assert open_candle is not None
+        assert stored
+        assert all(c.timestamp < open_candle.timestamp for c in stored)
+
+    def test_push_and_sync_do_not_double_count(self, storage, ticks):
+        """Aynı tick hem push hem sync ile gelirse bir kez işlenmeli"""
+        store = CandleStore(storage, intervals=[15], persist=False)
+        store.warm_up()
+
+        for ts, gram in ticks:
+            price = make_price(ts, gram)
+            storage.save_price(price)
+            store.add_price(price)
+
+        assert store.sync() == 0
+        assert store.get_stats()["intervals"]["15m"]["open_ticks"] <= 3
+
+    def test_warm_up_rebuilds_open_candle(self, storage, ticks):
+        """Yeni süreçte warm-up açık mumu ham veriden yeniden kurmalı"""
+        for ts, gram in ticks:
+            storage.save_price(make_price(ts, gram))
+
+        store = CandleStore(storage, intervals=[15, 60], persist=False)
+        candles = store.get_candles(60, 50)
+        expected = storage.aggregate_gram_candles(60, 50)
+
+        assert [c.close for c in candles] == [c.close for c in expected]
+
+    def test_storage_delegates_to_store(self, storage, ticks):
+        """enable_candle_store sonrası generate_gram_candles depodan okumalı"""
+        for ts, gram in ticks:
+            storage.save_price(make_price(ts, gram))
+
+        store = storage.enable_candle_store(persist=False, auto_sync=True)
+        before = len(storage.generate_gram_candles(15, 50))
+
+        next_ts = ticks[-1][0] + timedelta(minutes=15)
+        storage.save_price(make_price(next_ts, 2500))
+        candles = storage.generate_gram_candles(15, 50)
+
+        assert store.get_stats()["warmed_up"]
+        assert candles[-1].close == Decimal("2500.0")
+        assert len(candles) >= before
+
+    def test_sync_handles_mixed_utc_offsets(self, storage, ticks):
+        """+03:00 ve UTC ile saklanan tick'ler sync'te atlanmamalı / tekrar okunmamalı"""
+        for ts, gram in ticks[:-2]:
+            storage.save_price(make_price(timezone.to_turkey_time(ts), gram))
+        store = CandleStore(storage, intervals=[15], persist=False)
+        store.warm_up()
+
+        # Eski satırlar gibi UTC ile saklanan yeni tick'ler
+        for ts, gram in ticks[-2:]:
+            storage.save_price(make_price(timezone.to_utc(ts), gram))
+
+        assert store.sync() == 2
+        assert store.sync() == 0
+        assert store.get_open_candle(15).close == Decimal(str(ticks[-1][1]))
+
+    def test_warm_up_replay_is_bounded(self, storage, monkeypatch):
+        """Boş gram_candles ile 1d warm-up'ı 200 günlük ham tick'i yeniden oynatmamalı"""
+        now = timezone.utc_now()
+        for day in range(10, 0, -1):
+            storage.save_price(make_price(now - timedelta(days=day), 2400 + day))
+        storage.save_price(make_price(now - timedelta(minutes=1), 2500))
+
+        requested = []
+        get_ticks = storage.get_gram_ticks_since
+
+        def recording(since, until=None):
+            requested.append(since)
+            return get_ticks(since, until)
+
+        monkeypatch.setattr(storage, "get_gram_ticks_since", recording)
+        store = CandleStore(storage, intervals=[15, 1440], persist=False)
+        candles = store.get_recent_candles(1440, 20)
+
+        assert requested[0] >= (now - timedelta(hours=48)).timestamp()
+        assert len(candles) >= 10
+        assert candles[-1].close == Decimal("2500.0")
@@ -0,0 +1,79 @@
+"""
+SQLite bağlantı havuzu testleri
+"""
+import threading
+
+import pytest
+
+from storage.connection_pool import SQLiteConnectionPool, get_pool
+from storage.sqlite_storage import SQLiteStorage
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close_all()
+
+
+class TestSQLiteConnectionPool:
+    """SQLiteConnectionPool testleri"""
+
+    def test_connection_reused_within_thread(self, pool):
+        """Aynı thread'de bağlantı yeniden kullanılmalı"""
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        metrics = pool.get_metrics()
+        assert first is second
+        assert metrics["checkouts"] == 2
+        assert metrics["connections_created"] == 1
+        assert metrics["in_use"] == 0
+
+    def test_pragmas_applied(self, pool):
+        """WAL ve synchronous=NORMAL ayarlanmalı"""
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_separate_connection_per_thread(self, pool):
+        """Her thread kendi bağlantısını almalı"""
+        connections = []
+
+        def worker():
+            with pool.connection() as conn:
+                connections.append(conn)
+
+        with pool.connection() as main_conn:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert connections[0] is not main_conn
+        assert pool.get_metrics()["connections_created"] == 2
+
+    def test_nested_rollback_only_at_outer_block(self, pool):
+        """İç bloktaki hata dış bloğa yayılınca tüm işlem geri alınmalı"""
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE items (name TEXT)")
+
+        with pytest.raises(ValueError):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO items VALUES ('a')")
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO items VALUES ('b')")
+                raise ValueError("boom")
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_storages_share_pool(self, tmp_path):
+        """Aynı db_path için SQLiteStorage örnekleri tek havuzu paylaşmalı"""
+        db_path = str(tmp_path / "shared.db")
+        first = SQLiteStorage(db_path)
+        second = SQLiteStorage(db_path)
+
+        assert first.pool is second.pool is get_pool(db_path)
+        assert first.get_pool_metrics()["open_connections"] >= 1
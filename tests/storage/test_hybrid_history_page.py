@@ -0,0 +1,91 @@
+"""
+Hibrit analiz geçmişi imleçli sayfalama testleri
+"""
+import json
+from datetime import timedelta
+
+import pytest
+
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+
+
+def insert_analysis(storage, timestamp, signal="BUY", timeframe="1h"):
+    gram = {"trend": "BULLISH", "indicators": {"rsi": 41.5, "macd": {"histogram": 0.2}}, "signal": signal,
+            "stop_loss": 2480.0, "take_profit": 2550.0, "padding": "x" * 2000}
+    global_ = {"trend_direction": "BULLISH", "trend_strength": "STRONG", "momentum": {"signal": "UP"},
+               "volatility": {"level": "LOW"}, "supportive_of_signal": True}
+    currency = {"risk_level": "LOW", "volatility": {"level": "LOW"}, "position_size_multiplier": 0.8,
+                "intervention_risk": {"has_risk": False}, "trend_alignment": True}
+    with storage.get_connection() as conn:
+        conn.execute("""
+            INSERT INTO hybrid_analysis (
+                timestamp, timeframe, gram_price, signal, signal_strength, confidence,
+                position_size, stop_loss, take_profit, risk_reward_ratio, global_trend,
+                global_trend_strength, currency_risk_level, position_multiplier,
+                recommendations, analysis_summary, gram_analysis, global_analysis, currency_analysis
+            ) VALUES (?, ?, 2500.0, ?, 'MODERATE', 0.7, 0.5, 2480.0, 2550.0, 2.5, 'BULLISH',
+                      'STRONG', 'LOW', 0.8, '["al"]', 'özet', ?, ?, ?)
+        """, (timestamp.isoformat(), timeframe, signal, json.dumps(gram), json.dumps(global_), json.dumps(currency)))
+        conn.commit()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "history.db"))
+    base = timezone.now().replace(microsecond=0)
+    # Aynı timestamp'e sahip kayıtlar da (id ile) sıralanabilmeli
+    for i in range(25):
+        insert_analysis(storage, base - timedelta(minutes=i // 2), signal="BUY" if i % 3 else "SELL")
+    return storage
+
+
+class TestHybridAnalysisPage:
+    """get_hybrid_analysis_page testleri"""
+
+    def test_cursor_pages_match_offset_order(self, storage):
+        """İmleçle gezilen sayfalar tam sıralı listeyle aynı olmalı"""
+        expected, _ = storage.get_hybrid_analysis_page(limit=100, include_details=False)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = storage.get_hybrid_analysis_page(limit=7, before=cursor, include_details=False)
+            seen.extend(row["id"] for row in page)
+            if cursor is None:
+                break
+
+        assert seen == [row["id"] for row in expected]
+        assert len(seen) == 25
+
+    def test_new_rows_do_not_shift_next_page(self, storage):
+        """Yeni kayıt eklenince sonraki sayfa kaymamalı"""
+        first, cursor = storage.get_hybrid_analysis_page(limit=5)
+        second_before, _ = storage.get_hybrid_analysis_page(limit=5, before=cursor)
+
+        insert_analysis(storage, timezone.now() + timedelta(minutes=5))
+        second_after, _ = storage.get_hybrid_analysis_page(limit=5, before=cursor)
+
+        assert [r["id"] for r in second_before] == [r["id"] for r in second_after]
+
+    def test_filters_apply_with_cursor(self, storage):
+        page, cursor = storage.get_hybrid_analysis_page(limit=3, signal_type="SELL")
+        rest, _ = storage.get_hybrid_analysis_page(limit=100, before=cursor, signal_type="SELL")
+
+        assert all(row["signal"] == "SELL" for row in page + rest)
+        assert len(page + rest) == storage.get_hybrid_analysis_count(signal_type="SELL")
+
+    def test_details_projected_from_json(self, storage):
+        """Yalnızca liste için gereken detay alanları dönmeli"""
+        page, _ = storage.get_hybrid_analysis_page(limit=1)
+        details = page[0]["details"]
+
+        assert details["gram"] == {"trend": "BULLISH", "indicators": {"rsi": 41.5}, "signal": page[0]["signal"],
+                                   "stop_loss": 2480.0, "take_profit": 2550.0}
+        assert details["global"]["supportive_of_signal"] is True
+        assert details["global"]["momentum"] == {"signal": "UP"}
+        assert details["currency"]["intervention_risk"] == {"has_risk": False}
+        assert page[0]["recommendations"] == ["al"]
+
+    def test_details_skipped(self, storage):
+        page, _ = storage.get_hybrid_analysis_page(limit=1, include_details=False)
+        assert page[0]["details"] == {"gram": {}, "global": {}, "currency": {}}
@@ -0,0 +1,178 @@
+"""
+hybrid_analysis tipli sinyal kolonları testleri
+"""
+import json
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from models.simulation import SimulationConfig, StrategyType
+from simulation.signal_analyzer import SignalAnalyzer
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+
+
+def make_analysis(timeframe="1h", signal="BUY"):
+    return {
+        "timestamp": timezone.now(),
+        "timeframe": timeframe,
+        "gram_price": 2500.0,
+        "signal": signal,
+        "signal_strength": "MODERATE",
+        "confidence": 0.72,
+        "position_size": 0.5,
+        "stop_loss": 2480.0,
+        "take_profit": 2550.0,
+        "risk_reward_ratio": 2.5,
+        "gram_analysis": {
+            "indicators": {
+                "rsi": 28.4,
+                "macd": {"macd_line": 1.2, "histogram": -0.35},
+                "bollinger": {"upper_band": 2540.0, "lower_band": 2490.0, "percent_b": -0.12},
+                "atr": {"atr": 12.5, "atr_percent": 0.5}
+            },
+            "patterns": [{"name": "DOJI", "type": "NEUTRAL", "confidence": 0.5}],
+            "padding": "x" * 2000
+        },
+        "global_trend": {"trend_direction": "BULLISH", "trend_strength": "STRONG"},
+        "currency_risk": {"risk_level": "LOW", "position_size_multiplier": 0.8},
+        "advanced_indicators": {"cci": {"value": -120}},
+        "pattern_analysis": {
+            "pattern_found": True,
+            "best_pattern": {"pattern": "DOUBLE_BOTTOM", "type": "BULLISH", "confidence": 0.81}
+        },
+        "market_regime_analysis": {
+            "status": "success",
+            "trend_regime": {"type": "ranging"},
+            "overall_assessment": {"market_phase": "accumulation"}
+        },
+        "divergence_analysis": {
+            "status": "success",
+            "dominant_divergence": {"type": "regular_bullish", "strength": 0.64, "class_rating": "A"}
+        },
+        "recommendations": ["al"],
+        "summary": "özet"
+    }
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE hybrid_analysis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        timeframe TEXT DEFAULT '15m',
+        gram_price REAL NOT NULL,
+        signal TEXT NOT NULL,
+        signal_strength TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        position_size REAL NOT NULL,
+        stop_loss REAL,
+        take_profit REAL,
+        risk_reward_ratio REAL,
+        global_trend TEXT,
+        global_trend_strength TEXT,
+        currency_risk_level TEXT,
+        position_multiplier REAL,
+        recommendations TEXT,
+        analysis_summary TEXT,
+        gram_analysis TEXT,
+        global_analysis TEXT,
+        currency_analysis TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteStorage(str(tmp_path / "signals.db"))
+
+
+class TestHybridSignalColumns:
+    """save_hybrid_analysis / get_latest_hybrid_signal testleri"""
+
+    def test_save_fills_typed_columns(self, storage):
+        """Kayıt sırasında sıcak alanlar tipli kolonlara yazılmalı"""
+        storage.save_hybrid_analysis(make_analysis())
+
+        latest = storage.get_latest_hybrid_signal("1h")
+
+        assert latest["signal"] == "BUY"
+        assert latest["gram_price"] == Decimal("2500.0")
+        assert latest["rsi"] == pytest.approx(28.4)
+        assert latest["macd_histogram"] == pytest.approx(-0.35)
+        assert latest["atr"] == pytest.approx(12.5)
+        assert latest["bb_position"] == pytest.approx(-0.12)
+        assert latest["market_regime"] == "accumulation"
+        assert latest["divergence_type"] == "regular_bullish"
+        assert latest["divergence_strength"] == pytest.approx(0.64)
+        assert (latest["pattern_name"], latest["pattern_type"]) == ("DOUBLE_BOTTOM", "BULLISH")
+        assert latest["pattern_confidence"] == pytest.approx(0.81)
+        assert storage.get_latest_hybrid_signal("4h") is None
+
+    def test_blobs_are_optional(self, storage):
+        """store_analysis_blobs kapalıyken blob'lar NULL, tipli kolonlar dolu olmalı"""
+        storage.store_analysis_blobs = False
+        storage.save_hybrid_analysis(make_analysis())
+
+        with storage.get_connection() as conn:
+            row = conn.execute("SELECT gram_analysis, pattern_analysis, rsi FROM hybrid_analysis").fetchone()
+
+        assert row["gram_analysis"] is None
+        assert row["pattern_analysis"] is None
+        assert row["rsi"] == pytest.approx(28.4)
+        # Detay okuyucuları boş blob'la çalışmaya devam etmeli
+        assert storage.get_latest_hybrid_analysis("1h")["details"]["gram"] == {}
+
+    def test_migration_backfills_legacy_rows(self, tmp_path):
+        """Eski şemadaki satırlar migration sırasında blob'lardan doldurulmalı"""
+        db_path = str(tmp_path / "legacy.db")
+        gram = {
+            "indicators": {"rsi": 55.0, "macd": {"histogram": 0.4}, "atr": 9.0,
+                           "bollinger": {"percent_b": 0.6}},
+            "patterns": [{"name": "DOJI", "type": "NEUTRAL", "confidence": 0.5},
+                         {"name": "HAMMER", "type": "BULLISH", "confidence": 0.7}]
+        }
+        conn = sqlite3.connect(db_path)
+        conn.execute(LEGACY_SCHEMA)
+        conn.execute("""
+            INSERT INTO hybrid_analysis (timestamp, timeframe, gram_price, signal, signal_strength,
+                                         confidence, position_size, gram_analysis)
+            VALUES (?, '1h', 2500.0, 'SELL', 'WEAK', 0.6, 0.3, ?)
+        """, (timezone.now().isoformat(), json.dumps(gram)))
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(db_path)
+        latest = storage.get_latest_hybrid_signal("1h")
+
+        assert latest["rsi"] == pytest.approx(55.0)
+        assert latest["macd_histogram"] == pytest.approx(0.4)
+        assert latest["atr"] == pytest.approx(9.0)
+        assert latest["bb_position"] == pytest.approx(0.6)
+        assert latest["pattern_name"] == "HAMMER"
+        assert latest["market_regime"] is None
+
+        # Migration sonrası INSERT (advanced_indicators/pattern_analysis dahil) çalışmalı
+        storage.save_hybrid_analysis(make_analysis())
+        assert storage.get_latest_hybrid_signal("1h")["pattern_name"] == "DOUBLE_BOTTOM"
+
+
+class TestSignalFromColumns:
+    """SignalAnalyzer.build_signal_data_from_columns testleri"""
+
+    def test_mean_reversion_uses_percent_b(self, storage):
+        """Tipli kolonlardan kurulan sinyal strateji filtrelerinden geçebilmeli"""
+        storage.save_hybrid_analysis(make_analysis())
+        signal_data = SignalAnalyzer.build_signal_data_from_columns(storage.get_latest_hybrid_signal("1h"))
+
+        assert signal_data["indicators"]["atr"] == pytest.approx(12.5)
+        assert signal_data["indicators"]["patterns"][0]["name"] == "DOUBLE_BOTTOM"
+        assert signal_data["position_size"] == {"lots": 0.5, "multiplier": 0.8}
+
+        analyzer = SignalAnalyzer()
+        config = SimulationConfig(name="mr", strategy_type=StrategyType.MEAN_REVERSION, min_confidence=0.6)
+        assert analyzer.should_open_position(config, signal_data, "1h")
+
+        signal_data["indicators"]["bb"] = {"percent_b": 0.5}
+        assert not analyzer.should_open_position(config, signal_data, "1h")
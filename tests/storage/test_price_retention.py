@@ -0,0 +1,136 @@
+"""
+Katmanlı veri saklama (PriceCompactor) testleri
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from storage.retention import PriceCompactor
+from storage.sqlite_storage import INSERT_PRICE_SQL, SQLiteStorage
+from utils import timezone
+
+NOW = timezone.UTC_TZ.localize(datetime(2025, 3, 20, 12, 7))
+START = NOW - timedelta(days=10)
+
+
+def price_at(i):
+    return 2400 + (i % 17) * 0.7 - (i % 5) * 1.3
+
+
+def seed_ticks(storage, stamp=lambda ts: ts):
+    # 10 gün boyunca 20 saniyede bir tick
+    rows = []
+    for i in range(10 * 24 * 180):
+        ts = stamp(START + timedelta(seconds=20 * i))
+        rows.append((ts, 2650.0 + i * 0.001, 34.0, price_at(i) * 31.1035, price_at(i), "test"))
+    with storage.get_connection() as conn:
+        conn.executemany(INSERT_PRICE_SQL, rows)
+    return storage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return seed_ticks(SQLiteStorage(str(tmp_path / "retention.db")))
+
+
+@pytest.fixture
+def tr_storage(tmp_path):
+    """Collector gibi +03:00 ofsetli zaman damgaları"""
+    return seed_ticks(SQLiteStorage(str(tmp_path / "retention_tr.db")), timezone.to_turkey_time)
+
+
+def hourly_ohlc(ticks):
+    """(epoch, ..., gram) tick'lerinden saatlik OHLC"""
+    candles = {}
+    for epoch, _, _, _, price in ticks:
+        key = epoch // 3600
+        if key not in candles:
+            candles[key] = [price, price, price, price]
+        else:
+            candle = candles[key]
+            candle[1] = max(candle[1], price)
+            candle[2] = min(candle[2], price)
+            candle[3] = price
+    return candles
+
+
+def count(storage, sql, params=()):
+    with storage.get_connection() as conn:
+        return conn.execute(sql, params).fetchone()[0]
+
+
+class TestPriceCompactor:
+    """PriceCompactor testleri"""
+
+    def test_compacts_old_ticks_into_rollups(self, storage):
+        """Kesimden eski tick'ler silinmeli, 1m/15m rollup'lar doğru OHLC ile yazılmalı"""
+        total = count(storage, "SELECT COUNT(*) FROM price_data")
+        compactor = PriceCompactor(storage, raw_days=7, rollup_days=30, window_minutes=120)
+
+        result = compactor.run(now=NOW)
+
+        cutoff = str(timezone.UTC_TZ.localize(datetime(2025, 3, 13, 12, 0)))
+        assert count(storage, "SELECT COUNT(*) FROM price_data WHERE timestamp < ?", (cutoff,)) == 0
+        remaining = count(storage, "SELECT COUNT(*) FROM price_data")
+        assert result["ticks_compacted"] == total - remaining
+
+        # 10 Mart 12:07 - 13 Mart 12:00 arası her dakika bir rollup
+        assert count(storage, "SELECT COUNT(*) FROM price_rollups WHERE interval = '1m'") == 3 * 24 * 60 - 7
+        assert count(storage, "SELECT SUM(tick_count) FROM price_rollups WHERE interval = '15m'") == result["ticks_compacted"]
+
+        with storage.get_connection() as conn:
+            row = conn.execute("""
+                SELECT open, high, low, close, tick_count, ons_usd_close FROM price_rollups
+                WHERE interval = '15m' ORDER BY timestamp LIMIT 1
+            """).fetchone()
+        prices = [price_at(i) for i in range(24)]  # 12:07 - 12:15 arası 24 tick
+        assert (row["open"], row["close"], row["tick_count"]) == (prices[0], prices[-1], 24)
+        assert (row["high"], row["low"]) == (max(prices), min(prices))
+        assert row["ons_usd_close"] == pytest.approx(2650.0 + 23 * 0.001)
+
+        # İkinci tur yapılacak iş bulmamalı
+        assert compactor.run(now=NOW)["ticks_compacted"] == 0
+
+    def test_prunes_minute_rollups_keeps_quarter_hours(self, storage):
+        """1m rollup'lar saklama süresinden sonra silinmeli, 15m'ler kalmalı"""
+        PriceCompactor(storage, raw_days=7, rollup_days=30).run(now=NOW)
+        quarter_hours = count(storage, "SELECT COUNT(*) FROM price_rollups WHERE interval = '15m'")
+
+        result = PriceCompactor(storage, raw_days=7, rollup_days=8).run(now=NOW)
+
+        assert result["rollups_pruned"] > 0
+        oldest_minute = count(storage, "SELECT MIN(timestamp) FROM price_rollups WHERE interval = '1m'")
+        assert oldest_minute == str(timezone.UTC_TZ.localize(datetime(2025, 3, 12, 12, 0)))
+        assert count(storage, "SELECT COUNT(*) FROM price_rollups WHERE interval = '15m'") == quarter_hours
+
+    def test_iter_price_ticks_reads_rollups(self, storage):
+        """Sıkıştırma sonrası tick akışı saatlik mumları aynen üretmeli"""
+        before = hourly_ohlc(storage.iter_price_ticks(START, NOW))
+
+        PriceCompactor(storage, raw_days=7, rollup_days=8).run(now=NOW)
+        ticks = list(storage.iter_price_ticks(START, NOW))
+
+        assert [t[0] for t in ticks] == sorted(t[0] for t in ticks)
+        after = hourly_ohlc(ticks)
+        assert after.keys() == before.keys()
+        for key, candle in before.items():
+            assert after[key] == pytest.approx(candle)
+
+    def test_turkey_stamped_ticks(self, storage, tr_storage):
+        """+03:00 saklanan tick'ler de kesime kadar eksiksiz sıkıştırılmalı"""
+        epoch = "CAST(strftime('%s', timestamp) AS INTEGER)"
+        cutoff = int(timezone.UTC_TZ.localize(datetime(2025, 3, 13, 12, 0)).timestamp())
+        eligible = count(tr_storage, f"SELECT COUNT(*) FROM price_data WHERE {epoch} < ?", (cutoff,))
+        before = list(tr_storage.iter_price_ticks(START, NOW))
+        assert before == list(storage.iter_price_ticks(START, NOW))
+
+        result = PriceCompactor(tr_storage, raw_days=7, rollup_days=30, window_minutes=120).run(now=NOW)
+
+        assert result == PriceCompactor(storage, raw_days=7, rollup_days=30, window_minutes=120).run(now=NOW)
+        assert result["ticks_compacted"] == eligible
+        assert count(tr_storage, f"SELECT COUNT(*) FROM price_data WHERE {epoch} < ?", (cutoff,)) == 0
+        assert count(tr_storage, f"SELECT MIN({epoch}) FROM price_data") == cutoff
+
+        ticks = list(tr_storage.iter_price_ticks(START, NOW))
+        assert ticks == list(storage.iter_price_ticks(START, NOW))
+        assert hourly_ohlc(ticks).keys() == hourly_ohlc(before).keys()
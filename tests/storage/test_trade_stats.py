@@ -0,0 +1,150 @@
+"""
+sim_trade_stats artımlı işlem istatistikleri testleri
+"""
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from models.simulation import ExitReason, PositionStatus, SimulationPosition
+from simulation.position_manager import PositionManager
+from simulation.statistics_manager import StatisticsManager
+from storage import trade_stats
+from storage.create_simulation_tables import create_simulation_tables
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+
+TIMEFRAMES = ("15m", "1h", "4h")
+REASONS = (ExitReason.STOP_LOSS, ExitReason.TAKE_PROFIT, ExitReason.REVERSE_SIGNAL)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    db_path = str(tmp_path / "sim.db")
+    create_simulation_tables(db_path)
+    return SQLiteStorage(db_path)
+
+
+def close_random_trades(storage, count, sim_id=1, seed=3):
+    """Pozisyonları PositionManager ile açıp kapat; net PnL'leri döndür"""
+    rng = np.random.default_rng(seed)
+    manager = PositionManager(storage)
+    start = timezone.now() - timedelta(hours=count)
+    pnls = []
+    for i in range(count):
+        position = SimulationPosition(
+            simulation_id=sim_id, timeframe=TIMEFRAMES[i % 3], entry_time=start,
+            entry_price=Decimal("2500"), entry_spread=Decimal("1"), entry_commission=Decimal("1"),
+            position_size=Decimal("1"), allocated_capital=Decimal("250"), risk_amount=Decimal("5"),
+            stop_loss=Decimal("2480"), take_profit=Decimal("2550"), entry_confidence=0.7
+        )
+        position.id = manager.save_position(position)
+
+        pnl = round(float(rng.normal(0.5, 10)), 2) if i % 7 else 0.0
+        pnls.append(pnl)
+        position.status = PositionStatus.CLOSED
+        position.exit_time = start + timedelta(hours=i, minutes=30)
+        position.exit_price = Decimal("2500")
+        position.exit_spread = Decimal("1")
+        position.exit_commission = Decimal("1")
+        position.exit_reason = REASONS[i % 3]
+        position.gross_profit_loss = Decimal(str(pnl))
+        position.net_profit_loss = Decimal(str(pnl))
+        position.profit_loss_pct = pnl / 250 * 100
+        position.holding_period_minutes = 30
+        manager.update_position_close(position)
+    return pnls
+
+
+def reference_aggregate(conn, where="", params=()):
+    """Eski sim_positions toplama sorgusu"""
+    return conn.execute(f"""
+        SELECT COUNT(*),
+               SUM(CASE WHEN net_profit_loss > 0 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN net_profit_loss < 0 THEN 1 ELSE 0 END),
+               SUM(net_profit_loss),
+               AVG(CASE WHEN net_profit_loss > 0 THEN net_profit_loss END),
+               AVG(CASE WHEN net_profit_loss < 0 THEN ABS(net_profit_loss) END),
+               AVG(profit_loss_pct), MAX(net_profit_loss), MIN(net_profit_loss)
+        FROM sim_positions WHERE status = 'CLOSED'{where}
+    """, params).fetchone()
+
+
+def as_tuple(stats):
+    return (stats["total_trades"], stats["winning_trades"], stats["losing_trades"], stats["total_pnl"],
+            stats["avg_win"], stats["avg_loss"], stats["avg_pnl_pct"], stats["best_trade"], stats["worst_trade"])
+
+
+class TestTradeStats:
+    """Özet kovaları ve okuyucular"""
+
+    def test_buckets_match_full_aggregation(self, storage):
+        pnls = close_random_trades(storage, 40)
+
+        with storage.get_connection() as conn:
+            cursor = conn.cursor()
+            assert as_tuple(trade_stats.get_bucket(cursor, 1)) == pytest.approx(reference_aggregate(conn))
+            for timeframe, stats in trade_stats.get_buckets(cursor, 1, "timeframe").items():
+                expected = reference_aggregate(conn, " AND timeframe = ?", (timeframe,))
+                assert as_tuple(stats) == pytest.approx(expected)
+            assert sum(s["total_trades"] for s in trade_stats.get_buckets(cursor, 1, "exit_reason").values()) == 40
+
+            # Kümülatif PnL zirvesi / en büyük düşüş ve işlem başına Sharpe
+            equity = np.concatenate(([0.0], np.cumsum(pnls)))
+            stats = trade_stats.get_bucket(cursor, 1)
+            assert stats["max_drawdown"] == pytest.approx(float(np.max(np.maximum.accumulate(equity) - equity)))
+            assert stats["peak_equity"] == pytest.approx(float(equity.max()))
+            assert stats["sharpe_ratio"] == pytest.approx(np.mean(pnls) / np.std(pnls, ddof=1))
+
+            # Saatlik pencere: son 10 işlemin ilkinin kapandığı saatten itibaren
+            since = conn.execute(
+                "SELECT exit_time FROM sim_positions ORDER BY exit_time DESC LIMIT 1 OFFSET 9"
+            ).fetchone()[0]
+            window = trade_stats.window_totals(cursor, timezone.parse_timestamp(since))
+            assert window["total_trades"] == 10
+            assert window["total_pnl"] == pytest.approx(sum(pnls[-10:]))
+
+            # Baştan oluşturma artımlı sonuçla aynı olmalı
+            before = conn.execute("SELECT * FROM sim_trade_stats ORDER BY 1, 2, 3").fetchall()
+            assert trade_stats.rebuild_trade_stats(cursor) == 40
+            after = conn.execute("SELECT * FROM sim_trade_stats ORDER BY 1, 2, 3").fetchall()
+            assert [row[:-1] for row in after] == pytest.approx([row[:-1] for row in before])
+
+    def test_statistics_manager_reads_summary(self, storage):
+        close_random_trades(storage, 12, sim_id=5)
+        capitals = {5: {tf: SimpleNamespace(current_capital=Decimal("260")) for tf in TIMEFRAMES}}
+        with storage.get_connection() as conn:
+            conn.execute("INSERT INTO simulations (id, name, strategy_type, start_date) VALUES (5, 's', 'MAIN', ?)",
+                         (timezone.now(),))
+
+        StatisticsManager(storage).update_simulation_stats(5, capitals)
+
+        with storage.get_connection() as conn:
+            row = conn.execute(
+                "SELECT total_trades, winning_trades, losing_trades, total_profit_loss, max_drawdown "
+                "FROM simulations WHERE id = 5"
+            ).fetchone()
+            expected = reference_aggregate(conn, " AND simulation_id = 5")
+        assert row[:4] == pytest.approx(expected[:4])
+        assert row[4] >= 0
+
+    def test_existing_positions_backfilled_on_init(self, storage):
+        """Özet tablosu olmayan veritabanında mevcut kapanmış pozisyonlardan doldurulur"""
+        with storage.get_connection() as conn:
+            conn.execute("DROP TABLE sim_trade_stats")
+            conn.execute("""
+                INSERT INTO sim_positions (simulation_id, timeframe, status, entry_time, entry_price,
+                    entry_spread, entry_commission, position_size, allocated_capital, risk_amount,
+                    stop_loss, take_profit, exit_time, exit_reason, net_profit_loss, profit_loss_pct)
+                VALUES (2, '1h', 'CLOSED', '2025-03-01 10:00:00+03:00', 2500, 1, 1, 1, 250, 5,
+                    2480, 2550, '2025-03-01 12:15:00+03:00', 'TAKE_PROFIT', 12.5, 5.0)
+            """)
+
+        reopened = SQLiteStorage(storage.db_path)
+        with reopened.get_connection() as conn:
+            cursor = conn.cursor()
+            assert trade_stats.get_bucket(cursor, 2)["total_pnl"] == 12.5
+            assert list(trade_stats.get_buckets(cursor, 2, "hour")) == ["2025-03-01 12"]
+            assert list(trade_stats.get_buckets(cursor, 2, "day_timeframe", "2025-03-01|")) == ["2025-03-01|1h"]
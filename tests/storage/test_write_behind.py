@@ -0,0 +1,143 @@
+"""
+Write-behind yazma kuyruğu testleri
+"""
+import sqlite3
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+from models.price_data import PriceData
+from storage.sqlite_storage import SQLiteStorage
+from storage.write_behind import WriteBehindQueue
+from utils import timezone
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "write_behind.db"))
+    with storage.get_connection() as conn:
+        conn.execute("CREATE TABLE events (seq INTEGER PRIMARY KEY, kind TEXT)")
+    return storage
+
+
+def count_rows(storage, table):
+    with storage.get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestWriteBehindQueue:
+    """WriteBehindQueue testleri"""
+
+    def test_writes_are_batched_until_flush(self, storage):
+        """Yazmalar flush'a kadar bekletilmeli ve tek flush'ta yazılmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        for seq in range(50):
+            queue.put("INSERT INTO events VALUES (?, ?)", (seq, "tick"))
+
+        assert count_rows(storage, "events") == 0
+        assert queue.flush() == 50
+        assert count_rows(storage, "events") == 50
+        assert queue.get_stats()["flushes"] == 1
+
+    def test_order_preserved_across_statements(self, storage):
+        """Farklı SQL'ler geliş sırasıyla uygulanmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        queue.put("INSERT INTO events VALUES (?, ?)", (1, "open"))
+        queue.put("UPDATE events SET kind = ? WHERE seq = ?", ("closed", 1))
+        queue.put("INSERT INTO events VALUES (?, ?)", (2, "open"))
+        queue.flush()
+
+        with storage.get_connection() as conn:
+            rows = conn.execute("SELECT seq, kind FROM events ORDER BY seq").fetchall()
+        assert [tuple(r) for r in rows] == [(1, "closed"), (2, "open")]
+
+    def test_backpressure_flushes_inline(self, storage):
+        """max_pending'e ulaşınca yazan taraf flush yapmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60, max_pending=10)
+        for seq in range(10):
+            queue.put("INSERT INTO events VALUES (?, ?)", (seq, "tick"))
+
+        assert queue.pending_count() == 0
+        assert queue.get_stats()["backpressure_flushes"] == 1
+        assert count_rows(storage, "events") == 10
+
+    def test_bad_row_does_not_drop_batch(self, storage):
+        """Hatalı satır atlanmalı, diğerleri yazılmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        queue.put("INSERT INTO events VALUES (?, ?)", (1, "a"))
+        queue.put("INSERT INTO events VALUES (?, ?)", (1, "duplicate"))
+        queue.put("INSERT INTO events VALUES (?, ?)", (2, "b"))
+
+        assert queue.flush() == 2
+        assert queue.get_stats()["dropped"] == 1
+        assert count_rows(storage, "events") == 2
+
+    def test_bad_statement_does_not_block_queue(self, storage):
+        """Şema hatası yeniden denenmemeli, diğer yazmalar geçmeli"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        queue.put("INSERT INTO events VALUES (?, ?)", (1, "a"))
+        queue.put("INSERT INTO missing_table VALUES (?)", (1,))
+        queue.put("INSERT INTO events VALUES (?, ?)", (2, "b"))
+
+        assert queue.flush() == 2
+        assert queue.pending_count() == 0
+        assert queue.get_stats()["dropped"] == 1
+        assert queue.get_stats()["retried_flushes"] == 0
+        assert count_rows(storage, "events") == 2
+
+        queue.put("INSERT INTO events VALUES (?, ?)", (3, "c"))
+        assert queue.flush() == 1
+
+    def test_lock_errors_are_retried_up_to_limit(self, storage, monkeypatch):
+        """Kilit hatası sınırlı sayıda yeniden denenmeli, sonra tek tek yazılmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60, max_retries=2)
+        queue.put("INSERT INTO events VALUES (?, ?)", (1, "a"))
+
+        write = queue._write
+
+        def locked_batch(batch):
+            if len(batch) > 1 or queue.get_stats()["retried_flushes"] < 2:
+                raise sqlite3.OperationalError("database is locked")
+            write(batch)
+
+        monkeypatch.setattr(queue, "_write", locked_batch)
+        queue.put("INSERT INTO events VALUES (?, ?)", (2, "b"))
+
+        assert queue.flush() == 0
+        assert queue.flush() == 0
+        assert queue.pending_count() == 2
+        assert queue.flush() == 2
+        assert queue.get_stats()["retried_flushes"] == 2
+        assert count_rows(storage, "events") == 2
+
+    def test_close_is_durable(self, storage):
+        """close() arka plan thread'ini durdurup bekleyenleri yazmalı"""
+        queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        queue.start()
+        for seq in range(5):
+            queue.put("INSERT INTO events VALUES (?, ?)", (seq, "tick"))
+        queue.close(timeout=5)
+
+        assert count_rows(storage, "events") == 5
+        assert queue.pending_count() == 0
+
+
+class TestStorageWriteBehind:
+    """SQLiteStorage entegrasyonu"""
+
+    def test_save_price_is_visible_to_reads(self, storage):
+        """Kuyruktaki fiyatlar okuma öncesi yazılmalı"""
+        storage.write_queue = WriteBehindQueue(storage, max_batch=1000, flush_interval=60)
+        base = timezone.utc_now()
+        for i in range(3):
+            storage.save_price(PriceData(
+                timestamp=base + timedelta(seconds=i),
+                ons_usd=Decimal("2400"), usd_try=Decimal("34"),
+                ons_try=Decimal("81600"), gram_altin=Decimal(str(2600 + i))
+            ))
+
+        assert storage.write_queue.pending_count() == 3
+        latest = storage.get_latest_price()
+        assert latest.gram_altin == Decimal("2602.0")
+        assert len(storage.get_latest_prices(10)) == 3
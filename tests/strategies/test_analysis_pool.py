@@ -0,0 +1,120 @@
+"""
+AnalysisProcessPool testleri
+"""
+import asyncio
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from models.market_data import GramAltinCandle
+from models.price_data import PriceData
+from strategies.analysis_pool import (
+    AnalysisProcessPool, decode_candles, decode_market_data, encode_candles, encode_market_data
+)
+from strategies.hybrid_strategy import HybridStrategy
+from utils import timezone
+
+START = timezone.UTC_TZ.localize(datetime(2025, 1, 6, 6, 0))
+
+
+def make_candles(count=40, interval="15m"):
+    candles = []
+    for i in range(count):
+        close = 3000 + 15 * math.sin(i / 4) + i * 0.8
+        candles.append(GramAltinCandle(
+            timestamp=timezone.to_turkey_time(START + timedelta(minutes=15 * i)),
+            open=Decimal(str(round(close - 2, 2))), high=Decimal(str(round(close + 4, 2))),
+            low=Decimal(str(round(close - 5, 2))), close=Decimal(str(round(close, 2))),
+            interval=interval
+        ))
+    return candles
+
+
+def make_market_data(count=80):
+    return [
+        PriceData(
+            timestamp=START + timedelta(minutes=i),
+            ons_usd=Decimal(str(round(2650 + math.sin(i / 9) * 5, 2))),
+            usd_try=Decimal("34.25"),
+            ons_try=Decimal(str(round((2650 + math.sin(i / 9) * 5) * 34.25, 2))),
+            gram_altin=Decimal(str(round(3000 + math.sin(i / 9) * 5, 2))) if i % 10 else None
+        )
+        for i in range(count)
+    ][::-1]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = AnalysisProcessPool(max_workers=2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestEncoding:
+    """Dizi kodlama testleri"""
+
+    def test_candles_round_trip(self):
+        candles = make_candles(5)
+        decoded = decode_candles(encode_candles(candles), "15m")
+        assert [c.close for c in decoded] == [c.close for c in candles]
+        assert [c.timestamp for c in decoded] == [c.timestamp for c in candles]
+
+    def test_market_data_round_trip_keeps_missing_gram(self):
+        data = make_market_data(12)
+        decoded = decode_market_data(encode_market_data(data))
+        assert [p.gram_altin for p in decoded] == [p.gram_altin for p in data]
+        assert [p.ons_try for p in decoded] == [p.ons_try for p in data]
+
+
+class TestAnalysisProcessPool:
+    """Süreç havuzu testleri"""
+
+    @pytest.mark.asyncio
+    async def test_matches_in_process_analysis(self, pool):
+        """Worker sonucu aynı girdilerle süreç içi analizle aynı olmalı"""
+        candles, market_data = make_candles(), make_market_data()
+
+        result = await pool.analyze(candles, market_data, "15m")
+        expected = HybridStrategy().analyze(candles, market_data, "15m")
+
+        assert isinstance(result, dict)
+        assert result["signal"] == expected["signal"]
+        assert result["confidence"] == pytest.approx(expected["confidence"])
+        assert result["gram_price"] == expected["gram_price"]
+
+    @pytest.mark.asyncio
+    async def test_timeframes_run_concurrently(self, pool):
+        """Birden fazla timeframe aynı anda gönderilebilmeli"""
+        market_data = make_market_data()
+        results = await asyncio.gather(*[
+            pool.analyze(make_candles(interval=tf), market_data, tf) for tf in ("15m", "1h", "4h")
+        ])
+
+        assert len(results) == 3
+        assert all(r["signal"] in ("BUY", "SELL", "HOLD") for r in results)
+        assert pool.get_stats()["calls"] >= 3
+        assert pool.get_stats()["fallbacks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_stage_timings_merged(self, monkeypatch):
+        """Worker'da ölçülen aşama süreleri ana sürecin profil kaydına eklenmeli"""
+        from utils import stage_profiler
+
+        # Spawn edilen worker ayarı ortamdan okur
+        monkeypatch.setenv("STAGE_PROFILING", "true")
+        profiler = stage_profiler.StageProfiler(enabled=True)
+        monkeypatch.setattr(stage_profiler, "_stage_profiler", profiler)
+
+        pool = AnalysisProcessPool(max_workers=1)
+        try:
+            result = await pool.analyze(make_candles(), make_market_data(), "15m")
+        finally:
+            pool.shutdown()
+
+        assert "stage_timings" not in result
+        stages = profiler.snapshot()["15m"]
+        assert stages["total"]["count"] == 1
+        assert {"gram_analysis", "smc", "combiner"} <= set(stages)
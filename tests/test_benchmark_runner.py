@@ -0,0 +1,68 @@
+"""
+Benchmark runner testleri - ölçüm, karşılaştırma ve regresyon kapısı
+"""
+import pytest
+
+from benchmarks import runner
+from benchmarks.__main__ import main
+
+
+def document(**medians):
+    return {"meta": {}, "results": {key: {"median": value} for key, value in medians.items()}}
+
+
+class TestCompare:
+    """runner.compare / has_regressions testleri"""
+
+    def test_flags_slowdown_above_threshold(self):
+        """Eşiği aşan yavaşlama regresyon, hızlanma improved olmalı"""
+        baseline = document(a=1.0, b=1.0, c=1.0, gone=1.0)
+        current = document(a=1.1, b=1.5, c=0.5, added=2.0)
+
+        rows = {row["benchmark"]: row for row in runner.compare(baseline, current, threshold=0.2)}
+
+        assert rows["a"]["status"] == "ok"
+        assert rows["b"]["status"] == "regression"
+        assert rows["b"]["ratio"] == pytest.approx(1.5)
+        assert rows["c"]["status"] == "improved"
+        assert rows["gone"]["status"] == "missing"
+        assert rows["added"]["status"] == "new"
+        assert runner.has_regressions(list(rows.values()))
+        assert not runner.has_regressions(runner.compare(baseline, document(a=1.0), threshold=0.2))
+
+    def test_error_in_current_run_fails_gate(self):
+        """Hata veren benchmark kapıyı kapatmalı"""
+        current = {"results": {"a": {"error": "ValueError: boom"}}}
+
+        rows = runner.compare(document(a=1.0), current)
+
+        assert rows[0]["status"] == "error"
+        assert runner.has_regressions(rows)
+        assert "ERROR" in runner.format_report(rows)
+
+
+class TestRunner:
+    """measure / CLI testleri"""
+
+    def test_measure_reports_per_call_time(self):
+        """Döngü sayısı min_time'a göre ayarlanmalı, süre çağrı başına verilmeli"""
+        calls = []
+        result = runner.measure(lambda: calls.append(1), repeat=3, min_time=0.01)
+
+        assert result["samples"] == 3
+        assert result["loops"] > 1
+        assert result["min"] <= result["median"] < 0.01
+        assert len(calls) >= result["loops"] * 3
+
+    def test_cli_run_and_compare(self, tmp_path, capsys):
+        """run sonucu JSON'a yazılmalı; aynı sonuçla karşılaştırma regresyonsuz geçmeli"""
+        output = str(tmp_path / "current.json")
+
+        assert main(["run", "-k", "indicators.rsi[1k]", "--repeat", "2", "--min-time", "0.01",
+                     "--output", output]) == 0
+        result = runner.load(output)
+        assert list(result["results"]) == ["indicators.rsi[1k]"]
+        assert result["meta"]["profile"] == "quick"
+
+        assert main(["compare", output, output]) == 0
+        assert "0 regression" in capsys.readouterr().out
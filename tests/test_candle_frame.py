@@ -0,0 +1,58 @@
+"""
+CandleFrame (kolon bazlı mum verisi) testleri
+"""
+import numpy as np
+import pytest
+
+from models.candle_frame import CandleFrame, OHLCV_COLUMNS
+from tests.test_helpers import generate_trending_candles
+
+
+class TestCandleFrame:
+    """CandleFrame testleri"""
+
+    @pytest.fixture
+    def candles(self):
+        return generate_trending_candles(2000, 60)
+
+    def test_from_candles_columns(self, candles):
+        """Kolonlar mumlarla birebir eşleşmeli"""
+        frame = CandleFrame.from_candles(candles)
+
+        assert len(frame) == 60
+        assert frame.close.dtype == np.float64
+        assert frame.timestamps.dtype == np.int64
+        assert frame.close[-1] == pytest.approx(float(candles[-1].close))
+        assert frame.high[0] == pytest.approx(float(candles[0].high))
+        assert frame.timestamps[-1] == int(candles[-1].timestamp.timestamp())
+
+    def test_arrays_are_read_only(self, candles):
+        """Paylaşılan diziler değiştirilememeli"""
+        frame = CandleFrame.from_candles(candles)
+
+        with pytest.raises(ValueError):
+            frame.close[0] = 0.0
+
+    def test_dataframe_is_zero_copy_and_isolated(self, candles):
+        """DataFrame kopyasız olmalı, üzerindeki değişiklikler diğer analizlere sızmamalı"""
+        frame = CandleFrame.from_candles(candles)
+        df = frame.to_dataframe()
+
+        assert list(df.columns) == ["open", "high", "low", "close"]
+        assert np.shares_memory(df["close"].to_numpy(), frame.close)
+
+        df["prev_close"] = df["close"].shift(1)
+        df.loc[0, "close"] = -1.0
+
+        fresh = frame.to_dataframe(OHLCV_COLUMNS)
+        assert "prev_close" not in fresh.columns
+        assert fresh["close"].iloc[0] == pytest.approx(float(candles[0].close))
+
+    def test_tail_is_view(self, candles):
+        """tail kopyasız dilim döndürmeli"""
+        frame = CandleFrame.from_candles(candles)
+        last = frame.tail(10)
+
+        assert len(last) == 10
+        assert np.shares_memory(last.close, frame.close)
+        assert last.close[-1] == frame.close[-1]
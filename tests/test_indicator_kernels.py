@@ -0,0 +1,215 @@
+"""
+Vektörel gösterge çekirdekleri için parity testleri
+
+Referanslar, göstergelerin eski Python döngüsü / pandas uygulamalarıdır.
+"""
+import statistics
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import kernels
+from indicators.atr import ATRIndicator
+from indicators.bollinger_bands import BollingerBandsIndicator
+from indicators.cci import CCI
+from indicators.macd import MACDIndicator
+from indicators.market_regime import MarketRegimeDetector
+from indicators.mfi import MFI
+from indicators.rsi import RSIIndicator
+from indicators.stochastic import StochasticIndicator
+from tests.test_helpers import MockCandle
+
+
+def reference_ema(values, period):
+    """Eski MACDIndicator.calculate_ema (Decimal döngüsü)"""
+    multiplier = Decimal(2) / (period + 1)
+    ema_values = [sum(values[:period]) / period]
+    for value in values[period:]:
+        ema_values.append((value - ema_values[-1]) * multiplier + ema_values[-1])
+    return ema_values
+
+
+def reference_wilder(values, period):
+    """Eski Wilder smoothing döngüsü"""
+    smoothed = [np.mean(values[:period])]
+    for value in values[period:]:
+        smoothed.append((smoothed[-1] * (period - 1) + value) / period)
+    return smoothed
+
+
+@pytest.fixture
+def ohlc():
+    """Rastgele yürüyüşlü OHLC verisi"""
+    rng = np.random.default_rng(42)
+    close = 2400 + np.cumsum(rng.normal(0, 5, 150))
+    high = close + rng.uniform(0.5, 6, 150)
+    low = close - rng.uniform(0.5, 6, 150)
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close})
+
+
+@pytest.fixture
+def decimal_candles(ohlc):
+    """Analizde kullanılan Decimal fiyatlı mumlar"""
+    return [
+        MockCandle(
+            Decimal(str(round(row.open, 3))),
+            close_price=Decimal(str(round(row.close, 3))),
+            high_price=Decimal(str(round(row.high, 3))),
+            low_price=Decimal(str(round(row.low, 3)))
+        )
+        for row in ohlc.itertuples()
+    ]
+
+
+class TestKernels:
+    """Çekirdek fonksiyon testleri"""
+
+    def test_ema_matches_decimal_loop(self, ohlc):
+        closes = [Decimal(str(v)) for v in ohlc['close']]
+        expected = [float(v) for v in reference_ema(closes, 12)]
+
+        np.testing.assert_allclose(kernels.ema(ohlc['close'], 12), expected, rtol=1e-10)
+
+    def test_ema_adjustless_matches_pandas(self, ohlc):
+        expected = ohlc['close'].ewm(alpha=2 / 27, adjust=False).mean()
+
+        np.testing.assert_allclose(kernels.ema_adjustless(ohlc['close'], 2 / 27), expected, rtol=1e-10)
+
+    def test_rma_matches_wilder_loop(self, ohlc):
+        values = ohlc['close'].diff().abs().dropna().values
+
+        np.testing.assert_allclose(kernels.rma(values, 14), reference_wilder(values, 14), rtol=1e-10)
+
+    def test_rolling_windows_match_pandas(self, ohlc):
+        close = ohlc['close']
+        rolling = close.rolling(20)
+
+        np.testing.assert_allclose(kernels.rolling_mean(close, 20), rolling.mean().dropna(), rtol=1e-10)
+        np.testing.assert_allclose(kernels.rolling_std(close, 20), rolling.std().dropna(), rtol=1e-8)
+        np.testing.assert_allclose(kernels.rolling_max(close, 20), rolling.max().dropna())
+        np.testing.assert_allclose(kernels.rolling_min(close, 20), rolling.min().dropna())
+
+    def test_true_range_and_directional_movement(self, ohlc):
+        prev_close = ohlc['close'].shift(1)
+        expected_tr = pd.concat([
+            ohlc['high'] - ohlc['low'],
+            (ohlc['high'] - prev_close).abs(),
+            (ohlc['low'] - prev_close).abs()
+        ], axis=1).max(axis=1)
+        np.testing.assert_allclose(kernels.true_range(ohlc['high'], ohlc['low'], ohlc['close']), expected_tr)
+
+        up, down = np.array([2.0, -1.0, 1.0]), np.array([1.0, 3.0, 1.0])
+        plus_dm, minus_dm = kernels.directional_movement(up, down)
+        assert plus_dm.tolist() == [2.0, 0.0, 0.0]
+        assert minus_dm.tolist() == [0.0, 3.0, 0.0]
+
+    def test_short_input_returns_empty(self):
+        assert len(kernels.ema([1.0, 2.0], 5)) == 0
+        assert len(kernels.rolling_mean([1.0, 2.0], 5)) == 0
+        assert np.isnan(kernels.rma_last([1.0], 5))
+
+
+class TestIndicatorParity:
+    """Göstergelerin kernel'e taşınmış hallerinin eski çıktılarla uyumu"""
+
+    def test_macd_parity(self, decimal_candles):
+        result = MACDIndicator().calculate(decimal_candles)
+
+        closes = [c.close for c in decimal_candles]
+        fast, slow = reference_ema(closes, 12), reference_ema(closes, 26)
+        macd_line = [fast[14 + i] - slow[i] for i in range(len(slow))]
+        signal = reference_ema(macd_line, 9)
+
+        assert result['macd_line'] == pytest.approx(float(macd_line[-1]), rel=1e-9)
+        assert result['signal_line'] == pytest.approx(float(signal[-1]), rel=1e-9)
+        assert result['histogram'] == pytest.approx(float(macd_line[-1] - signal[-1]), abs=1e-9)
+
+    def test_macd_accepts_float_candles(self, ohlc):
+        candles = [MockCandle(r.open, close_price=r.close, high_price=r.high, low_price=r.low) for r in ohlc.itertuples()]
+
+        assert MACDIndicator().calculate(candles)['macd_line'] is not None
+
+    def test_rsi_parity(self, ohlc):
+        deltas = np.diff(ohlc['close'].values)
+        avg_gain = reference_wilder(np.where(deltas > 0, deltas, 0), 14)[-1]
+        avg_loss = reference_wilder(np.where(deltas < 0, -deltas, 0), 14)[-1]
+        expected = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        rsi, _ = RSIIndicator().calculate(ohlc['close'].tolist())
+        assert rsi == pytest.approx(round(expected, 2))
+
+    def test_atr_parity(self, decimal_candles):
+        true_ranges = [
+            max(float(c.high - c.low), abs(float(c.high - p.close)), abs(float(c.low - p.close)))
+            for p, c in zip(decimal_candles, decimal_candles[1:])
+        ]
+        expected = reference_wilder(true_ranges, 14)[-1]
+
+        assert ATRIndicator().calculate(decimal_candles)['atr'] == pytest.approx(expected, rel=1e-10)
+
+    def test_stochastic_parity(self, decimal_candles):
+        raw_k = []
+        for i in range(13, len(decimal_candles)):
+            window = decimal_candles[i - 13:i + 1]
+            hh, ll = max(c.high for c in window), min(c.low for c in window)
+            raw_k.append(float((window[-1].close - ll) / (hh - ll) * 100))
+        k = [sum(raw_k[i - 2:i + 1]) / 3 for i in range(2, len(raw_k))]
+        d = [sum(k[i - 2:i + 1]) / 3 for i in range(2, len(k))]
+
+        result = StochasticIndicator().calculate(decimal_candles)
+        assert result['k'] == pytest.approx(k[-1], rel=1e-9)
+        assert result['d'] == pytest.approx(d[-1], rel=1e-9)
+        assert result['k_prev'] == pytest.approx(k[-2], rel=1e-9)
+
+    def test_bollinger_parity(self, decimal_candles):
+        indicator = BollingerBandsIndicator()
+        closes = [float(c.close) for c in decimal_candles]
+        std_dev = statistics.stdev(closes[-20:])
+        expected_widths = [
+            2 * statistics.stdev(closes[i - 20:i]) * 2.0 for i in range(20, len(closes))
+        ]
+
+        result = indicator.calculate(decimal_candles)
+        assert result['upper_band'] - result['middle_band'] == pytest.approx(2 * std_dev, rel=1e-9)
+        np.testing.assert_allclose(indicator._calculate_historical_widths(decimal_candles), expected_widths, rtol=1e-9)
+
+    def test_cci_parity(self, ohlc):
+        tp = (ohlc['high'] + ohlc['low'] + ohlc['close']) / 3
+        mad = tp.rolling(20).apply(lambda x: np.abs(x - x.mean()).mean())
+        expected = (tp - tp.rolling(20).mean()) / (0.015 * mad)
+
+        pd.testing.assert_series_equal(CCI().calculate(ohlc), expected, check_names=False, rtol=1e-8)
+
+    def test_mfi_parity(self, ohlc):
+        df = ohlc.assign(volume=np.linspace(1000, 2000, len(ohlc)))
+        tp = (df['high'] + df['low'] + df['close']) / 3
+        flow = tp * df['volume']
+        positive = flow.where(tp.diff() > 0, 0.0).rolling(14).sum()
+        negative = flow.where(tp.diff() < 0, 0.0).rolling(14).sum()
+        expected = 100 - 100 / (1 + positive / negative.replace(0, 0.0001))
+
+        pd.testing.assert_series_equal(MFI().calculate(df), expected, check_names=False, rtol=1e-8)
+
+    def test_market_regime_atr_and_adx_parity(self, ohlc):
+        detector = MarketRegimeDetector()
+        expected_tr = pd.concat([
+            ohlc['high'] - ohlc['low'],
+            (ohlc['high'] - ohlc['close'].shift(1)).abs(),
+            (ohlc['low'] - ohlc['close'].shift(1)).abs()
+        ], axis=1).max(axis=1)
+        np.testing.assert_allclose(detector.calculate_atr(ohlc), reference_wilder(expected_tr.values, 14), rtol=1e-10)
+
+        high_diff, low_diff = ohlc['high'].diff(), ohlc['low'].diff()
+        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0)
+        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0)
+        tr_smooth = expected_tr.rolling(14).mean()
+        plus_di = pd.Series(plus_dm).rolling(14).mean() / tr_smooth * 100
+        minus_di = pd.Series(minus_dm).rolling(14).mean() / tr_smooth * 100
+        dx = ((plus_di - minus_di).abs() / (plus_di + minus_di) * 100).dropna().values
+
+        adx = detector.calculate_adx(ohlc)
+        np.testing.assert_allclose(adx['adx'], reference_wilder(dx, 14), rtol=1e-8)
+        assert len(adx['plus_di']) == len(adx['adx'])
@@ -0,0 +1,92 @@
+"""
+StageProfiler ve /api/perf/stages testleri
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from storage.async_storage import AsyncSQLiteStorage
+from storage.sqlite_storage import SQLiteStorage
+from strategies.hybrid_strategy import HybridStrategy
+from tests.strategies.test_analysis_pool import make_candles, make_market_data
+from utils.stage_profiler import STAGE_SNAPSHOT_NAME, StageProfiler, to_prometheus
+
+
+class TestStageProfiler:
+    """Aşama ölçümü testleri"""
+
+    def test_disabled_profiler_records_nothing(self):
+        """Kapalı profil paylaşılan boş context manager döndürmeli"""
+        strategy = HybridStrategy()
+        strategy.profiler = StageProfiler(enabled=False)
+
+        result = strategy.analyze(make_candles(), make_market_data(), "15m")
+
+        assert "stage_timings" not in result
+        assert strategy.profiler.stage("smc") is strategy.profiler.run("15m")
+        assert strategy.profiler.snapshot() == {}
+
+    def test_analyze_records_each_stage(self):
+        """Her aşama timeframe altında ölçülmeli, toplam aşamaları kapsamalı"""
+        strategy = HybridStrategy()
+        strategy.profiler = StageProfiler(enabled=True)
+
+        result = strategy.analyze(make_candles(), make_market_data(), "15m")
+        strategy.analyze(make_candles(), make_market_data(), "15m")
+
+        timings = result["stage_timings"]
+        expected = {"gram_analysis", "global_trend", "currency_risk", "advanced_indicators", "patterns",
+                    "fibonacci", "smc", "market_regime", "divergence", "dip_peak", "combiner",
+                    "kelly", "risk_levels", "total"}
+        assert set(timings) == expected
+        stage_sum = sum(t["wall"] for name, t in timings.items() if name != "total")
+        assert stage_sum <= timings["total"]["wall"]
+
+        snapshot = strategy.profiler.snapshot()
+        assert list(snapshot) == ["15m"]
+        assert snapshot["15m"]["smc"]["count"] == 2
+        assert snapshot["15m"]["total"]["wall_ms"]["p95"] >= snapshot["15m"]["total"]["wall_ms"]["p50"]
+
+    def test_prometheus_histogram(self):
+        """Kovalar Prometheus'ta kümülatif yazılmalı"""
+        profiler = StageProfiler(enabled=True)
+        profiler.record("1h", "smc", 0.004, 0.003, 10)
+        profiler.record("1h", "smc", 0.2, 0.19, -4)
+        profiler.record("1h", "smc", 20.0, 19.0, 0)
+
+        text = to_prometheus(profiler.snapshot())
+
+        labels = 'timeframe="1h",stage="smc"'
+        assert f'gold_analyzer_stage_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        assert f'gold_analyzer_stage_duration_seconds_bucket{{{labels},le="0.25"}} 2' in text
+        assert f'gold_analyzer_stage_duration_seconds_bucket{{{labels},le="10.0"}} 2' in text
+        assert f'gold_analyzer_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f"gold_analyzer_stage_duration_seconds_count{{{labels}}} 3" in text
+        assert f"gold_analyzer_stage_alloc_blocks_sum{{{labels}}} 6" in text
+
+
+class TestStageMetricsEndpoint:
+    """/api/perf/stages testleri"""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return SQLiteStorage(str(tmp_path / "perf.db"))
+
+    def test_reads_snapshot_written_by_analyzer(self, storage):
+        """Analyzer'ın yazdığı anlık görüntü JSON ve Prometheus olarak okunmalı"""
+        from web_server import app
+
+        profiler = StageProfiler(enabled=True)
+        profiler.record("4h", "divergence", 0.05, 0.04)
+        storage.save_perf_snapshot(STAGE_SNAPSHOT_NAME, profiler.snapshot())
+
+        with patch("web.routes.api.db", AsyncSQLiteStorage(storage)):
+            client = TestClient(app)
+            data = client.get("/api/perf/stages").json()
+            prometheus = client.get("/api/perf/stages", params={"format": "prometheus"})
+
+        assert data["stages"]["4h"]["divergence"]["wall_ms"]["avg"] == pytest.approx(50.0)
+        assert data["updated_at"] is not None
+        assert prometheus.headers["content-type"].startswith("text/plain")
+        assert 'stage="divergence"' in prometheus.text
@@ -0,0 +1,180 @@
+"""
+Artımlı (streaming) göstergeler için testler
+"""
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.atr import ATRIndicator
+from indicators.bollinger_bands import BollingerBandsIndicator
+from indicators.cci import CCI
+from indicators.macd import MACDIndicator
+from indicators.mfi import MFI
+from indicators.rsi import RSIIndicator
+from indicators.stochastic import StochasticIndicator
+from indicators.streaming import StreamingIndicatorSet
+from tests.test_helpers import MockCandle
+
+
+@pytest.fixture
+def candles():
+    """Rastgele yürüyüşlü, zaman damgalı mumlar"""
+    rng = np.random.default_rng(7)
+    close = 2400 + np.cumsum(rng.normal(0, 5, 120))
+    timestamps = pd.date_range("2024-01-01", periods=120, freq="15min", tz="UTC")
+    return [
+        MockCandle(
+            Decimal(str(round(c - rng.normal(0, 2), 3))),
+            close_price=Decimal(str(round(c, 3))),
+            high_price=Decimal(str(round(c + rng.uniform(0.5, 5), 3))),
+            low_price=Decimal(str(round(c - rng.uniform(0.5, 5), 3))),
+            timestamp=ts.to_pydatetime()
+        )
+        for c, ts in zip(close, timestamps)
+    ]
+
+
+def batch_values(candles):
+    """Toplu göstergelerin son değerleri"""
+    df = pd.DataFrame([{
+        'open': float(c.open), 'high': float(c.high), 'low': float(c.low), 'close': float(c.close)
+    } for c in candles])
+    macd = MACDIndicator().calculate(candles)
+    bollinger = BollingerBandsIndicator().calculate(candles)
+    stochastic = StochasticIndicator().calculate(candles)
+    return {
+        'rsi': RSIIndicator().calculate([float(c.close) for c in candles])[0],
+        'macd_line': macd['macd_line'],
+        'histogram': macd['histogram'],
+        'histogram_prev': macd['histogram_prev'],
+        'atr': ATRIndicator().calculate(candles)['atr'],
+        'upper_band': bollinger['upper_band'],
+        'percent_b': bollinger['percent_b'],
+        'k': stochastic['k'],
+        'd': stochastic['d'],
+        'cci': CCI().calculate(df).iloc[-1],
+        'mfi': MFI().calculate(df).iloc[-1]
+    }
+
+
+def streaming_values(snapshot):
+    return {
+        'rsi': snapshot['rsi']['rsi'],
+        'macd_line': snapshot['macd']['macd_line'],
+        'histogram': snapshot['macd']['histogram'],
+        'histogram_prev': snapshot['macd']['histogram_prev'],
+        'atr': snapshot['atr']['atr'],
+        'upper_band': snapshot['bollinger']['upper_band'],
+        'percent_b': snapshot['bollinger']['percent_b'],
+        'k': snapshot['stochastic']['k'],
+        'd': snapshot['stochastic']['d'],
+        'cci': snapshot['cci']['cci'],
+        'mfi': snapshot['mfi']['mfi']
+    }
+
+
+class TestStreamingIndicators:
+    """Artımlı göstergelerin toplu hesaplamayla uyumu"""
+
+    def test_update_matches_batch(self, candles):
+        """Mum mum beslenen göstergeler toplu hesaplama ile aynı olmalı"""
+        indicator_set = StreamingIndicatorSet.from_candles(candles)
+
+        expected = batch_values(candles)
+        actual = streaming_values(indicator_set.snapshot())
+        for name, value in expected.items():
+            assert actual[name] == pytest.approx(value, rel=1e-7), name
+
+    def test_replace_last_matches_batch(self, candles):
+        """Açık mumun ara halleri son değeri etkilememeli"""
+        indicator_set = StreamingIndicatorSet.from_candles(candles[:-1])
+        final = candles[-1]
+
+        for close in (final.low, final.high, final.close):
+            indicator_set.on_candle(MockCandle(
+                final.open, close_price=close, high_price=final.high,
+                low_price=final.low, timestamp=final.timestamp
+            ))
+
+        expected = batch_values(candles)
+        actual = streaming_values(indicator_set.snapshot())
+        for name, value in expected.items():
+            assert actual[name] == pytest.approx(value, rel=1e-7), name
+
+    def test_insufficient_data_returns_none(self, candles):
+        """Periyot dolmadan değer üretilmemeli"""
+        snapshot = StreamingIndicatorSet.from_candles(candles[:5]).snapshot()
+
+        assert snapshot['rsi']['rsi'] is None
+        assert snapshot['macd']['macd_line'] is None
+        assert snapshot['bollinger']['upper_band'] is None
+
+    def test_old_candles_ignored(self, candles):
+        """Son mumdan eski zaman damgalı mumlar yok sayılmalı"""
+        indicator_set = StreamingIndicatorSet.from_candles(candles)
+        before = indicator_set.snapshot()
+
+        indicator_set.on_candle(candles[10])
+
+        assert indicator_set.snapshot() == before
+
+
+class TestLiveIndicatorTracker:
+    """LiveIndicatorTracker testleri"""
+
+    def test_refresh_follows_candle_store(self, candles):
+        """İlk refresh ısınır, sonrakiler sadece son mumları işler"""
+        from unittest.mock import Mock
+        from indicators.streaming import LiveIndicatorTracker
+
+        store = Mock()
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:100][-count:]
+        tracker = LiveIndicatorTracker(store, timeframes={"15m": 15})
+        tracker.refresh()
+
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:101][-count:]
+        tracker.refresh()
+
+        expected = StreamingIndicatorSet.from_candles(candles[:101]).snapshot()
+        assert tracker.snapshot("15m") == expected
+        assert store.get_recent_candles.call_args.args == (15, 2)
+
+    def test_refresh_replays_all_bars_closed_between_reads(self, candles):
+        """Okumalar arasında kapanan tüm mumlar ve son açık mumun kapanışı işlenmeli"""
+        from unittest.mock import Mock
+        from indicators.streaming import LiveIndicatorTracker
+
+        last = candles[99]
+        partial = MockCandle(last.open, close_price=last.open, high_price=last.open,
+                             low_price=last.open, timestamp=last.timestamp)
+        store = Mock()
+        store.get_recent_candles.side_effect = lambda interval, count: (candles[:99] + [partial])[-count:]
+        tracker = LiveIndicatorTracker(store, timeframes={"15m": 15})
+        tracker.refresh()
+
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:106][-count:]
+        tracker.refresh()
+
+        expected = StreamingIndicatorSet.from_candles(candles[:106]).snapshot()
+        actual = tracker.snapshot("15m")
+        assert actual["timestamp"] == expected["timestamp"]
+        for name in StreamingIndicatorSet().indicators:
+            assert actual[name] == pytest.approx(expected[name])
+
+    def test_refresh_rewarms_after_long_gap(self, candles):
+        """Isınma penceresinden uzun boşlukta baştan ısınmalı"""
+        from unittest.mock import Mock
+        from indicators.streaming import LiveIndicatorTracker
+
+        store = Mock()
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:40][-count:]
+        tracker = LiveIndicatorTracker(store, timeframes={"15m": 15}, warm_up_candles=50)
+        tracker.refresh()
+
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:120][-count:]
+        tracker.refresh()
+
+        expected = StreamingIndicatorSet.from_candles(candles[70:120]).snapshot()
+        assert tracker.snapshot("15m") == expected
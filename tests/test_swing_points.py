@@ -0,0 +1,80 @@
+"""
+Paylaşılan swing noktası indeksi (indicators/swing_points) testleri
+"""
+import numpy as np
+import pytest
+from scipy.signal import argrelextrema, find_peaks
+
+from indicators.swing_points import SwingIndex, SwingIndexCache, swing_index
+from strategies.hybrid.structure_manager import StructureManager
+from tests.test_helpers import MockCandle
+
+
+def reference_window_extrema(values, order, reducer):
+    """Eski SMC döngüsü: pencerenin max/min'ine eşit iç noktalar"""
+    return [i for i in range(order, len(values) - order)
+            if values[i] == reducer(values[i - order:i + order + 1])]
+
+
+def series(n, seed=0, levels=8):
+    rng = np.random.default_rng(seed)
+    # Az sayıda seviye: eşit komşular (plato) sık oluşsun
+    return rng.integers(0, levels, n).astype(float)
+
+
+class TestSwingIndex:
+    """SwingIndex / önbellek testleri"""
+
+    @pytest.mark.parametrize("order", [1, 2, 5])
+    def test_matches_reference_finders(self, order):
+        values = series(300, seed=order)
+        swings = SwingIndex(values)
+
+        assert np.array_equal(swings.highs(order), argrelextrema(values, np.greater, order=order)[0])
+        assert np.array_equal(swings.lows(order), argrelextrema(values, np.less, order=order)[0])
+        assert swings.highs(order, strict=False).tolist() == reference_window_extrema(values, order, np.max)
+        assert swings.lows(order, strict=False).tolist() == reference_window_extrema(values, order, np.min)
+        assert np.array_equal(swings.peaks(order), find_peaks(values, distance=order)[0])
+        assert np.array_equal(swings.valleys(order), find_peaks(-values, distance=order)[0])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_extend_matches_full_recompute(self, seed):
+        """Yeni mumlarla genişletilen indeks baştan hesaplananla aynı olmalı"""
+        values = series(250, seed=seed)
+        for n in (0, 3, 120, 240):
+            old = SwingIndex(values[:n])
+            for order in (1, 5, 10):
+                old.highs(order), old.lows(order, strict=False)
+            extended, fresh = old.extend(values), SwingIndex(values)
+            for order in (1, 5, 10):
+                assert np.array_equal(extended.highs(order), fresh.highs(order))
+                assert np.array_equal(extended.lows(order, strict=False), fresh.lows(order, strict=False))
+
+    def test_cache_shares_and_extends_by_content(self):
+        cache = SwingIndexCache(maxsize=4)
+        values = series(200)
+
+        first = swing_index(values[:150], cache)
+        first.highs(5)
+        assert swing_index(list(values[:150]), cache) is first
+        assert cache.stats == {"hits": 1, "extended": 0, "misses": 1}
+
+        # Aynı ön ekli daha uzun seri: hesaplanmış pivotlar taşınır
+        longer = swing_index(values, cache)
+        assert cache.stats["extended"] == 1
+        assert ("high", 5, True) in longer._pivots
+        assert np.array_equal(longer.highs(5), SwingIndex(values).highs(5))
+
+        # Farklı içerik yeni indeks üretir; LRU kapasitesi aşılmaz
+        for seed in range(1, 6):
+            swing_index(series(200, seed=seed), cache)
+        assert len(cache._entries) == 4
+
+    def test_structure_manager_swings(self):
+        """İki yanda ikişer mumdan kesin büyük high; aynı mumda high öncelikli"""
+        highs = [10, 11, 15, 11, 10, 12, 16, 12, 11, 10]
+        lows = [9, 10, 8, 10, 9, 11, 5, 11, 10, 9]
+        candles = [MockCandle(h - 1, close_price=h - 1, high_price=h, low_price=l) for h, l in zip(highs, lows)]
+
+        swings = StructureManager()._find_swing_points(candles)
+        assert [(s["type"], s["index"]) for s in swings] == [("HIGH", 2), ("HIGH", 6)]
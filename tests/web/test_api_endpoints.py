@@ -66,6 +66,7 @@ class TestAPIEndpoints:
         mock_storage.get_connection.return_value = mock_conn
         
         with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage), \
              patch('web.routes.api.stats', mock_stats), \
              patch('web.routes.api.cache.get', return_value=None), \
              patch('web.routes.api.cache.set'), \
@@ -82,7 +83,8 @@ class TestAPIEndpoints:
     
     def test_current_price_endpoint(self, client, mock_storage):
         """Anlık fiyat endpoint'i testi"""
-        with patch('web.routes.api.storage', mock_storage):
+        with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage):
             response = client.get("/api/prices/current")
             assert response.status_code == 200
             
@@ -98,7 +100,8 @@ class TestAPIEndpoints:
         mock_storage = Mock()
         mock_storage.get_latest_price.return_value = None
         
-        with patch('web.routes.api.storage', mock_storage):
+        with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage):
             response = client.get("/api/prices/current")
             assert response.status_code == 200
             
@@ -123,7 +126,8 @@ class TestAPIEndpoints:
         
         mock_storage.get_latest_prices.return_value = mock_prices
         
-        with patch('web.routes.api.storage', mock_storage):
+        with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage):
             response = client.get("/api/prices/latest")
             assert response.status_code == 200
             
@@ -153,6 +157,7 @@ class TestAPIEndpoints:
         mock_storage.get_connection.return_value = mock_conn
         
         with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage), \
              patch('web.routes.api.cache.get', return_value=None), \
              patch('web.routes.api.cache.set'), \
              patch('utils.timezone.now', return_value=timezone.now()):
@@ -187,6 +192,7 @@ class TestAPIEndpoints:
         mock_storage.get_connection.return_value = mock_conn
         
         with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage), \
              patch('web.routes.api.cache.get', return_value=None), \
              patch('web.routes.api.cache.set'), \
              patch('utils.timezone.now', return_value=timezone.now()):
@@ -217,7 +223,8 @@ class TestAPIEndpoints:
         ]
         mock_storage.generate_candles.return_value = mock_candles
         
-        with patch('web.routes.api.storage', mock_storage):
+        with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage):
             response = client.get("/api/candles/15m")
             assert response.status_code == 200
             
@@ -248,6 +255,7 @@ class TestAPIEndpoints:
         mock_storage.generate_gram_candles.return_value = mock_candles
         
         with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage), \
              patch('web.routes.api.cache.get', return_value=None), \
              patch('web.routes.api.cache.set'):
             
@@ -296,6 +304,7 @@ class TestAPIEndpoints:
         mock_storage.get_latest_price.return_value = Mock(gram_altin=1932.0)
         
         with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage), \
              patch('web.routes.api.cache.get', return_value=None), \
              patch('web.routes.api.cache.set'):
             
@@ -340,7 +349,8 @@ class TestAPIEndpoints:
             }
         ]
         
-        with patch('web.routes.api.storage', mock_storage):
+        with patch('web.routes.api.storage', mock_storage), \
+             patch('web.routes.api.db.storage', mock_storage):
             response = client.get("/api/market/overview")
             assert response.status_code == 200
             
@@ -350,6 +360,45 @@ class TestAPIEndpoints:
             assert data["analysis"]["signal"] == "BUY"
             assert data["analysis"]["confidence"] == 85.0
 
+    
+    def test_live_indicators_endpoint(self, client):
+        """Canlı göstergeler okuma anında son mumlarla güncellenir"""
+        from decimal import Decimal
+        from indicators.streaming import LiveIndicatorTracker, StreamingIndicatorSet
+        from tests.test_helpers import MockCandle
+        
+        start = timezone.now().replace(second=0, microsecond=0)
+        candles = [
+            MockCandle(
+                Decimal(str(2400 + i % 7)),
+                close_price=Decimal(str(2401 + (i * 3) % 11)),
+                high_price=Decimal(str(2415 + i % 5)),
+                low_price=Decimal(str(2390 - i % 4)),
+                timestamp=start + timedelta(minutes=15 * i)
+            )
+            for i in range(60)
+        ]
+        store = Mock()
+        store.get_recent_candles.side_effect = lambda interval, count: candles[:50][-count:]
+        tracker = LiveIndicatorTracker(store, timeframes={"15m": 15})
+        
+        with patch('web.routes.api.live_indicators', tracker):
+            response = client.get("/api/indicators/live")
+            assert response.status_code == 200
+            first = response.json()["indicators"]["15m"]
+            
+            # Yeni mum kapandı: ikinci okuma sadece son mumları işler
+            store.get_recent_candles.side_effect = lambda interval, count: candles[:51][-count:]
+            data = client.get("/api/indicators/live?timeframe=15m").json()
+            
+            invalid = client.get("/api/indicators/live?timeframe=5m").json()
+        
+        expected = StreamingIndicatorSet.from_candles(candles[:51]).snapshot()
+        assert data["indicators"]["15m"]["rsi"] == pytest.approx(expected["rsi"])
+        assert data["indicators"]["15m"]["rsi"] != first["rsi"]
+        assert store.get_recent_candles.call_args.args == (15, 2)
+        assert "error" in invalid
+
 
 def mock_open(read_data=""):
     """Mock open fonksiyonu"""
@@ -0,0 +1,131 @@
+"""
+delta1 WebSocket protokolü testleri
+"""
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from storage.sqlite_storage import SQLiteStorage
+from web.handlers.delta_protocol import (
+    PriceDeltaStream, decode_frame, frame_stream_id, state_to_payload, FRAME_SNAPSHOT, FRAME_DELTA
+)
+from web.handlers.publisher import UpdatePublisher
+
+
+def price(second: int, gram: float = 2500.25, ons: float = 2000.5, usd: float = 32.1234):
+    return {"t": f"2026-01-05T10:00:{second:02d}+03:00", "g": gram, "o": ons, "u": usd}
+
+
+def apply(frames, state=None):
+    for frame in frames:
+        seq, state = decode_frame(frame, state)
+    return seq, state
+
+
+class TestPriceDeltaStream:
+    """PriceDeltaStream testleri"""
+
+    def test_first_frame_is_snapshot_then_deltas(self):
+        stream = PriceDeltaStream()
+        first = stream.push(price(0))
+        second = stream.push(price(1, gram=2500.75))
+
+        assert first[0] == FRAME_SNAPSHOT and len(first) == 41
+        assert frame_stream_id(first) == stream.stream_id
+        assert frame_stream_id(second) is None
+        assert second[0] == FRAME_DELTA and len(second) == 21
+        assert len(second) < len(json.dumps({"type": "price", "data": price(1)}))
+
+    def test_deltas_reconstruct_exact_prices(self):
+        stream = PriceDeltaStream()
+        frames = [stream.push(price(i, gram=2500 + i * 0.37, usd=32.1 + i * 0.0001)) for i in range(30)]
+
+        seq, state = apply(frames)
+        payload = state_to_payload(state)
+        assert seq == 30
+        assert payload["g"] == pytest.approx(2500 + 29 * 0.37)
+        assert payload["u"] == pytest.approx(32.1029)
+
+    def test_missing_gram_falls_back_to_snapshot(self):
+        stream = PriceDeltaStream()
+        stream.push(price(0))
+        frame = stream.push(price(1, gram=None))
+
+        assert frame[0] == FRAME_SNAPSHOT
+        assert state_to_payload(decode_frame(frame)[1])["g"] is None
+
+    def test_resume_replays_only_missed_deltas(self):
+        stream = PriceDeltaStream(history=10)
+        frames = [stream.push(price(i, gram=2500 + i)) for i in range(5)]
+        _, client_state = apply(frames[:2])
+
+        replay = stream.replay(since=2, stream_id=stream.stream_id)
+        assert [frame[0] for frame in replay] == [FRAME_DELTA] * 3
+        assert apply(replay, client_state) == apply(frames)
+        assert stream.replay(since=5, stream_id=stream.stream_id) == []
+
+    def test_resume_after_long_gap_sends_snapshot_and_deltas(self):
+        stream = PriceDeltaStream(history=4)
+        frames = [stream.push(price(i, gram=2500 + i)) for i in range(10)]
+
+        replay = stream.replay(since=1, stream_id=stream.stream_id)
+        assert replay[0][0] == FRAME_SNAPSHOT
+        assert len(replay) == 4
+        assert apply(replay) == apply(frames)
+
+    def test_since_from_previous_process_forces_snapshot(self):
+        """Sunucu yeniden başlayınca eski akışın since'i yeni tampona uygulanmamalı"""
+        old = PriceDeltaStream(stream_id=1)
+        old_frames = [old.push(price(i, gram=2400 + i)) for i in range(3)]
+        _, client_state = apply(old_frames)
+
+        new = PriceDeltaStream(stream_id=2)
+        frames = [new.push(price(i, gram=2500 + i)) for i in range(5)]
+
+        replay = new.replay(since=3, stream_id=1)
+        assert len(replay) == 1 and replay[0][0] == FRAME_SNAPSHOT
+        assert frame_stream_id(replay[0]) == 2
+        assert apply(replay, client_state) == apply(frames)
+        # Kimliksiz since de güvenli tarafta kalır
+        assert new.replay(since=3)[0][0] == FRAME_SNAPSHOT
+
+    def test_new_client_gets_current_snapshot(self):
+        stream = PriceDeltaStream()
+        assert stream.replay() == []
+        frames = [stream.push(price(i)) for i in range(3)]
+
+        replay = stream.replay()
+        assert len(replay) == 1 and replay[0][0] == FRAME_SNAPSHOT
+        assert apply(replay) == apply(frames)
+
+
+class TestBinarySubscribers:
+    """Yayıncının delta1 istemcilerine dağıtımı"""
+
+    def test_binary_and_json_clients_share_encoded_frames(self, tmp_path):
+        publisher = UpdatePublisher(SQLiteStorage(str(tmp_path / "ws.db")))
+        json_channel = publisher.subscribe(AsyncMock())
+        binary_channels = [publisher.subscribe(AsyncMock(), binary=True) for _ in range(2)]
+
+        publisher.publish("price", price(0))
+        publisher.publish("perf", {"op": 1})
+
+        assert isinstance(json_channel.queue.get_nowait(), str)
+        first = [channel.queue.get_nowait() for channel in binary_channels]
+        assert isinstance(first[0], bytes) and first[0] is first[1]
+        assert json.loads(binary_channels[0].queue.get_nowait())["type"] == "perf"
+
+    def test_reconnect_with_since_receives_replay(self, tmp_path):
+        publisher = UpdatePublisher(SQLiteStorage(str(tmp_path / "ws.db")))
+        for i in range(5):
+            publisher.publish("price", price(i, gram=2500 + i))
+
+        stream_id = publisher.price_stream.stream_id
+        channel = publisher.subscribe(AsyncMock(), binary=True, since=3, stream_id=stream_id)
+        replay = channel.queue.get_nowait()
+        assert [frame[0] for frame in replay] == [FRAME_DELTA, FRAME_DELTA]
+
+        channel = publisher.subscribe(AsyncMock(), binary=True, since=3, stream_id=stream_id + 1)
+        replay = channel.queue.get_nowait()
+        assert [frame[0] for frame in replay] == [FRAME_SNAPSHOT]
@@ -0,0 +1,104 @@
+"""
+WebSocket yayıncısı testleri
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from models.price_data import PriceData
+from storage.sqlite_storage import SQLiteStorage
+from utils import timezone
+from web.handlers.publisher import UpdatePublisher, ClientChannel
+
+
+def make_socket():
+    websocket = AsyncMock()
+    websocket.send_text = AsyncMock()
+    return websocket
+
+
+class TestUpdatePublisher:
+    """UpdatePublisher testleri"""
+
+    @pytest.fixture
+    def publisher(self, tmp_path):
+        return UpdatePublisher(SQLiteStorage(str(tmp_path / "ws.db")), max_pending=2)
+
+    def test_publish_encodes_once_for_all_clients(self, publisher):
+        """Aynı frame nesnesi tüm kuyruklara konmalı"""
+        channels = [publisher.subscribe(make_socket()) for _ in range(3)]
+
+        assert publisher.publish("price", {"g": 2500.0})
+
+        frames = [channel.queue.get_nowait() for channel in channels]
+        assert all(frame is frames[0] for frame in frames)
+        assert json.loads(frames[0]) == {"type": "price", "data": {"g": 2500.0}}
+
+    def test_unchanged_payload_is_skipped(self, publisher):
+        """İçerik değişmediyse tekrar yayınlanmamalı"""
+        channel = publisher.subscribe(make_socket())
+
+        assert publisher.publish("perf", {"op": 1})
+        assert not publisher.publish("perf", {"op": 1})
+        assert channel.queue.qsize() == 1
+        assert publisher.stats["duplicates_skipped"] == 1
+
+    def test_slow_consumer_dropped(self, publisher):
+        """Kuyruğu dolan istemci diğerlerini etkilemeden düşürülmeli"""
+        slow_socket = make_socket()
+        slow = publisher.subscribe(slow_socket)
+        fast = publisher.subscribe(make_socket())
+
+        for i in range(3):
+            publisher.publish("price", {"g": i})
+            if i < 2:
+                fast.queue.get_nowait()
+
+        assert slow_socket not in publisher.channels
+        assert slow.closed
+        assert fast.queue.qsize() == 1
+        assert publisher.stats["slow_consumers_dropped"] == 1
+
+    def test_new_subscriber_receives_snapshot(self, publisher):
+        """Yeni istemci son bilinen durumu veritabanına gitmeden almalı"""
+        publisher.publish("signals", [])
+        publisher.publish("price", {"g": 1.0})
+
+        channel = publisher.subscribe(make_socket())
+        types = [json.loads(channel.queue.get_nowait())["type"] for _ in range(2)]
+        assert types == ["price", "signals"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_publishes_only_on_new_rows(self, publisher):
+        """Fiyat yalnızca price_data'ya yeni satır geldiğinde yayınlanmalı"""
+        publisher.refresh_interval = float("inf")
+        publisher.subscribe(make_socket())
+        publisher.storage.save_price(PriceData(
+            timestamp=timezone.now(), ons_usd=2000.0, usd_try=30.0,
+            ons_try=60000.0, gram_altin=1932.0
+        ))
+
+        await publisher.refresh()
+        published = publisher.stats["published"]
+        assert "price" in publisher._frames
+
+        await publisher.refresh()
+        assert publisher.stats["published"] == published
+
+    @pytest.mark.asyncio
+    async def test_channel_run_sends_until_closed(self):
+        """Gönderim döngüsü close() ile sonlanmalı"""
+        websocket = make_socket()
+        channel = ClientChannel(websocket, max_pending=4)
+        channel.offer("a")
+        channel.offer("b")
+
+        task = asyncio.create_task(channel.run())
+        await asyncio.sleep(0.01)
+        channel.close()
+        await asyncio.wait_for(task, timeout=1)
+
+        assert channel.sent == 2
+        assert not channel.offer("c")
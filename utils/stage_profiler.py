@@ -0,0 +1,252 @@
+"""
+Aşama bazlı profil kaydı - HybridStrategy.analyze içindeki adımların süresi
+
+Her aşama için duvar saati (perf_counter), CPU süresi (thread_time) ve net
+ayrılan bellek bloğu (sys.getallocatedblocks farkı) timeframe bazında
+kaydedilir. Yüzdelikler son `window` ölçümden (kayan pencere), Prometheus
+histogramı başlangıçtan beri birikimli kovalardan hesaplanır.
+
+Kapalıyken stage() paylaşılan boş bir context manager döndürür; analiz
+başına maliyet birkaç attribute erişimidir.
+
+    profiler = get_stage_profiler()
+    with profiler.run("1h"):
+        with profiler.stage("smc"):
+            ...
+"""
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Prometheus histogram kova üst sınırları (saniye)
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bir analizin tamamı bu aşama adıyla kaydedilir
+TOTAL_STAGE = "total"
+
+# perf_snapshots tablosundaki kayıt adı (analyzer yazar, web sunucusu okur)
+STAGE_SNAPSHOT_NAME = "hybrid_stages"
+
+
+class _NoopStage:
+    """Profil kapalıyken kullanılan boş context manager"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+class _StageStats:
+    """Tek (timeframe, aşama) çifti için kayan pencere ve birikimli kovalar"""
+
+    __slots__ = ("samples", "count", "wall_sum", "cpu_sum", "alloc_sum", "buckets")
+
+    def __init__(self, window: int):
+        self.samples: Deque[Tuple[float, float, int]] = deque(maxlen=window)
+        self.count = 0
+        self.wall_sum = 0.0
+        self.cpu_sum = 0.0
+        self.alloc_sum = 0
+        self.buckets = [0] * len(STAGE_BUCKETS)
+
+    def add(self, wall: float, cpu: float, blocks: int):
+        self.samples.append((wall, cpu, blocks))
+        self.count += 1
+        self.wall_sum += wall
+        self.cpu_sum += cpu
+        self.alloc_sum += blocks
+        for i, bound in enumerate(STAGE_BUCKETS):
+            if wall <= bound:
+                self.buckets[i] += 1
+                break
+
+    def summary(self) -> Dict[str, Any]:
+        data = np.array(self.samples, dtype=np.float64).reshape(-1, 3)
+        wall_ms, cpu_ms = data[:, 0] * 1000, data[:, 1] * 1000
+        return {
+            "count": self.count,
+            "window": len(data),
+            "wall_ms": {
+                "avg": round(float(wall_ms.mean()), 3),
+                "p50": round(float(np.percentile(wall_ms, 50)), 3),
+                "p95": round(float(np.percentile(wall_ms, 95)), 3),
+                "max": round(float(wall_ms.max()), 3),
+                "last": round(float(wall_ms[-1]), 3)
+            },
+            "cpu_ms": {
+                "avg": round(float(cpu_ms.mean()), 3),
+                "p95": round(float(np.percentile(cpu_ms, 95)), 3)
+            },
+            "alloc_blocks": {
+                "avg": round(float(data[:, 2].mean()), 1),
+                "max": int(data[:, 2].max())
+            },
+            # Prometheus için birikimli değerler (kovalar kümülatif değil, sırayla)
+            "wall_sum": self.wall_sum,
+            "cpu_sum": self.cpu_sum,
+            "alloc_sum": self.alloc_sum,
+            "buckets": list(self.buckets)
+        }
+
+
+class _StageTimer:
+    """Etkin profilde tek aşamanın ölçümü"""
+
+    __slots__ = ("profiler", "name", "wall", "cpu", "blocks")
+
+    def __init__(self, profiler: "StageProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.blocks = sys.getallocatedblocks() if self.profiler.track_allocations else 0
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        blocks = sys.getallocatedblocks() - self.blocks if self.profiler.track_allocations else 0
+        self.profiler._finish_stage(self.name, wall, cpu, blocks)
+        return False
+
+
+class _RunContext:
+    """Bir analiz çalıştırması: aşama ölçümlerini timeframe altında toplar"""
+
+    __slots__ = ("profiler", "timeframe", "stages", "timer")
+
+    def __init__(self, profiler: "StageProfiler", timeframe: str):
+        self.profiler = profiler
+        self.timeframe = timeframe
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.timer = _StageTimer(profiler, TOTAL_STAGE)
+
+    def __enter__(self):
+        self.profiler._local.run = self
+        self.timer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.__exit__(exc_type, exc, tb)
+        self.profiler._local.run = None
+        return False
+
+
+class StageProfiler:
+    """Timeframe ve aşama bazlı süre / CPU / bellek bloğu kaydı"""
+
+    def __init__(self, enabled: bool = False, window: int = 200, track_allocations: bool = True):
+        """
+        Args:
+            enabled: Kapalıyken stage()/run() boş context manager döndürür
+            window: Yüzdelikler için tutulan son ölçüm sayısı
+            track_allocations: Net ayrılan bellek bloğu da ölçülsün mü
+        """
+        self.enabled = enabled
+        self.window = window
+        self.track_allocations = track_allocations
+        self._stats: Dict[Tuple[str, str], _StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def run(self, timeframe: str):
+        """Bir analiz çalıştırmasını başlat; içindeki stage()'ler bu timeframe'e yazılır"""
+        if not self.enabled:
+            return _NOOP
+        return _RunContext(self, timeframe)
+
+    def stage(self, name: str):
+        """Tek aşamayı ölçen context manager"""
+        if not self.enabled or getattr(self._local, "run", None) is None:
+            return _NOOP
+        return _StageTimer(self, name)
+
+    def last_run(self) -> Optional[Dict[str, Dict[str, float]]]:
+        """Bu thread'de biten son çalıştırmanın aşama ölçümleri"""
+        return getattr(self._local, "last", None)
+
+    def _finish_stage(self, name: str, wall: float, cpu: float, blocks: int):
+        run = self._local.run
+        run.stages[name] = {"wall": wall, "cpu": cpu, "alloc_blocks": blocks}
+        if name == TOTAL_STAGE:
+            self._local.last = run.stages
+        self.record(run.timeframe, name, wall, cpu, blocks)
+
+    def record(self, timeframe: str, stage: str, wall: float, cpu: float, blocks: int = 0):
+        with self._lock:
+            stats = self._stats.get((timeframe, stage))
+            if stats is None:
+                stats = self._stats[(timeframe, stage)] = _StageStats(self.window)
+            stats.add(wall, cpu, blocks)
+
+    def merge_run(self, timeframe: str, stages: Dict[str, Dict[str, float]]):
+        """Başka süreçte (analiz worker'ı) ölçülmüş bir çalıştırmayı ekle"""
+        for name, values in stages.items():
+            self.record(timeframe, name, values["wall"], values["cpu"], values.get("alloc_blocks", 0))
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{timeframe: {aşama: özet}} - JSON'a yazılabilir"""
+        with self._lock:
+            items = [(key, stats.summary()) for key, stats in self._stats.items() if stats.samples]
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (timeframe, stage), summary in sorted(items):
+            result.setdefault(timeframe, {})[stage] = summary
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def to_prometheus(snapshot: Dict[str, Dict[str, Dict[str, Any]]], prefix: str = "gold_analyzer") -> str:
+    """snapshot() çıktısını Prometheus metin formatına çevir"""
+    lines: List[str] = [
+        f"# HELP {prefix}_stage_duration_seconds HybridStrategy.analyze stage wall time",
+        f"# TYPE {prefix}_stage_duration_seconds histogram"
+    ]
+    cpu_lines = [
+        f"# HELP {prefix}_stage_cpu_seconds_total HybridStrategy.analyze stage CPU time",
+        f"# TYPE {prefix}_stage_cpu_seconds_total counter"
+    ]
+    alloc_lines = [
+        f"# HELP {prefix}_stage_alloc_blocks_sum Net allocated memory blocks per stage (can be negative)",
+        f"# TYPE {prefix}_stage_alloc_blocks_sum gauge"
+    ]
+    for timeframe, stages in snapshot.items():
+        for stage, summary in stages.items():
+            labels = f'timeframe="{timeframe}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip(STAGE_BUCKETS, summary["buckets"]):
+                cumulative += count
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {summary["count"]}')
+            lines.append(f"{prefix}_stage_duration_seconds_sum{{{labels}}} {summary['wall_sum']:.6f}")
+            lines.append(f"{prefix}_stage_duration_seconds_count{{{labels}}} {summary['count']}")
+            cpu_lines.append(f"{prefix}_stage_cpu_seconds_total{{{labels}}} {summary['cpu_sum']:.6f}")
+            alloc_lines.append(f"{prefix}_stage_alloc_blocks_sum{{{labels}}} {summary['alloc_sum']}")
+    return "\n".join(lines + cpu_lines + alloc_lines) + "\n"
+
+
+_stage_profiler: Optional[StageProfiler] = None
+
+
+def get_stage_profiler() -> StageProfiler:
+    """Süreç genelinde tek profil kaydı (STAGE_PROFILING ayarıyla açılır)"""
+    global _stage_profiler
+    if _stage_profiler is None:
+        from config import settings
+        _stage_profiler = StageProfiler(enabled=settings.stage_profiling)
+    return _stage_profiler
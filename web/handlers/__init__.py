@@ -3,5 +3,6 @@ WebSocket handler modulleri
 """
 
 from .websocket import WebSocketManager
+from .publisher import UpdatePublisher
 
-__all__ = ['WebSocketManager']
\ No newline at end of file
+__all__ = ['WebSocketManager', 'UpdatePublisher']
@@ -0,0 +1,165 @@
+"""
+Kompakt WebSocket protokolü - sıra numaralı, delta kodlanmış ikili fiyat akışı
+
+İstemci ``/ws?proto=delta1`` ile bağlanırsa fiyat güncellemeleri JSON yerine
+sabit düzenli ikili frame'ler olarak gelir. Performans ve sinyal mesajları
+seyrek olduğundan JSON metin frame'i olarak kalır.
+
+Fiyatlar 1e-4 hassasiyetli tam sayılara çevrilir; böylece deltaların
+toplanması kayan nokta hatası biriktirmez. Tüm alanlar big-endian:
+
+    SNAPSHOT (41 byte): B type=0x01 | I stream | I seq | q ts_ms | q gram | q ons_usd | q usd_try
+    DELTA    (21 byte): B type=0x02 | I seq | I dt_ms | i gram | i ons_usd | i usd_try
+
+Gram altın fiyatı yoksa snapshot'ta INT64_MIN gönderilir. Delta int32'ye
+sığmazsa ya da gram fiyatı eksikse yerine snapshot gönderilir.
+
+Kopan istemci ``stream=<id>&since=<son seq>`` ile yeniden bağlanır. Kaçırdığı
+güncellemeler bellekteki halka tampondaysa yalnızca o deltalar tekrar
+oynatılır. Boşluk tampondan eskiyse tamponun en eski durumu snapshot olarak
+gönderilir, ardından sonraki deltalar gelir.
+
+stream, süreç başına rastgele seçilen akış kimliğidir ve her snapshot'ta
+gelir. Sunucu yeniden başlayınca seq 1'den başlar; kimlik eşleşmezse
+istemcinin since'i yok sayılır ve güncel snapshot gönderilir.
+"""
+import secrets
+import struct
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+PROTOCOL_NAME = "delta1"
+
+FRAME_SNAPSHOT = 0x01
+FRAME_DELTA = 0x02
+
+PRICE_SCALE = 10_000
+MISSING = -(2 ** 63)
+
+_SNAPSHOT = struct.Struct("!BIIqqqq")
+_DELTA = struct.Struct("!BIIiii")
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+_UINT32_MAX = 2 ** 32 - 1
+
+# (ts_ms, gram, ons_usd, usd_try) - fiyatlar PRICE_SCALE ile çarpılmış tam sayılar
+PriceState = Tuple[int, int, int, int]
+
+
+def _to_fixed(value: Optional[float]) -> int:
+    return MISSING if value is None else int(round(value * PRICE_SCALE))
+
+
+def _from_fixed(value: int) -> Optional[float]:
+    return None if value == MISSING else value / PRICE_SCALE
+
+
+def state_from_payload(payload: Dict[str, Any]) -> PriceState:
+    """Yayıncının {"t","g","o","u"} fiyat mesajını sabit noktalı duruma çevir"""
+    ts_ms = int(datetime.fromisoformat(payload["t"]).timestamp() * 1000)
+    return ts_ms, _to_fixed(payload.get("g")), _to_fixed(payload["o"]), _to_fixed(payload["u"])
+
+
+def encode_snapshot(stream_id: int, seq: int, state: PriceState) -> bytes:
+    return _SNAPSHOT.pack(FRAME_SNAPSHOT, stream_id, seq, *state)
+
+
+def encode_delta(seq: int, previous: PriceState, state: PriceState) -> Optional[bytes]:
+    """İki durum arasındaki delta frame'i - int32'ye sığmıyorsa None"""
+    if MISSING in (previous[1], state[1]):
+        return None
+    dt = state[0] - previous[0]
+    diffs = [state[i] - previous[i] for i in range(1, 4)]
+    if not 0 <= dt <= _UINT32_MAX or any(not _INT32_MIN <= d <= _INT32_MAX for d in diffs):
+        return None
+    return _DELTA.pack(FRAME_DELTA, seq, dt, *diffs)
+
+
+def decode_frame(frame: bytes, previous: Optional[PriceState] = None) -> Tuple[int, PriceState]:
+    """
+    Frame'i çöz ve yeni durumu döndür (istemci tarafı referans uygulaması)
+
+    Raises:
+        ValueError: Delta frame'i önceki durum olmadan geldiyse veya tip bilinmiyorsa
+    """
+    if frame[0] == FRAME_SNAPSHOT:
+        _, _, seq, *state = _SNAPSHOT.unpack(frame)
+        return seq, tuple(state)
+    if frame[0] == FRAME_DELTA:
+        if previous is None:
+            raise ValueError("Delta frame without a snapshot")
+        _, seq, dt, dg, do, du = _DELTA.unpack(frame)
+        return seq, (previous[0] + dt, previous[1] + dg, previous[2] + do, previous[3] + du)
+    raise ValueError(f"Unknown frame type: {frame[0]}")
+
+
+def frame_stream_id(frame: bytes) -> Optional[int]:
+    """Snapshot frame'indeki akış kimliği (delta frame'leri için None)"""
+    return _SNAPSHOT.unpack(frame)[1] if frame[0] == FRAME_SNAPSHOT else None
+
+
+def state_to_payload(state: PriceState) -> Dict[str, Any]:
+    """Çözülmüş durumu JSON akışıyla aynı alan adlarına çevir"""
+    return {
+        "t": state[0],
+        "g": _from_fixed(state[1]),
+        "o": _from_fixed(state[2]),
+        "u": _from_fixed(state[3])
+    }
+
+
+class PriceDeltaStream:
+    """Fiyat akışı için sıra numaralı snapshot/delta kodlayıcı ve replay tamponu"""
+
+    def __init__(self, history: int = 512, stream_id: Optional[int] = None):
+        """
+        Args:
+            history: Yeniden bağlanan istemciler için saklanan son güncelleme sayısı
+            stream_id: Akış kimliği (varsayılan: rastgele 32 bit)
+        """
+        self.stream_id = secrets.randbits(32) if stream_id is None else stream_id
+        self.seq = 0
+        self._state: Optional[PriceState] = None
+        # (seq, durum, yayınlanan frame)
+        self._history: Deque[Tuple[int, PriceState, bytes]] = deque(maxlen=history)
+        self.stats = {"snapshots": 0, "deltas": 0}
+
+    def push(self, payload: Dict[str, Any]) -> bytes:
+        """Yeni fiyatı kodla; tüm ikili istemcilere gidecek frame'i döndür"""
+        state = state_from_payload(payload)
+        self.seq += 1
+        frame = None
+        if self._state is not None:
+            frame = encode_delta(self.seq, self._state, state)
+        if frame is None:
+            frame = encode_snapshot(self.stream_id, self.seq, state)
+            self.stats["snapshots"] += 1
+        else:
+            self.stats["deltas"] += 1
+        self._state = state
+        self._history.append((self.seq, state, frame))
+        return frame
+
+    def replay(self, since: Optional[int] = None, stream_id: Optional[int] = None) -> List[bytes]:
+        """
+        Bağlanan istemcinin güncel duruma gelmesi için gereken frame'ler
+
+        Args:
+            since: İstemcinin elindeki son seq (yeni istemci için None)
+            stream_id: since'in ait olduğu akış kimliği; farklıysa since yok sayılır
+        """
+        if self._state is None:
+            return []
+        if since is None or stream_id != self.stream_id:
+            # Yeni istemci ya da önceki süreçten kalan seq: güncel snapshot
+            return [encode_snapshot(self.stream_id, self.seq, self._state)]
+        if since == self.seq:
+            return []
+
+        oldest_seq = self._history[0][0]
+        if oldest_seq - 1 <= since < self.seq:
+            return [frame for seq, _, frame in self._history if seq > since]
+
+        # Boşluk tampondan eski: snapshot + delta replay
+        seq, state, _ = self._history[0]
+        return [encode_snapshot(self.stream_id, seq, state)] + [frame for s, _, frame in self._history if s > seq]
@@ -0,0 +1,368 @@
+"""
+WebSocket yayıncısı - tek görev, tek serialize, tüm istemcilere dağıtım
+
+Fiyat, performans ve sinyal güncellemeleri bağlantı başına ayrı ayrı
+sorgulanmaz. Tek bir yayıncı görevi değişiklikleri tespit eder, her
+güncellemeyi bir kez JSON frame'ine çevirir ve aynı frame'i her istemcinin
+sınırlı gönderim kuyruğuna koyar:
+
+    publisher = UpdatePublisher(storage)
+    publisher.start()
+    channel = publisher.subscribe(websocket)
+    await channel.run()
+
+Analiz süreci (main.py) ayrı çalıştığı için çapraz süreç olaylar
+price_data / hybrid_analysis tablolarının MAX(id) işaretleri üzerinden
+yakalanır; bu sorgu istemci sayısından bağımsız olarak periyot başına bir
+kez çalışır. Aynı süreçte bir HaremPriceCollector varsa attach_collector()
+ile fiyatlar veritabanı beklenmeden yayınlanır.
+
+``proto=delta1`` ile bağlanan istemciler fiyatları ikili delta frame'leri
+olarak alır (bkz. delta_protocol.py); bu frame'ler de güncelleme başına bir
+kez kodlanır.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import WebSocket
+from models.price_data import PriceData
+from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage
+from storage import trade_stats
+from utils import timezone
+from .delta_protocol import PriceDeltaStream
+
+logger = logging.getLogger(__name__)
+
+# Yeni bağlanan istemciye gönderilen anlık görüntü sırası
+SNAPSHOT_TOPICS = ("price", "perf", "signals")
+
+
+def encode_frame(update_type: str, data: Any) -> str:
+    """Mesajı tüm istemcilere aynen gönderilecek kompakt JSON frame'ine çevir"""
+    return json.dumps({"type": update_type, "data": data}, separators=(",", ":"), default=str)
+
+
+class ClientChannel:
+    """Tek istemcinin sınırlı gönderim kuyruğu"""
+
+    def __init__(self, websocket: WebSocket, max_pending: int = 16, binary: bool = False):
+        """
+        Args:
+            websocket: İstemci soketi
+            max_pending: Kuyrukta bekleyebilecek en fazla frame sayısı
+            binary: İstemci delta1 protokolünü seçtiyse True
+        """
+        self.websocket = websocket
+        self.binary = binary
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.sent = 0
+        self.closed = False
+
+    def offer(self, frame: Union[str, bytes, List[bytes]]) -> bool:
+        """Frame'i (veya tek parça gönderilecek frame listesini) kuyruğa koy - kuyruk doluysa False döner"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def run(self):
+        """Kuyruktaki frame'leri sırayla sokete yaz; close() ile biter"""
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                return
+            for item in (frame if isinstance(frame, list) else (frame,)):
+                if isinstance(item, bytes):
+                    await self.websocket.send_bytes(item)
+                else:
+                    await self.websocket.send_text(item)
+                self.sent += 1
+
+    def close(self):
+        """Bekleyen frame'leri at ve gönderim döngüsünü sonlandır"""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class UpdatePublisher:
+    """Güncellemeleri bir kez üretip tüm WebSocket istemcilerine dağıtan yayıncı"""
+
+    def __init__(self, storage: SQLiteStorage, poll_interval: float = 2.0,
+                 refresh_interval: float = 60.0, max_pending: int = 16, replay_history: int = 512):
+        """
+        Args:
+            storage: SQLite storage instance
+            poll_interval: Çapraz süreç değişiklik işaretlerinin kontrol aralığı (saniye)
+            refresh_interval: Zamana bağlı özetlerin (performans, son 6 saat sinyalleri) yenilenme aralığı
+            max_pending: İstemci başına kuyruk sınırı - dolduğunda istemci düşürülür
+            replay_history: Yeniden bağlanan delta1 istemcileri için saklanan fiyat güncellemesi sayısı
+        """
+        self.storage = storage
+        self.db = AsyncSQLiteStorage(storage)
+        self.poll_interval = poll_interval
+        self.refresh_interval = refresh_interval
+        self.max_pending = max_pending
+
+        self.channels: Dict[WebSocket, ClientChannel] = {}
+        self._frames: Dict[str, str] = {}
+        self.price_stream = PriceDeltaStream(history=replay_history)
+        self._markers: Dict[str, Any] = {"price": None, "signals": None}
+        self._last_refresh = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"published": 0, "duplicates_skipped": 0, "slow_consumers_dropped": 0, "polls": 0,
+                      "frames_sent": 0}
+
+    # ------------------------------------------------------------------ #
+    # Yaşam döngüsü
+    # ------------------------------------------------------------------ #
+    def start(self):
+        """Yayıncı görevini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("WebSocket publisher started")
+
+    async def stop(self):
+        """Yayıncıyı durdur ve tüm istemci kuyruklarını kapat"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for channel in list(self.channels.values()):
+            channel.close()
+        self.channels.clear()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------ #
+    # Abonelik
+    # ------------------------------------------------------------------ #
+    def subscribe(self, websocket: WebSocket, binary: bool = False, since: Optional[int] = None,
+                  stream_id: Optional[int] = None) -> ClientChannel:
+        """
+        İstemciyi kaydet ve son bilinen durumu kuyruğuna koy
+
+        Args:
+            websocket: İstemci soketi
+            binary: Fiyatlar delta1 ikili frame'leri olarak gönderilsin
+            since: delta1 istemcisinin elindeki son fiyat seq'i (yeniden bağlanma)
+            stream_id: since'in ait olduğu akış kimliği (sunucu yeniden başladıysa farklıdır)
+        """
+        channel = ClientChannel(websocket, self.max_pending, binary=binary)
+        for topic in SNAPSHOT_TOPICS:
+            if binary and topic == "price":
+                replay = self.price_stream.replay(since, stream_id)
+                if replay:
+                    channel.offer(replay)
+                continue
+            frame = self._frames.get(topic)
+            if frame is not None:
+                channel.offer(frame)
+        self.channels[websocket] = channel
+        # İşaretler değiştiyse yeni istemci beklemeden güncel veriyi alsın
+        self.notify()
+        return channel
+
+    def unsubscribe(self, websocket: WebSocket):
+        """İstemciyi kaldır ve gönderim döngüsünü sonlandır"""
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            self.stats["frames_sent"] += channel.sent
+            channel.close()
+
+    # ------------------------------------------------------------------ #
+    # Yayın
+    # ------------------------------------------------------------------ #
+    def publish(self, update_type: str, data: Any, force: bool = False) -> bool:
+        """
+        Güncellemeyi bir kez serialize edip tüm istemci kuyruklarına koy
+
+        Returns:
+            Frame dağıtıldıysa True, içerik öncekiyle aynıysa False
+        """
+        frame = encode_frame(update_type, data)
+        if not force and self._frames.get(update_type) == frame:
+            self.stats["duplicates_skipped"] += 1
+            return False
+        self._frames[update_type] = frame
+        self.stats["published"] += 1
+
+        binary_frame = self._encode_binary(update_type, data)
+        slow = [
+            ws for ws, channel in self.channels.items()
+            if not channel.offer(binary_frame if channel.binary and binary_frame is not None else frame)
+        ]
+        for websocket in slow:
+            self.stats["slow_consumers_dropped"] += 1
+            logger.warning("Slow WebSocket consumer dropped (send queue full)")
+            self.unsubscribe(websocket)
+        return True
+
+    def _encode_binary(self, update_type: str, data: Any) -> Optional[bytes]:
+        """Fiyat güncellemesini delta1 frame'ine çevir (diğer konular JSON kalır)"""
+        if update_type != "price":
+            return None
+        try:
+            return self.price_stream.push(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Price update could not be delta encoded: {e}")
+            return None
+
+    def notify(self):
+        """Yayıncı döngüsünü bir sonraki periyodu beklemeden uyandır"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def on_price(self, price_data: PriceData):
+        """HaremPriceCollector analiz callback'i - yeni fiyatı doğrudan yayınla"""
+        self.publish("price", self._price_payload(price_data))
+
+    def attach_collector(self, collector):
+        """Aynı süreçteki collector'ın fiyat olaylarına abone ol"""
+        collector.add_analysis_callback(self.on_price)
+
+    # ------------------------------------------------------------------ #
+    # Değişiklik tespiti
+    # ------------------------------------------------------------------ #
+    async def _run(self):
+        """Tek yayıncı döngüsü - istemci sayısından bağımsız"""
+        while True:
+            if self.channels:
+                try:
+                    await self.refresh()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"WebSocket publisher refresh error: {e}")
+            await self._wait_for_wakeup()
+
+    async def _wait_for_wakeup(self):
+        """poll_interval kadar bekle; notify() beklemeyi erken bitirir"""
+        # wait_for yerine wait: 3.11'de wait_for, iç future tamamlanmışken gelen iptali yutabiliyor
+        waiter = asyncio.ensure_future(self._wakeup.wait())
+        try:
+            await asyncio.wait({waiter}, timeout=self.poll_interval)
+        finally:
+            waiter.cancel()
+        self._wakeup.clear()
+
+    async def refresh(self):
+        """Değişen konuları veritabanından okuyup yayınla"""
+        self.stats["polls"] += 1
+        markers = await self.db.run(self._query_markers)
+        periodic = time.monotonic() - self._last_refresh >= self.refresh_interval
+
+        if markers["price"] != self._markers["price"]:
+            latest = await self.db.get_latest_price()
+            if latest:
+                self.publish("price", self._price_payload(latest))
+            self._markers["price"] = markers["price"]
+
+        if periodic or markers["signals"] != self._markers["signals"]:
+            self.publish("signals", await self.db.run(self._query_signals))
+            self._markers["signals"] = markers["signals"]
+
+        if periodic:
+            self.publish("perf", await self.db.run(self._query_performance))
+            self._last_refresh = time.monotonic()
+
+    @staticmethod
+    def _price_payload(price: PriceData) -> Dict[str, Any]:
+        """Fiyatı minimal mesaj yapısına çevir"""
+        return {
+            "t": price.timestamp.isoformat(),
+            "g": float(price.gram_altin) if price.gram_altin else None,
+            "o": float(price.ons_usd),
+            "u": float(price.usd_try)
+        }
+
+    def _query_markers(self) -> Dict[str, Any]:
+        """Tabloların son satır id'leri - yeni kayıt gelip gelmediğini ucuza gösterir"""
+        with self.storage.get_connection() as conn:
+            row = conn.execute("""
+                SELECT (SELECT MAX(id) FROM price_data),
+                       (SELECT MAX(id) FROM hybrid_analysis)
+            """).fetchone()
+            return {"price": row[0], "signals": row[1]}
+
+    def _query_performance(self) -> Dict[str, Any]:
+        """Performans özeti sorgusu (sqlite-io havuzunda çalışır)"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Açık pozisyonlar; son 24 saatin işlemleri saatlik özet kovalarından
+            cursor.execute("""
+                SELECT COUNT(*) as open_count, SUM(allocated_capital) as total_capital
+                FROM sim_positions
+                WHERE status = 'OPEN'
+            """)
+            open_count, total_capital = cursor.fetchone()
+            daily = trade_stats.window_totals(cursor, timezone.now() - timedelta(hours=24))
+            daily_trades = daily["total_trades"]
+            win_rate = (daily["winning_trades"] / daily_trades * 100) if daily_trades > 0 else 0
+
+            # Minimized data structure
+            return {
+                "op": open_count or 0,                       # open_positions
+                "tc": round(float(total_capital or 0), 1),   # total_capital
+                "dt": daily_trades,                          # daily_trades
+                "wr": round(win_rate, 1)                     # win_rate
+            }
+
+    def _query_signals(self) -> List[Dict[str, Any]]:
+        """Son 6 saatin BUY/SELL sinyalleri (sqlite-io havuzunda çalışır)"""
+        with self.storage.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT timestamp, timeframe, signal, confidence, gram_price
+                FROM hybrid_analysis
+                WHERE signal IN ('BUY', 'SELL')
+                AND timestamp > datetime('now', '-6 hours')
+                ORDER BY timestamp DESC
+                LIMIT 3
+            """)
+
+            # Minimized data structure for signals
+            return [
+                {
+                    "t": row[0],                    # timestamp
+                    "tf": row[1],                   # timeframe
+                    "s": row[2],                    # signal
+                    "c": round(float(row[3]), 2),  # confidence
+                    "p": round(float(row[4]), 1)   # price
+                }
+                for row in cursor.fetchall()
+            ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Yayıncı metrikleri"""
+        return {
+            **self.stats,
+            "subscribers": len(self.channels),
+            "binary_subscribers": sum(1 for channel in self.channels.values() if channel.binary),
+            "price_seq": self.price_stream.seq,
+            "price_frames": dict(self.price_stream.stats),
+            "frames_sent": self.stats["frames_sent"] + sum(channel.sent for channel in self.channels.values()),
+            "max_pending": self.max_pending,
+            "poll_interval": self.poll_interval,
+            "running": self.is_running
+        }
@@ -2,11 +2,14 @@
 Analiz API endpoint'leri
 """
 from fastapi import APIRouter
+import base64
 import json
 import logging
 from datetime import timedelta
+from typing import Optional, Tuple
 
 from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage
 from config import settings
 from utils import timezone
 from web.utils import cache
@@ -17,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 # Storage instance
 storage = SQLiteStorage()
+# Analiz süreci mumları kalıcılaştırır; web süreci yeni tick'leri price_data'dan çeker
+storage.enable_candle_store(persist=False, auto_sync=True)
+# Sorgular event loop dışında, sqlite-io havuzunda çalışır
+db = AsyncSQLiteStorage(storage)
 
 @router.get("/config")
 async def get_analysis_config():
@@ -44,19 +51,19 @@ async def trigger_analysis(timeframe: str):
             return {"error": f"Geçersiz timeframe. Geçerli değerler: {valid_timeframes}"}
         
         # Son fiyat verisini al
-        latest_price = storage.get_latest_price()
+        latest_price = await db.get_latest_price()
         if not latest_price:
             return {"error": "Fiyat verisi bulunamadı"}
         
         # Mum verilerini oluştur
         if timeframe == "15m":
-            candles = storage.generate_gram_candles(15, 100)
+            candles = await db.generate_gram_candles(15, 100)
         elif timeframe == "1h":
-            candles = storage.generate_gram_candles(60, 100)
+            candles = await db.generate_gram_candles(60, 100)
         elif timeframe == "4h":
-            candles = storage.generate_gram_candles(240, 100)
+            candles = await db.generate_gram_candles(240, 100)
         else:  # 1d
-            candles = storage.generate_gram_candles(1440, 100)
+            candles = await db.generate_gram_candles(1440, 100)
         
         if len(candles) < 50:
             return {"error": f"Yeterli veri yok. Mevcut: {len(candles)}, Gerekli: 50"}
@@ -66,7 +73,7 @@ async def trigger_analysis(timeframe: str):
         logger.info(f"Manuel analiz tetiklendi: {timeframe}")
         
         # Son analizi dön
-        analyses = storage.get_hybrid_analysis_history(limit=1, timeframe=timeframe)
+        analyses = await db.get_hybrid_analysis_history(limit=1, timeframe=timeframe)
         
         return {
             "status": "success",
@@ -82,6 +89,39 @@ async def trigger_analysis(timeframe: str):
         logger.error(f"Analiz tetikleme hatası: {e}")
         return {"error": str(e)}
 
+# Toplam kayıt sayısı filtre başına bu kadar süre cache'lenir (saniye)
+HISTORY_COUNT_TTL = 60
+
+
+def _encode_cursor(position: Tuple[str, int]) -> str:
+    """(ham timestamp, id) imlecini URL'de taşınabilir hale getir"""
+    return base64.urlsafe_b64encode(f"{position[0]}|{position[1]}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return timestamp, int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        logger.warning(f"Geçersiz analiz geçmişi imleci: {cursor}")
+        return None
+
+
+async def _get_history_count(timeframe, start_dt, end_dt, signal_type) -> int:
+    """Filtreye göre toplam kayıt sayısı - her sayfada COUNT(*) çalıştırmamak için cache'li"""
+    cache_key = f"analysis_history_count:{timeframe}:{start_dt}:{end_dt}:{signal_type}"
+    total_count = cache.get(cache_key)
+    if total_count is None:
+        total_count = await db.get_hybrid_analysis_count(
+            timeframe=timeframe,
+            start_date=start_dt,
+            end_date=end_dt,
+            signal_type=signal_type
+        )
+        cache.set(cache_key, total_count, ttl=HISTORY_COUNT_TTL)
+    return total_count
+
+
 @router.get("/history")
 async def get_analysis_history(
     timeframe: str = None,
@@ -89,9 +129,17 @@ async def get_analysis_history(
     per_page: int = 20,
     start_date: str = None,
     end_date: str = None,
-    signal_type: str = None
+    signal_type: str = None,
+    cursor: str = None,
+    details: bool = True
 ):
-    """Son hibrit analiz sonuçlarını döndür - gelişmiş filtreleme ile"""
+    """
+    Son hibrit analiz sonuçlarını döndür - gelişmiş filtreleme ile
+    
+    cursor verilirse (önceki yanıtın pagination.next_cursor değeri) sayfa
+    OFFSET yerine (timestamp, id) anahtarıyla okunur. page yalnızca imleç
+    yokken kullanılır. details=false liste için JSON detay alanlarını atlar.
+    """
     try:
         from datetime import datetime
         
@@ -99,25 +147,24 @@ async def get_analysis_history(
         start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00')) if start_date else None
         end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00')) if end_date else None
         
-        # Offset hesapla
-        offset = (page - 1) * per_page if page > 0 else 0
+        before = _decode_cursor(cursor) if cursor else None
+        
+        # İmleç yoksa eski sayfa numarası davranışı
+        offset = (page - 1) * per_page if page > 0 and before is None else 0
         
         # Toplam kayıt sayısını al
-        total_count = storage.get_hybrid_analysis_count(
-            timeframe=timeframe,
-            start_date=start_dt,
-            end_date=end_dt,
-            signal_type=signal_type
-        )
+        total_count = await _get_history_count(timeframe, start_dt, end_dt, signal_type)
         
         # Hibrit analiz verilerini al
-        analyses = storage.get_hybrid_analysis_history(
-            limit=per_page, 
+        analyses, next_position = await db.get_hybrid_analysis_page(
+            limit=per_page,
+            before=before,
             offset=offset,
             timeframe=timeframe,
             start_date=start_dt,
             end_date=end_dt,
-            signal_type=signal_type
+            signal_type=signal_type,
+            include_details=details
         )
         
         # API formatına dönüştür
@@ -203,7 +250,8 @@ async def get_analysis_history(
                 "page": page,
                 "per_page": per_page,
                 "total": total_count,
-                "pages": (total_count + per_page - 1) // per_page if per_page > 0 else 0
+                "pages": (total_count + per_page - 1) // per_page if per_page > 0 else 0,
+                "next_cursor": _encode_cursor(next_position) if next_position else None
             }
         }
         
@@ -216,63 +264,67 @@ async def get_analysis_history(
 async def get_analysis_details(timeframe: str = None):
     """Detaylı analiz bilgilerini döndür"""
     try:
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # En son analizleri al
-            if timeframe:
-                cursor.execute("""
-                    SELECT * FROM hybrid_analysis 
-                    WHERE timeframe = ? 
-                    ORDER BY id DESC LIMIT 1
-                """, (timeframe,))
-            else:
-                cursor.execute("""
-                    SELECT * FROM hybrid_analysis 
-                    ORDER BY id DESC LIMIT 3
-                """)
-            
-            analyses = []
-            for row in cursor.fetchall():
-                col_names = [desc[0] for desc in cursor.description]
-                data = dict(zip(col_names, row))
-                
-                # JSON alanları parse et
-                try:
-                    gram_analysis = json.loads(data.get('gram_analysis', '{}'))
-                    global_analysis = json.loads(data.get('global_analysis', '{}'))
-                    currency_analysis = json.loads(data.get('currency_analysis', '{}'))
-                    advanced_indicators = json.loads(data.get('advanced_indicators', '{}'))
-                    pattern_analysis = json.loads(data.get('pattern_analysis', '{}'))
-                except:
-                    continue
-                
-                analyses.append({
-                    'id': data['id'],
-                    'timestamp': data['timestamp'],
-                    'timeframe': data['timeframe'],
-                    'signal': data['signal'],
-                    'confidence': float(data['confidence']) if data['confidence'] else 0,
-                    'gram_price': float(data['gram_price']) if data['gram_price'] else 0,
-                    'gram_analysis': gram_analysis,
-                    'global_analysis': global_analysis,
-                    'currency_analysis': currency_analysis,
-                    'advanced_indicators': advanced_indicators,
-                    'pattern_analysis': pattern_analysis
-                })
-            
-            return {'analyses': analyses}
-            
+        return await db.run(_query_analysis_details, timeframe)
+        
     except Exception as e:
         logger.error(f"Analysis details error: {e}")
         return {'analyses': []}
 
+def _query_analysis_details(timeframe: Optional[str]):
+    """Son analizlerin detay JSON alanları (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # En son analizleri al
+        if timeframe:
+            cursor.execute("""
+                SELECT * FROM hybrid_analysis 
+                WHERE timeframe = ? 
+                ORDER BY id DESC LIMIT 1
+            """, (timeframe,))
+        else:
+            cursor.execute("""
+                SELECT * FROM hybrid_analysis 
+                ORDER BY id DESC LIMIT 3
+            """)
+        
+        analyses = []
+        for row in cursor.fetchall():
+            col_names = [desc[0] for desc in cursor.description]
+            data = dict(zip(col_names, row))
+            
+            # JSON alanları parse et
+            try:
+                gram_analysis = json.loads(data.get('gram_analysis') or '{}')
+                global_analysis = json.loads(data.get('global_analysis') or '{}')
+                currency_analysis = json.loads(data.get('currency_analysis') or '{}')
+                advanced_indicators = json.loads(data.get('advanced_indicators') or '{}')
+                pattern_analysis = json.loads(data.get('pattern_analysis') or '{}')
+            except:
+                continue
+            
+            analyses.append({
+                'id': data['id'],
+                'timestamp': data['timestamp'],
+                'timeframe': data['timeframe'],
+                'signal': data['signal'],
+                'confidence': float(data['confidence']) if data['confidence'] else 0,
+                'gram_price': float(data['gram_price']) if data['gram_price'] else 0,
+                'gram_analysis': gram_analysis,
+                'global_analysis': global_analysis,
+                'currency_analysis': currency_analysis,
+                'advanced_indicators': advanced_indicators,
+                'pattern_analysis': pattern_analysis
+            })
+        
+        return {'analyses': analyses}
+
 @router.get("/levels")
 async def get_support_resistance():
     """Destek/Direnç seviyeleri"""
     try:
         # Son 100 veriyi al
-        prices = storage.get_latest_prices(100)
+        prices = await db.get_latest_prices(100)
         if len(prices) < 10:
             return {"support": [], "resistance": []}
         
@@ -324,13 +376,13 @@ async def get_technical_indicators(timeframe: str):
         }
         
         minutes = interval_map.get(timeframe, 60)
-        candles = storage.generate_gram_candles(minutes, 100)
+        candles = await db.generate_gram_candles(minutes, 100)
         
         if len(candles) < 20:
             return {"error": "Yeterli veri yok"}
         
         # Son analizi al
-        analyses = storage.get_hybrid_analysis_history(limit=1, timeframe=timeframe)
+        analyses = await db.get_hybrid_analysis_history(limit=1, timeframe=timeframe)
         
         if not analyses:
             return {"error": "Analiz bulunamadı"}
@@ -388,92 +440,96 @@ async def get_performance_summary():
         # Son 7 günlük performans verilerini al
         week_ago = timezone.now() - timedelta(days=7)
         
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Toplam sinyal sayıları
-            cursor.execute("""
-                SELECT 
-                    signal,
-                    COUNT(*) as count,
-                    AVG(confidence) as avg_confidence
-                FROM hybrid_analysis
-                WHERE timestamp > ?
-                GROUP BY signal
-            """, (week_ago,))
-            
-            signal_stats = {}
-            for row in cursor.fetchall():
-                signal_stats[row[0]] = {
-                    "count": row[1],
-                    "avg_confidence": row[2]
-                }
-            
-            # Timeframe bazlı istatistikler
-            cursor.execute("""
-                SELECT 
-                    timeframe,
-                    COUNT(*) as total_signals,
-                    SUM(CASE WHEN signal = 'BUY' THEN 1 ELSE 0 END) as buy_signals,
-                    SUM(CASE WHEN signal = 'SELL' THEN 1 ELSE 0 END) as sell_signals,
-                    AVG(confidence) as avg_confidence
-                FROM hybrid_analysis
-                WHERE timestamp > ? AND signal IN ('BUY', 'SELL')
-                GROUP BY timeframe
-            """, (week_ago,))
-            
-            timeframe_stats = []
-            for row in cursor.fetchall():
-                timeframe_stats.append({
-                    "timeframe": row[0],
-                    "total_signals": row[1],
-                    "buy_signals": row[2],
-                    "sell_signals": row[3],
-                    "avg_confidence": row[4]
-                })
-            
-            # Son 24 saatteki en güçlü sinyaller
-            yesterday = timezone.now() - timedelta(days=1)
-            cursor.execute("""
-                SELECT 
-                    timestamp,
-                    timeframe,
-                    signal,
-                    confidence,
-                    gram_price
-                FROM hybrid_analysis
-                WHERE timestamp > ? AND signal IN ('BUY', 'SELL')
-                ORDER BY confidence DESC
-                LIMIT 5
-            """, (yesterday,))
-            
-            strongest_signals = []
-            for row in cursor.fetchall():
-                strongest_signals.append({
-                    "timestamp": row[0],
-                    "timeframe": row[1],
-                    "signal": row[2],
-                    "confidence": row[3],
-                    "price": row[4]
-                })
-            
-            return {
-                "period": "7_days",
-                "signal_distribution": signal_stats,
-                "timeframe_performance": timeframe_stats,
-                "strongest_signals_24h": strongest_signals
-            }
-            
+        return await db.run(_query_performance_summary, week_ago)
+        
     except Exception as e:
         logger.error(f"Error getting performance summary: {e}")
         return {"error": str(e)}
 
+def _query_performance_summary(week_ago):
+    """Son 7 günün sinyal istatistikleri (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Toplam sinyal sayıları
+        cursor.execute("""
+            SELECT 
+                signal,
+                COUNT(*) as count,
+                AVG(confidence) as avg_confidence
+            FROM hybrid_analysis
+            WHERE timestamp > ?
+            GROUP BY signal
+        """, (week_ago,))
+        
+        signal_stats = {}
+        for row in cursor.fetchall():
+            signal_stats[row[0]] = {
+                "count": row[1],
+                "avg_confidence": row[2]
+            }
+        
+        # Timeframe bazlı istatistikler
+        cursor.execute("""
+            SELECT 
+                timeframe,
+                COUNT(*) as total_signals,
+                SUM(CASE WHEN signal = 'BUY' THEN 1 ELSE 0 END) as buy_signals,
+                SUM(CASE WHEN signal = 'SELL' THEN 1 ELSE 0 END) as sell_signals,
+                AVG(confidence) as avg_confidence
+            FROM hybrid_analysis
+            WHERE timestamp > ? AND signal IN ('BUY', 'SELL')
+            GROUP BY timeframe
+        """, (week_ago,))
+        
+        timeframe_stats = []
+        for row in cursor.fetchall():
+            timeframe_stats.append({
+                "timeframe": row[0],
+                "total_signals": row[1],
+                "buy_signals": row[2],
+                "sell_signals": row[3],
+                "avg_confidence": row[4]
+            })
+        
+        # Son 24 saatteki en güçlü sinyaller
+        yesterday = timezone.now() - timedelta(days=1)
+        cursor.execute("""
+            SELECT 
+                timestamp,
+                timeframe,
+                signal,
+                confidence,
+                gram_price
+            FROM hybrid_analysis
+            WHERE timestamp > ? AND signal IN ('BUY', 'SELL')
+            ORDER BY confidence DESC
+            LIMIT 5
+        """, (yesterday,))
+        
+        strongest_signals = []
+        for row in cursor.fetchall():
+            strongest_signals.append({
+                "timestamp": row[0],
+                "timeframe": row[1],
+                "signal": row[2],
+                "confidence": row[3],
+                "price": row[4]
+            })
+        
+        return {
+            "period": "7_days",
+            "signal_distribution": signal_stats,
+            "timeframe_performance": timeframe_stats,
+            "strongest_signals_24h": strongest_signals
+        }
+
 @router.get("/patterns/active")
 async def get_active_patterns():
     """Aktif chart pattern'leri getir"""
     try:
         # Son analizlerden pattern bilgilerini al
-        analyses = storage.get_hybrid_analysis_history(limit=4)  # Her timeframe için 1
+        analyses = await db.get_hybrid_analysis_history(limit=4)  # Her timeframe için 1
         
         active_patterns = []
         for analysis in analyses:
@@ -503,7 +559,7 @@ async def get_ons_indicators():
     """ONS/USD teknik göstergelerini getir"""
     try:
         # Son hibrit analizden ONS/USD göstergelerini al
-        analyses = storage.get_hybrid_analysis_history(limit=1)
+        analyses = await db.get_hybrid_analysis_history(limit=1)
         
         if not analyses:
             return {"error": "No analysis data available"}
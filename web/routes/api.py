@@ -2,25 +2,41 @@
 Genel API endpoint'leri
 """
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from datetime import timedelta
+import bisect
 import os
 import logging
 import json
 from typing import Dict, List, Any
 
 from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage, get_loop_lag_monitor
+from storage.connection_pool import get_all_pool_metrics
+from storage.analysis_cache import get_analysis_cache
+from storage import trade_stats
 from utils import timezone
 from utils.log_manager import LogManager
+from utils.stage_profiler import STAGE_SNAPSHOT_NAME, to_prometheus
 from web.utils import cache, stats
 from web.utils.formatters import parse_log_line
 from indicators.market_regime import calculate_market_regime_analysis
+from indicators.streaming import LiveIndicatorTracker
 
 router = APIRouter(prefix="/api")
 logger = logging.getLogger(__name__)
 
 # Storage instances
 storage = SQLiteStorage()
+# Analiz süreci mumları kalıcılaştırır; web süreci yeni tick'leri price_data'dan çeker
+storage.enable_candle_store(persist=False, auto_sync=True)
+# Sorgular event loop dışında, sqlite-io havuzunda çalışır
+db = AsyncSQLiteStorage(storage)
 log_manager = LogManager()
+# Aynı mumlarla yapılan analizler analyzer süreciyle paylaşılır
+analysis_cache = get_analysis_cache()
+# Mum deposundan artımlı göstergeler - okuma anında yalnızca son mumlar işlenir
+live_indicators = LiveIndicatorTracker(storage.candle_store)
 
 @router.get("/dashboard")
 async def get_dashboard_data():
@@ -31,99 +47,43 @@ async def get_dashboard_data():
         return cached
     
     try:
-        # Single connection for all queries - Connection pooling optimization
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Optimized: Single query for all dashboard data
-            latest_price = storage.get_latest_price()
-            if not latest_price:
-                return {"error": "No price data available"}
-            
-            # Batched queries for better performance
-            today_start = timezone.get_day_start()
-            
-            # Single query to get all dashboard metrics
-            cursor.execute("""
-                WITH dashboard_metrics AS (
-                    SELECT 
-                        COUNT(CASE WHEN signal IN ('BUY', 'SELL') AND timestamp >= ? THEN 1 END) as today_signals,
-                        COUNT(*) as total_records
-                    FROM hybrid_analysis
-                ),
-                recent_signals AS (
-                    SELECT timestamp, timeframe, signal, confidence, gram_price
-                    FROM hybrid_analysis
-                    WHERE signal IN ('BUY', 'SELL')
-                    ORDER BY timestamp DESC
-                    LIMIT 5
-                ),
-                performance_data AS (
-                    SELECT 
-                        COUNT(*) as daily_trades,
-                        SUM(CASE WHEN net_profit_loss > 0 THEN 1 ELSE 0 END) as daily_wins
-                    FROM sim_positions
-                    WHERE status = 'CLOSED' AND exit_time >= ?
-                )
-                SELECT 
-                    dm.today_signals,
-                    dm.total_records,
-                    pd.daily_trades,
-                    pd.daily_wins
-                FROM dashboard_metrics dm, performance_data pd
-            """, (today_start, timezone.now() - timedelta(hours=24)))
-            
-            metrics = cursor.fetchone()
-            
-            # Get recent signals separately for better cache efficiency
-            cursor.execute("""
-                SELECT timestamp, timeframe, signal, confidence, gram_price
-                FROM hybrid_analysis
-                WHERE signal IN ('BUY', 'SELL')
-                ORDER BY timestamp DESC
-                LIMIT 5
-            """)
-            
-            recent_signals = [
-                {
-                    "timestamp": row[0],
-                    "timeframe": row[1], 
-                    "signal": row[2],
-                    "confidence": float(row[3]),
-                    "price": float(row[4])
-                }
-                for row in cursor.fetchall()
-            ]
-        
-            # Calculate performance metrics from batched query
-            daily_trades = metrics[2] if metrics else 0
-            daily_wins = metrics[3] if metrics else 0
-            performance_summary = {
-                "daily_trades": daily_trades,
-                "daily_wins": daily_wins,
-                "daily_win_rate": (daily_wins / daily_trades * 100) if daily_trades > 0 else 0
-            }
+        # Fiyat bağlantı bloğu dışında alınır; bekleyen coroutine loop bağlantısını tutmaz
+        latest_price = await db.get_latest_price()
+        if not latest_price:
+            return {"error": "No price data available"}
+        
+        # Tüm dashboard sorguları tek bağlantıda, sqlite-io havuzunda
+        metrics, daily, recent_signals = await db.run(_query_dashboard)
+        
+        # Calculate performance metrics from batched query
+        daily_trades = daily["total_trades"]
+        daily_wins = daily["winning_trades"]
+        performance_summary = {
+            "daily_trades": daily_trades,
+            "daily_wins": daily_wins,
+            "daily_win_rate": (daily_wins / daily_trades * 100) if daily_trades > 0 else 0
+        }
         
-            # Optimized dashboard data structure
-            dashboard_data = {
-                "current_price": {
-                    "gram_altin": float(latest_price.gram_altin) if latest_price.gram_altin else 0,
-                    "ons_usd": float(latest_price.ons_usd),
-                    "usd_try": float(latest_price.usd_try),
-                    "timestamp": latest_price.timestamp.isoformat()
-                },
-                "stats": {
-                    "total_records": metrics[1] if metrics else 0,
-                    "today_signals": metrics[0] if metrics else 0
-                },
-                "recent_signals": recent_signals,
-                "performance": performance_summary,
-                "last_update": timezone.now().isoformat()
-            }
-            
-            # Increased cache time for better performance - 60 seconds
-            cache.set(cache_key, dashboard_data, ttl=60)
-            return dashboard_data
+        # Optimized dashboard data structure
+        dashboard_data = {
+            "current_price": {
+                "gram_altin": float(latest_price.gram_altin) if latest_price.gram_altin else 0,
+                "ons_usd": float(latest_price.ons_usd),
+                "usd_try": float(latest_price.usd_try),
+                "timestamp": latest_price.timestamp.isoformat()
+            },
+            "stats": {
+                "total_records": metrics[1] if metrics else 0,
+                "today_signals": metrics[0] if metrics else 0
+            },
+            "recent_signals": recent_signals,
+            "performance": performance_summary,
+            "last_update": timezone.now().isoformat()
+        }
+        
+        # Increased cache time for better performance - 60 seconds
+        cache.set(cache_key, dashboard_data, ttl=60)
+        return dashboard_data
         
     except Exception as e:
         logger.error(f"Dashboard data hatası: {e}")
@@ -135,6 +95,62 @@ async def get_dashboard_data():
             "performance": {"daily_trades": 0, "daily_wins": 0, "daily_win_rate": 0}
         }
 
+def _query_dashboard():
+    """Dashboard metrikleri, son 24 saat işlem özeti ve son sinyaller (sqlite-io havuzunda çalışır)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Batched queries for better performance
+        today_start = timezone.get_day_start()
+        
+        # Single query to get all dashboard metrics
+        cursor.execute("""
+            WITH dashboard_metrics AS (
+                SELECT 
+                    COUNT(CASE WHEN signal IN ('BUY', 'SELL') AND timestamp >= ? THEN 1 END) as today_signals,
+                    COUNT(*) as total_records
+                FROM hybrid_analysis
+            ),
+            recent_signals AS (
+                SELECT timestamp, timeframe, signal, confidence, gram_price
+                FROM hybrid_analysis
+                WHERE signal IN ('BUY', 'SELL')
+                ORDER BY timestamp DESC
+                LIMIT 5
+            )
+            SELECT 
+                dm.today_signals,
+                dm.total_records
+            FROM dashboard_metrics dm
+        """, (today_start,))
+        
+        metrics = cursor.fetchone()
+        
+        # Son 24 saatin işlemleri - saatlik özet kovalarından
+        daily = trade_stats.window_totals(cursor, timezone.now() - timedelta(hours=24))
+        
+        # Get recent signals separately for better cache efficiency
+        cursor.execute("""
+            SELECT timestamp, timeframe, signal, confidence, gram_price
+            FROM hybrid_analysis
+            WHERE signal IN ('BUY', 'SELL')
+            ORDER BY timestamp DESC
+            LIMIT 5
+        """)
+        
+        recent_signals = [
+            {
+                "timestamp": row[0],
+                "timeframe": row[1], 
+                "signal": row[2],
+                "confidence": float(row[3]),
+                "price": float(row[4])
+            }
+            for row in cursor.fetchall()
+        ]
+    
+    return metrics, daily, recent_signals
+
 @router.get("/stats")
 async def get_stats():
     """Sistem istatistikleri - Geriye dönük uyumluluk için"""
@@ -142,7 +158,7 @@ async def get_stats():
     if cached:
         return cached
     
-    db_stats = storage.get_statistics()
+    db_stats = await db.get_statistics()
     
     # Uptime hesapla
     uptime = stats.get_uptime()
@@ -150,15 +166,7 @@ async def get_stats():
     # Bugünkü sinyalleri say - veritabanından
     today_signals = 0
     try:
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            today_start = timezone.get_day_start()
-            cursor.execute("""
-                SELECT COUNT(*) FROM hybrid_analysis 
-                WHERE timestamp >= ? AND signal IN ('BUY', 'SELL')
-            """, (today_start,))
-            result = cursor.fetchone()
-            today_signals = result[0] if result else 0
+        today_signals = await db.run(_count_today_signals)
     except Exception as e:
         logger.error(f"Bugünkü sinyal sayısı alma hatası: {str(e)}")
         today_signals = 0
@@ -185,6 +193,17 @@ async def get_stats():
     cache.set("stats", result)
     return result
 
+def _count_today_signals() -> int:
+    """Bugünkü BUY/SELL sinyal sayısı (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM hybrid_analysis 
+            WHERE timestamp >= ? AND signal IN ('BUY', 'SELL')
+        """, (timezone.get_day_start(),))
+        result = cursor.fetchone()
+        return result[0] if result else 0
+
 @router.get("/prices/latest")
 async def get_latest_prices(limit: int = 60, interval: str = "1m"):
     """
@@ -213,7 +232,7 @@ async def get_latest_prices(limit: int = 60, interval: str = "1m"):
     config = interval_config.get(interval, interval_config["1m"])
     fetch_count = min(limit * config["multiplier"] + 20, 300)  # Reduced fetch size
     
-    latest_prices = storage.get_latest_prices(fetch_count)
+    latest_prices = await db.get_latest_prices(fetch_count)
     
     # Optimized filtering algorithm
     if latest_prices:
@@ -261,7 +280,7 @@ async def get_latest_prices(limit: int = 60, interval: str = "1m"):
 @router.get("/prices/current")
 async def get_current_price():
     """Anlık gram altın fiyatı - Cache kullanılmaz, her zaman fresh data"""
-    latest = storage.get_latest_price()
+    latest = await db.get_latest_price()
     if latest:
         return {
             "timestamp": latest.timestamp.isoformat(),
@@ -283,48 +302,51 @@ async def get_daily_price_range():
         # Son 24 saatteki fiyatları al
         yesterday = timezone.now() - timedelta(hours=24)
         
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    MIN(gram_altin) as daily_low,
-                    MAX(gram_altin) as daily_high,
-                    MIN(ons_usd) as ons_low,
-                    MAX(ons_usd) as ons_high,
-                    MIN(usd_try) as usd_low,
-                    MAX(usd_try) as usd_high
-                FROM prices 
-                WHERE timestamp >= ?
-                AND gram_altin IS NOT NULL
-            """, (yesterday,))
+        result = await db.run(_query_daily_range, yesterday)
+        
+        if result and result[0] is not None:
+            data = {
+                "gram_altin": {
+                    "low": float(result[0]),
+                    "high": float(result[1])
+                },
+                "ons_usd": {
+                    "low": float(result[2]) if result[2] else None,
+                    "high": float(result[3]) if result[3] else None
+                },
+                "usd_try": {
+                    "low": float(result[4]) if result[4] else None,
+                    "high": float(result[5]) if result[5] else None
+                }
+            }
             
-            result = cursor.fetchone()
+            cache.set("daily_price_range", data, ttl=300)  # 5 dakika cache
+            return data
+        else:
+            return {"error": "No price data available for the last 24 hours"}
             
-            if result and result[0] is not None:
-                data = {
-                    "gram_altin": {
-                        "low": float(result[0]),
-                        "high": float(result[1])
-                    },
-                    "ons_usd": {
-                        "low": float(result[2]) if result[2] else None,
-                        "high": float(result[3]) if result[3] else None
-                    },
-                    "usd_try": {
-                        "low": float(result[4]) if result[4] else None,
-                        "high": float(result[5]) if result[5] else None
-                    }
-                }
-                
-                cache.set("daily_price_range", data, ttl=300)  # 5 dakika cache
-                return data
-            else:
-                return {"error": "No price data available for the last 24 hours"}
-                
     except Exception as e:
         logger.error(f"Daily price range error: {e}")
         return {"error": str(e)}
 
+def _query_daily_range(since) -> tuple:
+    """Son 24 saatin min/max fiyatları (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                MIN(gram_altin) as daily_low,
+                MAX(gram_altin) as daily_high,
+                MIN(ons_usd) as ons_low,
+                MAX(ons_usd) as ons_high,
+                MIN(usd_try) as usd_low,
+                MAX(usd_try) as usd_high
+            FROM prices 
+            WHERE timestamp >= ?
+            AND gram_altin IS NOT NULL
+        """, (since,))
+        return cursor.fetchone()
+
 @router.get("/gram-candles/{interval}")
 async def get_gram_candles(interval: str):
     """Gram altın OHLC mum verileri"""
@@ -341,7 +363,7 @@ async def get_gram_candles(interval: str):
     }
     
     minutes = interval_map.get(interval, 60)
-    candles = storage.generate_gram_candles(minutes, 100)
+    candles = await db.generate_gram_candles(minutes, 100)
     
     result = {
         "candles": [
@@ -370,7 +392,7 @@ async def get_candles(interval: str):
     }
     
     minutes = interval_map.get(interval, 60)
-    candles = storage.generate_candles(minutes, 100)
+    candles = await db.generate_candles(minutes, 100)
     
     return {
         "candles": [
@@ -394,56 +416,36 @@ async def get_recent_signals():
     
     try:
         # Son 24 saatteki hybrid analizleri al
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Son 24 saatteki analizleri al
-            yesterday = timezone.now() - timedelta(hours=24)
-            
-            cursor.execute("""
-                SELECT 
-                    timestamp,
-                    timeframe,
-                    signal,
-                    confidence,
-                    gram_price,
-                    stop_loss,
-                    take_profit,
-                    position_size,
-                    risk_reward_ratio
-                FROM hybrid_analysis
-                WHERE timestamp > ?
-                ORDER BY timestamp DESC
-                LIMIT 100
-            """, (yesterday,))
-            
-            signals = []
-            for row in cursor.fetchall():
-                timestamp, timeframe, signal, confidence, gram_price, stop_loss, take_profit, position_size, risk_reward = row
-                
-                # Sadece BUY/SELL sinyallerini al (HOLD hariç)
-                if signal in ['BUY', 'SELL']:
-                    signals.append({
-                        'timestamp': timestamp,
-                        'timeframe': timeframe,
-                        'signal': signal,
-                        'confidence': confidence,
-                        'gram_price': gram_price,
-                        'stop_loss': stop_loss,
-                        'take_profit': take_profit,
-                        'position_size': position_size,
-                        'risk_reward': risk_reward
-                    })
-            
-            result = {
-                'status': 'success',
-                'signals': signals,
-                'count': len(signals)
-            }
-            
-            cache.set("signals_recent", result)
-            return result
+        yesterday = timezone.now() - timedelta(hours=24)
+        rows = await db.run(_query_recent_signals, yesterday)
+        
+        signals = []
+        for row in rows:
+            timestamp, timeframe, signal, confidence, gram_price, stop_loss, take_profit, position_size, risk_reward = row
             
+            # Sadece BUY/SELL sinyallerini al (HOLD hariç)
+            if signal in ['BUY', 'SELL']:
+                signals.append({
+                    'timestamp': timestamp,
+                    'timeframe': timeframe,
+                    'signal': signal,
+                    'confidence': confidence,
+                    'gram_price': gram_price,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'position_size': position_size,
+                    'risk_reward': risk_reward
+                })
+        
+        result = {
+            'status': 'success',
+            'signals': signals,
+            'count': len(signals)
+        }
+        
+        cache.set("signals_recent", result)
+        return result
+        
     except Exception as e:
         logger.error(f"Sinyal alma hatası: {str(e)}")
         return {
@@ -452,6 +454,28 @@ async def get_recent_signals():
             'signals': []
         }
 
+def _query_recent_signals(since) -> list:
+    """Son 24 saatin hybrid analiz satırları (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                timestamp,
+                timeframe,
+                signal,
+                confidence,
+                gram_price,
+                stop_loss,
+                take_profit,
+                position_size,
+                risk_reward_ratio
+            FROM hybrid_analysis
+            WHERE timestamp > ?
+            ORDER BY timestamp DESC
+            LIMIT 100
+        """, (since,))
+        return cursor.fetchall()
+
 @router.get("/signals/today")
 async def get_today_signals():
     """Bugünkü sinyalleri al (eski API uyumluluğu için)"""
@@ -545,8 +569,8 @@ async def get_recent_errors(count: int = 10):
 @router.get("/debug/candles")
 async def debug_candles():
     """Mum verisi debug"""
-    prices = storage.get_latest_prices(100)
-    candles_15m = storage.generate_candles(15, 10)
+    prices = await db.get_latest_prices(100)
+    candles_15m = await db.generate_candles(15, 10)
     
     return {
         "total_prices": len(prices),
@@ -560,6 +584,10 @@ async def debug_candles():
 @router.get("/debug/analysis-timeframes")
 async def debug_analysis_timeframes():
     """Analiz timeframe değerlerini debug et"""
+    return await db.run(_query_analysis_timeframes)
+
+def _query_analysis_timeframes() -> Dict[str, Any]:
+    """Timeframe dağılımı ve son analizler (sqlite-io havuzunda)"""
     with storage.get_connection() as conn:
         cursor = conn.cursor()
         
@@ -612,100 +640,75 @@ async def get_performance_metrics(period: str = "month", summary_only: bool = Fa
         return cached
     
     try:
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Period'a göre zaman aralığı belirle
-            now = timezone.now()
-            period_map = {
-                "day": now - timedelta(hours=24),
-                "week": now - timedelta(days=7),
-                "month": now - timedelta(days=30)
-            }
-            
-            since_time = period_map.get(period, period_map["month"])
-            
-            # Güncel fiyat bilgisi
-            latest_price = storage.get_latest_price()
-            current_price = float(latest_price.gram_altin) if latest_price and latest_price.gram_altin else 0
-            
-            # Tek sorgu ile temel performans metrikleri
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_trades,
-                    SUM(CASE WHEN net_profit_loss > 0 THEN 1 ELSE 0 END) as winning_trades,
-                    SUM(CASE WHEN net_profit_loss < 0 THEN 1 ELSE 0 END) as losing_trades,
-                    SUM(net_profit_loss) as total_pnl,
-                    AVG(CASE WHEN net_profit_loss > 0 THEN net_profit_loss ELSE NULL END) as avg_win,
-                    AVG(CASE WHEN net_profit_loss < 0 THEN ABS(net_profit_loss) ELSE NULL END) as avg_loss,
-                    MAX(net_profit_loss) as best_trade,
-                    MIN(net_profit_loss) as worst_trade
-                FROM sim_positions
-                WHERE status = 'CLOSED' AND exit_time >= ?
-            """, (since_time,))
-            
-            # Açık pozisyonlar
-            cursor.execute("""
-                SELECT COUNT(*) as open_positions,
-                       SUM(allocated_capital) as locked_capital
-                FROM sim_positions
-                WHERE status = 'OPEN'
-            """)
-            open_positions = cursor.fetchone()
-            
-            # Temel metrikleri hesapla
-            total_trades = stats[0] or 0
-            winning_trades = stats[1] or 0
-            losing_trades = stats[2] or 0
-            total_pnl = float(stats[3] or 0)
-            avg_win = float(stats[4] or 0)
-            avg_loss = float(stats[5] or 0)
-            best_trade = float(stats[6] or 0)
-            worst_trade = float(stats[7] or 0)
-            
-            # Win rate hesapla
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            
-            # Profit factor
-            profit_factor = (avg_win * winning_trades) / (avg_loss * losing_trades) if losing_trades > 0 and avg_loss > 0 else 0
-            
-            # Basit result - sadece temel bilgiler
+        # Period'a göre zaman aralığı belirle
+        now = timezone.now()
+        period_map = {
+            "day": now - timedelta(hours=24),
+            "week": now - timedelta(days=7),
+            "month": now - timedelta(days=30)
+        }
+        
+        since_time = period_map.get(period, period_map["month"])
+        
+        # Güncel fiyat bilgisi
+        latest_price = await db.get_latest_price()
+        current_price = float(latest_price.gram_altin) if latest_price and latest_price.gram_altin else 0
+        
+        stats, open_positions = await db.run(_query_performance_metrics, since_time)
+        
+        # Temel metrikleri hesapla
+        total_trades = stats["total_trades"]
+        winning_trades = stats["winning_trades"]
+        losing_trades = stats["losing_trades"]
+        total_pnl = float(stats["total_pnl"] or 0)
+        avg_win = float(stats["avg_win"] or 0)
+        avg_loss = float(stats["avg_loss"] or 0)
+        best_trade = float(stats["best_trade"] or 0)
+        worst_trade = float(stats["worst_trade"] or 0)
+        
+        # Win rate hesapla
+        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        
+        # Profit factor
+        profit_factor = (avg_win * winning_trades) / (avg_loss * losing_trades) if losing_trades > 0 and avg_loss > 0 else 0
+        
+        # Basit result - sadece temel bilgiler
+        result = {
+            "period": period,
+            "current_price": current_price,
+            "open_positions": open_positions[0] if open_positions else 0,
+            "locked_capital": round(float(open_positions[1] or 0), 2) if open_positions else 0,
+            "performance": {
+                "total_trades": total_trades,
+                "winning_trades": winning_trades,
+                "losing_trades": losing_trades,
+                "win_rate": round(win_rate, 2),
+                "total_pnl": round(total_pnl, 2),
+                "avg_win": round(avg_win, 2),
+                "avg_loss": round(avg_loss, 2),
+                "profit_factor": round(profit_factor, 2),
+                "best_trade": round(best_trade, 2),
+                "worst_trade": round(worst_trade, 2)
+            },
+            "last_update": timezone.now().isoformat()
+        }
+        
+        # Summary only mode için daha az veri
+        if summary_only:
             result = {
                 "period": period,
                 "current_price": current_price,
-                "open_positions": open_positions[0] if open_positions else 0,
-                "locked_capital": round(float(open_positions[1] or 0), 2) if open_positions else 0,
-                "performance": {
-                    "total_trades": total_trades,
-                    "winning_trades": winning_trades,
-                    "losing_trades": losing_trades,
-                    "win_rate": round(win_rate, 2),
-                    "total_pnl": round(total_pnl, 2),
-                    "avg_win": round(avg_win, 2),
-                    "avg_loss": round(avg_loss, 2),
-                    "profit_factor": round(profit_factor, 2),
-                    "best_trade": round(best_trade, 2),
-                    "worst_trade": round(worst_trade, 2)
-                },
-                "last_update": timezone.now().isoformat()
+                "total_trades": total_trades,
+                "win_rate": round(win_rate, 2),
+                "total_pnl": round(total_pnl, 2),
+                "open_positions": open_positions[0] if open_positions else 0
             }
-            
-            # Summary only mode için daha az veri
-            if summary_only:
-                result = {
-                    "period": period,
-                    "current_price": current_price,
-                    "total_trades": total_trades,
-                    "win_rate": round(win_rate, 2),
-                    "total_pnl": round(total_pnl, 2),
-                    "open_positions": open_positions[0] if open_positions else 0
-                }
-            
-            # 5 dakika cache (period'a göre uzatılabilir)
-            cache_ttl = 300 if period != "day" else 120
-            cache.set(cache_key, result, ttl=cache_ttl)
-            return result
-            
+        
+        # 5 dakika cache (period'a göre uzatılabilir)
+        cache_ttl = 300 if period != "day" else 120
+        cache.set(cache_key, result, ttl=cache_ttl)
+        return result
+        
     except Exception as e:
         logger.error(f"Performans metrikleri hatası: {e}")
         import traceback
@@ -722,28 +725,36 @@ async def get_performance_metrics(period: str = "month", summary_only: bool = Fa
             "best_timeframe": {"name": "N/A", "stats": {}}
         }
 
+def _query_performance_metrics(since_time):
+    """Dönem işlem özeti ve açık pozisyonlar (sqlite-io havuzunda çalışır)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Temel performans metrikleri - saatlik özet kovalarından
+        stats = trade_stats.window_totals(cursor, since_time)
+        
+        # Açık pozisyonlar
+        cursor.execute("""
+            SELECT COUNT(*) as open_positions,
+                   SUM(allocated_capital) as locked_capital
+            FROM sim_positions
+            WHERE status = 'OPEN'
+        """)
+        return stats, cursor.fetchone()
+
 @router.get("/market/overview")
 async def get_market_overview():
     """Piyasa genel görünümü"""
     try:
         # Son fiyat bilgileri
-        latest = storage.get_latest_price()
+        latest = await db.get_latest_price()
         if not latest:
             return {"error": "Fiyat verisi bulunamadı"}
         
-        # Son 1 saatlik değişim
+        # Son 1 saatlik değişim ve günlük en yüksek/en düşük
         hour_ago = timezone.now() - timedelta(hours=1)
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT gram_altin, ons_usd, usd_try 
-                FROM price_data 
-                WHERE timestamp >= ? 
-                ORDER BY timestamp ASC 
-                LIMIT 1
-            """, (hour_ago,))
-            
-            hour_old = cursor.fetchone()
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        hour_old, daily_range = await db.run(_query_market_overview, hour_ago, today_start)
         
         # Değişim hesapla
         changes = {}
@@ -776,7 +787,7 @@ async def get_market_overview():
                 }
         
         # Son analizden trend bilgisi
-        analyses = storage.get_hybrid_analysis_history(limit=1)
+        analyses = await db.get_hybrid_analysis_history(limit=1)
         trend_info = {}
         if analyses:
             analysis = analyses[0]
@@ -787,17 +798,6 @@ async def get_market_overview():
                 "currency_risk": analysis.get("currency_risk", {}).get("level")
             }
         
-        # Günlük en yüksek/en düşük
-        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT MIN(gram_altin), MAX(gram_altin)
-                FROM price_data
-                WHERE timestamp >= ?
-            """, (today_start,))
-            daily_range = cursor.fetchone()
-        
         daily_range_data = {}
         if daily_range and daily_range[0] and daily_range[1]:
             daily_range_data = {
@@ -825,82 +825,88 @@ async def get_market_overview():
         logger.error(f"Market overview hatası: {e}")
         return {"error": str(e)}
 
+def _query_market_overview(hour_ago, today_start) -> tuple:
+    """1 saat önceki fiyat ve günün min/max gram fiyatı (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT gram_altin, ons_usd, usd_try 
+            FROM price_data 
+            WHERE timestamp >= ? 
+            ORDER BY timestamp ASC 
+            LIMIT 1
+        """, (hour_ago,))
+        hour_old = cursor.fetchone()
+        
+        cursor.execute("""
+            SELECT MIN(gram_altin), MAX(gram_altin)
+            FROM price_data
+            WHERE timestamp >= ?
+        """, (today_start,))
+        return hour_old, cursor.fetchone()
+
 @router.get("/alerts/active")
 async def get_active_alerts():
     """Aktif uyarıları getir (önemli seviyeler yaklaşıldığında)"""
     try:
         alerts = []
-        latest = storage.get_latest_price()
+        latest = await db.get_latest_price()
         
         if not latest or not latest.gram_altin:
             return {"alerts": []}
         
         current_price = float(latest.gram_altin)
         
-        # Son 24 saatlik min/max
+        # Son 24 saatlik min/max ve 1 saat önceki fiyat
         yesterday = timezone.now() - timedelta(hours=24)
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT MIN(gram_altin) as min_price, MAX(gram_altin) as max_price
-                FROM price_data
-                WHERE timestamp >= ? AND gram_altin IS NOT NULL
-            """, (yesterday,))
+        hour_ago = timezone.now() - timedelta(hours=1)
+        result, hour_old = await db.run(_query_alert_levels, yesterday, hour_ago)
+        
+        if result and result[0] and result[1]:
+            min_24h = float(result[0])
+            max_24h = float(result[1])
             
-            result = cursor.fetchone()
-            if result and result[0] and result[1]:
-                min_24h = float(result[0])
-                max_24h = float(result[1])
-                
-                # Fiyat aralığını hesapla
-                price_range = max_24h - min_24h
-                
-                # Sadece anlamlı bir aralık varsa uyarı ver
-                if price_range > 10:  # En az 10 TL fark olmalı
-                    # Minimum seviyeye yaklaşma (alt %2'lik dilimde)
-                    support_threshold = min_24h + (price_range * 0.02)
-                    if current_price <= support_threshold:
+            # Fiyat aralığını hesapla
+            price_range = max_24h - min_24h
+            
+            # Sadece anlamlı bir aralık varsa uyarı ver
+            if price_range > 10:  # En az 10 TL fark olmalı
+                # Minimum seviyeye yaklaşma (alt %2'lik dilimde)
+                support_threshold = min_24h + (price_range * 0.02)
+                if current_price <= support_threshold:
+                    alerts.append({
+                        "type": "SUPPORT_NEAR",
+                        "level": min_24h,
+                        "message": f"Destek seviyesine yaklaşıyor: ₺{min_24h:.2f}",
+                        "severity": "HIGH",
+                        "timestamp": timezone.now().isoformat()
+                    })
+                else:
+                    # Maksimum seviyeye yaklaşma (üst %2'lik dilimde)
+                    resistance_threshold = max_24h - (price_range * 0.02)
+                    if current_price >= resistance_threshold:
                         alerts.append({
-                            "type": "SUPPORT_NEAR",
-                            "level": min_24h,
-                            "message": f"Destek seviyesine yaklaşıyor: ₺{min_24h:.2f}",
+                            "type": "RESISTANCE_NEAR",
+                            "level": max_24h,
+                            "message": f"Direnç seviyesine yaklaşıyor: ₺{max_24h:.2f}",
                             "severity": "HIGH",
                             "timestamp": timezone.now().isoformat()
                         })
-                    else:
-                        # Maksimum seviyeye yaklaşma (üst %2'lik dilimde)
-                        resistance_threshold = max_24h - (price_range * 0.02)
-                        if current_price >= resistance_threshold:
-                            alerts.append({
-                                "type": "RESISTANCE_NEAR",
-                                "level": max_24h,
-                                "message": f"Direnç seviyesine yaklaşıyor: ₺{max_24h:.2f}",
-                                "severity": "HIGH",
-                                "timestamp": timezone.now().isoformat()
-                            })
-            
-            # Son 1 saatte hızlı değişim
-            hour_ago = timezone.now() - timedelta(hours=1)
-            cursor.execute("""
-                SELECT gram_altin FROM price_data
-                WHERE timestamp >= ? AND gram_altin IS NOT NULL
-                ORDER BY timestamp ASC LIMIT 1
-            """, (hour_ago,))
+        
+        # Son 1 saatte hızlı değişim
+        if hour_old and hour_old[0]:
+            hour_old_price = float(hour_old[0])
+            change_pct = ((current_price - hour_old_price) / hour_old_price) * 100
             
-            hour_old = cursor.fetchone()
-            if hour_old and hour_old[0]:
-                hour_old_price = float(hour_old[0])
-                change_pct = ((current_price - hour_old_price) / hour_old_price) * 100
-                
-                if abs(change_pct) >= 2:  # %2'den fazla değişim
-                    direction = "yükseliş" if change_pct > 0 else "düşüş"
-                    alerts.append({
-                        "type": "RAPID_CHANGE",
-                        "change_pct": change_pct,
-                        "message": f"Son 1 saatte hızlı {direction}: %{abs(change_pct):.1f}",
-                        "severity": "MEDIUM",
-                        "timestamp": timezone.now().isoformat()
-                    })
+            if abs(change_pct) >= 2:  # %2'den fazla değişim
+                direction = "yükseliş" if change_pct > 0 else "düşüş"
+                alerts.append({
+                    "type": "RAPID_CHANGE",
+                    "change_pct": change_pct,
+                    "message": f"Son 1 saatte hızlı {direction}: %{abs(change_pct):.1f}",
+                    "severity": "MEDIUM",
+                    "timestamp": timezone.now().isoformat()
+                })
         
         return {"alerts": alerts, "count": len(alerts)}
         
@@ -908,138 +914,196 @@ async def get_active_alerts():
         logger.error(f"Alert hatası: {e}")
         return {"alerts": [], "error": str(e)}
 
+def _query_alert_levels(since, hour_ago) -> tuple:
+    """24 saatlik min/max ve 1 saat önceki gram fiyatı (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT MIN(gram_altin) as min_price, MAX(gram_altin) as max_price
+            FROM price_data
+            WHERE timestamp >= ? AND gram_altin IS NOT NULL
+        """, (since,))
+        price_range = cursor.fetchone()
+        
+        cursor.execute("""
+            SELECT gram_altin FROM price_data
+            WHERE timestamp >= ? AND gram_altin IS NOT NULL
+            ORDER BY timestamp ASC LIMIT 1
+        """, (hour_ago,))
+        return price_range, cursor.fetchone()
+
 @router.get("/prices/daily-open")
 async def get_daily_open_price():
     """Günlük açılış fiyatını getir"""
     try:
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Bugünün açılış fiyatını al (Türkiye saati ile)
-            today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            
+        return await db.run(_query_daily_open)
+        
+    except Exception as e:
+        logger.error(f"Günlük açılış fiyatı hatası: {e}")
+        return {"error": str(e)}
+
+def _query_daily_open() -> Dict[str, Any]:
+    """Bugünün açılış fiyatı, yoksa önceki kapanış (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Bugünün açılış fiyatını al (Türkiye saati ile)
+        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        cursor.execute("""
+            SELECT open, timestamp 
+            FROM gram_altin_candles
+            WHERE timestamp >= ?
+            ORDER BY timestamp ASC
+            LIMIT 1
+        """, (today_start.isoformat(),))
+        
+        result = cursor.fetchone()
+        
+        if result:
+            return {
+                "open": float(result[0]),
+                "timestamp": result[1],
+                "date": today_start.strftime("%Y-%m-%d")
+            }
+        else:
+            # Bugün veri yoksa dünün kapanışını al
+            yesterday_end = today_start - timedelta(days=1)
             cursor.execute("""
-                SELECT open, timestamp 
+                SELECT close, timestamp 
                 FROM gram_altin_candles
-                WHERE timestamp >= ?
-                ORDER BY timestamp ASC
+                WHERE timestamp < ?
+                ORDER BY timestamp DESC
                 LIMIT 1
             """, (today_start.isoformat(),))
             
             result = cursor.fetchone()
-            
             if result:
                 return {
                     "open": float(result[0]),
                     "timestamp": result[1],
-                    "date": today_start.strftime("%Y-%m-%d")
+                    "date": today_start.strftime("%Y-%m-%d"),
+                    "is_previous_close": True
                 }
-            else:
-                # Bugün veri yoksa dünün kapanışını al
-                yesterday_end = today_start - timedelta(days=1)
-                cursor.execute("""
-                    SELECT close, timestamp 
-                    FROM gram_altin_candles
-                    WHERE timestamp < ?
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """, (today_start.isoformat(),))
                 
-                result = cursor.fetchone()
-                if result:
-                    return {
-                        "open": float(result[0]),
-                        "timestamp": result[1],
-                        "date": today_start.strftime("%Y-%m-%d"),
-                        "is_previous_close": True
-                    }
-                    
-            return {"error": "Açılış fiyatı bulunamadı"}
-            
-    except Exception as e:
-        logger.error(f"Günlük açılış fiyatı hatası: {e}")
-        return {"error": str(e)}
+        return {"error": "Açılış fiyatı bulunamadı"}
 
 @router.get("/analysis/indicators/{timeframe}")
-async def get_analysis_indicators(timeframe: str):
-    """Belirli bir timeframe için detaylı teknik göstergeler"""
-    cache_key = f"indicators_{timeframe}"
+async def get_analysis_indicators(timeframe: str, details: bool = False):
+    """
+    Belirli bir timeframe için teknik göstergeler
+    
+    Args:
+        details: Tipli kolonlara ek olarak detay JSON blob'larını da döndür
+    """
+    cache_key = f"indicators_{timeframe}_{details}"
     cached = cache.get(cache_key)
     if cached:
         return cached
     
     try:
-        # Son analizi al
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT gram_analysis, global_trend_analysis, currency_risk_analysis, advanced_indicators
-                FROM hybrid_analysis
-                WHERE timeframe = ?
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, (timeframe,))
-            
-            result = cursor.fetchone()
-            if not result:
-                return {"error": "Analiz bulunamadı"}
-            
-            gram_analysis = json.loads(result[0]) if result[0] else {}
-            global_analysis = json.loads(result[1]) if result[1] else {}
-            currency_analysis = json.loads(result[2]) if result[2] else {}
-            advanced = json.loads(result[3]) if result[3] else {}
-            
-            indicators = {
-                "timeframe": timeframe,
-                "gram_indicators": gram_analysis.get("indicators", {}),
-                "global_indicators": global_analysis,
-                "currency_indicators": currency_analysis,
-                "advanced_indicators": advanced,
-                "timestamp": timezone.now().isoformat()
-            }
-            
-            cache.set(cache_key, indicators)
-            return indicators
+        latest = await db.get_latest_hybrid_signal(timeframe)
+        if not latest:
+            return {"error": "Analiz bulunamadı"}
+        
+        indicators = {
+            "timeframe": timeframe,
+            "analysis_timestamp": latest["timestamp"].isoformat(),
+            "signal": latest["signal"],
+            "confidence": latest["confidence"],
+            "key_indicators": {
+                "rsi": latest["rsi"],
+                "macd_histogram": latest["macd_histogram"],
+                "atr": latest["atr"],
+                "bb_position": latest["bb_position"],
+                "market_regime": latest["market_regime"],
+                "divergence_type": latest["divergence_type"],
+                "divergence_strength": latest["divergence_strength"],
+                "pattern": {
+                    "name": latest["pattern_name"],
+                    "type": latest["pattern_type"],
+                    "confidence": latest["pattern_confidence"]
+                } if latest["pattern_name"] else None
+            },
+            "timestamp": timezone.now().isoformat()
+        }
+        
+        if details:
+            blobs = await db.run(_load_indicator_blobs, latest["id"])
+            indicators.update(blobs)
+        
+        cache.set(cache_key, indicators)
+        return indicators
             
     except Exception as e:
         logger.error(f"Indicator analiz hatası: {e}")
         return {"error": str(e)}
 
+
+def _load_indicator_blobs(analysis_id: int) -> Dict[str, Any]:
+    """Detay görünümü için soğuk JSON blob'ları (sqlite-io havuzunda çalışır)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT json_extract(gram_analysis, '$.indicators'), global_analysis,
+                   currency_analysis, advanced_indicators
+            FROM hybrid_analysis
+            WHERE id = ?
+        """, (analysis_id,))
+        row = cursor.fetchone()
+    
+    gram, global_analysis, currency, advanced = row if row else (None,) * 4
+    return {
+        "gram_indicators": json.loads(gram) if gram else {},
+        "global_indicators": json.loads(global_analysis) if global_analysis else {},
+        "currency_indicators": json.loads(currency) if currency else {},
+        "advanced_indicators": json.loads(advanced) if advanced else {}
+    }
+
+@router.get("/indicators/live")
+async def get_live_indicators(timeframe: str = None):
+    """
+    Açık mum dahil anlık göstergeler (RSI/MACD/ATR/Bollinger/Stochastic/CCI/MFI)
+    
+    Args:
+        timeframe: Sadece bu zaman dilimi (verilmezse hepsi)
+    """
+    if timeframe is not None and timeframe not in live_indicators.timeframes:
+        return {"error": f"Geçersiz timeframe: {timeframe}"}
+    
+    try:
+        # Yeni tick'ler price_data'dan çekildiği için sqlite-io havuzunda
+        await db.run(live_indicators.refresh)
+        
+        timeframes = [timeframe] if timeframe else list(live_indicators.timeframes)
+        return {
+            "indicators": {tf: live_indicators.snapshot(tf) for tf in timeframes},
+            "timestamp": timezone.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Live indicator hatası: {e}")
+        return {"error": str(e)}
+
 @router.get("/analysis/patterns/active")
 async def get_active_patterns():
-    """Aktif chart pattern'leri getir"""
+    """Aktif chart pattern'leri getir - timeframe başına en güvenilir pattern"""
     try:
         patterns = []
         
-        # Her timeframe için son pattern'leri al
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            for timeframe in ["15m", "1h", "4h", "1d"]:
-                cursor.execute("""
-                    SELECT gram_analysis, timestamp
-                    FROM hybrid_analysis
-                    WHERE timeframe = ?
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """, (timeframe,))
-                
-                result = cursor.fetchone()
-                if result and result[0]:
-                    gram_analysis = json.loads(result[0])
-                    if gram_analysis.get("patterns"):
-                        for pattern in gram_analysis["patterns"]:
-                            patterns.append({
-                                "timeframe": timeframe,
-                                "name": pattern.get("name"),
-                                "type": pattern.get("type"),
-                                "confidence": pattern.get("confidence"),
-                                "target": pattern.get("target"),
-                                "timestamp": result[1]
-                            })
+        # Her timeframe için son analizin tipli pattern kolonları
+        for timeframe in ["15m", "1h", "4h", "1d"]:
+            latest = await db.get_latest_hybrid_signal(timeframe)
+            if latest and latest["pattern_name"]:
+                patterns.append({
+                    "timeframe": timeframe,
+                    "name": latest["pattern_name"],
+                    "type": latest["pattern_type"],
+                    "confidence": latest["pattern_confidence"] or 0,
+                    "timestamp": latest["timestamp"].isoformat()
+                })
         
         # Güven skoruna göre sırala
-        patterns.sort(key=lambda x: x.get("confidence", 0), reverse=True)
+        patterns.sort(key=lambda x: x["confidence"], reverse=True)
         
         return {
             "patterns": patterns[:10],  # En güvenilir 10 pattern
@@ -1068,73 +1132,31 @@ async def get_realtime_performance(include_history: bool = False, limit: int = 1
     try:
         limit = min(max(limit, 5), 50)  # 5-50 arası limit
         
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            now = timezone.now()
-            latest_price = storage.get_latest_price()
-            current_price = float(latest_price.gram_altin) if latest_price and latest_price.gram_altin else 0
-            
-            # Açık pozisyonlar - sadeleştirilmiş
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as count,
-                    SUM(allocated_capital) as total_capital,
-                    AVG(CASE 
-                        WHEN signal_type = 'BUY' THEN (? - entry_price) / entry_price * 100
-                        ELSE (entry_price - ?) / entry_price * 100
-                    END) as avg_pnl_pct
-                FROM sim_positions
-                WHERE status = 'OPEN'
-            """, (current_price, current_price))
-            
-            open_summary = cursor.fetchone()
-            
-            result = {
-                "current_price": current_price,
-                "open_positions": {
-                    "count": open_summary[0] if open_summary else 0,
-                    "total_capital": round(float(open_summary[1] or 0), 2) if open_summary else 0,
-                    "avg_pnl_pct": round(float(open_summary[2] or 0), 2) if open_summary else 0
-                },
-                "last_update": timezone.now().isoformat()
-            }
-            
-            # Include history aktifse son kapatılan pozisyonları ekle
-            if include_history:
-                cursor.execute("""
-                    SELECT 
-                        timeframe,
-                        signal_type,
-                        net_profit_loss,
-                        profit_loss_pct,
-                        exit_time,
-                        exit_reason
-                    FROM sim_positions
-                    WHERE status = 'CLOSED'
-                    ORDER BY exit_time DESC
-                    LIMIT ?
-                """, (limit,))
-                
-                recent_closed = []
-                for row in cursor.fetchall():
-                    tf, signal, pnl, pnl_pct, exit_time, reason = row
-                    recent_closed.append({
-                        "timeframe": tf,
-                        "signal": signal,
-                        "pnl": round(float(pnl), 2),
-                        "pnl_pct": round(float(pnl_pct), 2),
-                        "exit_time": exit_time,
-                        "exit_reason": reason,
-                        "success": pnl > 0
-                    })
-                
-                result["recent_closed"] = recent_closed
-            
-            # Cache - 30 saniye (gerçek zamanlı olmalı)
-            cache.set(cache_key, result, ttl=30)
-            return result
-            
+        latest_price = await db.get_latest_price()
+        current_price = float(latest_price.gram_altin) if latest_price and latest_price.gram_altin else 0
+        
+        open_summary, recent_closed = await db.run(
+            _query_realtime_performance, current_price, limit if include_history else 0
+        )
+        
+        result = {
+            "current_price": current_price,
+            "open_positions": {
+                "count": open_summary[0] if open_summary else 0,
+                "total_capital": round(float(open_summary[1] or 0), 2) if open_summary else 0,
+                "avg_pnl_pct": round(float(open_summary[2] or 0), 2) if open_summary else 0
+            },
+            "last_update": timezone.now().isoformat()
+        }
+        
+        # Include history aktifse son kapatılan pozisyonları ekle
+        if include_history:
+            result["recent_closed"] = recent_closed
+        
+        # Cache - 30 saniye (gerçek zamanlı olmalı)
+        cache.set(cache_key, result, ttl=30)
+        return result
+        
     except Exception as e:
         logger.error(f"Realtime performans hatası: {e}")
         return {
@@ -1144,6 +1166,56 @@ async def get_realtime_performance(include_history: bool = False, limit: int = 1
             "open_positions": {"count": 0, "total_capital": 0, "avg_pnl_pct": 0}
         }
 
+def _query_realtime_performance(current_price: float, history_limit: int):
+    """Açık pozisyon özeti ve son history_limit kapanış (sqlite-io havuzunda çalışır)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Açık pozisyonlar - sadeleştirilmiş
+        cursor.execute("""
+            SELECT 
+                COUNT(*) as count,
+                SUM(allocated_capital) as total_capital,
+                AVG(CASE 
+                    WHEN signal_type = 'BUY' THEN (? - entry_price) / entry_price * 100
+                    ELSE (entry_price - ?) / entry_price * 100
+                END) as avg_pnl_pct
+            FROM sim_positions
+            WHERE status = 'OPEN'
+        """, (current_price, current_price))
+        
+        open_summary = cursor.fetchone()
+        
+        recent_closed = []
+        if history_limit:
+            cursor.execute("""
+                SELECT 
+                    timeframe,
+                    signal_type,
+                    net_profit_loss,
+                    profit_loss_pct,
+                    exit_time,
+                    exit_reason
+                FROM sim_positions
+                WHERE status = 'CLOSED'
+                ORDER BY exit_time DESC
+                LIMIT ?
+            """, (history_limit,))
+            
+            for row in cursor.fetchall():
+                tf, signal, pnl, pnl_pct, exit_time, reason = row
+                recent_closed.append({
+                    "timeframe": tf,
+                    "signal": signal,
+                    "pnl": round(float(pnl), 2),
+                    "pnl_pct": round(float(pnl_pct), 2),
+                    "exit_time": exit_time,
+                    "exit_reason": reason,
+                    "success": pnl > 0
+                })
+    
+    return open_summary, recent_closed
+
 @router.get("/market-regime")
 async def get_market_regime():
     """Market Regime Detection analizi"""
@@ -1154,7 +1226,7 @@ async def get_market_regime():
     
     try:
         # Son 100 adet gram altın OHLC verisini al
-        candles = storage.generate_gram_candles(60, 100)  # 1 saatlik mumlar
+        candles = await db.generate_gram_candles(60, 100)  # 1 saatlik mumlar
         
         if not candles or len(candles) < 50:
             return {
@@ -1178,7 +1250,7 @@ async def get_market_regime():
         df = pd.DataFrame(df_data)
         df.set_index('timestamp', inplace=True)
         
-        # Market regime analizi yap
+        # Market regime analizi yap (sonuç zaman damgası taşır; yukarıdaki 2 dakikalık önbellek yeterli)
         regime_analysis = calculate_market_regime_analysis(df)
         
         if regime_analysis.get('status') == 'error':
@@ -1209,22 +1281,18 @@ async def get_market_regime_history(hours: int = 24):
         regime_history = []
         now = timezone.now()
         
-        # Her saat için market regime hesapla (cache olmadan)
+        # Tüm aralığın mumları tek sorguda; saatlere zaman damgası sırasıyla bölünür
+        rows = await db.run(_query_candles_between, (now - timedelta(hours=hours)).isoformat(), now.isoformat())
+        timestamps = [str(row[4]) for row in rows]
+        
+        # Her saat için market regime hesapla (kapanmış saatler analiz önbelleğinden gelir)
         for i in range(hours):
             hour_start = now - timedelta(hours=i+1)
             hour_end = now - timedelta(hours=i)
             
-            # O saatteki mumları al
-            with storage.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT open, high, low, close, timestamp
-                    FROM gram_altin_candles
-                    WHERE timestamp BETWEEN ? AND ?
-                    ORDER BY timestamp ASC
-                """, (hour_start.isoformat(), hour_end.isoformat()))
-                
-                hour_data = cursor.fetchall()
+            # O saatteki mumlar (BETWEEN: iki uç dahil)
+            hour_data = rows[bisect.bisect_left(timestamps, hour_start.isoformat()):
+                             bisect.bisect_right(timestamps, hour_end.isoformat())]
                 
             if len(hour_data) >= 20:  # Minimum veri kontrolü
                 try:
@@ -1240,7 +1308,11 @@ async def get_market_regime_history(hours: int = 24):
                         })
                     
                     df = pd.DataFrame(df_data)
-                    regime_result = calculate_market_regime_analysis(df)
+                    # Her çağrıda geçmişsiz yeni dedektör: sonuç yalnızca mumlara bağlı,
+                    # stratejinin durumlu dedektöründen ayrı anahtar kullanılır
+                    regime_result = analysis_cache.get_or_compute(
+                        "api_market_regime_fresh", df, lambda: calculate_market_regime_analysis(df)
+                    )
                     
                     if regime_result.get('status') == 'success':
                         regime_history.append({
@@ -1270,6 +1342,18 @@ async def get_market_regime_history(hours: int = 24):
             "history": []
         }
 
+def _query_candles_between(start: str, end: str) -> list:
+    """[start, end] aralığındaki gram mumları, eski->yeni (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT open, high, low, close, timestamp
+            FROM gram_altin_candles
+            WHERE timestamp BETWEEN ? AND ?
+            ORDER BY timestamp ASC
+        """, (start, end))
+        return cursor.fetchall()
+
 @router.get("/cache/stats")
 async def get_cache_stats():
     """Cache istatistiklerini getir"""
@@ -1288,6 +1372,65 @@ async def get_cache_stats():
             "cache_stats": {}
         }
 
+@router.get("/db/pool-stats")
+async def get_db_pool_stats():
+    """SQLite bağlantı havuzu metrikleri"""
+    try:
+        return {
+            "status": "success",
+            "pools": get_all_pool_metrics(),
+            "timestamp": timezone.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"DB pool stats hatası: {e}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "pools": {}
+        }
+
+@router.get("/perf/loop-lag")
+async def get_loop_lag():
+    """Event loop gecikme metrikleri (bloklayan senkron işlerin etkisi)"""
+    try:
+        return {
+            "status": "success",
+            "loop_lag": get_loop_lag_monitor().get_metrics(),
+            "timestamp": timezone.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Loop lag metrics hatası: {e}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "loop_lag": {}
+        }
+
+@router.get("/perf/stages")
+async def get_stage_metrics(format: str = "json"):
+    """HybridStrategy.analyze aşama süreleri (STAGE_PROFILING=true ile analyzer yazar)
+
+    format=prometheus ile Prometheus metin formatı döner.
+    """
+    try:
+        snapshot = await db.get_perf_snapshot(STAGE_SNAPSHOT_NAME)
+        stages = snapshot["payload"] if snapshot else {}
+        if format == "prometheus":
+            return PlainTextResponse(to_prometheus(stages), media_type="text/plain; version=0.0.4")
+        return {
+            "status": "success",
+            "stages": stages,
+            "updated_at": snapshot["updated_at"] if snapshot else None,
+            "timestamp": timezone.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Stage metrics hatası: {e}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "stages": {}
+        }
+
 @router.post("/cache/clear")
 async def clear_cache(key: str = None):
     """Cache'i temizle"""
@@ -1324,7 +1467,7 @@ async def get_divergence_analysis():
         import pandas as pd
         
         # Son 200 adet gram altın OHLC verisini al
-        candles = storage.generate_gram_candles(60, 200)  # 1 saatlik mumlar
+        candles = await db.generate_gram_candles(60, 200)  # 1 saatlik mumlar
         
         if not candles or len(candles) < 50:
             return {
@@ -1346,27 +1489,16 @@ async def get_divergence_analysis():
         df = pd.DataFrame(df_data)
         
         # Divergence analizi yap
-        divergence_result = calculate_divergence_analysis(df)
+        divergence_result = analysis_cache.get_or_compute(
+            "divergence", df, lambda: calculate_divergence_analysis(df)
+        )
         
         if divergence_result.get('status') == 'error':
             return divergence_result
         
         # Veritabanına kaydet (isteğe bağlı)
         try:
-            with storage.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO divergence_analysis 
-                    (timestamp, analysis_data, overall_signal, signal_strength, confluence_score)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    timezone.now().isoformat(),
-                    json.dumps(divergence_result),
-                    divergence_result.get('overall_signal', 'NEUTRAL'),
-                    divergence_result.get('signal_strength', 0),
-                    divergence_result.get('confluence_score', 0)
-                ))
-                conn.commit()
+            await db.run(_save_divergence_analysis, divergence_result)
         except Exception as db_error:
             logger.warning(f"Divergence analizi veritabanına kaydedilemedi: {db_error}")
         
@@ -1385,6 +1517,23 @@ async def get_divergence_analysis():
             "error_type": "analysis_error"
         }
 
+def _save_divergence_analysis(divergence_result: Dict[str, Any]):
+    """Divergence sonucunu divergence_analysis tablosuna yaz (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO divergence_analysis 
+            (timestamp, analysis_data, overall_signal, signal_strength, confluence_score)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            timezone.now().isoformat(),
+            json.dumps(divergence_result),
+            divergence_result.get('overall_signal', 'NEUTRAL'),
+            divergence_result.get('signal_strength', 0),
+            divergence_result.get('confluence_score', 0)
+        ))
+        conn.commit()
+
 @router.get("/divergence/active")
 async def get_active_divergences():
     """Aktif divergence'ları getir"""
@@ -1479,61 +1628,7 @@ async def get_divergence_history(hours: int = 24, limit: int = 100):
         if limit > 500:  # Max 500 kayıt
             limit = 500
             
-        with storage.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Divergence analiz tablosu varsa oradan al
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='divergence_analysis'
-            """)
-            
-            if cursor.fetchone():
-                # Divergence tablosu var
-                since_time = timezone.now() - timedelta(hours=hours)
-                
-                cursor.execute("""
-                    SELECT timestamp, analysis_data, overall_signal, 
-                           signal_strength, confluence_score
-                    FROM divergence_analysis
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                """, (since_time.isoformat(), limit))
-                
-                history = []
-                for row in cursor.fetchall():
-                    timestamp, analysis_data, signal, strength, confluence = row
-                    
-                    try:
-                        analysis = json.loads(analysis_data) if analysis_data else {}
-                        history.append({
-                            "timestamp": timestamp,
-                            "overall_signal": signal,
-                            "signal_strength": float(strength) if strength else 0,
-                            "confluence_score": float(confluence) if confluence else 0,
-                            "regular_count": len(analysis.get('regular_divergences', [])),
-                            "hidden_count": len(analysis.get('hidden_divergences', [])),
-                            "dominant_divergence": analysis.get('dominant_divergence')
-                        })
-                    except json.JSONDecodeError:
-                        continue
-                
-                return {
-                    "status": "success",
-                    "history": history,
-                    "count": len(history),
-                    "period_hours": hours
-                }
-            else:
-                # Divergence tablosu yok, boş döndür
-                return {
-                    "status": "success",
-                    "history": [],
-                    "count": 0,
-                    "period_hours": hours,
-                    "note": "Divergence geçmişi henüz mevcut değil"
-                }
+        return await db.run(_query_divergence_history, hours, limit)
                 
     except Exception as e:
         logger.error(f"Divergence history hatası: {e}")
@@ -1543,6 +1638,64 @@ async def get_divergence_history(hours: int = 24, limit: int = 100):
             "history": []
         }
 
+def _query_divergence_history(hours: int, limit: int) -> Dict[str, Any]:
+    """divergence_analysis kayıtları (sqlite-io havuzunda)"""
+    with storage.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Divergence analiz tablosu varsa oradan al
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='divergence_analysis'
+        """)
+        
+        if cursor.fetchone():
+            # Divergence tablosu var
+            since_time = timezone.now() - timedelta(hours=hours)
+            
+            cursor.execute("""
+                SELECT timestamp, analysis_data, overall_signal, 
+                       signal_strength, confluence_score
+                FROM divergence_analysis
+                WHERE timestamp >= ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (since_time.isoformat(), limit))
+            
+            history = []
+            for row in cursor.fetchall():
+                timestamp, analysis_data, signal, strength, confluence = row
+                
+                try:
+                    analysis = json.loads(analysis_data) if analysis_data else {}
+                    history.append({
+                        "timestamp": timestamp,
+                        "overall_signal": signal,
+                        "signal_strength": float(strength) if strength else 0,
+                        "confluence_score": float(confluence) if confluence else 0,
+                        "regular_count": len(analysis.get('regular_divergences', [])),
+                        "hidden_count": len(analysis.get('hidden_divergences', [])),
+                        "dominant_divergence": analysis.get('dominant_divergence')
+                    })
+                except json.JSONDecodeError:
+                    continue
+            
+            return {
+                "status": "success",
+                "history": history,
+                "count": len(history),
+                "period_hours": hours
+            }
+        else:
+            # Divergence tablosu yok, boş döndür
+            return {
+                "status": "success",
+                "history": [],
+                "count": 0,
+                "period_hours": hours,
+                "note": "Divergence geçmişi henüz mevcut değil"
+            }
+
 @router.get("/divergence/alerts")
 async def get_divergence_alerts():
     """Divergence tabanlı uyarılar"""
@@ -1598,7 +1751,7 @@ async def get_divergence_alerts():
             })
         
         # Invalidation yakın uyarıları
-        latest_price = storage.get_latest_price()
+        latest_price = await db.get_latest_price()
         if latest_price and latest_price.gram_altin:
             current_price = float(latest_price.gram_altin)
             
@@ -1658,7 +1811,7 @@ async def get_fibonacci_analysis():
         import pandas as pd
         
         # Son 100 adet gram altın OHLC verisini al
-        candles = storage.generate_gram_candles(60, 100)  # 1 saatlik mumlar
+        candles = await db.generate_gram_candles(60, 100)  # 1 saatlik mumlar
         
         if not candles or len(candles) < 20:
             return {
@@ -1680,7 +1833,9 @@ async def get_fibonacci_analysis():
         df = pd.DataFrame(df_data)
         
         # Fibonacci analizi yap
-        fibonacci_result = calculate_fibonacci_analysis(df)
+        fibonacci_result = analysis_cache.get_or_compute(
+            "fibonacci", df, lambda: calculate_fibonacci_analysis(df)
+        )
         
         if fibonacci_result.get('status') == 'error':
             return fibonacci_result
@@ -1765,7 +1920,7 @@ async def get_smc_analysis():
         import pandas as pd
         
         # Son 150 adet gram altın OHLC verisini al
-        candles = storage.generate_gram_candles(60, 150)  # 1 saatlik mumlar
+        candles = await db.generate_gram_candles(60, 150)  # 1 saatlik mumlar
         
         if not candles or len(candles) < 50:
             return {
@@ -1787,7 +1942,9 @@ async def get_smc_analysis():
         df = pd.DataFrame(df_data)
         
         # SMC analizi yap
-        smc_result = calculate_smc_analysis(df)
+        smc_result = analysis_cache.get_or_compute(
+            "smc", df, lambda: calculate_smc_analysis(df)
+        )
         
         if smc_result.get('status') == 'error':
             return smc_result
@@ -8,6 +8,7 @@ import logging
 from utils import timezone
 
 from storage.sqlite_storage import SQLiteStorage
+from storage.async_storage import AsyncSQLiteStorage, get_loop_lag_monitor
 from utils.logger import setup_logger
 from web import (
     dashboard_router,
@@ -53,7 +54,7 @@ async def update_stats_periodically():
     while True:
         await asyncio.sleep(60)  # Her dakika
         
-        latest = storage.get_latest_price()
+        latest = await AsyncSQLiteStorage(storage).get_latest_price()
         if latest:
             stats.update("last_price_update", latest.timestamp.isoformat())
         
@@ -66,6 +67,12 @@ async def startup_event():
     """Uygulama başlangıcında çalışacak işlemler"""
     logger.info("Web server başlatılıyor...")
     
+    # Event loop gecikmesini ölç (/api/perf/loop-lag)
+    get_loop_lag_monitor().start()
+    
+    # Tek WebSocket yayıncısı - fiyat/sinyal değişikliklerini tüm istemcilere dağıtır
+    websocket_manager.start()
+    
     # İstatistik güncelleme task'ini başlat
     asyncio.create_task(update_stats_periodically())
     
@@ -82,6 +89,8 @@ async def startup_event():
 async def shutdown_event():
     """Uygulama kapanırken çalışacak işlemler"""
     logger.info("Web server kapatılıyor...")
+    get_loop_lag_monitor().stop()
+    await websocket_manager.stop()
 
 if __name__ == "__main__":
     import uvicorn